@@ -32,6 +32,49 @@ import os
 import statistics
 from collections import defaultdict
 
+import numpy as np
+
+from Market_History import MarketHistory
+from Scenario_Optimizer import best_scenario as select_best_scenario, scenario_grid, score_surface
+from Series_Store import SeriesStore
+from Trade_Journal import TradeJournal
+
+# 시계열 기록 스키마 (Series_Store 열) - 예전엔 통계 JSON 의 dict 목록으로 쌓였음
+SPREAD_ANALYSIS_FIELDS = {
+    'avg_spread': 'f8', 'min_spread': 'f8', 'max_spread': 'f8', 'spread_std': 'f8',
+    'avg_volatility': 'f8', 'max_volatility': 'f8', 'volatility_std': 'f8',
+    'trend': 'i1',                        # UP = 1, DOWN = -1
+    'trend_strength': 'f8', 'optimal_spread_limit': 'f8', 'spread_volatility_ratio': 'f8',
+    'spread_efficiency_score': 'f8', 'hourly_avg_spread': 'f8',
+    'hourly_spread_increasing': 'i1',     # INCREASING = 1, STABLE = 0
+}
+OPTIMIZATION_FIELDS = {
+    'target_profit_percentage': 'f8', 'min_price_movement': 'f8', 'custom_lot_multiplier': 'f8',
+    'risk_tolerance': 'i1',               # RISK_TOLERANCE_CODES
+    'profit_ratio': 'f8', 'lot_size': 'f8', 'min_profit': 'f8', 'expected_profit_per_trade': 'f8',
+    'trades_per_hour': 'f8', 'hourly_profit': 'f8', 'risk_score': 'f8', 'success_rate': 'f8',
+    'spread_limit': 'f8', 'user_satisfaction': 'f8', 'score': 'f8',
+}
+RISK_TOLERANCE_CODES = {'low': 0, 'medium': 1, 'high': 2, 'extreme': 3}
+
+
+def spread_analysis_row(analysis):
+    """시장 분석 dict → SPREAD_ANALYSIS_FIELDS 행"""
+    row = {name: analysis.get(name) for name in SPREAD_ANALYSIS_FIELDS}
+    row['trend'] = 1 if analysis.get('price_trend') == 'UP' else -1
+    row['hourly_spread_increasing'] = int(analysis.get('hourly_spread_trend') == 'INCREASING')
+    return row
+
+
+def optimization_row(user_settings, scenario):
+    """사용자 설정 + 선택된 시나리오 → OPTIMIZATION_FIELDS 행"""
+    row = {name: scenario.get(name) for name in OPTIMIZATION_FIELDS}
+    row.update({name: user_settings.get(name) for name in
+                ('target_profit_percentage', 'min_price_movement', 'custom_lot_multiplier')})
+    row['risk_tolerance'] = RISK_TOLERANCE_CODES.get(user_settings.get('risk_tolerance'), -1)
+    return row
+
+
 class UltimateOptimizedBot:
     def __init__(self):
         self.config = {}
@@ -59,14 +102,19 @@ class UltimateOptimizedBot:
             'winning_trades': 0,
             'start_time': datetime.now(),
             'daily_profits': defaultdict(float),
-            'optimization_history': [],
-            'spread_optimization_data': [],
             'compound_history': [],              # 복리 히스토리
             'ai_decisions': []                   # AI 결정 기록
         }
         
         self.last_price = 0.0
         self.save_file = 'ultimate_bot_stats.json'
+        self.journal = TradeJournal(self.save_file)   # 거래마다 바뀐 항목만 추가 기록
+        # 최적화/시장 분석 기록은 통계 JSON 대신 열 기반 시계열 저장소로 (시간 구간 조회)
+        self.optimization_history = SeriesStore('series_store/optimization_history', OPTIMIZATION_FIELDS,
+                                                chunk_rows=1024, retention_days=365)
+        self.spread_history = SeriesStore('series_store/spread_optimization', SPREAD_ANALYSIS_FIELDS,
+                                          chunk_rows=1024, retention_days=90,
+                                          downsample_after_days=14, downsample_seconds=3600)
         self.market_data = {
             'spreads': [],
             'volatility': [],
@@ -75,6 +123,12 @@ class UltimateOptimizedBot:
             'spread_patterns': defaultdict(list),
             'ai_market_analysis': {}             # AI 시장 분석 데이터
         }
+        # 시나리오 탐색 격자 (None = 기존 6×9×6, 숫자 = 같은 범위를 그 단계 수로)
+        self.scenario_grid = {'ratio_steps': None, 'lot_steps': None, 'min_steps': None}
+        self.score_surface = None                # 마지막 시나리오 점수 큐브 (Scenario_Optimizer)
+        # 시장 분석용 틱 히스토리 (심볼/시간대별 디스크 캐시, 재시작시 새 틱만 추가)
+        self.market_history = MarketHistory('market_cache')
+        self.analysis_seconds = 300              # 분석 구간 (기존 300초 수집과 같은 길이)
         self.load_stats()
     
     def get_revolutionary_compound_settings(self):
@@ -285,32 +339,26 @@ class UltimateOptimizedBot:
         print("  🔍 시장 상황 완전 분석 중...")
         print("="*70)
         
-        # 5분간 집중 데이터 수집 (더 정확한 분석)
-        spreads = []
-        prices = []
-        volatilities = []
-        spread_times = []
-        
-        print("📊 고급 데이터 수집 중 (300초)...")
-        for i in range(300):  # 5분간 수집
-            price_data = self.get_current_price()
-            if price_data:
-                spreads.append(price_data['spread'])
-                prices.append(price_data['mid'])
-                spread_times.append(datetime.now())
-                
-                if len(prices) >= 2:
-                    volatility = abs(prices[-1] - prices[-2])
-                    volatilities.append(volatility)
-                
-                # 스프레드 패턴 학습
-                hour = datetime.now().hour
-                self.market_data['spread_patterns'][hour].append(price_data['spread'])
-                
-                if i % 30 == 0:
-                    print(f"  진행률: {i+1}/300 - 스프레드: ${price_data['spread']:.2f} - 변동성: ${volatility if len(prices) >= 2 else 0:.2f}")
-            
-            time.sleep(1)
+        # 과거 틱 히스토리로 분석 (디스크 캐시 + 마지막 저장 이후 새 틱만 받음 - 300초 대기 없음)
+        symbol = self.config.get('symbol', 'BTCUSD')
+        print(f"📊 틱 히스토리 불러오는 중 (최근 {self.analysis_seconds}초 구간)...")
+        update = self.market_history.update(symbol)
+        samples = self.market_history.recent(symbol, self.analysis_seconds) if update else None
+        if samples is None:
+            print(f"❌ 틱 히스토리 조회 실패: {mt5.last_error()}")
+            return None
+        
+        sample_times, spread_samples, mid_samples = samples
+        spreads = spread_samples.tolist()
+        prices = mid_samples.tolist()
+        volatilities = np.abs(np.diff(mid_samples)).tolist()
+        
+        # 스프레드 패턴 (시간대별, 캐시된 여러 날 포함)
+        for hour, hour_spreads in self.market_history.hourly_spreads(symbol).items():
+            self.market_data['spread_patterns'][hour] = hour_spreads.tolist()
+        
+        source = '캐시 + 새 틱' if update['from_cache'] else f"최근 {self.market_history.history_hours}시간 새로 수집"
+        print(f"  ✅ {source} {update['new_ticks']:,}개 → {len(spreads)}초 샘플 ({update['fetch_sec']*1000:.0f}ms)")
         
         # 고급 시장 분석
         if spreads and volatilities:
@@ -331,8 +379,8 @@ class UltimateOptimizedBot:
             spread_optimization = self.calculate_optimal_spread_limits(spreads, volatilities)
             market_analysis.update(spread_optimization)
             
-            # 시간대별 스프레드 패턴 분석
-            current_hour = datetime.now().hour
+            # 시간대별 스프레드 패턴 분석 (마지막 틱 시각 기준)
+            current_hour = datetime.fromtimestamp(int(sample_times[-1])).hour
             if current_hour in self.market_data['spread_patterns']:
                 hourly_spreads = self.market_data['spread_patterns'][current_hour]
                 market_analysis['hourly_avg_spread'] = statistics.mean(hourly_spreads)
@@ -348,10 +396,7 @@ class UltimateOptimizedBot:
             print(f"  시간대별 스프레드: ${market_analysis.get('hourly_avg_spread', 0):.2f}")
             
             # 스프레드 최적화 데이터 저장
-            self.stats['spread_optimization_data'].append({
-                'timestamp': datetime.now().isoformat(),
-                'analysis': market_analysis
-            })
+            self.spread_history.append(time.time(), **spread_analysis_row(market_analysis))
             
             return market_analysis
         
@@ -399,93 +444,25 @@ class UltimateOptimizedBot:
         print("  🧮 사용자 맞춤 시나리오 계산 중...")
         print("="*70)
         
-        # 사용자 설정 기반 시나리오 생성
-        scenarios = []
-        
-        # 사용자 목표 수익률 중심으로 범위 설정
+        # 사용자 목표 수익률/거래량 배수/최소 변동폭 중심 격자 (scenario_grid 로 촘촘하게 가능)
         target_ratio = self.user_settings['target_profit_percentage']
-        profit_ratios = [
-            target_ratio * 0.5,   # 50% 보수적
-            target_ratio * 0.75,  # 75% 보수적
-            target_ratio,         # 목표값
-            target_ratio * 1.25,  # 25% 공격적
-            target_ratio * 1.5,   # 50% 공격적
-            target_ratio * 2.0    # 100% 공격적
-        ]
-        
-        # 거래량 옵션 (사용자 배수 반영)
-        base_lots = [0.001, 0.005, 0.01, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0]
-        lot_sizes = [lot * self.user_settings['custom_lot_multiplier'] for lot in base_lots]
-        
-        # 최소 수익 옵션 (사용자 변동폭 기반)
         min_movement = self.user_settings['min_price_movement']
-        min_profits = [
-            min_movement * 0.05,  # 5%
-            min_movement * 0.1,   # 10%
-            min_movement * 0.15,  # 15%
-            min_movement * 0.2,   # 20%
-            min_movement * 0.25,  # 25%
-            min_movement * 0.3    # 30%
-        ]
+        profit_ratios, lot_sizes, min_profits = scenario_grid(self.user_settings, **self.scenario_grid)
         
         total_scenarios = len(profit_ratios) * len(lot_sizes) * len(min_profits)
-        print(f"📊 사용자 맞춤 시나리오: {total_scenarios}개")
+        print(f"📊 사용자 맞춤 시나리오: {total_scenarios:,}개")
         print(f"  🎯 목표 수익률 기준: {target_ratio*100:.1f}%")
         print(f"  💰 거래량 배수: {self.user_settings['custom_lot_multiplier']:.1f}x")
         print(f"  📊 최소 변동폭 기준: ${min_movement:.1f}")
         
-        scenario_count = 0
-        for profit_ratio in profit_ratios:
-            for lot_size in lot_sizes:
-                for min_profit in min_profits:
-                    scenario_count += 1
-                    
-                    # 사용자 설정 기반 예상 성과 계산
-                    expected_profit_per_trade = min_movement * profit_ratio * lot_size
-                    trades_per_hour = self.estimate_trade_frequency_advanced(market_analysis, profit_ratio, min_profit)
-                    hourly_profit = expected_profit_per_trade * trades_per_hour
-                    
-                    # 고급 리스크 계산 (사용자 허용도 반영)
-                    risk_score = self.calculate_advanced_risk_score(lot_size, profit_ratio, market_analysis)
-                    
-                    # 성공률 계산 (스프레드 최적화 반영)
-                    success_rate = self.calculate_advanced_success_rate(profit_ratio, market_analysis)
-                    
-                    # 최적 스프레드 한계 (이미 계산됨)
-                    optimal_spread_limit = market_analysis.get('optimal_spread_limit', 5.0)
-                    
-                    # 사용자 만족도 점수 계산
-                    user_satisfaction = self.calculate_user_satisfaction_score(
-                        profit_ratio, lot_size, min_profit, expected_profit_per_trade
-                    )
-                    
-                    scenario = {
-                        'profit_ratio': profit_ratio,
-                        'lot_size': lot_size,
-                        'min_profit': min_profit,
-                        'expected_profit_per_trade': expected_profit_per_trade,
-                        'trades_per_hour': trades_per_hour,
-                        'hourly_profit': hourly_profit,
-                        'risk_score': risk_score,
-                        'success_rate': success_rate,
-                        'spread_limit': optimal_spread_limit,
-                        'user_satisfaction': user_satisfaction,
-                        'score': self.calculate_advanced_scenario_score(
-                            hourly_profit, risk_score, success_rate, user_satisfaction
-                        )
-                    }
-                    
-                    scenarios.append(scenario)
-                    
-                    if scenario_count % 50 == 0:
-                        print(f"  진행률: {scenario_count}/{total_scenarios}")
+        # 전체 파라미터 큐브를 한 번에 계산 (점수 모델은 Scenario_Optimizer.score_surface)
+        started = time.perf_counter()
+        surface = score_surface(profit_ratios, lot_sizes, min_profits, market_analysis, self.user_settings)
         
-        # 사용자 만족도가 높은 상위 시나리오 중에서 최고 점수 선택
-        high_satisfaction_scenarios = [s for s in scenarios if s['user_satisfaction'] >= 0.7]
-        if high_satisfaction_scenarios:
-            best_scenario = max(high_satisfaction_scenarios, key=lambda x: x['score'])
-        else:
-            best_scenario = max(scenarios, key=lambda x: x['score'])
+        # 사용자 만족도가 높은 (70% 이상) 시나리오 중에서 최고 점수 선택
+        best_scenario = select_best_scenario(surface, market_analysis.get('optimal_spread_limit', 5.0))
+        self.score_surface = surface
+        print(f"  ⚡ 계산 시간: {(time.perf_counter() - started) * 1000:.1f}ms")
         
         print(f"\n🏆 사용자 맞춤 최적 시나리오 발견!")
         print(f"  🎯 수익률: {best_scenario['profit_ratio']*100:.1f}% (목표: {target_ratio*100:.1f}%)")
@@ -499,95 +476,6 @@ class UltimateOptimizedBot:
         
         return best_scenario
     
-    def calculate_user_satisfaction_score(self, profit_ratio, lot_size, min_profit, expected_profit):
-        """😊 사용자 만족도 점수 계산"""
-        target_ratio = self.user_settings['target_profit_percentage']
-        target_movement = self.user_settings['min_price_movement']
-        target_multiplier = self.user_settings['custom_lot_multiplier']
-        
-        # 목표 수익률과의 일치도 (40%)
-        ratio_match = 1.0 - abs(profit_ratio - target_ratio) / target_ratio
-        ratio_score = max(0, ratio_match) * 0.4
-        
-        # 예상 수익의 적절성 (30%)
-        target_profit = target_movement * target_ratio
-        profit_match = min(1.0, expected_profit / target_profit) if target_profit > 0 else 0
-        profit_score = profit_match * 0.3
-        
-        # 거래량 배수 반영도 (20%)
-        lot_appropriateness = min(1.0, lot_size / (0.1 * target_multiplier)) if target_multiplier > 0 else 0.5
-        lot_score = lot_appropriateness * 0.2
-        
-        # 리스크 허용도와의 일치 (10%)
-        risk_tolerance_scores = {'low': 0.3, 'medium': 0.6, 'high': 0.9}
-        risk_preference = risk_tolerance_scores.get(self.user_settings['risk_tolerance'], 0.6)
-        risk_score = risk_preference * 0.1
-        
-        total_satisfaction = ratio_score + profit_score + lot_score + risk_score
-        return min(1.0, total_satisfaction)
-    
-    def estimate_trade_frequency_advanced(self, market_analysis, profit_ratio, min_profit):
-        """고급 거래 빈도 추정"""
-        base_frequency = market_analysis['avg_volatility'] / 15
-        
-        # 사용자 설정 반영
-        target_movement = self.user_settings['min_price_movement']
-        movement_factor = market_analysis['avg_volatility'] / target_movement if target_movement > 0 else 1
-        
-        ratio_factor = (1 / profit_ratio) * 0.05
-        profit_factor = max(0.1, 1 / min_profit)
-        
-        # 스프레드 효율성 반영
-        spread_efficiency = market_analysis.get('spread_efficiency_score', 0.5)
-        efficiency_factor = 1 + spread_efficiency
-        
-        frequency = base_frequency * movement_factor * ratio_factor * profit_factor * efficiency_factor
-        return min(frequency, 8)  # 최대 시간당 8회
-    
-    def calculate_advanced_risk_score(self, lot_size, profit_ratio, market_analysis):
-        """고급 리스크 점수 계산"""
-        # 기본 리스크
-        lot_risk = lot_size * 1.5
-        ratio_risk = profit_ratio * 3
-        
-        # 시장 리스크
-        volatility_risk = market_analysis.get('volatility_std', 0) / max(market_analysis.get('avg_volatility', 1), 1)
-        spread_risk = market_analysis.get('spread_std', 0) / max(market_analysis.get('avg_spread', 1), 1)
-        
-        # 사용자 리스크 허용도 반영
-        risk_tolerance_multipliers = {'low': 1.5, 'medium': 1.0, 'high': 0.7}
-        tolerance_multiplier = risk_tolerance_multipliers.get(self.user_settings['risk_tolerance'], 1.0)
-        
-        total_risk = (lot_risk + ratio_risk + volatility_risk + spread_risk) * tolerance_multiplier
-        return min(total_risk, 10)
-    
-    def calculate_advanced_success_rate(self, profit_ratio, market_analysis):
-        """고급 성공률 계산"""
-        base_rate = 0.95  # 양방향 거래의 높은 기본 성공률
-        
-        # 수익률 페널티 (더 정교하게)
-        ratio_penalty = (profit_ratio - self.user_settings['target_profit_percentage']) * 0.3
-        
-        # 변동성 보너스
-        volatility_bonus = min(market_analysis['avg_volatility'] / 50, 0.05)
-        
-        # 스프레드 효율성 보너스
-        spread_efficiency = market_analysis.get('spread_efficiency_score', 0)
-        efficiency_bonus = spread_efficiency * 0.03
-        
-        success_rate = base_rate - ratio_penalty + volatility_bonus + efficiency_bonus
-        return max(0.6, min(1.0, success_rate))  # 최소 60%, 최대 100%
-    
-    def calculate_advanced_scenario_score(self, hourly_profit, risk_score, success_rate, user_satisfaction):
-        """고급 시나리오 종합 점수 계산"""
-        # 가중치: 사용자 만족도 40%, 수익성 30%, 안전성 20%, 성공률 10%
-        satisfaction_score = user_satisfaction * 40
-        profit_score = min(hourly_profit, 100) * 0.3  # 최대 100달러로 제한
-        safety_score = (10 - risk_score) * 2
-        success_score = success_rate * 10
-        
-        return satisfaction_score + profit_score + safety_score + success_score
-    
     def estimate_trade_frequency(self, market_analysis, profit_ratio, min_profit):
         """거래 빈도 추정"""
         # 변동성이 높을수록, 수익률이 낮을수록 더 많은 거래 기회
@@ -646,14 +534,8 @@ class UltimateOptimizedBot:
             'user_risk_tolerance': self.user_settings['risk_tolerance']
         }
         
-        # 최적화 기록 저장 (더 상세하게)
-        self.stats['optimization_history'].append({
-            'timestamp': datetime.now().isoformat(),
-            'user_settings': self.user_settings.copy(),
-            'scenario': best_scenario,
-            'config': self.config.copy(),
-            'market_conditions': 'analyzed'
-        })
+        # 최적화 기록 저장 (config 는 시나리오 + 사용자 설정에서 나오므로 숫자 열만)
+        self.optimization_history.append(time.time(), **optimization_row(self.user_settings, best_scenario))
     
     def get_current_price(self):
         """현재가 조회"""
@@ -1429,7 +1311,7 @@ class UltimateOptimizedBot:
             self.display_final_stats()
             
         finally:
-            self.save_stats()
+            self.save_stats(compact=True)
             mt5.shutdown()
             print("\n🏆 사용자 맞춤 AI 최적화 시스템 종료\n")
     
@@ -1454,29 +1336,51 @@ class UltimateOptimizedBot:
             print(f"  🎯 사용자 목표 수익률: {target_pct:.1f}%")
             print(f"  😊 사용자 만족도: {self.config.get('user_satisfaction', 0)*100:.1f}%")
     
-    def save_stats(self):
-        """통계 저장"""
+    def save_stats(self, compact=False):
+        """통계 저장 - 저널에 바뀐 항목만 한 줄 추가 (compact=True 면 전체 스냅샷으로 압축)"""
         stats_to_save = self.stats.copy()
         stats_to_save['daily_profits'] = dict(stats_to_save['daily_profits'])
         stats_to_save['start_time'] = stats_to_save['start_time'].isoformat()
         
-        with open(self.save_file, 'w') as f:
-            json.dump(stats_to_save, f, indent=2)
+        if compact:
+            self.journal.snapshot(stats_to_save)
+            self.optimization_history.flush()
+            self.spread_history.flush()
+        else:
+            self.journal.record(stats_to_save)
     
     def load_stats(self):
         """통계 불러오기"""
-        if os.path.exists(self.save_file):
-            try:
-                with open(self.save_file, 'r') as f:
-                    loaded_stats = json.load(f)
-                
+        try:
+            # 스냅샷(기존 통계 파일) + 저널 재생
+            loaded_stats = self.journal.load()
+            if loaded_stats:
+                migrated = self.migrate_legacy_history(loaded_stats)
                 self.stats.update(loaded_stats)
                 self.stats['start_time'] = datetime.fromisoformat(loaded_stats['start_time'])
                 self.stats['daily_profits'] = defaultdict(float, loaded_stats['daily_profits'])
                 
                 print(f"\n✓ 이전 통계 불러옴: 누적 수익 ${self.stats['total_real_profit']:,.2f}")
-            except:
-                print("\n⚠️ 통계 파일 손상. 새로 시작합니다.")
+                if migrated:
+                    # 옮긴 목록이 빠진 스냅샷으로 다시 써서 다음 시작에 또 옮기지 않음
+                    self.save_stats(compact=True)
+                    print(f"✓ 최적화/분석 기록 {migrated}건을 시계열 저장소로 이전")
+        except:
+            print("\n⚠️ 통계 파일 손상. 새로 시작합니다.")
+    
+    def migrate_legacy_history(self, loaded_stats):
+        """예전 통계 JSON 의 optimization_history / spread_optimization_data 목록 → 시계열 저장소"""
+        migrated = 0
+        for record in loaded_stats.pop('optimization_history', []):
+            timestamp = datetime.fromisoformat(record['timestamp']).timestamp()
+            self.optimization_history.append(
+                timestamp, **optimization_row(record.get('user_settings', {}), record.get('scenario', {})))
+            migrated += 1
+        for record in loaded_stats.pop('spread_optimization_data', []):
+            timestamp = datetime.fromisoformat(record['timestamp']).timestamp()
+            self.spread_history.append(timestamp, **spread_analysis_row(record.get('analysis', {})))
+            migrated += 1
+        return migrated
 
 def main():
     """메인 함수"""
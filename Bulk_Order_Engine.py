@@ -0,0 +1,374 @@
+"""
+🚀 벌크 주문 배치 엔진 - 그리드 주문 수백~수천 개를 파이프라인으로 한 번에 배치
+- 거래량/가격을 배열로 한 번에 정규화 (symbol_info 는 배치당 1회만 조회)
+- 워커 스레드 파이프라인 + 토큰 버킷 속도 제한 (고정 sleep 없음)
+- 브로커 응답 코드 기반 적응형 조절
+  · 과다요청/타임아웃/연결오류 → 속도 절반 + 재시도
+  · 성공이 이어지면 속도 점진 증가 (최대치까지)
+  · 주문 한도/증거금 부족 → 남은 주문은 보내지 않음
+- 구조화된 배치 리포트 + '그리드 완전 활성화까지 걸린 시간' 지표
+
+💡 사용법:
+    placer = BulkOrderPlacer('BTCUSD', magic=999999, deviation=20)
+    report = placer.place_limit_grid(buy_prices, sell_prices, 0.01)
+    report['buy']      # {가격: 주문번호}
+    print_placement_report(report)
+    placer.execute([{'action': mt5.TRADE_ACTION_REMOVE, 'order': ticket}, ...])   # 취소/수정도 같은 파이프라인
+"""
+
+import time
+import queue
+import threading
+from collections import Counter
+
+import numpy as np
+import MetaTrader5 as mt5
+
+# 응답 코드 분류
+THROTTLE_RETCODES = {
+    mt5.TRADE_RETCODE_TOO_MANY_REQUESTS,
+    mt5.TRADE_RETCODE_TIMEOUT,
+    mt5.TRADE_RETCODE_CONNECTION,
+}
+RETRY_RETCODES = {
+    mt5.TRADE_RETCODE_REQUOTE,
+    mt5.TRADE_RETCODE_PRICE_CHANGED,
+    mt5.TRADE_RETCODE_PRICE_OFF,
+}
+ABORT_RETCODES = {
+    mt5.TRADE_RETCODE_LIMIT_ORDERS,
+    mt5.TRADE_RETCODE_LIMIT_VOLUME,
+    mt5.TRADE_RETCODE_NO_MONEY,
+    mt5.TRADE_RETCODE_TRADE_DISABLED,
+    mt5.TRADE_RETCODE_MARKET_CLOSED,
+}
+
+# 주문별 상태 코드 (리포트 status 배열)
+STATUS_PENDING = 0
+STATUS_PLACED = 1
+STATUS_FAILED = 2
+STATUS_SKIPPED = 3      # 사전 검증 실패 또는 한도 도달로 전송 안 함
+
+DEFAULT_PLACER_CONFIG = {
+    'workers': 8,                   # 동시 전송 스레드 (응답 대기 시간 겹치기)
+    'max_requests_per_second': 200, # 속도 상한 (브로커가 10024 를 주면 자동으로 낮춤)
+    'min_requests_per_second': 2,   # 조절 하한
+    'increase_step': 2,             # 성공 연속시 초당 증가량
+    'increase_after': 20,           # 이만큼 연속 성공하면 속도 증가
+    'max_retries': 3,
+    'retry_backoff': 0.2,           # 재시도 대기 (초, 시도마다 2배)
+}
+
+
+class AdaptiveRateLimiter:
+    """⏱️ 토큰 버킷 + AIMD 속도 조절 (스레드 안전)"""
+
+    THROTTLE_COOLDOWN = 1.0
+
+    def __init__(self, rate, min_rate, max_rate, increase_step, increase_after):
+        self.rate = float(rate)
+        self.min_rate = float(min_rate)
+        self.max_rate = float(max_rate)
+        self.increase_step = increase_step
+        self.increase_after = increase_after
+        self._next_slot = time.perf_counter()
+        self._streak = 0
+        self._last_throttle = float('-inf')
+        self._lock = threading.Lock()
+        self.throttle_events = 0
+
+    def acquire(self):
+        """다음 전송 슬롯까지 대기"""
+        with self._lock:
+            now = time.perf_counter()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + 1.0 / self.rate
+        wait = slot - now
+        if wait > 0:
+            time.sleep(wait)
+
+    def success(self):
+        with self._lock:
+            self._streak += 1
+            if self._streak >= self.increase_after:
+                self._streak = 0
+                self.rate = min(self.max_rate, self.rate + self.increase_step)
+
+    def throttle(self):
+        """브로커가 느려지라고 할 때 - 속도 절반
+
+        동시에 보낸 요청들이 한꺼번에 거절되므로 1초 안의 추가 거절은 같은 신호로 봄
+        """
+        with self._lock:
+            now = time.perf_counter()
+            self._streak = 0
+            if now - self._last_throttle < self.THROTTLE_COOLDOWN:
+                return
+            self._last_throttle = now
+            self.throttle_events += 1
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._next_slot = max(self._next_slot, now + 1.0 / self.rate)
+
+
+class BulkOrderPlacer:
+    """🚀 대기주문 일괄 배치 파이프라인"""
+
+    def __init__(self, symbol, magic, deviation=20, type_filling=None, config=None):
+        self.symbol = symbol
+        self.magic = magic
+        self.deviation = deviation
+        self.type_filling = type_filling
+        self.config = dict(DEFAULT_PLACER_CONFIG)
+        if config:
+            self.config.update(config)
+        self.metrics = {
+            'batches': 0,
+            'orders_placed': 0,
+            'time_to_live_sec': [],     # 배치별 그리드 완전 활성화 시간
+        }
+
+    # ---------- 배열 정규화 ----------
+    def normalize(self, order_types, prices, volumes):
+        """📐 거래량/가격 배열 정규화 + 사전 검증 → (prices, volumes, valid)"""
+        info = mt5.symbol_info(self.symbol)
+        tick = mt5.symbol_info_tick(self.symbol)
+        if info is None or tick is None:
+            raise RuntimeError(f"{self.symbol}: 심볼 정보 조회 실패")
+
+        order_types = np.asarray(order_types)
+        prices = np.asarray(prices, dtype=np.float64)
+        volumes = np.broadcast_to(np.asarray(volumes, dtype=np.float64), prices.shape)
+
+        # 거래량: step 단위로 반올림 후 최소/최대 범위로
+        step = info.volume_step or 0.01
+        volumes = np.clip(np.round(volumes / step) * step, info.volume_min, info.volume_max)
+        volumes = np.round(volumes, max(0, int(-np.floor(np.log10(step))) + 2))
+
+        # 가격: 틱 크기 단위 + 심볼 소수점
+        tick_size = info.trade_tick_size or info.point
+        if tick_size:
+            prices = np.round(prices / tick_size) * tick_size
+        prices = np.round(prices, info.digits)
+
+        # 대기주문은 현재가에서 stops_level 이상 올바른 쪽에 있어야 함 (보내봐야 10015)
+        gap = info.trade_stops_level * info.point
+        side_ok = np.select(
+            [order_types == mt5.ORDER_TYPE_BUY_LIMIT, order_types == mt5.ORDER_TYPE_SELL_LIMIT,
+             order_types == mt5.ORDER_TYPE_BUY_STOP, order_types == mt5.ORDER_TYPE_SELL_STOP],
+            [prices < tick.ask - gap, prices > tick.bid + gap,
+             prices > tick.ask + gap, prices < tick.bid - gap],
+            default=False,
+        )
+        valid = (prices > 0) & side_ok
+        return prices, volumes, valid
+
+    # ---------- 파이프라인 ----------
+    def _run(self, n, valid, build_request, success_codes):
+        """요청 n개를 워커 스레드로 전송 (valid 인 것만) → 결과 배열 dict"""
+        tickets = np.zeros(n, dtype=np.int64)
+        status = np.where(valid, STATUS_PENDING, STATUS_SKIPPED).astype(np.int8)
+        retcodes = np.zeros(n, dtype=np.int64)
+        attempts = np.zeros(n, dtype=np.int32)
+        sent_at = np.full(n, np.nan)
+
+        cfg = self.config
+        limiter = AdaptiveRateLimiter(cfg['max_requests_per_second'], cfg['min_requests_per_second'],
+                                      cfg['max_requests_per_second'], cfg['increase_step'],
+                                      cfg['increase_after'])
+        work = queue.Queue()
+        for i in np.flatnonzero(valid):
+            work.put(int(i))
+        abort = threading.Event()
+
+        def worker():
+            while True:
+                try:
+                    i = work.get_nowait()
+                except queue.Empty:
+                    return
+                if abort.is_set():
+                    status[i] = STATUS_SKIPPED
+                    continue
+                limiter.acquire()
+                attempts[i] += 1
+                result = mt5.order_send(build_request(i))
+                code = result.retcode if result else -1
+                retcodes[i] = code
+                if code in success_codes:
+                    tickets[i] = result.order
+                    status[i] = STATUS_PLACED
+                    sent_at[i] = time.perf_counter()
+                    limiter.success()
+                    continue
+                if code in ABORT_RETCODES:
+                    status[i] = STATUS_FAILED
+                    abort.set()
+                    continue
+                retryable = code in THROTTLE_RETCODES or code in RETRY_RETCODES or code == -1
+                if code in THROTTLE_RETCODES or code == -1:
+                    limiter.throttle()
+                if retryable and attempts[i] <= cfg['max_retries']:
+                    time.sleep(cfg['retry_backoff'] * 2 ** (attempts[i] - 1))
+                    work.put(i)
+                else:
+                    status[i] = STATUS_FAILED
+
+        threads = [threading.Thread(target=worker, daemon=True)
+                   for _ in range(max(1, min(cfg['workers'], int(np.count_nonzero(valid)))))]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        return {
+            'tickets': tickets,
+            'status': status,
+            'retcodes': retcodes,
+            'attempts': attempts,
+            'sent_at': sent_at,
+            'limiter': limiter,
+            'aborted': abort.is_set(),
+        }
+
+    # ---------- 배치 ----------
+    def place(self, order_types, prices, volumes, comments=None, extra=None):
+        """📦 대기주문 배열 전체 배치 → 리포트 dict
+
+        order_types/prices/volumes: 같은 길이 배열 (volumes 는 스칼라 가능)
+        comments: 주문별 코멘트 리스트 (없으면 'GRID')
+        extra: 모든 요청에 공통으로 넣을 필드 (예: {'tp': ...})
+        """
+        started = time.perf_counter()
+        order_types = np.asarray(order_types)
+        prices, volumes, valid = self.normalize(order_types, prices, volumes)
+        n = len(prices)
+        if comments is None:
+            comments = ['GRID'] * n
+
+        def build_request(i):
+            request = {
+                "action": mt5.TRADE_ACTION_PENDING,
+                "symbol": self.symbol,
+                "volume": float(volumes[i]),
+                "type": int(order_types[i]),
+                "price": float(prices[i]),
+                "deviation": self.deviation,
+                "magic": self.magic,
+                "comment": comments[i],
+                "type_time": mt5.ORDER_TIME_GTC,
+            }
+            if self.type_filling is not None:
+                request["type_filling"] = self.type_filling
+            if extra:
+                request.update(extra)
+            return request
+
+        run = self._run(n, valid, build_request, (mt5.TRADE_RETCODE_DONE, mt5.TRADE_RETCODE_PLACED))
+        status, retcodes, attempts, limiter = run['status'], run['retcodes'], run['attempts'], run['limiter']
+
+        elapsed = time.perf_counter() - started
+        placed = status == STATUS_PLACED
+        time_to_live = float(np.nanmax(run['sent_at']) - started) if placed.any() else None
+
+        self.metrics['batches'] += 1
+        self.metrics['orders_placed'] += int(placed.sum())
+        if time_to_live is not None and placed.sum() == valid.sum():
+            self.metrics['time_to_live_sec'].append(time_to_live)
+
+        return {
+            'requested': n,
+            'placed': int(placed.sum()),
+            'failed': int((status == STATUS_FAILED).sum()),
+            'skipped': int((status == STATUS_SKIPPED).sum()),
+            'retries': int(np.maximum(attempts - 1, 0).sum()),
+            'aborted': run['aborted'],
+            'elapsed_sec': elapsed,
+            'time_to_live_sec': time_to_live,
+            'fully_live': bool(placed.sum() == n),
+            'orders_per_sec': placed.sum() / elapsed if elapsed > 0 else 0.0,
+            'final_rate': limiter.rate,
+            'throttle_events': limiter.throttle_events,
+            'retcodes': Counter(int(c) for c in retcodes[retcodes != 0]),
+            'order_types': order_types,
+            'prices': prices,
+            'volumes': volumes,
+            'tickets': run['tickets'],
+            'status': status,
+        }
+
+    def execute(self, requests):
+        """📨 이미 만들어진 요청 목록 (취소/수정 등) 을 같은 파이프라인으로 전송
+
+        요청 내용은 그대로 보냄 (정규화/사전 검증 없음). 'no changes'(10025) 도 성공으로 봄.
+        리포트: requested, done, failed, skipped, retries, elapsed_sec, retcodes, status, tickets
+        """
+        started = time.perf_counter()
+        n = len(requests)
+        run = self._run(n, np.ones(n, dtype=bool), requests.__getitem__,
+                        (mt5.TRADE_RETCODE_DONE, mt5.TRADE_RETCODE_PLACED, mt5.TRADE_RETCODE_NO_CHANGES))
+        status, retcodes = run['status'], run['retcodes']
+        return {
+            'requested': n,
+            'done': int((status == STATUS_PLACED).sum()),
+            'failed': int((status == STATUS_FAILED).sum()),
+            'skipped': int((status == STATUS_SKIPPED).sum()),
+            'retries': int(np.maximum(run['attempts'] - 1, 0).sum()),
+            'aborted': run['aborted'],
+            'elapsed_sec': time.perf_counter() - started,
+            'throttle_events': run['limiter'].throttle_events,
+            'retcodes': Counter(int(c) for c in retcodes[retcodes != 0]),
+            'status': status,
+            'tickets': run['tickets'],
+        }
+
+    def place_limit_grid(self, buy_prices, sell_prices, volumes=None, comment_format='GRID_{side}_{price:.2f}',
+                         buy_volumes=None, sell_volumes=None, buy_labels=None, sell_labels=None):
+        """🎯 매수 Limit + 매도 Limit 그리드 일괄 배치
+
+        volumes: 공통 거래량 (방향별로 다르면 buy_volumes / sell_volumes 배열)
+        comment_format: {side}, {price}, {label} 사용 가능 (label 기본값은 1부터 번호)
+        리포트에 'buy' / 'sell' = {가격: 주문번호}, 'buy_index' / 'sell_index' = 성공한 입력 위치 추가
+        """
+        buy_prices = np.asarray(buy_prices, dtype=np.float64)
+        sell_prices = np.asarray(sell_prices, dtype=np.float64)
+        n_buy = len(buy_prices)
+        order_types = np.concatenate([np.full(n_buy, mt5.ORDER_TYPE_BUY_LIMIT),
+                                      np.full(len(sell_prices), mt5.ORDER_TYPE_SELL_LIMIT)])
+        prices = np.concatenate([buy_prices, sell_prices])
+        volumes = np.concatenate([
+            np.broadcast_to(volumes if buy_volumes is None else buy_volumes, buy_prices.shape),
+            np.broadcast_to(volumes if sell_volumes is None else sell_volumes, sell_prices.shape),
+        ]).astype(np.float64)
+        if buy_labels is None:
+            buy_labels = range(1, n_buy + 1)
+        if sell_labels is None:
+            sell_labels = range(1, len(sell_prices) + 1)
+        comments = ([comment_format.format(side='BUY', price=p, label=int(l)) for p, l in zip(buy_prices, buy_labels)]
+                    + [comment_format.format(side='SELL', price=p, label=int(l)) for p, l in zip(sell_prices, sell_labels)])
+
+        report = self.place(order_types, prices, volumes, comments)
+        placed = report['status'] == STATUS_PLACED
+        prices, tickets = report['prices'], report['tickets']
+        report['buy_index'] = np.flatnonzero(placed[:n_buy])
+        report['sell_index'] = np.flatnonzero(placed[n_buy:])
+        report['buy'] = {float(prices[i]): int(tickets[i]) for i in report['buy_index']}
+        report['sell'] = {float(prices[i]): int(tickets[i]) for i in report['sell_index'] + n_buy}
+        return report
+
+
+def print_placement_report(report):
+    """📊 배치 리포트 출력"""
+    ttl = report['time_to_live_sec']
+    print(f"\n📦 벌크 배치: 요청 {report['requested']}개 → 성공 {report['placed']}개 | "
+          f"실패 {report['failed']}개 | 건너뜀 {report['skipped']}개 | 재시도 {report['retries']}회")
+    print(f"⏱️ 소요 {report['elapsed_sec']:.2f}초 ({report['orders_per_sec']:.0f}건/초) | "
+          f"그리드 활성화까지 {ttl:.2f}초" if ttl is not None else
+          f"⏱️ 소요 {report['elapsed_sec']:.2f}초 | 활성화된 주문 없음")
+    if report['throttle_events']:
+        print(f"🐢 속도 조절 {report['throttle_events']}회 (최종 {report['final_rate']:.0f}건/초)")
+    if report['aborted']:
+        print("⚠️ 주문 한도/증거금 부족으로 나머지 주문 중단")
+    failures = {code: count for code, count in report['retcodes'].items()
+                if code not in (mt5.TRADE_RETCODE_DONE, mt5.TRADE_RETCODE_PLACED)}
+    if failures:
+        print(f"❌ 실패 코드: {dict(failures)}")
@@ -0,0 +1,216 @@
+"""
+⏰ 마감시각 기반 주기 작업 스케줄러 - time.time() % N 트리거 대체
+- 작업마다 다음 마감시각을 힙에 보관 → 가장 가까운 마감까지만 정확히 잠듦 (빈 루프 없음)
+- 주기/위상이 고정되어 루프 지연이 있어도 두 번 실행되거나 건너뛰지 않음
+- 작업별 지연 정책
+  · 'skip'     : 밀린 주기는 건너뛰고 다음 격자 시각으로 (누락 횟수 집계)
+  · 'catch_up' : 밀린 주기를 연달아 실행 (max_catch_up 까지)
+  · 'delay'    : 실행 끝난 시각 + interval (고정 간격, 위상 이동 허용)
+- 작업별 실행/지연/누락 횟수, 최대·평균 지연 리포트
+- 루프 지터: 작업별 최근 지연 표본 링 (JITTER_SAMPLES 개) → p50 / p99 (렌더러 위치별 비교용)
+
+💡 사용법:
+    scheduler = DeadlineScheduler(clock=time)
+    scheduler.add('monitor', 1.0, bot.monitor_grid_positions)
+    scheduler.add('status', 15.0, bot.print_status, align=True)     # 시계 기준 :00 :15 :30 :45
+    while True:
+        scheduler.run_pending()
+        scheduler.sleep_until_next()
+"""
+
+import heapq
+import time
+from collections import deque
+from itertools import count
+
+POLICIES = ('skip', 'catch_up', 'delay')
+
+JITTER_SAMPLES = 1024     # 작업별 보관하는 최근 지연 표본 수
+
+
+class ScheduledTask:
+    """⏰ 등록된 주기 작업 하나 (상태 + 통계)"""
+
+    __slots__ = ('name', 'interval', 'callback', 'policy', 'tolerance', 'max_catch_up',
+                 'enabled', 'queued', 'deadline', 'fired', 'late', 'missed', 'errors',
+                 'max_lateness', 'total_lateness', 'total_runtime', 'lateness_samples')
+
+    def __init__(self, name, interval, callback, policy, tolerance, max_catch_up):
+        self.name = name
+        self.interval = float(interval)
+        self.callback = callback
+        self.policy = policy
+        self.tolerance = tolerance
+        self.max_catch_up = max_catch_up
+        self.enabled = True
+        self.queued = False             # 힙에 살아있는 항목이 있는지
+        self.deadline = 0.0
+        self.fired = 0
+        self.late = 0
+        self.missed = 0
+        self.errors = 0
+        self.max_lateness = 0.0
+        self.total_lateness = 0.0
+        self.total_runtime = 0.0
+        self.lateness_samples = deque(maxlen=JITTER_SAMPLES)
+
+
+class DeadlineScheduler:
+    """⏰ 힙 기반 마감시각 스케줄러 (단일 스레드 - 메인 루프에서 호출)
+
+    clock: time() / sleep() 를 가진 객체 (기본 time 모듈, 재생 시뮬레이터의 가상 시계 주입 가능)
+    """
+
+    EARLY_WAKE = 0.002      # sleep 이 이만큼 일찍 깨도 마감 도달로 봄 (1ms 짜리 추가 대기 방지)
+
+    def __init__(self, clock=time):
+        self.clock = clock
+        self.tasks = {}
+        self._heap = []                 # (마감시각, 등록순서, 작업)
+        self._order = count()
+        self.stats = {'wakeups': 0, 'idle_wakeups': 0, 'slept_sec': 0.0}
+
+    # ---------- 등록 ----------
+    def add(self, name, interval, callback, policy='skip', tolerance=None,
+            align=False, start_delay=0.0, max_catch_up=3):
+        """➕ 주기 작업 등록
+
+        tolerance: 이만큼 늦으면 '지연' 으로 집계 (기본 interval 의 10%, 최대 0.5초)
+        align: True 면 시계 기준 interval 배수 시각에 실행 (기존 % N 트리거와 같은 위상)
+        start_delay: 첫 실행까지 대기 (align 이면 정렬된 시각 이후)
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"알 수 없는 정책: {policy} (가능: {', '.join(POLICIES)})")
+        if interval <= 0:
+            raise ValueError("interval 은 0 보다 커야 함")
+        if tolerance is None:
+            tolerance = min(interval * 0.1, 0.5)
+        task = ScheduledTask(name, interval, callback, policy, tolerance, max_catch_up)
+        now = self.clock.time() + start_delay
+        task.deadline = (now // interval + 1) * interval if align else now
+        self.tasks[name] = task
+        self._push(task)
+        return task
+
+    def set_enabled(self, name, enabled):
+        """작업 일시정지/재개 - 정지된 작업은 힙에서 빠져 루프를 깨우지 않음, 재개하면 즉시 실행"""
+        task = self.tasks[name]
+        task.enabled = enabled
+        if enabled and not task.queued:
+            task.deadline = self.clock.time()
+            self._push(task)
+
+    def _push(self, task):
+        task.queued = True
+        heapq.heappush(self._heap, (task.deadline, next(self._order), task))
+
+    # ---------- 실행 ----------
+    def next_deadline(self):
+        return self._heap[0][0] if self._heap else None
+
+    def run_pending(self):
+        """▶️ 마감이 지난 작업 전부 실행 (마감 순서, 같으면 등록 순서) → 실행한 작업 이름 목록"""
+        now = self.clock.time()
+        ran = []
+        while self._heap and self._heap[0][0] <= now + self.EARLY_WAKE:
+            deadline, _, task = heapq.heappop(self._heap)
+            if self.tasks.get(task.name) is not task:
+                continue                    # 같은 이름으로 다시 등록된 옛 작업
+            task.queued = False
+            if not task.enabled:
+                continue                    # 정지된 작업은 재개될 때까지 힙에서 뺌
+            self._fire(task, deadline, now)
+            ran.append(task.name)
+            self._reschedule(task, deadline)
+            now = self.clock.time()
+        self.stats['wakeups'] += 1
+        if not ran:
+            self.stats['idle_wakeups'] += 1
+        return ran
+
+    def _fire(self, task, deadline, now):
+        lateness = max(0.0, now - deadline)
+        task.fired += 1
+        task.total_lateness += lateness
+        task.max_lateness = max(task.max_lateness, lateness)
+        task.lateness_samples.append(lateness)
+        if lateness > task.tolerance:
+            task.late += 1
+        started = time.perf_counter()
+        try:
+            task.callback()
+        except Exception as e:
+            task.errors += 1
+            print(f"❌ 예약 작업 '{task.name}' 오류: {e}")
+        task.total_runtime += time.perf_counter() - started
+
+    def _reschedule(self, task, deadline):
+        now = self.clock.time()
+        interval = task.interval
+        if task.policy == 'delay':
+            task.deadline = now + interval
+        else:
+            task.deadline = deadline + interval
+            behind = int((now - task.deadline) // interval) + 1 if now >= task.deadline else 0
+            if task.policy == 'catch_up':
+                behind = max(0, behind - task.max_catch_up)
+            if behind > 0:
+                task.missed += behind
+                task.deadline += behind * interval
+        self._push(task)
+
+    def sleep_until_next(self, max_sleep=None):
+        """😴 다음 마감시각까지 정확히 대기 (max_sleep: 입력 확인 등을 위한 최대 대기)"""
+        deadline = self.next_deadline()
+        if deadline is None:
+            return
+        wait = deadline - self.clock.time()
+        if max_sleep is not None:
+            wait = min(wait, max_sleep)
+        if wait > 0:
+            self.stats['slept_sec'] += wait
+            self.clock.sleep(wait)
+
+    # ---------- 리포트 ----------
+    def report(self):
+        """📊 작업별 통계 dict (p50/p99 지연은 최근 JITTER_SAMPLES 회 기준)"""
+        return {
+            name: {
+                **lateness_percentiles(task.lateness_samples),
+                'interval': task.interval,
+                'policy': task.policy,
+                'fired': task.fired,
+                'late': task.late,
+                'missed': task.missed,
+                'errors': task.errors,
+                'max_lateness_sec': task.max_lateness,
+                'avg_lateness_sec': task.total_lateness / task.fired if task.fired else 0.0,
+                'avg_runtime_sec': task.total_runtime / task.fired if task.fired else 0.0,
+            }
+            for name, task in self.tasks.items()
+        }
+
+
+def lateness_percentiles(samples):
+    """지연 표본 → {'p50_lateness_sec', 'p99_lateness_sec'} (최근접 순위 방식)"""
+    ordered = sorted(samples)
+    if not ordered:
+        return {'p50_lateness_sec': 0.0, 'p99_lateness_sec': 0.0}
+    last = len(ordered) - 1
+    return {
+        'p50_lateness_sec': ordered[round(last * 0.50)],
+        'p99_lateness_sec': ordered[round(last * 0.99)],
+    }
+
+
+def print_schedule_report(scheduler):
+    """📊 스케줄러 리포트 출력"""
+    stats = scheduler.stats
+    print(f"\n⏰ 스케줄러: 깨어남 {stats['wakeups']}회 (할 일 없음 {stats['idle_wakeups']}회) | "
+          f"대기 {stats['slept_sec']:.1f}초")
+    for name, r in scheduler.report().items():
+        print(f"  {name:<16} {r['interval']:>7.2f}초 {r['policy']:<8} | 실행 {r['fired']}회 | "
+              f"지연 {r['late']}회 | 누락 {r['missed']}회 | 지연 p50 {r['p50_lateness_sec'] * 1000:.1f}ms "
+              f"p99 {r['p99_lateness_sec'] * 1000:.1f}ms 최대 {r['max_lateness_sec'] * 1000:.0f}ms | "
+              f"평균 실행 {r['avg_runtime_sec'] * 1000:.1f}ms"
+              + (f" | 오류 {r['errors']}회" if r['errors'] else ""))
@@ -0,0 +1,108 @@
+"""
+🎯 시장가 청산 감시 엔진 - 포지션마다 스레드를 띄우는 대신 힙 3개로 한 곳에서 감시
+- 매수 포지션: 목표가 최소 힙 → bid 가 맨 위 목표가 이상이면 꺼냄
+- 매도 포지션: 목표가 최대 힙 → ask 가 맨 위 목표가 이하면 꺼냄
+- 시간 초과: 마감시각 최소 힙 → 지난 것부터 꺼냄
+- 틱마다 발동된 청산만 O(log n) 으로 꺼내고, 호출자가 한 번에 배치 청산
+- 같은 포지션이 여러 힙에 있어도 한 번만 발동 (지연 삭제)
+
+💡 사용법:
+    watcher = ExitWatcher()
+    watcher.watch(ticket, 'buy', 0.01, target_price=90100.0, now=time.time(), timeout=30)
+    for exit_order in watcher.pop_triggered(tick.bid, tick.ask, time.time()):
+        ...   # exit_order.reason: 'take_profit' | 'timeout'
+"""
+
+import heapq
+from collections import namedtuple
+from itertools import count
+
+ExitOrder = namedtuple('ExitOrder', ['ticket', 'side', 'volume', 'target_price', 'deadline', 'reason'])
+
+
+class ExitWatcher:
+    """🎯 목표가/시간 초과 청산 대기열 (단일 스레드에서 사용)"""
+
+    def __init__(self, default_timeout=30.0):
+        self.default_timeout = default_timeout
+        self._long = []         # (목표가, 순번, ticket) - 매수 포지션
+        self._short = []        # (-목표가, 순번, ticket) - 매도 포지션
+        self._deadlines = []    # (마감시각, 순번, ticket)
+        self._active = {}       # ticket → (순번, side, volume, 목표가, 마감시각)
+        self._seq = count()
+        self.stats = {'watched': 0, 'take_profit': 0, 'timeout': 0, 'discarded': 0}
+
+    # ---------- 등록 ----------
+    def watch(self, ticket, side, volume, target_price, now, timeout=None):
+        """➕ 청산 감시 등록 (같은 ticket 을 다시 등록하면 이전 목표는 무효)"""
+        seq = next(self._seq)
+        deadline = now + (self.default_timeout if timeout is None else timeout)
+        self._active[ticket] = (seq, side, volume, target_price, deadline)
+        if side == 'buy':
+            heapq.heappush(self._long, (target_price, seq, ticket))
+        else:
+            heapq.heappush(self._short, (-target_price, seq, ticket))
+        heapq.heappush(self._deadlines, (deadline, seq, ticket))
+        self.stats['watched'] += 1
+
+    def discard(self, ticket):
+        """다른 경로로 이미 청산된 포지션 - 감시 해제 (힙에서는 꺼낼 때 무시)"""
+        if self._active.pop(ticket, None) is not None:
+            self.stats['discarded'] += 1
+
+    # ---------- 발동 ----------
+    def _take(self, seq, ticket, reason):
+        entry = self._active.get(ticket)
+        if entry is None or entry[0] != seq:
+            return None                     # 이미 발동/해제/재등록된 항목
+        del self._active[ticket]
+        self.stats[reason] += 1
+        _, side, volume, target_price, deadline = entry
+        return ExitOrder(ticket, side, volume, target_price, deadline, reason)
+
+    def pop_triggered(self, bid, ask, now):
+        """⚡ 이번 틱에 발동된 청산 전부 꺼내기 → [ExitOrder]"""
+        triggered = []
+        while self._long and self._long[0][0] <= bid:
+            _, seq, ticket = heapq.heappop(self._long)
+            exit_order = self._take(seq, ticket, 'take_profit')
+            if exit_order:
+                triggered.append(exit_order)
+        while self._short and -self._short[0][0] >= ask:
+            _, seq, ticket = heapq.heappop(self._short)
+            exit_order = self._take(seq, ticket, 'take_profit')
+            if exit_order:
+                triggered.append(exit_order)
+        while self._deadlines and self._deadlines[0][0] <= now:
+            _, seq, ticket = heapq.heappop(self._deadlines)
+            exit_order = self._take(seq, ticket, 'timeout')
+            if exit_order:
+                triggered.append(exit_order)
+        self._compact()
+        return triggered
+
+    def _compact(self):
+        # 무효 항목이 많이 쌓이면 힙 재구성 (발동된 포지션의 나머지 힙 항목 정리)
+        live = len(self._active)
+        if len(self._deadlines) > 2 * live + 64:
+            self._long = [e for e in self._long if self._is_live(e)]
+            self._short = [e for e in self._short if self._is_live(e)]
+            self._deadlines = [e for e in self._deadlines if self._is_live(e)]
+            for heap in (self._long, self._short, self._deadlines):
+                heapq.heapify(heap)
+
+    def _is_live(self, entry):
+        active = self._active.get(entry[2])
+        return active is not None and active[0] == entry[1]
+
+    # ---------- 조회 ----------
+    def next_deadline(self):
+        while self._deadlines and not self._is_live(self._deadlines[0]):
+            heapq.heappop(self._deadlines)
+        return self._deadlines[0][0] if self._deadlines else None
+
+    def __len__(self):
+        return len(self._active)
+
+    def __contains__(self, ticket):
+        return ticket in self._active
@@ -0,0 +1,185 @@
+"""
+⚡ 저지연 CPU 추론 경로 - get_pytorch_prediction 한 행 예측용
+- StandardScaler 를 두 신경망의 첫 Linear 층에 합침 (W' = W / scale, b' = b - W' · mean)
+- 가격/방향 모델을 한 모듈로 묶어 TorchScript trace + freeze (eval 모드, Dropout 제거)
+- 입력 버퍼 미리 할당 (numpy 와 메모리를 공유하는 torch 텐서 - 호출마다 텐서 생성 없음)
+- RandomForest 150개 트리를 노드 배열 하나로 펼쳐 모든 트리를 동시에 한 층씩 내려감
+  (sklearn 과 같은 float32 비교, 같은 순서의 합 → predict 와 같은 값)
+
+💡 사용법:
+    predictor = FastPredictor(price_model, direction_model, scaler, forest)
+    price, direction_probs, volatility = predictor.predict(features)   # features: (15,)
+    python Fast_Inference.py        # CPU 지연시간 벤치마크 (p50/p99, 기존 경로 vs 최적화 경로, MT5 불필요)
+"""
+
+import copy
+import time
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+
+def fuse_scaler_into_linear(model, mean, scale):
+    """모델 복사본의 첫 Linear 층에 (x - mean) / scale 을 합침 → 원본 특성을 바로 입력"""
+    fused = copy.deepcopy(model).cpu().eval()
+    first = next(m for m in fused.modules() if isinstance(m, nn.Linear))
+    with torch.no_grad():
+        weight = first.weight.double()
+        inv_scale = torch.as_tensor(1.0 / np.asarray(scale), dtype=torch.float64)
+        shift = torch.as_tensor(np.asarray(mean) / np.asarray(scale), dtype=torch.float64)
+        first.bias.copy_((first.bias.double() - weight @ shift).float())
+        first.weight.copy_((weight * inv_scale).float())
+    return fused
+
+
+class _FusedHeads(nn.Module):
+    """가격/방향 모델을 한 번의 호출로"""
+
+    def __init__(self, price_model, direction_model):
+        super().__init__()
+        self.price_model = price_model
+        self.direction_model = direction_model
+
+    def forward(self, x):
+        return self.price_model(x), self.direction_model(x)
+
+
+class FlatForest:
+    """🌲 RandomForestRegressor 를 펼친 노드 배열 (모든 트리 동시 탐색)"""
+
+    def __init__(self, forest):
+        trees = [estimator.tree_ for estimator in forest.estimators_]
+        sizes = [tree.node_count for tree in trees]
+        offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(np.intp)
+
+        left, right, feature, threshold, value = [], [], [], [], []
+        for tree, offset in zip(trees, offsets):
+            own = np.arange(tree.node_count, dtype=np.intp) + offset
+            is_leaf = tree.children_left < 0
+            # 잎 노드는 자기 자신을 가리키게 → 깊이가 다른 트리도 같은 횟수만큼 내려가면 됨
+            left.append(np.where(is_leaf, own, tree.children_left + offset))
+            right.append(np.where(is_leaf, own, tree.children_right + offset))
+            feature.append(np.where(is_leaf, 0, tree.feature))
+            threshold.append(np.where(is_leaf, np.inf, tree.threshold))
+            value.append(tree.value[:, 0, 0])
+
+        self.roots = offsets
+        self.left = np.concatenate(left).astype(np.intp)
+        self.right = np.concatenate(right).astype(np.intp)
+        self.feature = np.concatenate(feature).astype(np.intp)
+        self.threshold = np.concatenate(threshold)
+        self.value = np.concatenate(value)
+        self.depth = max(tree.max_depth for tree in trees)
+        self.n_trees = len(trees)
+
+    def predict_one(self, x):
+        """한 행 예측 - x 는 float32 (sklearn 트리도 float32 로 변환 후 비교)"""
+        node = self.roots
+        for _ in range(self.depth):
+            go_left = x[self.feature[node]] <= self.threshold[node]
+            node = np.where(go_left, self.left[node], self.right[node])
+        # sklearn 과 같은 순서로 더한 뒤 나눔
+        return sum(self.value[node].tolist()) / self.n_trees
+
+
+class FastPredictor:
+    """⚡ 한 행 전용 추론기 (CPU)"""
+
+    def __init__(self, price_model, direction_model, scaler, forest, input_size=15):
+        self.mean = np.asarray(scaler.mean_, dtype=np.float64)
+        self.scale = np.asarray(scaler.scale_, dtype=np.float64)
+
+        heads = _FusedHeads(fuse_scaler_into_linear(price_model, self.mean, self.scale),
+                            fuse_scaler_into_linear(direction_model, self.mean, self.scale)).eval()
+        self._input = torch.zeros(1, input_size)
+        self._input_np = self._input.numpy()[0]             # 텐서와 메모리 공유
+        self._scaled = np.zeros(input_size, dtype=np.float32)
+        with torch.inference_mode():
+            traced = torch.jit.trace(heads, self._input)
+            self.heads = torch.jit.freeze(traced)
+            self.heads(self._input)                         # 첫 호출 최적화 비용 미리 지불
+        self.forest = FlatForest(forest)
+
+    def predict(self, features):
+        """features (15,) → (예측가, 방향 확률 ndarray(3,), 예상 변동성)"""
+        np.copyto(self._input_np, features, casting='unsafe')
+        with torch.inference_mode():
+            price, direction = self.heads(self._input)
+        # 변동성 모델은 정규화된 특성으로 학습됨 - StandardScaler.transform 과 같은 float32 연산
+        scaled = self._scaled
+        np.copyto(scaled, features, casting='unsafe')
+        np.subtract(scaled, self.mean, out=scaled, casting='unsafe')
+        np.divide(scaled, self.scale, out=scaled, casting='unsafe')
+        volatility = self.forest.predict_one(scaled)
+        return float(price[0, 0]), direction[0].numpy(), volatility
+
+
+def _percentiles(samples):
+    micro = np.asarray(samples) * 1e6
+    return np.percentile(micro, 50), np.percentile(micro, 99)
+
+
+def benchmark(price_model, direction_model, scaler, forest, features, runs=2000):
+    """📊 기존 경로 vs 최적화 경로 지연시간 (µs) → dict"""
+    torch.set_num_threads(1)
+
+    def legacy(row):
+        scaled = scaler.transform(row.reshape(1, -1))
+        X = torch.FloatTensor(scaled)
+        price_model.eval()
+        direction_model.eval()
+        with torch.no_grad():
+            price = price_model(X).cpu().numpy()[0][0]
+            probs = direction_model(X).cpu().numpy()[0]
+        return price, probs, forest.predict(scaled)[0]
+
+    fast = FastPredictor(price_model, direction_model, scaler, forest)
+    results = {}
+    for name, fn in (('legacy', legacy), ('fast', fast.predict)):
+        for row in features[:20]:
+            fn(row)                                         # 워밍업
+        samples = []
+        for i in range(runs):
+            row = features[i % len(features)]
+            started = time.perf_counter()
+            fn(row)
+            samples.append(time.perf_counter() - started)
+        results[name] = _percentiles(samples)
+
+    # 같은 입력에서 두 경로 결과 차이
+    diffs = np.array([[abs(a - b) for a, b in zip((p, v), (fp, fv))] + [np.abs(d - fd).max()]
+                      for (p, d, v), (fp, fd, fv) in ((legacy(r), fast.predict(r)) for r in features[:200])])
+    results['max_diff'] = {'price': diffs[:, 0].max(), 'volatility': diffs[:, 1].max(),
+                           'direction': diffs[:, 2].max()}
+    return results
+
+
+def main():
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.preprocessing import StandardScaler
+    import MT5_Simulator
+    MT5_Simulator.install()     # Revolutionary_Bot 이 MetaTrader5 를 import - 모델 클래스만 쓰므로 시뮬레이터로 대신
+    from Revolutionary_Bot import PyTorchDirectionClassifier, PyTorchPricePredictor
+
+    rng = np.random.default_rng(42)
+    features = (rng.normal(0, 1, (500, 15)) * rng.uniform(0.1, 100, 15)).astype(np.float32)
+    scaler = StandardScaler().fit(features)
+    scaled = scaler.transform(features)
+    forest = RandomForestRegressor(n_estimators=150, max_depth=15, random_state=42)
+    forest.fit(scaled, rng.normal(50, 10, len(features)))
+
+    torch.manual_seed(42)
+    results = benchmark(PyTorchPricePredictor(), PyTorchDirectionClassifier(), scaler, forest, features)
+
+    print("\n⚡ 한 행 예측 지연시간 (CPU, 1 스레드)")
+    for name, label in (('legacy', '기존 경로'), ('fast', '최적화 경로')):
+        p50, p99 = results[name]
+        print(f"  {label:<8} p50 {p50:8.1f}µs | p99 {p99:8.1f}µs")
+    diff = results['max_diff']
+    print(f"  결과 차이 (최대): 예측가 {diff['price']:.2e} | 방향확률 {diff['direction']:.2e} | "
+          f"변동성 {diff['volatility']:.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,10 @@ from datetime import datetime
 import sys
 from collections import defaultdict
 
+import numpy as np
+
+from Position_Book import CORE_DTYPE, position_book, evaluate
+
 # ==================== 설정 ====================
 GRID_CONFIG = {
     'symbol': 'BTCUSD',
@@ -275,7 +279,19 @@ class PerfectGridBot:
         if not current_price:
             return
         
-        for position in positions:
+        # 손익/방향전환/익절 대상을 전체 포지션 한 번에 계산
+        book = position_book(positions, dtype=CORE_DTYPE)
+        ev = evaluate(book, current_price['bid'], current_price['ask'],
+                      max_loss=self.config['max_loss_per_position'] if self.config['flip_on_loss'] else None,
+                      take_profit=self.config['take_profit_ticks'])
+        flip = ev.get('flip_mask', np.zeros(len(book), dtype=bool))
+        take = ev['take_mask']
+        new = np.fromiter((ticket not in self.active_positions for ticket in book['ticket'].tolist()),
+                          dtype=bool, count=len(book))
+        
+        # 새 체결 / 방향전환 / 익절 대상만 순회 (나머지는 할 일 없음)
+        for i in np.flatnonzero(new | flip | take).tolist():
+            position = positions[i]
             # 새 포지션 추적
             if position.ticket not in self.active_positions:
                 self.active_positions[position.ticket] = {
@@ -292,23 +308,15 @@ class PerfectGridBot:
                 # 그리드 재생성
                 self.refill_grid(position.price_open, position.type)
             
-            # 손익 계산
-            if position.type == mt5.ORDER_TYPE_BUY:
-                profit_loss = (current_price['bid'] - position.price_open) * position.volume
-                close_price = current_price['bid']
-            else:
-                profit_loss = (position.price_open - current_price['ask']) * position.volume
-                close_price = current_price['ask']
-            
             # 🔥 핵심: 손실 체크 및 방향 전환
-            if self.config['flip_on_loss'] and profit_loss < -self.config['max_loss_per_position']:
-                print(f"⚠️ 손실 감지: ${profit_loss:.4f} → 방향 전환 실행!")
+            if flip[i]:
+                print(f"⚠️ 손실 감지: ${ev['pnl'][i]:.4f} → 방향 전환 실행!")
                 self.flip_position(position)
                 continue
             
             # 수익 실현
-            if profit_loss >= self.config['take_profit_ticks']:
-                self.close_position_with_profit(position, close_price, profit_loss)
+            if take[i]:
+                self.close_position_with_profit(position, float(ev['close_price'][i]), float(ev['pnl'][i]))
     
     def close_position_with_profit(self, position, close_price, profit):
         """수익 실현"""
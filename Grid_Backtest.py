@@ -0,0 +1,707 @@
+"""
+⚡ 벡터화 그리드 백테스트 엔진 - 밀집 그리드 전략을 틱 단위로 재현
+- 모든 그리드 레벨을 NumPy 배열로 관리 (레벨 수천 개도 한 번에 처리)
+- 틱 루프 없이 '다음 이벤트 인덱스'를 블록 최소/최대 테이블로 검색
+- 체결 → 익절 / 손실시 방향전환(flip) → 재배치(refill) 를 라운드 단위로 일괄 처리
+- 증거금: 체결/전환마다 여유 증거금 확인 (부족하면 주문 거부), 증거금 수준 margin_so 이하면 스톱아웃 (전부 청산 후 종료)
+- 결과: 실현/평가 손익, 최대 낙폭, 노출(랏), 체결/익절/전환 횟수, 증거금 거부 / 스톱아웃 시각·자산
+
+💡 사용법:
+    python Grid_Backtest.py                      # 합성 틱 1일치 + main.py 설정
+    python Grid_Backtest.py btcusd_ticks.csv minn
+
+    from Grid_Backtest import GridBacktestEngine, config_from_grid_config
+    engine = GridBacktestEngine(config_from_grid_config(GRID_CONFIG))
+    report = engine.run(ticks)
+"""
+
+import ast
+import sys
+import time
+
+import numpy as np
+
+from MT5_Simulator import normalize_ticks, generate_ticks
+
+BUY = 1
+SELL = -1
+
+# 포지션 종료 사유
+EXIT_TAKE_PROFIT = 0
+EXIT_FLIP = 1
+EXIT_STOP = 2
+EXIT_STOP_OUT = 3
+
+MARGIN_WINDOW = 16    # 증거금 확인 구간 시작 길이 (틱) - 문제 없으면 구간마다 2배, 문제 틱 뒤에는 다시 처음 길이
+
+# 이벤트 로그 열 (opens: 틱, 방향, 랏, 가격 / closes: 틱, 방향, 랏, 진입가, 손익, 사유, 합쳐진 포지션 수)
+OPEN_DTYPES = (np.int64, np.int8, np.float64, np.float64)
+CLOSE_DTYPES = (np.int64, np.int8, np.float64, np.float64, np.float64, np.int8, np.float64)
+ACCOUNT_KEYS = ('vol_buy', 'vol_sell', 'cost_buy', 'cost_sell', 'realized')
+
+DEFAULT_BACKTEST_CONFIG = {
+    'grid_spacing': 0.01,
+    'levels_below': 100,          # 매수 Limit 레벨 수
+    'levels_above': 100,          # 매도 Limit 레벨 수
+    'lot_per_order': 0.01,
+    'take_profit': 0.01,          # 포지션당 익절 금액 ($)
+    'max_loss': 0.02,             # 포지션당 허용 손실 ($)
+    'loss_action': 'flip',        # 'flip' (반대 진입) / 'close' (손절) / None
+    'refill': 'on_fill',          # 'on_fill' (체결 즉시 같은 가격 재배치) / 'on_close' / None
+    'contract_size': 1.0,
+    'center_price': None,         # None 이면 첫 틱 중간가
+    'balance': 10000.0,
+    'leverage': 100,
+    'margin_check': True,         # 체결/전환마다 여유 증거금 확인 (부족하면 거부)
+    'margin_so': 30.0,            # 스톱아웃 증거금 수준 (%) - 시뮬레이터 account_info 의 margin_so_so, None 이면 끔
+    'block_size': 128,
+}
+
+
+def config_from_grid_config(grid_config, **overrides):
+    """main/live/fix/final/minn 의 GRID_CONFIG → 백테스트 설정"""
+    levels = grid_config.get('grid_levels', 100)
+    config = dict(DEFAULT_BACKTEST_CONFIG)
+    config.update({
+        'grid_spacing': grid_config['grid_spacing'],
+        'levels_below': grid_config.get('grid_levels_below', levels),
+        'levels_above': grid_config.get('grid_levels_above', levels),
+        'lot_per_order': grid_config['lot_per_order'],
+        'take_profit': grid_config['take_profit_ticks'],
+        'max_loss': grid_config['max_loss_per_position'],
+        'loss_action': 'flip' if grid_config.get('flip_on_loss', True) else None,
+    })
+    config.update(overrides)
+    return config
+
+
+def load_grid_config(bot_name):
+    """봇 스크립트(.py)에서 GRID_CONFIG 만 읽기 - MetaTrader5 없이도 동작 (import 안 함)"""
+    with open(f"{bot_name}.py", encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(getattr(t, 'id', None) == 'GRID_CONFIG' for t in node.targets):
+            return ast.literal_eval(node.value)
+    raise ValueError(f"{bot_name}.py 에 GRID_CONFIG 가 없습니다")
+
+
+def _stack_events(parts, dtypes):
+    """이벤트 로그 (열 튜플 목록) → 열별로 이어 붙인 배열"""
+    if not parts:
+        return [np.empty(0, dtype=d) for d in dtypes]
+    return [np.concatenate([p[c] for p in parts]).astype(d) for c, d in enumerate(dtypes)]
+
+
+# ==================== 임계값 첫 돌파 검색 ====================
+class CrossingIndex:
+    """📐 가격 배열에서 'start 이후 처음으로 임계값에 닿는 인덱스' 를 벡터화 검색
+
+    블록별 최소/최대값에 희소 테이블(2^k 블록 구간)을 얹어서
+    질의 하나당 O(block + log n) - 질의 수천 개를 한 번에 처리한다.
+    """
+
+    PROBE = 8   # 바로 다음 몇 틱 안에 닿는 경우가 대부분이라 먼저 짧게 확인
+
+    def __init__(self, values, block_size=128):
+        self.values = np.ascontiguousarray(values, dtype=np.float64)
+        self.n = len(self.values)
+        self.block = int(block_size)
+        self.offsets = np.arange(self.block, dtype=np.int64)
+        self.probe_offsets = np.arange(self.PROBE, dtype=np.int64)
+
+        n_blocks = max(1, -(-self.n // self.block))
+        pad = n_blocks * self.block - self.n
+        padded_min = np.concatenate([self.values, np.full(pad, np.inf)])
+        padded_max = np.concatenate([self.values, np.full(pad, -np.inf)])
+        self.min_table = [padded_min.reshape(n_blocks, self.block).min(axis=1)]
+        self.max_table = [padded_max.reshape(n_blocks, self.block).max(axis=1)]
+
+        step = 1
+        while step * 2 <= n_blocks:
+            prev_min, prev_max = self.min_table[-1], self.max_table[-1]
+            self.min_table.append(np.minimum(prev_min[:-step], prev_min[step:]))
+            self.max_table.append(np.maximum(prev_max[:-step], prev_max[step:]))
+            step *= 2
+        self.n_blocks = n_blocks
+
+    def first_at_or_below(self, threshold, start):
+        """values[i] <= threshold 인 첫 i (i >= start), 없으면 n"""
+        return self._first(threshold, start, below=True)
+
+    def first_at_or_above(self, threshold, start):
+        """values[i] >= threshold 인 첫 i (i >= start), 없으면 n"""
+        return self._first(threshold, start, below=False)
+
+    def first_below(self, threshold, start):
+        return self._first(np.nextafter(threshold, -np.inf), start, below=True)
+
+    def first_above(self, threshold, start):
+        return self._first(np.nextafter(threshold, np.inf), start, below=False)
+
+    def _scan_blocks(self, first_index, threshold, below):
+        """first_index 부터 블록 하나 길이만큼 직접 비교 → (찾음 여부, 인덱스)"""
+        n = self.n
+        idx = first_index[:, None] + self.offsets
+        block_end = (first_index // self.block + 1) * self.block
+        valid = idx < np.minimum(block_end, n)[:, None]
+        vals = self.values[np.minimum(idx, n - 1)]
+        hit = (vals <= threshold[:, None]) if below else (vals >= threshold[:, None])
+        hit &= valid
+        found = hit.any(axis=1)
+        return found, first_index + hit.argmax(axis=1)
+
+    def _first(self, threshold, start, below):
+        start = np.asarray(start, dtype=np.int64)
+        threshold = np.broadcast_to(np.asarray(threshold, dtype=np.float64), start.shape)
+        result = np.full(start.shape, self.n, dtype=np.int64)
+
+        live = start < self.n
+        if not live.any():
+            return result
+        s = start[live]
+        t = threshold[live]
+
+        # 0) 바로 다음 PROBE 틱
+        idx = s[:, None] + self.probe_offsets
+        vals = self.values[np.minimum(idx, self.n - 1)]
+        hit = ((vals <= t[:, None]) if below else (vals >= t[:, None])) & (idx < self.n)
+        near = hit.any(axis=1)
+        if near.all():
+            result[live] = s + hit.argmax(axis=1)
+            return result
+        out = np.where(near, s + hit.argmax(axis=1), self.n)
+        far = ~near
+        s, t = s[far], t[far]
+
+        # 1) start 가 속한 블록의 나머지 구간
+        found, index = self._scan_blocks(s, t, below)
+        far_out = np.where(found, index, self.n)
+
+        # 2) 다음 블록부터 희소 테이블로 건너뛰기 (큰 구간부터)
+        rest = ~found
+        if rest.any():
+            block = s[rest] // self.block + 1
+            tr = t[rest]
+            table = self.min_table if below else self.max_table
+            for k in range(len(table) - 1, -1, -1):
+                span = 1 << k
+                ok = block + span <= self.n_blocks
+                extreme = table[k][np.where(ok, block, 0)]
+                skip = ok & ((extreme > tr) if below else (extreme < tr))
+                block += span * skip
+
+            # 3) 찾은 블록 안에서 정확한 위치
+            has = block < self.n_blocks
+            rest_out = np.full(block.shape, self.n, dtype=np.int64)
+            if has.any():
+                _, index = self._scan_blocks(block[has] * self.block, tr[has], below)
+                rest_out[has] = index
+            far_out[rest] = rest_out
+
+        out[far] = far_out
+        result[live] = out
+        return result
+
+
+# ==================== 백테스트 엔진 ====================
+class GridBacktestEngine:
+    """⚡ 벡터화 그리드 백테스트
+
+    레벨(대기주문)과 포지션은 서로 독립이므로 '라운드' 마다
+    - 대기중인 모든 레벨의 다음 체결
+    - 열린 모든 포지션의 다음 익절/손실 이벤트
+    를 한 번에 계산한다. 라운드 수 = 한 레벨/포지션이 겪는 최대 이벤트 수.
+    """
+
+    def __init__(self, config=None):
+        self.config = dict(DEFAULT_BACKTEST_CONFIG)
+        if config:
+            self.config.update(config)
+        self.stats = {}
+
+    # ---------- 레벨 배열 ----------
+    def build_levels(self, center):
+        """중심가 기준 매수/매도 레벨 배열 (가격, 방향, 랏)"""
+        cfg = self.config
+        below = np.arange(1, cfg['levels_below'] + 1)
+        above = np.arange(1, cfg['levels_above'] + 1)
+        price = np.round(np.concatenate([center - below * cfg['grid_spacing'],
+                                         center + above * cfg['grid_spacing']]), 8)
+        side = np.concatenate([np.full(len(below), BUY), np.full(len(above), SELL)]).astype(np.int8)
+        lot = np.full(len(price), cfg['lot_per_order'], dtype=np.float64)
+        return {'price': price, 'side': side, 'lot': lot}
+
+    def _distances(self, lot):
+        """금액 단위 익절/손실 → 가격 거리"""
+        cfg = self.config
+        unit = lot * cfg['contract_size']
+        tp = cfg['take_profit'] / unit
+        loss = cfg['max_loss'] / unit if cfg['loss_action'] else np.full(len(lot), np.inf)
+        return tp, loss
+
+    # ---------- 실행 ----------
+    def run(self, ticks):
+        """📊 틱 시리즈 전체 백테스트 → 리포트 dict
+
+        증거금을 보면서 틱 구간 단위로 진행한다 - 구간을 먼저 그대로 계산해 보고
+        체결/전환 직후 여유 증거금이 음수가 되거나 (주문 거부) 증거금 수준이 margin_so 이하가 되는
+        (스톱아웃) 첫 틱이 있으면, 구간 시작 상태로 되돌려 그 틱까지만 다시 계산한 뒤 처리한다.
+        """
+        started = time.perf_counter()
+        cfg = self.config
+        ticks = normalize_ticks(ticks)
+        bid, ask = ticks['bid'], ticks['ask']
+        n = len(bid)
+        if n == 0:
+            raise ValueError("틱 데이터가 비어 있습니다")
+
+        center = cfg['center_price']
+        if center is None:
+            center = round((bid[0] + ask[0]) / 2, 2)
+        levels = self.build_levels(center)
+        market = {
+            'bid': bid,
+            'ask': ask,
+            'n': n,
+            'bid_index': CrossingIndex(bid, cfg['block_size']),
+            'ask_index': CrossingIndex(ask, cfg['block_size']),
+            'level_price': levels['price'],
+            'level_side': levels['side'],
+            'level_lot': levels['lot'],
+            'is_buy_level': levels['side'] == BUY,
+        }
+        n_levels = len(levels['price'])
+
+        # 레벨이 '유효한 대기주문' 이 되는 시점 (매수 Limit 은 ask > 가격 일 때만 배치 가능)
+        state = {
+            'arm': self._next_valid(np.zeros(n_levels, dtype=np.int64), market['level_price'],
+                                    market['is_buy_level'], market['bid_index'], market['ask_index']),
+            'pos': self._empty_positions(),     # 다음 이벤트가 남은 포지션
+            'held': self._empty_positions(),    # 끝까지 이벤트가 없는 포지션 (스톱아웃 때만 청산)
+            'opens': [],
+            'closes': [],
+            'fill_counts': np.zeros(n_levels, dtype=np.int64),
+            'rounds': 0,
+        }
+
+        checking = cfg['margin_check'] or cfg['margin_so'] is not None
+        carry = dict.fromkeys(ACCOUNT_KEYS, 0.0)
+        rejects = 0
+        stop_out = None
+        tick = 0
+        window = MARGIN_WINDOW if checking else n
+        while tick < n:
+            horizon = min(n, tick + window)
+            saved = self._save(state)
+            self._rounds(market, state, horizon)
+            if not checking:
+                break
+
+            curves = self._account_curves(market, state['opens'][saved['opens']:],
+                                          state['closes'][saved['closes']:], tick, horizon, carry)
+            bad = self._first_margin_event(curves)
+            if bad is None:
+                carry = {key: curves[key][-1] for key in ACCOUNT_KEYS}
+                tick = horizon
+                window *= 2
+                continue
+
+            # 문제 틱 t 직전까지 다시 계산 → t 틱의 체결/전환을 여유 증거금 안에서만 받아들임
+            t = tick + bad
+            self._restore(state, saved)
+            self._rounds(market, state, t + 1)
+            curves = self._account_curves(market, state['opens'][saved['opens']:],
+                                          state['closes'][saved['closes']:], tick, t + 1, carry)
+            free = curves['equity'][-1] - curves['margin'][-1]
+            if cfg['margin_check'] and curves['opened'][-1] and free < 0:
+                rejects += self._reject_opens(market, state, t, free)
+                curves = self._account_curves(market, state['opens'][saved['opens']:],
+                                              state['closes'][saved['closes']:], tick, t + 1, carry)
+
+            if cfg['margin_so'] is not None and self._below_stop_out(curves)[-1]:
+                stop_out = {
+                    'tick': t,
+                    'time_msc': int(ticks['time_msc'][t]),
+                    'equity': float(curves['equity'][-1]),
+                    'margin_level': float(curves['equity'][-1] / curves['margin'][-1] * 100),
+                }
+                self._stop_out(market, state, t)
+                break
+
+            carry = {key: curves[key][-1] for key in ACCOUNT_KEYS}
+            tick = t + 1
+            window = MARGIN_WINDOW
+
+        report = self._build_report(market, ticks, center, levels, state, rejects, stop_out)
+        report['elapsed_sec'] = time.perf_counter() - started
+        report['ticks_per_sec'] = n / report['elapsed_sec'] if report['elapsed_sec'] > 0 else 0.0
+        self.stats = report
+        return report
+
+    def _rounds(self, market, state, horizon):
+        """⚙️ horizon 직전 틱까지의 체결 / 익절 / 전환 / 재배치를 라운드 단위로 일괄 처리
+
+        horizon 이후의 이벤트는 건드리지 않고 남겨 둠 (레벨은 체결 틱부터, 포지션은 시작 틱 그대로 다음 구간에서 재검색)
+        """
+        cfg = self.config
+        bid, ask, n = market['bid'], market['ask'], market['n']
+        bid_index, ask_index = market['bid_index'], market['ask_index']
+        level_price, level_side, level_lot = market['level_price'], market['level_side'], market['level_lot']
+        is_buy_level = market['is_buy_level']
+        arm, opens, closes, fill_counts = state['arm'], state['opens'], state['closes'], state['fill_counts']
+        merge = cfg['refill'] != 'on_close'
+
+        # 열린 포지션 (라운드마다 갱신) - weight: 같은 상태로 합쳐진 포지션 수
+        pos = state['pos']
+        parked, held = [], [state['held']]
+
+        while (arm < horizon).any() or len(pos['side']):
+            state['rounds'] += 1
+
+            # 1) 대기 레벨 체결
+            armed = np.flatnonzero(arm < horizon)
+            if len(armed):
+                buy = is_buy_level[armed]
+                price = level_price[armed]
+                fill = self._by_side(buy, price, arm[armed],
+                                     ask_index.first_at_or_below, bid_index.first_at_or_above)
+                arm[armed] = fill
+                hit = fill < horizon
+                armed, fill, price, buy = armed[hit], fill[hit], price[hit], buy[hit]
+                if len(armed):
+                    arm[armed] = n
+                    # 갭 체결이면 더 유리한 가격 (시뮬레이터와 동일 규칙)
+                    fill_price = np.where(buy, np.minimum(price, ask[fill]), np.maximum(price, bid[fill]))
+                    np.add.at(fill_counts, armed, 1)
+                    opens.append((fill, level_side[armed], level_lot[armed], fill_price))
+                    pos = self._append(pos, level=armed, side=level_side[armed], open=fill_price,
+                                       lot=level_lot[armed], start=fill + 1,
+                                       weight=np.ones(len(armed)), flipped=np.zeros(len(armed)))
+                    if cfg['refill'] == 'on_fill':
+                        arm[armed] = self._next_valid(fill + 1, price, buy, bid_index, ask_index)
+
+            if not len(pos['side']):
+                continue
+
+            # 2) 열린 포지션의 다음 이벤트 (익절 vs 손실)
+            tp_dist, loss_dist = self._distances(pos['lot'])
+            long_ = pos['side'] == BUY
+            tp_idx = self._by_side(long_, np.where(long_, pos['open'] + tp_dist, pos['open'] - tp_dist),
+                                   pos['start'], bid_index.first_at_or_above, ask_index.first_at_or_below)
+            if cfg['loss_action']:
+                loss_idx = self._by_side(long_, np.where(long_, pos['open'] - loss_dist, pos['open'] + loss_dist),
+                                         pos['start'], bid_index.first_below, ask_index.first_above)
+            else:
+                loss_idx = np.full(len(long_), n, dtype=np.int64)
+            exit_idx = np.minimum(tp_idx, loss_idx)
+
+            done = exit_idx < horizon
+            if done.any():
+                e = exit_idx[done]
+                side = pos['side'][done]
+                volume = pos['lot'][done] * pos['weight'][done]
+                close_price = np.where(side == BUY, bid[e], ask[e])
+                pnl = side * (close_price - pos['open'][done]) * volume * cfg['contract_size']
+                reason = np.where(tp_idx[done] <= loss_idx[done], EXIT_TAKE_PROFIT,
+                                  EXIT_FLIP if cfg['loss_action'] == 'flip' else EXIT_STOP)
+                closes.append((e, side, volume, pos['open'][done], pnl, reason, pos['weight'][done]))
+            never = exit_idx >= n
+            if never.any():
+                # 끝까지 열린 포지션은 더 이상 이벤트가 없으므로 따로 보관하고 라운드에서 제외
+                held.append({key: col[never] for key, col in pos.items()})
+            later = ~done & ~never
+            if later.any():
+                parked.append({key: col[later] for key, col in pos.items()})
+
+            # 3) 방향전환 포지션은 반대 방향으로 계속 보유
+            flipped = done & (loss_idx < tp_idx) & (cfg['loss_action'] == 'flip')
+            closed = done & ~flipped
+
+            # 4) on_close 재배치: 완전히 청산된 레벨만 다시 대기
+            if cfg['refill'] == 'on_close' and closed.any():
+                lv = pos['level'][closed]
+                arm[lv] = self._next_valid(exit_idx[closed] + 1, level_price[lv], is_buy_level[lv],
+                                           bid_index, ask_index)
+
+            pos = {key: col[flipped] for key, col in pos.items()}
+            if len(pos['side']):
+                e = exit_idx[flipped]
+                pos['side'] = (-pos['side']).astype(np.int8)
+                pos['open'] = np.where(pos['side'] == SELL, bid[e], ask[e])
+                pos['start'] = e + 1
+                pos['flipped'] = np.ones(len(e), dtype=np.int8)
+                opens.append((e, pos['side'], pos['lot'] * pos['weight'], pos['open']))
+                if merge:
+                    # 같은 틱에 같은 방향으로 전환된 포지션은 이후 경로가 완전히 같음 → 하나로 합침
+                    pos = self._merge(pos)
+
+        state['pos'] = self._concat(parked + [pos])
+        state['held'] = self._concat(held)
+
+    # ---------- 증거금 ----------
+    def _account_curves(self, market, opens, closes, lo, hi, carry):
+        """[lo, hi) 틱의 방향별 보유량 / 보유량×진입가 / 실현손익 누적 (carry = lo 직전 값) → 자산 / 증거금 곡선"""
+        cfg = self.config
+        cs = cfg['contract_size']
+        size = hi - lo
+
+        # 틱별 누적 → 틱마다 평가손익 O(구간 길이)
+        def curve(idx, weights):
+            return np.cumsum(np.bincount(idx - lo, weights=weights, minlength=size)[:size])
+
+        o_idx, o_side, o_lot, o_price = _stack_events(opens, OPEN_DTYPES)
+        c_idx, c_side, c_lot, c_open, c_pnl, _, _ = _stack_events(closes, CLOSE_DTYPES)
+        o_buy, c_buy = o_side == BUY, c_side == BUY
+        curves = {
+            'vol_buy': carry['vol_buy'] + curve(o_idx[o_buy], o_lot[o_buy]) - curve(c_idx[c_buy], c_lot[c_buy]),
+            'vol_sell': carry['vol_sell'] + curve(o_idx[~o_buy], o_lot[~o_buy]) - curve(c_idx[~c_buy], c_lot[~c_buy]),
+            'cost_buy': (carry['cost_buy'] + curve(o_idx[o_buy], o_lot[o_buy] * o_price[o_buy])
+                         - curve(c_idx[c_buy], c_lot[c_buy] * c_open[c_buy])),
+            'cost_sell': (carry['cost_sell'] + curve(o_idx[~o_buy], o_lot[~o_buy] * o_price[~o_buy])
+                          - curve(c_idx[~c_buy], c_lot[~c_buy] * c_open[~c_buy])),
+            'realized': carry['realized'] + curve(c_idx, c_pnl),
+        }
+        bid, ask = market['bid'][lo:hi], market['ask'][lo:hi]
+        curves['floating'] = cs * ((bid * curves['vol_buy'] - curves['cost_buy'])
+                                   + (curves['cost_sell'] - ask * curves['vol_sell']))
+        curves['equity'] = cfg['balance'] + curves['realized'] + curves['floating']
+        curves['margin'] = cs * (curves['cost_buy'] + curves['cost_sell']) / cfg['leverage']
+        curves['opened'] = np.bincount(o_idx - lo, minlength=size)[:size] > 0
+        return curves
+
+    def _below_stop_out(self, curves):
+        """틱별 스톱아웃 여부 (증거금 수준 = 자산 / 증거금 × 100 <= margin_so)"""
+        holding = curves['vol_buy'] + curves['vol_sell'] > 1e-9
+        return holding & (curves['equity'] * 100 <= self.config['margin_so'] * curves['margin'])
+
+    def _first_margin_event(self, curves):
+        """구간 안에서 처음으로 주문 거부 또는 스톱아웃이 일어나는 틱 (구간 내 위치), 없으면 None"""
+        cfg = self.config
+        bad = np.zeros(len(curves['equity']), dtype=bool)
+        if cfg['margin_check']:
+            bad |= curves['opened'] & (curves['equity'] - curves['margin'] < 0)
+        if cfg['margin_so'] is not None:
+            bad |= self._below_stop_out(curves)
+        return int(bad.argmax()) if bad.any() else None
+
+    def _reject_opens(self, market, state, t, free):
+        """🚫 t 틱에 체결/전환된 포지션을 여유 증거금 안에서 순서대로 받아들이고 나머지는 거부 → 거부 수
+
+        free: t 틱 이벤트를 모두 반영한 여유 증거금 (음수) - 새 포지션 몫을 되돌려 체결 직전 값으로 계산
+        시뮬레이터처럼 거부된 지정가 주문은 삭제 (on_fill 은 이미 재배치됨, on_close 는 레벨 다시 대기),
+        거부된 전환은 손실 청산만 남음
+        """
+        cfg = self.config
+        cs, leverage = cfg['contract_size'], cfg['leverage']
+        bid, ask = market['bid'][t], market['ask'][t]
+
+        new = {key: np.flatnonzero(state[key]['start'] == t + 1) for key in ('pos', 'held')}
+        for key, index in new.items():
+            pos = state[key]
+            unit = pos['lot'][index] * cs
+            close_price = np.where(pos['side'][index] == BUY, bid, ask)
+            floating = pos['side'][index] * (close_price - pos['open'][index]) * unit
+            free += float((pos['weight'][index] * (unit * pos['open'][index] / leverage - floating)).sum())
+
+        # 전환 재진입 먼저, 그다음 (방향, 가격, 랏, 레벨) 순 - 합쳐진 포지션이든 아니든 같은 순서
+        candidates = sorted((-int(state[key]['flipped'][i]), int(state[key]['side'][i]), float(state[key]['open'][i]),
+                             float(state[key]['lot'][i]), int(state[key]['level'][i]), key, i)
+                            for key, index in new.items() for i in index)
+        keep = {key: state[key]['weight'].copy() for key in new}
+        for *_, key, i in candidates:
+            pos = state[key]
+            required = pos['lot'][i] * cs * pos['open'][i] / leverage
+            keep[key][i] = min(pos['weight'][i], max(0.0, np.floor(free / required + 1e-9)))  # 누적 합 반올림 오차 흡수
+            free -= keep[key][i] * required
+
+        rejected = 0
+        for key in new:
+            pos = state[key]
+            cut = pos['weight'] - keep[key]
+            rej = np.flatnonzero(cut > 0)
+            if not len(rej):
+                continue
+
+            state['opens'].append((np.full(len(rej), t), pos['side'][rej], -pos['lot'][rej] * cut[rej],
+                                   pos['open'][rej]))
+            fills = rej[pos['flipped'][rej] == 0]
+            np.add.at(state['fill_counts'], pos['level'][fills], -cut[fills].astype(np.int64))
+            if cfg['refill'] == 'on_close':
+                lv = pos['level'][rej]
+                state['arm'][lv] = self._next_valid(np.full(len(lv), t + 1), market['level_price'][lv],
+                                                    market['is_buy_level'][lv], market['bid_index'],
+                                                    market['ask_index'])
+            rejected += int(cut.sum())
+            pos = dict(pos, weight=keep[key])
+            state[key] = {name: col[pos['weight'] > 0] for name, col in pos.items()}
+        return rejected
+
+    def _stop_out(self, market, state, t):
+        """🛑 스톱아웃 - 모든 포지션을 t 틱 가격으로 청산하고 대기 레벨 전부 취소"""
+        cs = self.config['contract_size']
+        for key in ('pos', 'held'):
+            pos = state[key]
+            count = len(pos['side'])
+            if not count:
+                continue
+            volume = pos['lot'] * pos['weight']
+            close_price = np.where(pos['side'] == BUY, market['bid'][t], market['ask'][t])
+            pnl = pos['side'] * (close_price - pos['open']) * volume * cs
+            state['closes'].append((np.full(count, t), pos['side'], volume, pos['open'], pnl,
+                                    np.full(count, EXIT_STOP_OUT), pos['weight']))
+            state[key] = self._empty_positions()
+        state['arm'][:] = market['n']
+
+    @staticmethod
+    def _save(state):
+        """구간 시작 상태 (되돌리기용) - 로그는 길이만 기억"""
+        return {
+            'arm': state['arm'].copy(),
+            'pos': dict(state['pos']),
+            'held': dict(state['held']),
+            'opens': len(state['opens']),
+            'closes': len(state['closes']),
+            'fill_counts': state['fill_counts'].copy(),
+        }
+
+    @staticmethod
+    def _restore(state, saved):
+        state['arm'][:] = saved['arm']
+        state['fill_counts'][:] = saved['fill_counts']
+        state['pos'], state['held'] = saved['pos'], saved['held']
+        del state['opens'][saved['opens']:]
+        del state['closes'][saved['closes']:]
+
+    @staticmethod
+    def _by_side(is_buy, threshold, start, buy_query, sell_query):
+        """매수/매도 쪽을 나눠서 각자 필요한 가격 배열에만 질의"""
+        out = np.empty(len(is_buy), dtype=np.int64)
+        if is_buy.any():
+            out[is_buy] = buy_query(threshold[is_buy], start[is_buy])
+        sell = ~is_buy
+        if sell.any():
+            out[sell] = sell_query(threshold[sell], start[sell])
+        return out
+
+    @staticmethod
+    def _empty_positions():
+        return {
+            'level': np.empty(0, dtype=np.int64),
+            'side': np.empty(0, dtype=np.int8),
+            'open': np.empty(0, dtype=np.float64),
+            'lot': np.empty(0, dtype=np.float64),
+            'start': np.empty(0, dtype=np.int64),
+            'weight': np.empty(0, dtype=np.float64),
+            'flipped': np.empty(0, dtype=np.int8),     # 1 = 방향전환으로 생긴 포지션 (레벨 체결 아님)
+        }
+
+    @staticmethod
+    def _concat(parts):
+        return {key: np.concatenate([p[key] for p in parts]) for key in parts[0]}
+
+    @staticmethod
+    def _append(pos, **cols):
+        return {key: np.concatenate([pos[key], np.asarray(cols[key], dtype=pos[key].dtype)]) for key in pos}
+
+    @staticmethod
+    def _merge(pos):
+        """(방향, 진입가, 랏, 시작틱) 이 같은 포지션을 weight 합으로 병합"""
+        if len(pos['side']) < 2:
+            return pos
+        order = np.lexsort((pos['lot'], pos['open'], pos['start'], pos['side']))
+        sorted_ = {key: col[order] for key, col in pos.items()}
+        head = np.ones(len(order), dtype=bool)
+        head[1:] = ((np.diff(sorted_['side']) != 0) | (np.diff(sorted_['start']) != 0)
+                    | (np.diff(sorted_['open']) != 0) | (np.diff(sorted_['lot']) != 0))
+        if head.all():
+            return pos
+        group = np.cumsum(head) - 1
+        merged = {key: col[head] for key, col in sorted_.items()}
+        merged['weight'] = np.bincount(group, weights=sorted_['weight'])
+        return merged
+
+    @staticmethod
+    def _next_valid(start, price, is_buy, bid_index, ask_index):
+        """대기주문이 다시 유효해지는 첫 틱 (매수 Limit: ask > 가격, 매도 Limit: bid < 가격)"""
+        return GridBacktestEngine._by_side(is_buy, price, start, ask_index.first_above, bid_index.first_below)
+
+    # ---------- 리포트 ----------
+    def _build_report(self, market, ticks, center, levels, state, rejects, stop_out):
+        n = market['n']
+        curves = self._account_curves(market, state['opens'], state['closes'], 0, n,
+                                      dict.fromkeys(ACCOUNT_KEYS, 0.0))
+        vol_buy, vol_sell = curves['vol_buy'], curves['vol_sell']
+        equity = curves['equity']
+        drawdown = np.maximum.accumulate(equity) - equity
+
+        _, _, _, _, _, c_reason, c_weight = _stack_events(state['closes'], CLOSE_DTYPES)
+        reasons = np.bincount(c_reason, weights=c_weight, minlength=4).astype(np.int64)
+        fill_counts = state['fill_counts']
+        level_buy = levels['side'] == BUY
+        return {
+            'ticks': n,
+            'center_price': center,
+            'levels': len(levels['price']),
+            'rounds': state['rounds'],
+            'fills_buy': int(fill_counts[level_buy].sum()),
+            'fills_sell': int(fill_counts[~level_buy].sum()),
+            'fills_per_level': fill_counts,
+            'take_profits': int(reasons[EXIT_TAKE_PROFIT]),
+            'flips': int(reasons[EXIT_FLIP]),
+            'stops': int(reasons[EXIT_STOP]),
+            'margin_rejects': rejects,
+            'stopped_out': stop_out is not None,
+            'stop_out_tick': stop_out['tick'] if stop_out else None,
+            'stop_out_time_msc': stop_out['time_msc'] if stop_out else None,
+            'stop_out_equity': stop_out['equity'] if stop_out else None,
+            'stop_out_margin_level': stop_out['margin_level'] if stop_out else None,
+            'stop_out_closed': int(reasons[EXIT_STOP_OUT]),
+            'realized_pnl': float(curves['realized'][-1]),
+            'floating_pnl': float(curves['floating'][-1]),
+            'final_equity': float(equity[-1]),
+            'max_drawdown': float(drawdown.max()),
+            'max_gross_exposure': float((vol_buy + vol_sell).max()),
+            'max_net_exposure': float(np.abs(vol_buy - vol_sell).max()),
+            'peak_margin': float(curves['margin'].max()),
+            'open_positions_end': int(state['pos']['weight'].sum() + state['held']['weight'].sum()),
+            'equity_curve': equity,
+            'exposure_curve': vol_buy - vol_sell,
+        }
+
+
+def print_report(report, title="그리드 백테스트"):
+    print("\n" + "="*70)
+    print(f"  ⚡ {title}")
+    print("="*70)
+    print(f"틱: {report['ticks']:,}개 | 레벨: {report['levels']:,}개 | 라운드: {report['rounds']:,}회 | "
+          f"소요: {report['elapsed_sec']:.2f}초 ({report['ticks_per_sec']:,.0f} 틱/초)")
+    print(f"중심가: ${report['center_price']:,.2f}")
+    print(f"체결: 매수 {report['fills_buy']:,} / 매도 {report['fills_sell']:,} | "
+          f"익절 {report['take_profits']:,} | 전환 {report['flips']:,} | 손절 {report['stops']:,} | "
+          f"증거금 거부 {report['margin_rejects']:,}")
+    print(f"실현손익: ${report['realized_pnl']:,.2f} | 평가손익: ${report['floating_pnl']:,.2f} | "
+          f"최종자산: ${report['final_equity']:,.2f}")
+    print(f"최대낙폭: ${report['max_drawdown']:,.2f} | 최대 노출: 총 {report['max_gross_exposure']:.2f}랏 / "
+          f"순 {report['max_net_exposure']:.2f}랏 | 최대 증거금: ${report['peak_margin']:,.2f}")
+    if report['stopped_out']:
+        print(f"🛑 스톱아웃: {np.datetime64(report['stop_out_time_msc'], 'ms')} (틱 #{report['stop_out_tick']:,}) | "
+              f"자산 ${report['stop_out_equity']:,.2f} | 증거금 수준 {report['stop_out_margin_level']:.1f}% | "
+              f"청산 {report['stop_out_closed']:,}개")
+    print(f"종료시 보유 포지션: {report['open_positions_end']:,}개")
+    print("="*70)
+
+
+if __name__ == "__main__":
+    # 인자: [틱 파일] [설정을 가져올 봇 모듈]
+    source = sys.argv[1] if len(sys.argv) > 1 and sys.argv[1] != '-' else None
+    bot = sys.argv[2] if len(sys.argv) > 2 else 'main'
+
+    if source:
+        ticks = source
+    else:
+        # 하루치 합성 틱 (200ms 간격 = 432,000틱)
+        ticks = generate_ticks(432000, volatility=0.00003, spread=10.0, seed=7)
+
+    grid_config = load_grid_config(bot)
+    engine = GridBacktestEngine(config_from_grid_config(grid_config))
+    print_report(engine.run(ticks), title=f"그리드 백테스트 ({bot}.py 설정)")
@@ -0,0 +1,693 @@
+"""
+🧩 공용 그리드 트레이딩 엔진 - main / live / live2 / fix / final / final_ / minn 이 같은 구현 사용
+- 각 스크립트는 GRID_CONFIG (그리드 설정 + 동작 옵션) 만 가지고 이 엔진을 실행
+- 포지션 손익: Position_Book 구조화 배열로 한 번에 계산 (포지션마다 Python 분기 없음)
+- 익절 / flip / 재배치 / 수동 청산 / 대기주문 취소: 요청을 모아 BulkOrderPlacer 파이프라인으로 일괄 전송
+  (포지션마다 order_send + sleep 반복 없음, flip 대기도 배치당 한 번)
+- 심볼 정보는 처음 한 번만 조회해서 보관
+- 스크립트별 차이는 설정 옵션: 계좌 전환(live2), 시작 전 정리(final_, minn), 배치 전 스프레드 확인(final, live),
+  flip 대기, 방향별 레벨 수 / 가격 자릿수 / 재배치 여부 / 동적 중심(minn)
+- 키 입력은 Windows(msvcrt) / Linux·Mac(select) 모두 지원
+
+💡 사용법:
+    from Grid_Engine import run_grid_bot
+    GRID_CONFIG = {'symbol': 'BTCUSD', 'grid_spacing': 200.0, 'grid_levels': 5, 'flip_delay': 0.2}
+    run_grid_bot(GRID_CONFIG)       # 연결 → 확인 → 그리드 배치 → 관리 루프 (H/L/Q/S/C)
+
+    python Grid_Engine_Benchmark.py # 기존 포지션별 루프 vs 엔진 (동작 일치 + 지연시간)
+"""
+
+import sys
+import time
+import threading
+from datetime import datetime
+from operator import attrgetter
+
+import numpy as np
+import MetaTrader5 as mt5
+
+from Bulk_Order_Engine import BulkOrderPlacer, STATUS_PLACED, print_placement_report
+from Position_Book import CORE_DTYPE, position_book, evaluate, summarize
+
+# 크로스 플랫폼 키보드 입력 처리
+try:
+    import msvcrt  # Windows
+    WINDOWS = True
+except ImportError:
+    import select  # Linux/Mac
+    WINDOWS = False
+
+SUCCESS_RETCODES = (mt5.TRADE_RETCODE_DONE, mt5.TRADE_RETCODE_PLACED)
+
+DEFAULT_GRID_CONFIG = {
+    'symbol': 'BTCUSD',
+    'magic_number': 999999,
+
+    # 그리드 전략
+    'grid_spacing': 0.01,
+    'grid_levels': 100,                 # 방향별 레벨 수 (grid_levels_below / grid_levels_above 로 따로 지정 가능)
+    'lot_per_order': 0.01,
+    'price_digits': 2,                  # 중심가 / 주문가 반올림 자릿수
+    'refill_on_hit': True,              # 체결된 가격에 같은 방향 Limit 재배치
+
+    # 손실 관리
+    'max_loss_per_position': 0.02,
+    'flip_on_loss': True,
+    'flip_delay': 0.1,                  # 청산 → 반대 진입 사이 대기 (초, 배치당 한 번)
+
+    # 수익 목표
+    'take_profit_ticks': 0.01,
+    'take_profit_comment': 'PROFIT',
+
+    # 동적 중심 (중심가만 이동, 재배치 없음)
+    'dynamic_center': False,
+    'center_update_interval': 300,
+    'center_move_threshold': 5,         # grid_spacing × 이 값 이상 움직이면 중심 이동
+
+    # 시작 옵션
+    'switch_account': False,            # 연결 후 다른 계좌로 전환할지 묻기
+    'clear_on_start': False,            # 시작 전 기존 포지션 청산 + 대기주문 취소
+    'clear_all_magics': False,          # 정리/취소할 때 다른 매직넘버까지 (심볼 전체)
+    'check_spread_on_setup': False,     # 그리드 배치 전 스프레드가 max_spread 초과면 중단
+
+    # 기타
+    'max_spread': 100,
+    'check_interval': 0.3,
+    'stats_interval': 30,
+    'deviation': 20,
+    'title': '🌟 완벽한 그리드 봇 - 수동 청산 기능',
+}
+
+# 청산 / flip / 재배치용 전송 설정 - 기존 코드처럼 응답 오는 대로 바로 보냄
+# (대량 배치용 기본 상한 200건/초 없이, 브로커가 과다요청을 알릴 때만 AIMD 로 낮춤)
+TRADE_SENDER_CONFIG = {
+    'max_requests_per_second': 5000,
+}
+
+# 순차 전송 예상 시간이 이보다 짧으면 스레드 파이프라인 없이 바로 보냄 (초)
+PIPELINE_MIN_SEC = 0.002
+
+class GridEngine:
+    """🧩 양방향 Limit 그리드 + 손실 방향전환(flip) + 익절 + 수동 청산 (H/L/Q/S/C)"""
+
+    def __init__(self, config):
+        self.config = {**DEFAULT_GRID_CONFIG, **config}
+        cfg = self.config
+        self.levels_below = cfg.get('grid_levels_below', cfg['grid_levels'])
+        self.levels_above = cfg.get('grid_levels_above', cfg['grid_levels'])
+        self.grid_orders = {'buy': {}, 'sell': {}}
+        self.order_placer = BulkOrderPlacer(cfg['symbol'], cfg['magic_number'],
+                                            deviation=cfg['deviation'],
+                                            type_filling=mt5.ORDER_FILLING_RETURN)
+        self.order_sender = BulkOrderPlacer(cfg['symbol'], cfg['magic_number'], deviation=cfg['deviation'],
+                                            config=TRADE_SENDER_CONFIG)
+        self.order_rtt = None               # 최근 주문 1건 왕복 시간 (초) - 전송 방식 선택용 (None: 아직 모름)
+        self._book = None                   # 마지막 포지션 배열 + 비교용 (티켓, 랏)
+        self._book_key = None
+        self._registered_book = None        # 새 체결 등록까지 끝낸 포지션 배열
+        self._book_columns = None           # 그 배열의 (매수 여부, 진입가, 부호 있는 랏)
+        self.active_positions = {}
+        self.stats = {
+            'total_profit': 0.0,
+            'total_trades': 0,
+            'grid_hits': 0,
+            'flips': 0,
+            'avoided_loss': 0.0,
+            'start_time': datetime.now(),
+        }
+        self.symbol_info = None
+        self.center_price = None
+        self.last_center_update = time.time()
+        self.running = True
+        self.manual_action = None
+
+    # ==================== 연결 / 시세 ====================
+    def connect_mt5(self):
+        """MT5 연결 (옵션: 다른 계좌로 전환)"""
+        print("\n" + "="*80)
+        print(f"  {self.config['title']}")
+        print("="*80)
+
+        if not mt5.initialize():
+            print(f"❌ MT5 초기화 실패: {mt5.last_error()}")
+            return False
+
+        account_info = mt5.account_info()
+        if account_info is None:
+            print("❌ 계좌 정보 없음 - MT5 터미널에 계좌가 로그인되어 있는지 확인하세요")
+            mt5.shutdown()
+            return False
+
+        print("\n✓ MT5 연결 성공!")
+        print(f"계좌: {account_info.login} | 서버: {account_info.server}")
+        print(f"잔고: ${account_info.balance:,.2f}")
+        print(f"자산: ${account_info.equity:,.2f}")
+
+        if self.config['switch_account']:
+            return self.switch_account()
+        return True
+
+    def switch_account(self):
+        """다른 계좌로 전환 (로그인 정보 입력 → mt5.login)"""
+        if input("\n다른 계좌로 전환하시겠습니까? (y/n): ").lower() != 'y':
+            return True
+        try:
+            login = int(input("로그인 ID 입력: "))
+        except ValueError:
+            print("입력 오류 → 현재 계좌로 진행합니다.")
+            return True
+        server = input("서버 이름 입력 (예: US50-LIVE): ").strip()
+        password = input("비밀번호 입력 (필요 시): ").strip() or ""
+
+        if not mt5.login(login, password=password, server=server):
+            print(f"❌ 계좌 전환 실패: {mt5.last_error()}")
+            mt5.shutdown()
+            return False
+
+        new_info = mt5.account_info()
+        print(f"\n전환 성공! 새 계좌: {new_info.login} | 서버: {new_info.server}")
+        return True
+
+    def get_symbol_info(self):
+        """심볼 정보 (처음 한 번만 조회)"""
+        if self.symbol_info is not None:
+            return self.symbol_info
+
+        symbol_info = mt5.symbol_info(self.config['symbol'])
+        if symbol_info is None:
+            print(f"❌ {self.config['symbol']} 심볼을 찾을 수 없습니다")
+            return None
+
+        if not symbol_info.visible:
+            mt5.symbol_select(self.config['symbol'], True)
+
+        self.symbol_info = symbol_info
+        return symbol_info
+
+    def get_current_price(self):
+        """현재가"""
+        tick = mt5.symbol_info_tick(self.config['symbol'])
+        if tick is None:
+            return None
+        return {'bid': tick.bid, 'ask': tick.ask, 'spread': tick.ask - tick.bid}
+
+    def get_positions(self):
+        """내 매직넘버 포지션 → 구조화 배열 (읽기 전용 - 다음 주기에 그대로 재사용될 수 있음)"""
+        positions = mt5.positions_get(symbol=self.config['symbol'])
+        if not positions:
+            self._book_key = None
+            return np.zeros(0, dtype=CORE_DTYPE)
+
+        # 티켓/랏 구성이 지난번과 같으면 이전 배열 재사용 (포지션 객체 → 배열 변환 생략)
+        # 비교 키는 파이썬 리스트 (리스트 == 는 C 루프 - 주기마다 NumPy 배열 두 개 만드는 것보다 싸다)
+        key = (list(map(attrgetter('ticket'), positions)), list(map(attrgetter('volume'), positions)))
+        if key == self._book_key:
+            return self._book
+        self._book_key = key
+        self._book = position_book(positions, self.config['magic_number'], CORE_DTYPE)
+        return self._book
+
+    # ==================== 일괄 전송 ====================
+    def send_requests(self, requests):
+        """📨 요청 목록 전송 → (성공 여부 배열, 주문번호 배열)
+
+        1건이거나 예상 순차 전송 시간(건수 × 최근 왕복 시간)이 짧으면 바로 차례로 order_send
+        (1건은 겹칠 응답 대기가 없어 스레드 비용만 늘어남),
+        길거나 아직 왕복 시간을 모르면 BulkOrderPlacer 파이프라인 (동시 전송 + 속도 조절 + 재시도)
+        """
+        n = len(requests)
+        if n == 0:
+            return np.zeros(0, dtype=bool), np.zeros(0, dtype=np.int64)
+
+        if n == 1 or (self.order_rtt is not None and n * self.order_rtt < PIPELINE_MIN_SEC):
+            ok = np.zeros(n, dtype=bool)
+            tickets = np.zeros(n, dtype=np.int64)
+            started = time.perf_counter()
+            for i, request in enumerate(requests):
+                result = mt5.order_send(request)
+                if result and result.retcode in SUCCESS_RETCODES:
+                    ok[i] = True
+                    tickets[i] = result.order
+            self.order_rtt = (time.perf_counter() - started) / n
+            return ok, tickets
+
+        report = self.order_sender.execute(requests)
+        self.order_rtt = report['elapsed_sec'] * min(self.order_sender.config['workers'], n) / n
+        return report['status'] == STATUS_PLACED, report['tickets']
+
+    def deal_request(self, order_type, volume, price, comment, position=None):
+        """시장가 요청 (position 이 있으면 그 포지션 청산)"""
+        request = {
+            "action": mt5.TRADE_ACTION_DEAL,
+            "symbol": self.config['symbol'],
+            "volume": volume,
+            "type": order_type,
+            "price": price,
+            "deviation": self.config['deviation'],
+            "magic": self.config['magic_number'],
+            "comment": comment,
+            "type_time": mt5.ORDER_TIME_GTC,
+            "type_filling": mt5.ORDER_FILLING_IOC,
+        }
+        if position is not None:
+            request["position"] = position
+        return request
+
+    def close_requests(self, book, price, comment):
+        """포지션 배열 → 반대 방향 청산 요청 목록 (매수는 bid, 매도는 ask)"""
+        is_buy = book['type'] == mt5.ORDER_TYPE_BUY
+        close_types = np.where(is_buy, mt5.ORDER_TYPE_SELL, mt5.ORDER_TYPE_BUY)
+        close_prices = np.where(is_buy, price['bid'], price['ask'])
+        return [self.deal_request(t, v, p, comment, position=ticket)
+                for ticket, t, v, p in zip(book['ticket'].tolist(), close_types.tolist(),
+                                           book['volume'].tolist(), close_prices.tolist())]
+
+    def cancel_pending_orders(self):
+        """대기주문 일괄 취소 → 취소된 개수"""
+        orders = mt5.orders_get(symbol=self.config['symbol'])
+        if not orders:
+            return 0
+        magic = None if self.config['clear_all_magics'] else self.config['magic_number']
+        ok, _ = self.send_requests([{"action": mt5.TRADE_ACTION_REMOVE, "order": o.ticket}
+                                    for o in orders if magic is None or o.magic == magic])
+        return int(ok.sum())
+
+    def clear_existing_positions_and_orders(self):
+        """시작 전 기존 포지션 청산 + 대기주문 취소"""
+        print(f"\n{'='*80}")
+        print("  🔄 기존 포지션 및 주문 정리 중...")
+        print(f"{'='*80}\n")
+
+        magic = None if self.config['clear_all_magics'] else self.config['magic_number']
+        book = position_book(mt5.positions_get(symbol=self.config['symbol']), magic, CORE_DTYPE)
+        price = self.get_current_price()
+        if len(book) and price:
+            ok, _ = self.send_requests(self.close_requests(book, price, 'CLEAR_EXISTING'))
+            print(f"✅ {int(ok.sum())}개 기존 포지션 청산 완료!")
+
+        canceled = self.cancel_pending_orders()
+        if canceled:
+            print(f"✅ {canceled}개 기존 대기 주문 취소 완료!")
+
+    # ==================== 그리드 ====================
+    def setup_grid(self):
+        """그리드 설정 - 아래 매수 / 위 매도 Limit 일괄 배치"""
+        cfg = self.config
+        current_price = self.get_current_price()
+        if not current_price:
+            return False
+
+        if cfg['check_spread_on_setup'] and current_price['spread'] > cfg['max_spread']:
+            print(f"❌ 스프레드 초과: {current_price['spread']:.2f} > {cfg['max_spread']}")
+            return False
+
+        digits = cfg['price_digits']
+        self.center_price = round((current_price['bid'] + current_price['ask']) / 2, digits)
+        self.last_center_update = time.time()
+
+        print(f"\n{'='*80}")
+        print("  🎯 그리드 설정")
+        print(f"{'='*80}")
+        print(f"중심 가격: ${self.center_price:,.{digits}f}")
+        print(f"간격: ${cfg['grid_spacing']}")
+        print(f"레벨: 아래 매수 {self.levels_below} + 위 매도 {self.levels_above} = "
+              f"{self.levels_below + self.levels_above}개")
+        print(f"총 lot: ≈ {(self.levels_below + self.levels_above) * cfg['lot_per_order']:.2f}")
+        print(f"{'='*80}\n")
+
+        print("📊 그리드 배치 중...")
+
+        spacing = cfg['grid_spacing']
+        buy_prices = np.round(self.center_price - np.arange(1, self.levels_below + 1) * spacing, digits)
+        sell_prices = np.round(self.center_price + np.arange(1, self.levels_above + 1) * spacing, digits)
+        report = self.order_placer.place_limit_grid(buy_prices, sell_prices, cfg['lot_per_order'],
+                                                    comment_format=f"GRID_{{side}}_{{price:.{digits}f}}")
+        self.grid_orders['buy'].update(report['buy'])
+        self.grid_orders['sell'].update(report['sell'])
+        print_placement_report(report)
+
+        total = len(self.grid_orders['buy']) + len(self.grid_orders['sell'])
+        print(f"\n✅ 그리드 완료: {total}개\n")
+        return True
+
+    def refill_grid(self, filled):
+        """그리드 재생성 - 새로 체결된 포지션 가격에 같은 방향 Limit 재배치 (한 번에)"""
+        cfg = self.config
+        digits = cfg['price_digits']
+        is_buy = (filled['type'] == mt5.ORDER_TYPE_BUY).tolist()
+        prices = filled['price_open'].tolist()
+        requests = [{
+            "action": mt5.TRADE_ACTION_PENDING,
+            "symbol": cfg['symbol'],
+            "volume": cfg['lot_per_order'],
+            "type": mt5.ORDER_TYPE_BUY_LIMIT if buy else mt5.ORDER_TYPE_SELL_LIMIT,
+            "price": price,
+            "deviation": cfg['deviation'],
+            "magic": cfg['magic_number'],
+            "comment": f"GRID_{'BUY' if buy else 'SELL'}_{price:.{digits}f}",
+            "type_time": mt5.ORDER_TIME_GTC,
+            "type_filling": mt5.ORDER_FILLING_RETURN,
+        } for buy, price in zip(is_buy, prices)]
+
+        ok, tickets = self.send_requests(requests)
+        for i in np.flatnonzero(ok).tolist():
+            self.grid_orders['buy' if is_buy[i] else 'sell'][prices[i]] = int(tickets[i])
+
+    def update_center_if_needed(self):
+        """동적 중심 - 가격이 grid_spacing × center_move_threshold 이상 움직였으면 중심가 이동"""
+        cfg = self.config
+        if not cfg['dynamic_center'] or self.center_price is None:
+            return False
+        if time.time() - self.last_center_update < cfg['center_update_interval']:
+            return False
+
+        price = self.get_current_price()
+        if not price:
+            return False
+
+        new_center = round((price['bid'] + price['ask']) / 2, cfg['price_digits'])
+        diff = abs(new_center - self.center_price) / cfg['grid_spacing']
+        if diff >= cfg['center_move_threshold']:
+            print(f"\n🔄 중심 가격 이동: ${self.center_price:,} → ${new_center:,} (변동 {diff:.1f}배)")
+            self.center_price = new_center
+            self.last_center_update = time.time()
+            return True
+        return False
+
+    # ==================== 포지션 관리 ====================
+    def check_and_manage_positions(self):
+        """포지션 관리 - 새 체결 등록/재배치 → 손실 flip / 익절 (손익은 전체 포지션 한 번에 계산)"""
+        book = self.get_positions()
+        if not len(book):
+            return
+
+        current_price = self.get_current_price()
+        if not current_price:
+            return
+
+        cfg = self.config
+        filled = self.register_fills(book) if book is not self._registered_book else None
+
+        # 손익 = (청산가 - 진입가) × 부호 있는 랏 (매도는 -랏) - 열은 포지션 구성이 바뀔 때만 다시 만듦
+        # (evaluate 와 같은 값, 주기마다 드는 NumPy 호출 수를 줄임)
+        # 계산은 전부 첫 전송 전에 - 주문 응답을 기다린 뒤에는 결과 반영만 남도록
+        is_buy, price_open, signed_volume = self._book_columns
+        pnl = (np.where(is_buy, current_price['bid'], current_price['ask']) - price_open) * signed_volume
+        take = pnl >= cfg['take_profit_ticks']
+        flip = None
+        if cfg['flip_on_loss']:
+            flip = pnl < -cfg['max_loss_per_position']
+            take &= ~flip
+
+        if filled is not None and cfg['refill_on_hit']:
+            self.refill_grid(filled)
+        if take.any():
+            self.close_with_profit(book[take], pnl[take], current_price)
+        if flip is not None and flip.any():
+            self.flip_positions(book[flip], pnl[flip], current_price)
+
+    def register_fills(self, book):
+        """새 포지션 배열 - 처음 보는 티켓을 체결로 등록, 손익 계산용 열 준비 → 새 체결 (없으면 None)"""
+        active = self.active_positions
+        is_buy = book['type'] == mt5.ORDER_TYPE_BUY
+        self._book_columns = (is_buy, np.ascontiguousarray(book['price_open']),
+                              np.where(is_buy, book['volume'], -book['volume']))
+        self._registered_book = book
+
+        new = [i for i, ticket in enumerate(book['ticket'].tolist()) if ticket not in active]
+        if not new:
+            return None
+        filled = book[new]
+        for ticket, order_type, price_open, volume in filled.tolist():
+            active[ticket] = {
+                'type': order_type,
+                'entry_price': price_open,
+                'volume': volume,
+                'flipped': False
+            }
+        self.stats['grid_hits'] += len(filled)
+        return filled
+
+    def close_with_profit(self, book, pnl, current_price):
+        """수익 실현 - 익절 대상 일괄 청산"""
+        ok, _ = self.send_requests(self.close_requests(book, current_price, self.config['take_profit_comment']))
+        if not ok.any():
+            return
+        self.stats['total_profit'] += float(pnl[ok].sum())
+        self.stats['total_trades'] += int(ok.sum())
+        for ticket in book['ticket'][ok].tolist():
+            self.active_positions.pop(ticket, None)
+
+    def flip_positions(self, book, pnl, current_price):
+        """🔄 손실 포지션 방향 전환 - 한 번에 청산 → (flip_delay) → 반대 방향 한 번에 진입"""
+        closed, _ = self.send_requests(self.close_requests(book, current_price, 'FLIP_CLOSE'))
+        if not closed.any():
+            return 0
+        book, pnl = book[closed], pnl[closed]
+
+        if self.config['flip_delay'] > 0:
+            time.sleep(self.config['flip_delay'])
+
+        is_buy = book['type'] == mt5.ORDER_TYPE_BUY
+        new_types = np.where(is_buy, mt5.ORDER_TYPE_SELL, mt5.ORDER_TYPE_BUY)
+        new_prices = np.where(is_buy, current_price['bid'], current_price['ask'])
+        opened, tickets = self.send_requests([
+            self.deal_request(int(t), float(v), float(p), 'FLIP_OPEN')
+            for t, v, p in zip(new_types, book['volume'], new_prices)])
+        if not opened.any():
+            return 0
+
+        avoided = np.abs(pnl[opened])
+        self.stats['flips'] += int(opened.sum())
+        self.stats['avoided_loss'] += float(avoided.sum())
+        for i in np.flatnonzero(opened):
+            self.active_positions.pop(int(book['ticket'][i]), None)
+            self.active_positions[int(tickets[i])] = {
+                'type': int(new_types[i]),
+                'entry_price': float(new_prices[i]),
+                'volume': float(book['volume'][i]),
+                'flipped': True
+            }
+
+        to_sell = int((opened & is_buy).sum())
+        print(f"\n🔄 방향 전환 {int(opened.sum())}건! 매수 → 매도 {to_sell} | "
+              f"매도 → 매수 {int(opened.sum()) - to_sell} | 회피: ${avoided.sum():.4f}")
+        return int(opened.sum())
+
+    def analyze_positions(self):
+        """포지션 분석 - 💙 수익 / ❤️ 손실 분류 (book, pnl, profit_mask + 개수/합계)"""
+        book = self.get_positions()
+        price = self.get_current_price()
+        if not price:
+            book = book[:0]
+        bid, ask = (price['bid'], price['ask']) if price else (0.0, 0.0)
+        ev = evaluate(book, bid, ask)
+        analysis = summarize(book, ev)
+        analysis.update(book=book, pnl=ev['pnl'], profit_mask=ev['pnl'] > 0, price=price)
+        return analysis
+
+    def close_selected(self, analysis, mask, comment):
+        """분석 결과 중 mask 포지션 일괄 청산 → 청산된 개수 (포지션별 결과 출력)"""
+        book, pnl, price = analysis['book'][mask], analysis['pnl'][mask], analysis['price']
+        requests = self.close_requests(book, price, comment)
+        ok, _ = self.send_requests(requests)
+        for i in np.flatnonzero(ok):
+            print(f"✓ 청산: {'매수' if book['type'][i] == mt5.ORDER_TYPE_BUY else '매도'} "
+                  f"@ ${book['price_open'][i]:,.2f} → ${requests[i]['price']:,.2f} "
+                  f"| 손익: ${pnl[i]:,.4f}")
+            self.active_positions.pop(int(book['ticket'][i]), None)
+        return int(ok.sum())
+
+    def close_profit_positions(self):
+        """수익 포지션만 청산 (파란불)"""
+        analysis = self.analyze_positions()
+        if not analysis['profit_count']:
+            print("\n💡 수익 포지션이 없습니다.")
+            return
+
+        print(f"\n{'='*80}")
+        print("  💙 수익 포지션 청산 (파란불)")
+        print(f"{'='*80}")
+        print(f"수익 포지션: {analysis['profit_count']}개")
+        print(f"총 수익: ${analysis['total_profit']:,.4f}")
+        print(f"{'='*80}\n")
+
+        closed = self.close_selected(analysis, analysis['profit_mask'], 'MANUAL_PROFIT')
+        print(f"\n✅ {closed}개 수익 포지션 청산 완료!")
+        print(f"💰 실현 수익: ${analysis['total_profit']:,.4f}")
+
+    def close_loss_positions(self):
+        """손실 포지션만 청산 (빨간불)"""
+        analysis = self.analyze_positions()
+        if not analysis['loss_count']:
+            print("\n💡 손실 포지션이 없습니다.")
+            return
+
+        print(f"\n{'='*80}")
+        print("  ❤️ 손실 포지션 청산 (빨간불)")
+        print(f"{'='*80}")
+        print(f"손실 포지션: {analysis['loss_count']}개")
+        print(f"총 손실: ${analysis['total_loss']:,.4f}")
+        print(f"{'='*80}\n")
+
+        closed = self.close_selected(analysis, ~analysis['profit_mask'], 'MANUAL_LOSS')
+        print(f"\n✅ {closed}개 손실 포지션 청산 완료!")
+        print(f"❌ 확정 손실: ${analysis['total_loss']:,.4f}")
+
+    def close_all_positions(self):
+        """모든 포지션 청산"""
+        analysis = self.analyze_positions()
+        if not len(analysis['book']):
+            print("\n💡 포지션이 없습니다.")
+            return
+
+        print(f"\n{'='*80}")
+        print("  🔴 모든 포지션 청산")
+        print(f"{'='*80}")
+
+        book, price = analysis['book'], analysis['price']
+        ok, _ = self.send_requests(self.close_requests(book, price, 'MANUAL_ALL'))
+        for ticket in book['ticket'][ok].tolist():
+            self.active_positions.pop(ticket, None)
+        print(f"\n✅ {int(ok.sum())}개 포지션 청산 완료!")
+
+    # ==================== 표시 / 입력 ====================
+    def display_stats(self):
+        """통계"""
+        runtime = (datetime.now() - self.stats['start_time']).total_seconds() / 3600
+        analysis = self.analyze_positions()
+
+        print(f"\n{'='*80}")
+        print("  📊 실시간 통계")
+        print(f"{'='*80}")
+        print(f"운영: {int(runtime)}시간 {int((runtime % 1) * 60)}분")
+        print(f"포지션: {len(analysis['book'])}개")
+        print(f"  💙 수익: {analysis['profit_count']}개 (${analysis['total_profit']:+,.4f})")
+        print(f"  ❤️ 손실: {analysis['loss_count']}개 (${analysis['total_loss']:+,.4f})")
+        print(f"히트: {self.stats['grid_hits']} | 완료: {self.stats['total_trades']}")
+        print(f"🔄 방향전환: {self.stats['flips']}회")
+        print(f"💰 누적 수익: ${self.stats['total_profit']:,.2f}")
+        print(f"✅ 회피 손실: ${self.stats['avoided_loss']:,.2f}")
+        print(f"{'='*80}\n")
+
+    def get_key_press(self):
+        """키 입력 감지 (크로스 플랫폼)"""
+        if WINDOWS:
+            if msvcrt.kbhit():
+                key = msvcrt.getch()
+                if isinstance(key, bytes):
+                    key = key.decode('utf-8', errors='ignore')
+                return key.upper()
+        elif select.select([sys.stdin], [], [], 0)[0]:
+            return sys.stdin.read(1).upper()
+        return None
+
+    def keyboard_listener(self):
+        """키보드 입력 감지"""
+        print("\n" + "="*80)
+        print("  ⌨️  키보드 명령")
+        print("="*80)
+        print("  H = 수익 포지션만 청산하고 종료 (파란불 💙)")
+        print("  L = 손실 포지션만 청산하고 종료 (빨간불 ❤️)")
+        print("  Q = 모든 포지션 청산하고 종료")
+        print("  S = 현재 통계 보기")
+        print("  C = 계속 실행")
+        print("="*80 + "\n")
+
+        actions = {'H': ('close_profit', "수익 포지션 청산 요청!"),
+                   'L': ('close_loss', "손실 포지션 청산 요청!"),
+                   'Q': ('close_all', "전체 청산 요청!")}
+        while self.running:
+            try:
+                key = self.get_key_press()
+            except (OSError, ValueError):
+                key = None  # 입력 장치 없음 (백그라운드 실행 등)
+            if key in actions:
+                self.manual_action, message = actions[key]
+                print(f"\n[{key}] {message}")
+                self.running = False
+                break
+            elif key == 'S':
+                self.display_stats()
+            elif key == 'C':
+                print("\n▶️ 계속 실행 중...\n")
+            time.sleep(0.1)
+
+    def run(self):
+        """메인 루프"""
+        cfg = self.config
+        listener_thread = threading.Thread(target=self.keyboard_listener, daemon=True)
+        listener_thread.start()
+
+        last_stats = time.time()
+
+        try:
+            while self.running:
+                self.update_center_if_needed()
+                self.check_and_manage_positions()
+
+                if time.time() - last_stats >= cfg['stats_interval']:
+                    self.display_stats()
+                    last_stats = time.time()
+
+                analysis = self.analyze_positions()
+                price = analysis['price']
+                if price:
+                    print(f"[{datetime.now().strftime('%H:%M:%S')}] "
+                          f"{cfg['symbol']}: ${price['ask']:,.2f} | "
+                          f"💙{analysis['profit_count']} "
+                          f"❤️{analysis['loss_count']} | "
+                          f"수익: ${self.stats['total_profit']:+,.2f}", end='\r')
+
+                time.sleep(cfg['check_interval'])
+
+            print("\n\n명령 처리 중...")
+            if self.manual_action == 'close_profit':
+                self.close_profit_positions()
+            elif self.manual_action == 'close_loss':
+                self.close_loss_positions()
+            elif self.manual_action == 'close_all':
+                self.close_all_positions()
+
+        except KeyboardInterrupt:
+            print("\n\nCtrl+C 감지")
+
+        finally:
+            self.display_stats()
+
+            canceled = self.cancel_pending_orders()
+            if canceled:
+                print(f"✓ {canceled}개 대기 주문 취소")
+
+            print(f"\n최종 수익: ${self.stats['total_profit']:+,.2f}")
+            print(f"회피 손실: ${self.stats['avoided_loss']:.2f}")
+
+            mt5.shutdown()
+
+
+def run_grid_bot(config, engine_class=GridEngine):
+    """▶️ 연결 → 심볼 확인 → (기존 정리) → 시작 확인 → 그리드 배치 → 관리 루프"""
+    bot = engine_class(config)
+
+    if not bot.connect_mt5():
+        sys.exit(1)
+
+    if not bot.get_symbol_info():
+        mt5.shutdown()
+        sys.exit(1)
+
+    if bot.config['clear_on_start']:
+        bot.clear_existing_positions_and_orders()
+
+    answer = input("\n시작하시겠습니까? (y/n): ")
+    if answer.lower() != 'y':
+        mt5.shutdown()
+        sys.exit(0)
+
+    if not bot.setup_grid():
+        mt5.shutdown()
+        sys.exit(1)
+
+    print("\n봇 실행 중... 키보드 명령어 사용 가능 (H/L/Q/S/C)")
+    bot.run()
+    return bot
@@ -0,0 +1,314 @@
+"""
+📊 그리드 엔진 벤치마크 - 기존 포지션별 루프 vs 공용 엔진 (MT5 시뮬레이터, 같은 틱 / 같은 설정)
+- 동작: 관리 주기마다 두 구현을 각자의 시뮬레이터에서 같은 틱으로 돌린 뒤
+        통계(체결/익절/flip/실현손익/회피손실) · deal 수 · 보유 포지션 · 대기주문 · 잔고 비교
+- 지연: 관리 주기 1회 (check_and_manage_positions) p50 / p99 / p99.9 / 최대, 주문을 보낸 주기만의 평균,
+        보유 포지션 CLOSE_ALL_POSITIONS 개에서 전체 청산(Q) 시간,
+        보유 포지션 100 / 1,000 / 5,000 개일 때 관리 주기 1회 (체결/청산 없이 손익 평가만)
+- 주기 p99 는 주문 왕복 한 번 (주문 지연) 에 묶임: 주문을 보내는 주기가 전체의 1% 남짓이라
+  p99 가 '주문 1건 주기' 에 걸림 → 두 구현 차이는 주문 여러 건 주기 (p99.9 / 최대 / 주문 주기 평균) 에서 드러남
+- 브로커 왕복 지연은 시뮬레이터 order_latency 로 흉내 (일괄 전송 효과 확인)
+- flip 대기는 두 쪽 모두 0 (대기 중 시세가 움직이지 않게 해서 결과를 그대로 비교)
+
+💡 사용법:
+    python Grid_Engine_Benchmark.py                  # 합성 틱 5만개, 주문 지연 2ms
+    python Grid_Engine_Benchmark.py 500000 0.005     # 틱 수, 주문 지연(초)
+    python Grid_Engine_Benchmark.py 50000 0.002 500  # + 전체 청산 포지션 수
+"""
+
+import io
+import sys
+import time
+import contextlib
+
+import numpy as np
+
+import MT5_Simulator
+
+mt5 = MT5_Simulator.install()
+
+from Grid_Engine import GridEngine  # noqa: E402 (시뮬레이터 등록 후 import)
+
+BENCH_CONFIG = {
+    'symbol': 'BTCUSD',
+    'magic_number': 999999,
+    'grid_spacing': 2.0,
+    'grid_levels': 300,
+    'lot_per_order': 0.01,
+    'max_loss_per_position': 1.0,
+    'flip_on_loss': True,
+    'flip_delay': 0,
+    'take_profit_ticks': 0.5,
+    'deviation': 20,
+}
+
+CLOSE_ALL_POSITIONS = 200       # 전체 청산 측정용 보유 포지션 수 (기존 루프는 건당 주문 지연 + 0.05초)
+
+
+class LegacyGridLoop(GridEngine):
+    """기존 main.py 처리 방식 (비교 기준) - 포지션마다 손익 계산 / order_send / 시세 조회"""
+
+    def check_and_manage_positions(self):
+        positions = mt5.positions_get(symbol=self.config['symbol'], magic=self.config['magic_number'])
+        if not positions:
+            return
+
+        current_price = self.get_current_price()
+        if not current_price:
+            return
+
+        for position in positions:
+            if position.ticket not in self.active_positions:
+                self.active_positions[position.ticket] = {
+                    'type': position.type,
+                    'entry_price': position.price_open,
+                    'volume': position.volume,
+                    'flipped': False
+                }
+                self.stats['grid_hits'] += 1
+                self.refill_one(position.price_open, position.type)
+
+            if position.type == mt5.ORDER_TYPE_BUY:
+                profit_loss = (current_price['bid'] - position.price_open) * position.volume
+                close_price = current_price['bid']
+            else:
+                profit_loss = (position.price_open - current_price['ask']) * position.volume
+                close_price = current_price['ask']
+
+            if self.config['flip_on_loss'] and profit_loss < -self.config['max_loss_per_position']:
+                self.flip_position(position)
+                continue
+
+            if profit_loss >= self.config['take_profit_ticks']:
+                self.close_position_with_profit(position, close_price, profit_loss)
+
+    def flip_position(self, position):
+        current_price = self.get_current_price()
+        if not current_price:
+            return False
+
+        if position.type == mt5.ORDER_TYPE_BUY:
+            current_loss = (current_price['bid'] - position.price_open) * position.volume
+            new_type, new_price = mt5.ORDER_TYPE_SELL, current_price['bid']
+        else:
+            current_loss = (position.price_open - current_price['ask']) * position.volume
+            new_type, new_price = mt5.ORDER_TYPE_BUY, current_price['ask']
+
+        close_result = mt5.order_send(self.deal_request(new_type, position.volume, new_price, 'FLIP_CLOSE',
+                                                        position=position.ticket))
+        if not close_result or close_result.retcode != mt5.TRADE_RETCODE_DONE:
+            return False
+
+        time.sleep(self.config['flip_delay'])
+
+        flip_result = mt5.order_send(self.deal_request(new_type, position.volume, new_price, 'FLIP_OPEN'))
+        if flip_result and flip_result.retcode == mt5.TRADE_RETCODE_DONE:
+            self.stats['flips'] += 1
+            self.stats['avoided_loss'] += abs(current_loss)
+            self.active_positions[flip_result.order] = {
+                'type': new_type,
+                'entry_price': new_price,
+                'volume': position.volume,
+                'flipped': True
+            }
+            self.active_positions.pop(position.ticket, None)
+            return True
+        return False
+
+    def close_position_with_profit(self, position, close_price, profit):
+        close_type = mt5.ORDER_TYPE_SELL if position.type == mt5.ORDER_TYPE_BUY else mt5.ORDER_TYPE_BUY
+        result = mt5.order_send(self.deal_request(close_type, position.volume, close_price, 'PROFIT',
+                                                  position=position.ticket))
+        if result and result.retcode == mt5.TRADE_RETCODE_DONE:
+            self.stats['total_profit'] += profit
+            self.stats['total_trades'] += 1
+            self.active_positions.pop(position.ticket, None)
+
+    def refill_one(self, filled_price, filled_type):
+        side = 'buy' if filled_type == mt5.ORDER_TYPE_BUY else 'sell'
+        result = mt5.order_send({
+            "action": mt5.TRADE_ACTION_PENDING,
+            "symbol": self.config['symbol'],
+            "volume": self.config['lot_per_order'],
+            "type": mt5.ORDER_TYPE_BUY_LIMIT if side == 'buy' else mt5.ORDER_TYPE_SELL_LIMIT,
+            "price": filled_price,
+            "deviation": self.config['deviation'],
+            "magic": self.config['magic_number'],
+            "comment": f"GRID_{side.upper()}_{filled_price:.2f}",
+            "type_time": mt5.ORDER_TIME_GTC,
+            "type_filling": mt5.ORDER_FILLING_RETURN,
+        })
+        if result and result.retcode == mt5.TRADE_RETCODE_DONE:
+            self.grid_orders[side][filled_price] = result.order
+
+    def close_all_positions(self):
+        positions = mt5.positions_get(symbol=self.config['symbol'], magic=self.config['magic_number'])
+        current_price = self.get_current_price()
+        for position in positions or ():
+            close_type = mt5.ORDER_TYPE_SELL if position.type == mt5.ORDER_TYPE_BUY else mt5.ORDER_TYPE_BUY
+            close_price = current_price['bid'] if close_type == mt5.ORDER_TYPE_SELL else current_price['ask']
+            mt5.order_send(self.deal_request(close_type, position.volume, close_price, 'MANUAL_ALL',
+                                             position=position.ticket))
+            time.sleep(0.05)
+
+
+def run_bot(engine_class, ticks, order_latency, cycle_seconds=0.3):
+    """시뮬레이터 하나에서 봇 하나 실행 → 결과 dict"""
+    sim = MT5_Simulator.reset(balance=10_000_000.0, order_latency=order_latency)
+    sim.load_ticks(BENCH_CONFIG['symbol'], ticks, digits=2)
+    bot = engine_class(BENCH_CONFIG)
+
+    cycle_times = []
+    sent_cycle = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        mt5.initialize()
+        bot.get_symbol_info()
+        bot.setup_grid()
+        while not sim.finished:
+            sim.advance(cycle_seconds)
+            requests = sim.call_stats['order_send'][0]
+            started = time.perf_counter()
+            bot.check_and_manage_positions()
+            cycle_times.append(time.perf_counter() - started)
+            sent_cycle.append(sim.call_stats['order_send'][0] > requests)
+
+        open_positions = len(sim.positions)
+        bot.close_all_positions()
+
+    cycle_ms = np.asarray(cycle_times) * 1000
+    sent_cycle = np.asarray(sent_cycle)
+    return {
+        'stats': {key: value for key, value in bot.stats.items() if key != 'start_time'},
+        'deals': len(sim.deals),
+        'open_positions': open_positions,
+        'pending_orders': len(sim.orders),
+        'balance': sim.account_info().balance,
+        'cycles': len(cycle_ms),
+        'cycle_p50_ms': float(np.percentile(cycle_ms, 50)),
+        'cycle_p99_ms': float(np.percentile(cycle_ms, 99)),
+        'cycle_p999_ms': float(np.percentile(cycle_ms, 99.9)),
+        'cycle_max_ms': float(cycle_ms.max()),
+        'sent_cycles': int(sent_cycle.sum()),
+        'sent_cycle_avg_ms': float(cycle_ms[sent_cycle].mean()) if sent_cycle.any() else 0.0,
+        'left_after_close_all': len(sim.positions),
+    }
+
+
+def run_close_all(engine_class, ticks, position_count, order_latency):
+    """보유 포지션 position_count 개 (주문 지연 없이 미리 체결) 에서 전체 청산(Q) → (초, 남은 포지션 수)"""
+    sim = MT5_Simulator.reset(balance=1e12)
+    sim.load_ticks(BENCH_CONFIG['symbol'], ticks, digits=2)
+    bot = engine_class(BENCH_CONFIG)
+    tick = mt5.symbol_info_tick(BENCH_CONFIG['symbol'])
+    for i in range(position_count):
+        order_type = mt5.ORDER_TYPE_BUY if i % 2 == 0 else mt5.ORDER_TYPE_SELL
+        mt5.order_send(bot.deal_request(order_type, BENCH_CONFIG['lot_per_order'],
+                                        tick.ask if order_type == mt5.ORDER_TYPE_BUY else tick.bid, 'BENCH'))
+    sim.order_latency = order_latency
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        started = time.perf_counter()
+        bot.close_all_positions()
+        elapsed = time.perf_counter() - started
+    return elapsed, len(sim.positions)
+
+
+def run_static_book(engine_class, ticks, position_count, repeats=200):
+    """보유 포지션 position_count 개 (청산/flip 조건 없음) 에서 관리 주기 1회 시간 p50 (ms)"""
+    MT5_Simulator.reset(balance=1e12)
+    MT5_Simulator.load_ticks(BENCH_CONFIG['symbol'], ticks, digits=2)
+    bot = engine_class({**BENCH_CONFIG, 'max_loss_per_position': 1e12, 'take_profit_ticks': 1e12,
+                        'refill_on_hit': False})
+    tick = mt5.symbol_info_tick(BENCH_CONFIG['symbol'])
+    for i in range(position_count):
+        order_type = mt5.ORDER_TYPE_BUY if i % 2 == 0 else mt5.ORDER_TYPE_SELL
+        mt5.order_send(bot.deal_request(order_type, BENCH_CONFIG['lot_per_order'],
+                                        tick.ask if order_type == mt5.ORDER_TYPE_BUY else tick.bid, 'BENCH'))
+    bot.check_and_manage_positions()                # 처음 한 번은 새 체결 등록
+
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        bot.check_and_manage_positions()
+        samples.append(time.perf_counter() - started)
+    return float(np.percentile(samples, 50) * 1000)
+
+
+def compare(legacy, engine):
+    """동작 비교 → 다른 항목 목록 (없으면 일치)"""
+    mismatches = []
+    for key in ('grid_hits', 'total_trades', 'flips'):
+        if legacy['stats'][key] != engine['stats'][key]:
+            mismatches.append(key)
+    for key in ('total_profit', 'avoided_loss'):
+        if not np.isclose(legacy['stats'][key], engine['stats'][key], rtol=1e-9, atol=1e-9):
+            mismatches.append(key)
+    for key in ('deals', 'open_positions', 'pending_orders', 'left_after_close_all'):
+        if legacy[key] != engine[key]:
+            mismatches.append(key)
+    if not np.isclose(legacy['balance'], engine['balance'], rtol=1e-12, atol=1e-6):
+        mismatches.append('balance')
+    return mismatches
+
+
+def main():
+    tick_count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    order_latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.002
+    close_all_count = int(sys.argv[3]) if len(sys.argv) > 3 else CLOSE_ALL_POSITIONS
+    ticks = MT5_Simulator.generate_ticks(tick_count, seed=42)
+
+    results = {}
+    for name, engine_class in (('legacy', LegacyGridLoop), ('engine', GridEngine)):
+        results[name] = run_bot(engine_class, ticks, order_latency)
+    legacy, engine = results['legacy'], results['engine']
+    for name, engine_class in (('legacy', LegacyGridLoop), ('engine', GridEngine)):
+        results[name]['close_all_sec'], results[name]['close_all_left'] = run_close_all(
+            engine_class, ticks, close_all_count, order_latency)
+
+    print("\n" + "="*78)
+    print(f"  📊 그리드 엔진 벤치마크 - 틱 {tick_count:,}개 | 주문 지연 {order_latency * 1000:.1f}ms")
+    print("="*78)
+    print(f"{'':18}{'기존 루프':>18}{'공용 엔진':>18}")
+    rows = [
+        ('그리드 히트', legacy['stats']['grid_hits'], engine['stats']['grid_hits'], '{:,}'),
+        ('익절', legacy['stats']['total_trades'], engine['stats']['total_trades'], '{:,}'),
+        ('방향전환', legacy['stats']['flips'], engine['stats']['flips'], '{:,}'),
+        ('실현 손익 $', legacy['stats']['total_profit'], engine['stats']['total_profit'], '{:,.4f}'),
+        ('회피 손실 $', legacy['stats']['avoided_loss'], engine['stats']['avoided_loss'], '{:,.4f}'),
+        ('deal 수', legacy['deals'], engine['deals'], '{:,}'),
+        ('보유 포지션', legacy['open_positions'], engine['open_positions'], '{:,}'),
+        ('잔고 $', legacy['balance'], engine['balance'], '{:,.2f}'),
+        ('관리 주기', legacy['cycles'], engine['cycles'], '{:,}'),
+        ('주기 p50 ms', legacy['cycle_p50_ms'], engine['cycle_p50_ms'], '{:.3f}'),
+        ('주기 p99 ms', legacy['cycle_p99_ms'], engine['cycle_p99_ms'], '{:.3f}'),
+        ('주기 p99.9 ms', legacy['cycle_p999_ms'], engine['cycle_p999_ms'], '{:.3f}'),
+        ('주기 최대 ms', legacy['cycle_max_ms'], engine['cycle_max_ms'], '{:.3f}'),
+        ('주문 보낸 주기', legacy['sent_cycles'], engine['sent_cycles'], '{:,}'),
+        ('  그 주기 평균 ms', legacy['sent_cycle_avg_ms'], engine['sent_cycle_avg_ms'], '{:.3f}'),
+        (f'전체 청산 {close_all_count}개 초', legacy['close_all_sec'], engine['close_all_sec'], '{:.3f}'),
+        ('  청산 후 남은 포지션', legacy['close_all_left'], engine['close_all_left'], '{:,}'),
+    ]
+    for label, a, b, fmt in rows:
+        print(f"{label:<18}{fmt.format(a):>18}{fmt.format(b):>18}")
+
+    for count in (100, 1000, 5000):
+        a, b = (run_static_book(cls, ticks, count) for cls in (LegacyGridLoop, GridEngine))
+        print(f"{f'포지션 {count:,}개 p50 ms':<18}{a:>18.3f}{b:>18.3f}")
+
+    mismatches = compare(legacy, engine)
+    print("-"*78)
+    if mismatches:
+        print(f"❌ 동작 불일치: {', '.join(mismatches)}")
+    else:
+        print("✅ 동작 일치 (통계 / deal / 포지션 / 대기주문 / 잔고)")
+    print("⚡ 기존 루프 / 공용 엔진 시간 비 (1 보다 크면 엔진이 빠름): "
+          f"주기 p99 {legacy['cycle_p99_ms'] / max(engine['cycle_p99_ms'], 1e-9):.2f} | "
+          f"p99.9 {legacy['cycle_p999_ms'] / max(engine['cycle_p999_ms'], 1e-9):.2f} | "
+          f"주문 주기 평균 {legacy['sent_cycle_avg_ms'] / max(engine['sent_cycle_avg_ms'], 1e-9):.2f} | "
+          f"전체 청산 {legacy['close_all_sec'] / max(engine['close_all_sec'], 1e-9):.1f}")
+    print("="*78)
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
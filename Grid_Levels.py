@@ -0,0 +1,222 @@
+"""
+📊 컬럼형 그리드 레벨 테이블 - 레벨별 dict 리스트 대신 NumPy 배열
+- 진입가/목표가/거래량/거리를 한 번의 벡터 연산으로 계산 (10,000 레벨 ≈ 수십 µs)
+- 배열은 읽기 전용 → 시각화 스레드에 복사 없이 그대로 넘겨도 안전
+- level_data['buy_entry'] 처럼 기존 dict 방식 접근도 그대로 지원 (읽기 전용 뷰)
+
+💡 사용법:
+    levels = GridLevels.build(baseline_price, grid_distance=0.001, max_levels=100, base_lot=0.01)
+    levels.buy_entry                 # 전체 매수 진입가 배열 (읽기 전용)
+    levels[0]['sell_entry']          # 기존 dict 스타일 접근
+    levels.near(price, 0.2)          # 현재가 ±20% 이내 레벨 인덱스
+    moved = levels.recentered(new_price)           # 같은 간격 격자 위로 중심 이동
+    plan = plan_rebalance(order_prices, moved.buy_entry, tick_size)   # 유지/수정/추가/취소
+"""
+
+from collections import namedtuple
+from collections.abc import Mapping
+
+import numpy as np
+
+
+def _readonly(array, dtype=np.float64):
+    array = np.ascontiguousarray(array, dtype=dtype)
+    array.flags.writeable = False
+    return array
+
+
+# 재배치 계획 (현재 주문 위치 / 목표 레벨 위치 배열)
+#   keep:   (주문, 목표) 가격이 그대로인 쌍 - 요청 없음
+#   modify: (주문, 목표) TRADE_ACTION_MODIFY 로 가격만 옮길 쌍
+#   add:    새로 배치할 목표
+#   cancel: 취소할 주문
+RebalancePlan = namedtuple('RebalancePlan', ['keep', 'modify', 'add', 'cancel'])
+
+
+def plan_rebalance(order_prices, target_prices, tick_size):
+    """🔁 현재 주문 가격 ↔ 새 레벨 가격 최소 변경 계획 (한 방향/같은 주문 유형끼리)
+
+    tick_size 단위로 같은 가격이면 유지, 남는 주문은 가격 순서대로 남는 목표로 수정,
+    그래도 남으면 취소/추가. 요청 수 = 수정 + 추가 + 취소.
+    """
+    order_keys = np.rint(np.asarray(order_prices, dtype=np.float64) / tick_size).astype(np.int64)
+    target_keys = np.rint(np.asarray(target_prices, dtype=np.float64) / tick_size).astype(np.int64)
+
+    # 같은 가격 주문이 여러 개면 첫 번째만 매칭 (나머지는 수정/취소 대상)
+    _, order_first = np.unique(order_keys, return_index=True)
+    _, target_first = np.unique(target_keys, return_index=True)
+    _, oi, ti = np.intersect1d(order_keys[order_first], target_keys[target_first],
+                               assume_unique=True, return_indices=True)
+    keep_orders, keep_targets = order_first[oi], target_first[ti]
+
+    free_orders = np.setdiff1d(np.arange(len(order_keys)), keep_orders)
+    free_targets = np.setdiff1d(np.arange(len(target_keys)), keep_targets)
+    free_orders = free_orders[np.argsort(order_keys[free_orders], kind='stable')]
+    free_targets = free_targets[np.argsort(target_keys[free_targets], kind='stable')]
+    paired = min(len(free_orders), len(free_targets))
+
+    return RebalancePlan(
+        keep=np.column_stack([keep_orders, keep_targets]),
+        modify=np.column_stack([free_orders[:paired], free_targets[:paired]]),
+        add=free_targets[paired:],
+        cancel=free_orders[paired:],
+    )
+
+
+class GridLevelView(Mapping):
+    """🔍 레벨 하나에 대한 읽기 전용 dict 호환 뷰 (데이터 복사 없음)"""
+
+    __slots__ = ('_levels', '_index')
+
+    def __init__(self, levels, index):
+        self._levels = levels
+        self._index = index
+
+    def __getitem__(self, key):
+        if key == 'name':
+            return self._levels.name_of(self._index)
+        value = self._levels.column(key)[self._index]
+        return int(value) if key == 'level' else float(value)
+
+    def __iter__(self):
+        return iter(self._levels.keys())
+
+    def __len__(self):
+        return len(self._levels.keys())
+
+    def __repr__(self):
+        return f"GridLevelView({dict(self)})"
+
+
+class GridLevels:
+    """📊 컬럼형 그리드 레벨 테이블
+
+    columns: {이름: 1차원 배열} - 모두 같은 길이, 읽기 전용.
+    'level' 컬럼은 원래 테이블 기준 레벨 번호 (슬라이스해도 유지).
+    이름은 name_format 으로 필요할 때만 생성하고, names 로 일부를 직접 지정할 수 있다.
+    """
+
+    def __init__(self, columns, name_format='L{:04d}', names=None, params=None):
+        columns = dict(columns)
+        size = len(next(iter(columns.values()))) if columns else 0
+        if 'level' not in columns:
+            columns['level'] = np.arange(size, dtype=np.int64)
+        self._columns = {
+            key: _readonly(col, np.int64 if key == 'level' else np.float64)
+            for key, col in columns.items()
+        }
+        self._size = size
+        self._name_format = name_format
+        self._names = dict(names or {})     # {레벨 번호: 이름}
+        self.params = params                # build() 인자 (recentered 용, 슬라이스는 None)
+
+    # ---------- 생성 ----------
+    @classmethod
+    def build(cls, baseline_price, grid_distance, max_levels, base_lot,
+              target_ratio=0.5, lot_growth=0.01, name_format='즉시{:03d}'):
+        """🚀 기준가 위아래로 grid_distance 간격 레벨 max_levels 개 (벡터 계산)"""
+        i = np.arange(1, max_levels + 1, dtype=np.float64)
+        distance_pct = grid_distance * i
+        distance = baseline_price * distance_pct
+        lot_size = base_lot * (1 + i * lot_growth)           # 레벨별 거래량 증가
+        buy_entry = baseline_price - distance                 # 현재가 아래
+        sell_entry = baseline_price + distance                # 현재가 위
+        return cls({
+            'distance_pct': distance_pct,
+            'distance': distance,
+            'lot_size': lot_size,
+            'buy_entry': buy_entry,
+            'buy_target': buy_entry + distance * target_ratio,     # 일부만 회복해도 수익
+            'sell_entry': sell_entry,
+            'sell_target': sell_entry - distance * target_ratio,
+            'profit_per_trade': distance * target_ratio * lot_size,
+        }, name_format=name_format, params={
+            'baseline_price': baseline_price, 'grid_distance': grid_distance,
+            'max_levels': max_levels, 'base_lot': base_lot,
+            'target_ratio': target_ratio, 'lot_growth': lot_growth,
+        })
+
+    def recentered(self, price):
+        """🎯 price 에 가장 가까운 격자점으로 중심만 옮긴 새 테이블
+
+        가격 간격(절대값)은 그대로라 이동한 칸 수만큼의 양 끝 레벨 말고는
+        기존 진입가와 같은 가격이 나옴 → plan_rebalance 로 대부분 유지
+        """
+        p = self.params
+        if p is None:
+            raise ValueError("build() 로 만든 테이블만 중심 이동 가능")
+        spacing = p['baseline_price'] * p['grid_distance']
+        baseline = p['baseline_price'] + round((price - p['baseline_price']) / spacing) * spacing
+        return GridLevels.build(baseline, spacing / baseline, p['max_levels'], p['base_lot'],
+                                p['target_ratio'], p['lot_growth'], self._name_format)
+
+    @classmethod
+    def schedule(cls, count, step_pct, base_multiplier, multiplier_step,
+                 name_format='L{:04d}', extra=()):
+        """📋 거리(%)/거래량 배수 스케줄 테이블 (설정용 unlimited_grid_levels 대체)
+
+        extra: 뒤에 덧붙일 개별 레벨 dict 목록 ({'name', 'distance_pct', 'lot_multiplier'})
+        """
+        i = np.arange(1, count + 1, dtype=np.float64)
+        distance_pct = np.concatenate([step_pct * i, [e['distance_pct'] for e in extra]])
+        lot_multiplier = np.concatenate([base_multiplier + i * multiplier_step,
+                                         [e['lot_multiplier'] for e in extra]])
+        names = {count + k: e['name'] for k, e in enumerate(extra)}
+        return cls({'distance_pct': distance_pct, 'lot_multiplier': lot_multiplier},
+                   name_format=name_format, names=names)
+
+    # ---------- 컬럼 접근 ----------
+    def column(self, key):
+        return self._columns[key]
+
+    def __getattr__(self, key):
+        columns = self.__dict__.get('_columns')
+        if columns is not None and key in columns:
+            return columns[key]
+        raise AttributeError(key)
+
+    def keys(self):
+        return ('level', 'name') + tuple(k for k in self._columns if k != 'level')
+
+    def name_of(self, index):
+        level = int(self._columns['level'][index])
+        name = self._names.get(level)
+        return name if name is not None else self._name_format.format(level + 1)
+
+    # ---------- 시퀀스 호환 (기존 for level_data in grid_data 코드용) ----------
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, index):
+        if isinstance(index, (slice, np.ndarray, list)):
+            return GridLevels({k: c[index] for k, c in self._columns.items()},
+                              name_format=self._name_format, names=self._names)
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError(index)
+        return GridLevelView(self, index)
+
+    def __iter__(self):
+        for index in range(self._size):
+            yield GridLevelView(self, index)
+
+    def copy(self):
+        """읽기 전용이라 복사할 필요 없음 - 기존 .copy() 호출 호환용"""
+        return self
+
+    def to_dicts(self):
+        return [dict(view) for view in self]
+
+    # ---------- 조회 ----------
+    def near(self, price, max_pct, key='buy_entry'):
+        """price 로부터 ±max_pct 이내 레벨 인덱스"""
+        col = self._columns[key]
+        return np.flatnonzero(np.abs(col - price) < price * max_pct)
+
+    @property
+    def nbytes(self):
+        return sum(c.nbytes for c in self._columns.values())
+
+    def __repr__(self):
+        return f"GridLevels({self._size} levels, {self.nbytes / 1024:.1f} KB)"
@@ -1,19 +1,28 @@
 """
 🎮 Pygame 기반 실시간 그리드 트레이딩 시각화 시스템
-- 더 부드러운 애니메이션
+- 더 부드러운 애니메이션 (60 FPS)
 - 인터랙티브 컨트롤
-- 실시간 데이터 업데이트
+- 실시간 데이터 업데이트 (Viz_Snapshot 더블 버퍼의 최신 버전만 읽음 - 큐/복사 없음)
+- 유지 모드 렌더링: 배경/패널 테두리/안내문은 한 번만 그린 정적 레이어, 바뀐 패널 영역만 다시 그려
+  pygame.display.update(dirty rects) 로 그 부분만 화면에 올림 (새 스냅샷이 없는 프레임은 펄스 글자만)
+- 글리프 캐시: 같은 (폰트, 문자열, 색) 은 font.render 한 번 (축 라벨은 축 범위가 바뀔 때만 새로)
+- 가격/수익 히스토리는 렌더러 쪽 NumPy 링 버퍼 (새 행만 추가), 선은 픽셀 열마다 최소/최대로 줄여서 그림
+- 그리드 레벨 LOD: 정렬된 레벨 가격을 이분 탐색해 보이는 가격 구간의 레벨만, 1픽셀보다 촘촘하면 밀도 띠로
+  → 레벨 수천~수만 개 전체를 프레임 비용 일정하게 표시
+- 가격 축 확대/축소 (마우스 휠, +/-) · 이동 (드래그, ↑/↓) · 자동 범위 복귀 (Home)
 """
 
 import pygame
-import sys
 import math
 import time
-from datetime import datetime, timedelta
-from collections import deque
+from collections import OrderedDict
+from datetime import datetime
 import threading
-import queue
-import json
+
+import numpy as np
+
+from Viz_Snapshot import SnapshotBuffer
+from Viz_Geometry import SeriesRing, AxisRange, polyline, sorted_levels, visible_slice, level_density
 
 # 색상 정의
 COLORS = {
@@ -35,9 +44,56 @@ COLORS = {
     'DARK_RED': (128, 0, 0),
 }
 
+TARGET_FPS = 60
+HISTORY_CAPACITY = 36000        # 렌더러 쪽 히스토리 (1초마다 게시하면 10시간)
+GLYPH_CACHE_SIZE = 1024
+PULSE_STEPS = 16                # 펄스 밝기 단계 (단계가 바뀔 때만 다시 그림)
+AXIS_MARGIN = 48                # 차트 왼쪽 Y축 라벨 폭
+TITLE_HEIGHT = 25
+ZOOM_STEP = 0.8                 # 휠 한 칸 / +- 한 번 확대 비율
+PAN_STEP = 0.1                  # ↑/↓ 한 번 이동 (축 폭 대비)
+LEVEL_TABLE_ROWS = 8
+LEVEL_LINE_ALPHA = 110          # 픽셀 행에 레벨 하나 (선)
+LEVEL_BAND_MAX_ALPHA = 170      # 밀도 띠 최대 진하기 (가격선이 묻히지 않게)
+LEVEL_SIDES = (('buy_entry', COLORS['GREEN']), ('sell_entry', COLORS['RED']))
+
+# 패널 그리는 순서, 새 스냅샷이 오면 다시 그리는 패널 (그리드 레벨은 레벨 테이블이 바뀔 때만)
+PANELS = ('price_chart', 'profit_chart', 'positions', 'levels', 'status_values', 'status_pulse')
+SNAPSHOT_PANELS = ('price_chart', 'profit_chart', 'positions', 'status_values')
+
+
+class GlyphCache:
+    """🔤 font.render 결과 캐시 - (폰트, 문자열, 색) → Surface, 오래 안 쓴 것부터 버림"""
+
+    def __init__(self, max_entries=GLYPH_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color):
+        key = (font, text, color)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = font.render(text, True, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
 class PygameGridVisualizer:
-    def __init__(self, width=1600, height=1000, symbol="BTCUSD"):
-        """Pygame 시각화 초기화"""
+    def __init__(self, width=1600, height=1000, symbol="BTCUSD", snapshots=None):
+        """Pygame 시각화 초기화 - snapshots: 봇이 게시하는 SnapshotBuffer (없으면 add_data 용으로 새로 만듦)"""
         pygame.init()
         
         self.width = width
@@ -46,17 +102,17 @@ class PygameGridVisualizer:
         self.screen = pygame.display.set_mode((width, height))
         pygame.display.set_caption(f"🚀 {symbol} Grid Trading System - Real-time Visualization")
         
-        # 폰트 설정
+        # 폰트 설정 + 글리프 캐시
         self.font_large = pygame.font.Font(None, 36)
         self.font_medium = pygame.font.Font(None, 24)
         self.font_small = pygame.font.Font(None, 18)
+        self.glyphs = GlyphCache()
         
-        # 데이터 저장
-        self.price_history = deque(maxlen=200)
-        self.profit_history = deque(maxlen=200)
-        self.timestamps = deque(maxlen=200)
+        # 데이터 저장 (히스토리는 렌더러 쪽 링 버퍼 - 게시 쪽 링보다 훨씬 길게)
+        self.history = SeriesRing(HISTORY_CAPACITY)
+        self.history_version = 0
         self.grid_levels = []
-        self.active_positions = []
+        self.active_positions = ()
         self.current_price = 0
         self.baseline_price = 0
         self.total_profit = 0
@@ -69,152 +125,202 @@ class PygameGridVisualizer:
             'levels': pygame.Rect(800, 400, 700, 250),
             'status': pygame.Rect(50, 700, 1500, 250)
         }
+        self.panel_areas = self._panel_areas()
+        self.price_axis = AxisRange()
+        self.price_view = None          # 확대/이동한 가격 축 (None 이면 자동 범위)
+        self.drag_y = None
+        self.level_index = {}           # {'buy_entry': (오름차순 가격, 레벨 번호)} - 레벨 테이블이 바뀔 때만
+        self.level_layer = pygame.Surface((1, self.chart_areas['price_chart'].height), pygame.SRCALPHA)
+        self.profit_axis = AxisRange()
+        self.profit_fill = pygame.Surface(self.chart_areas['profit_chart'].size, pygame.SRCALPHA)
+        
+        # 정적 레이어 (배경 그라데이션 + 상태 패널 테두리/안내문) - 패널을 다시 그릴 때 이 영역부터 복원
+        self.background = self.draw_background()
         
         # 애니메이션 변수
         self.animation_time = 0
         self.last_update = time.time()
+        self.pulse_step = None
+        self.status_second = None
+        
+        # 다시 그릴 패널 / 화면에 올릴 영역
+        self.dirty = set(PANELS)
+        self.dirty_rects = []
+        self.render_stats = {'frames': 0, 'repainted_px': 0, 'panel_redraws': 0}
         
-        # 데이터 큐
-        self.data_queue = queue.Queue()
+        # 스냅샷 버퍼 (마지막으로 그린 버전 이후 것만 반영)
+        self.snapshots = snapshots if snapshots is not None else SnapshotBuffer(history=200)
+        self.snapshot_version = 0
         self.running = True
         
         print("🎮 Pygame 시각화 시스템 초기화 완료!")
     
+    def _panel_areas(self):
+        """패널별 다시 그리는 영역 (제목 띠, Y축 라벨 포함 - 서로 겹치지 않음)"""
+        charts = self.chart_areas
+        screen_rect = self.screen.get_rect()
+        areas = {}
+        for key in ('price_chart', 'profit_chart'):
+            rect = charts[key]
+            areas[key] = pygame.Rect(rect.x - AXIS_MARGIN, rect.y - TITLE_HEIGHT, rect.width + AXIS_MARGIN + 2,
+                                     rect.height + TITLE_HEIGHT + 2).clip(screen_rect)
+        for key in ('positions', 'levels'):
+            rect = charts[key]
+            areas[key] = pygame.Rect(rect.x, rect.y - TITLE_HEIGHT, rect.width, rect.height + TITLE_HEIGHT)
+        status = charts['status']
+        areas['status_values'] = pygame.Rect(status.x + 5, status.y + 15, status.width - 10, 35)
+        areas['status_pulse'] = pygame.Rect(status.x + 5, status.y + 55, status.width - 10, 35)
+        return areas
+    
+    def text(self, font, text, color):
+        """글리프 캐시를 거친 font.render"""
+        return self.glyphs.render(font, text, color)
+    
     def add_data(self, price, profit, baseline, grid_levels, positions):
-        """데이터 추가"""
-        try:
-            data = {
-                'timestamp': datetime.now(),
-                'price': price,
-                'profit': profit,
-                'baseline': baseline,
-                'grid_levels': grid_levels,
-                'positions': positions
-            }
-            self.data_queue.put_nowait(data)
-        except queue.Full:
-            pass
+        """데이터 추가 - 스냅샷으로 게시 (렌더 루프가 최신 것만 가져감)"""
+        self.snapshots.publish(price=price, profit=profit, baseline=baseline,
+                               grid_levels=grid_levels, positions=positions)
     
     def update_data(self):
-        """큐에서 데이터 업데이트"""
-        updated = False
-        while not self.data_queue.empty():
-            try:
-                data = self.data_queue.get_nowait()
-                
-                self.timestamps.append(data['timestamp'])
-                self.price_history.append(data['price'])
-                self.profit_history.append(data['profit'])
-                self.current_price = data['price']
-                self.baseline_price = data['baseline']
-                self.total_profit = data['profit']
-                self.grid_levels = data['grid_levels']
-                self.active_positions = data['positions']
-                
-                updated = True
-            except queue.Empty:
-                break
-        
-        return updated
+        """최신 스냅샷 반영 - 새 버전이 없으면 False (중간 버전은 건너뜀, 히스토리는 새 행만 링 버퍼에)"""
+        snapshot = self.snapshots.latest(since=self.snapshot_version)
+        if snapshot is None:
+            return False
+        
+        self.snapshot_version = snapshot.version
+        self.history_version, rows = self.snapshots.history_since(self.history_version)
+        self.history.extend(rows)
+        self.current_price = snapshot.price
+        self.baseline_price = snapshot.baseline
+        self.total_profit = snapshot.profit
+        if snapshot.grid_levels is not self.grid_levels:
+            self.grid_levels = snapshot.grid_levels
+            self.level_index = {key: sorted_levels(self.grid_levels, key) for key, _ in LEVEL_SIDES}
+            self.dirty.add('levels')
+        self.active_positions = snapshot.positions
+        self.dirty.update(SNAPSHOT_PANELS)
+        return True
     
     def draw_background(self):
-        """배경 그리기"""
+        """정적 레이어 그리기 (그라데이션 배경 + 상태 패널 테두리/안내문) → Surface"""
+        background = pygame.Surface((self.width, self.height)).convert()
         # 그라데이션 배경
         for y in range(self.height):
             color_ratio = y / self.height
             r = int(10 + color_ratio * 20)
             g = int(10 + color_ratio * 30)
             b = int(20 + color_ratio * 40)
-            pygame.draw.line(self.screen, (r, g, b), (0, y), (self.width, y))
+            pygame.draw.line(background, (r, g, b), (0, y), (self.width, y))
+        
+        # 상태 패널 (값/펄스 줄은 따로 다시 그림)
+        rect = self.chart_areas['status']
+        self.draw_chart_border(rect, "📊 System Status", COLORS['GOLD'], surface=background)
+        info_lines = [
+            "🎮 Controls: ESC to exit, SPACE to pause, Wheel/+/- zoom, Drag/Up/Down pan, Home auto range",
+            "📈 Real-time grid trading visualization",
+            "💡 Multi-level unlimited profit system"
+        ]
+        for i, line in enumerate(info_lines):
+            info_surface = self.text(self.font_small, line, COLORS['LIGHT_GRAY'])
+            background.blit(info_surface, (rect.x + 10, rect.y + 100 + i * 20))
+        return background
     
-    def draw_chart_border(self, rect, title, color=COLORS['WHITE']):
+    def draw_chart_border(self, rect, title, color=COLORS['WHITE'], surface=None):
         """차트 테두리 및 제목 그리기"""
-        pygame.draw.rect(self.screen, color, rect, 2)
+        surface = self.screen if surface is None else surface
+        pygame.draw.rect(surface, color, rect, 2)
         
         # 제목 배경
         title_rect = pygame.Rect(rect.x, rect.y - 25, len(title) * 12, 25)
-        pygame.draw.rect(self.screen, COLORS['DARK_GRAY'], title_rect)
+        pygame.draw.rect(surface, COLORS['DARK_GRAY'], title_rect)
         
         # 제목 텍스트
-        title_surface = self.font_medium.render(title, True, color)
-        self.screen.blit(title_surface, (rect.x + 5, rect.y - 22))
+        title_surface = self.text(self.font_medium, title, color)
+        surface.blit(title_surface, (rect.x + 5, rect.y - 22))
+    
+    def draw_axis_labels(self, rect, axis, fmt):
+        """Y축 라벨 5개 (축 범위가 그대로면 글리프 캐시 적중)"""
+        for i in range(5):
+            y_pos = rect.y + (i / 4) * rect.height
+            label = self.text(self.font_small, fmt.format(axis.high - (i / 4) * axis.span), COLORS['WHITE'])
+            self.screen.blit(label, (rect.x - 4 - label.get_width(), y_pos - 8))
+    
+    def price_chart_axis(self, prices):
+        """가격 차트 축 - 확대/이동 중이면 그 범위, 아니면 데이터 자동 범위 (바뀌면 레벨 표도 다시)"""
+        if self.price_view is not None:
+            return self.price_view
+        max_price = prices.max()
+        if self.price_axis.fit(prices.min(), max_price, floor_span=max_price * 0.01):  # 변동 없으면 1% 범위
+            self.dirty.add('levels')
+        return self.price_axis
+    
+    def draw_level_bands(self, rect, axis):
+        """🎯 보이는 구간의 그리드 레벨 전부 - 픽셀 행마다 레벨 수를 세어 1개면 선, 여러 개면 진한 밀도 띠
+        
+        1픽셀 열 하나에 행별 알파를 채운 뒤 차트 폭으로 늘려 붙임 → 레벨 수와 무관하게 일정한 비용
+        """
+        for key, color in LEVEL_SIDES:
+            prices = self.level_index.get(key, (np.zeros(0),))[0]
+            counts = level_density(prices, axis, rect.height)
+            if not counts.any():
+                continue
+            alpha = np.where(counts > 0, np.minimum(LEVEL_BAND_MAX_ALPHA,
+                                                    LEVEL_LINE_ALPHA + 20 * np.log2(np.maximum(counts, 1))), 0)
+            self.level_layer.fill((*color, 0))
+            pixels = pygame.surfarray.pixels_alpha(self.level_layer)
+            pixels[0] = alpha
+            del pixels                  # 표면 잠금 해제
+            self.screen.blit(pygame.transform.scale(self.level_layer, rect.size), rect)
     
     def draw_price_chart(self):
-        """가격 차트 그리기"""
+        """가격 차트 그리기 (그리드 레벨은 보이는 구간 전체를 LOD 로)"""
         rect = self.chart_areas['price_chart']
-        self.draw_chart_border(rect, f"📈 {self.symbol} Price & Grid Levels", COLORS['CYAN'])
         
-        if len(self.price_history) < 2:
+        if len(self.history) < 2:
+            self.draw_chart_border(rect, f"📈 {self.symbol} Price & Grid Levels", COLORS['CYAN'])
             # 데이터 없음 표시
-            text = self.font_medium.render("Waiting for price data...", True, COLORS['WHITE'])
+            text = self.text(self.font_medium, "Waiting for price data...", COLORS['WHITE'])
             text_rect = text.get_rect(center=rect.center)
             self.screen.blit(text, text_rect)
             return
         
-        # 가격 범위 계산
-        prices = list(self.price_history)
-        min_price = min(prices)
-        max_price = max(prices)
-        price_range = max_price - min_price
+        # 가격 범위 (자동이면 데이터가 축 범위 안에 있는 동안 그대로 → 라벨 재사용)
+        prices = self.history.view()['price']
+        axis = self.price_chart_axis(prices)
+        zoom_mark = " 🔍" if self.price_view is not None else ""
+        self.draw_chart_border(rect, f"📈 {self.symbol} Price & Grid Levels{zoom_mark}", COLORS['CYAN'])
         
-        if price_range == 0:
-            price_range = max_price * 0.01  # 1% 범위
+        # 차트 안쪽만 그리도록 잘라냄 (확대하면 선이 차트 밖으로 나감)
+        area_clip = self.screen.get_clip()
+        self.screen.set_clip(rect.clip(area_clip))
         
-        # 여백 추가
-        margin = price_range * 0.1
-        min_price -= margin
-        max_price += margin
-        price_range = max_price - min_price
+        # 그리드 레벨 (선 / 밀도 띠)
+        if self.current_price > 0:
+            self.draw_level_bands(rect, axis)
         
-        # 가격 라인 그리기
-        points = []
-        for i, price in enumerate(prices):
-            x = rect.x + (i / (len(prices) - 1)) * rect.width
-            y = rect.y + rect.height - ((price - min_price) / price_range) * rect.height
-            points.append((x, y))
+        # 가격 라인 그리기 (픽셀 열마다 최소/최대)
+        points = polyline(prices, rect.x, rect.width, axis, rect.y, rect.height)
+        pygame.draw.lines(self.screen, COLORS['CYAN'], False, points, 3)
         
-        if len(points) > 1:
-            pygame.draw.lines(self.screen, COLORS['CYAN'], False, points, 3)
+        # 기준가 표시
+        if self.baseline_price > 0 and axis.contains(self.baseline_price):
+            baseline_y = axis.to_y(self.baseline_price, rect.y, rect.height)
+            pygame.draw.line(self.screen, COLORS['GOLD'], 
+                           (rect.x, baseline_y), (rect.x + rect.width, baseline_y), 2)
         
         # 현재가 표시
-        if self.current_price > 0:
-            current_y = rect.y + rect.height - ((self.current_price - min_price) / price_range) * rect.height
+        if self.current_price > 0 and axis.contains(self.current_price):
+            current_y = axis.to_y(self.current_price, rect.y, rect.height)
             pygame.draw.line(self.screen, COLORS['YELLOW'], 
                            (rect.x, current_y), (rect.x + rect.width, current_y), 2)
             
             # 현재가 텍스트
-            price_text = f"${self.current_price:,.0f}"
-            text_surface = self.font_small.render(price_text, True, COLORS['YELLOW'])
+            text_surface = self.text(self.font_small, f"${self.current_price:,.0f}", COLORS['YELLOW'])
             self.screen.blit(text_surface, (rect.x + rect.width - 100, current_y - 10))
-        
-        # 기준가 표시
-        if self.baseline_price > 0 and min_price <= self.baseline_price <= max_price:
-            baseline_y = rect.y + rect.height - ((self.baseline_price - min_price) / price_range) * rect.height
-            pygame.draw.line(self.screen, COLORS['GOLD'], 
-                           (rect.x, baseline_y), (rect.x + rect.width, baseline_y), 2)
-        
-        # 그리드 레벨 표시 (현재가 근처만)
-        if self.grid_levels and self.current_price > 0:
-            for level_data in self.grid_levels[:5]:  # 처음 5개 레벨만
-                # 매수 레벨
-                if min_price <= level_data['buy_entry'] <= max_price:
-                    buy_y = rect.y + rect.height - ((level_data['buy_entry'] - min_price) / price_range) * rect.height
-                    pygame.draw.line(self.screen, COLORS['GREEN'], 
-                                   (rect.x, buy_y), (rect.x + rect.width, buy_y), 1)
-                
-                # 매도 레벨
-                if min_price <= level_data['sell_entry'] <= max_price:
-                    sell_y = rect.y + rect.height - ((level_data['sell_entry'] - min_price) / price_range) * rect.height
-                    pygame.draw.line(self.screen, COLORS['RED'], 
-                                   (rect.x, sell_y), (rect.x + rect.width, sell_y), 1)
+        self.screen.set_clip(area_clip)
         
         # Y축 라벨
-        for i in range(5):
-            y_pos = rect.y + (i / 4) * rect.height
-            price_val = max_price - (i / 4) * price_range
-            label = f"${price_val:,.0f}"
-            text_surface = self.font_small.render(label, True, COLORS['WHITE'])
-            self.screen.blit(text_surface, (rect.x - 80, y_pos - 8))
+        self.draw_axis_labels(rect, axis, "${:,.0f}")
     
     def draw_profit_chart(self):
         """수익 차트 그리기"""
@@ -222,73 +328,47 @@ class PygameGridVisualizer:
         color = COLORS['GREEN'] if self.total_profit >= 0 else COLORS['RED']
         self.draw_chart_border(rect, f"💰 Profit History (${self.total_profit:+.2f})", color)
         
-        if len(self.profit_history) < 2:
-            text = self.font_medium.render("Waiting for profit data...", True, COLORS['WHITE'])
+        if len(self.history) < 2:
+            text = self.text(self.font_medium, "Waiting for profit data...", COLORS['WHITE'])
             text_rect = text.get_rect(center=rect.center)
             self.screen.blit(text, text_rect)
             return
         
-        # 수익 범위 계산
-        profits = list(self.profit_history)
-        min_profit = min(profits)
-        max_profit = max(profits)
-        profit_range = max_profit - min_profit
-        
-        if profit_range == 0:
-            profit_range = max(abs(max_profit), abs(min_profit), 100) * 0.1
-            min_profit = -profit_range / 2
-            max_profit = profit_range / 2
-        
-        # 여백 추가
-        margin = profit_range * 0.1
-        min_profit -= margin
-        max_profit += margin
-        profit_range = max_profit - min_profit
+        # 수익 범위 (변동 없으면 최소 $10 폭)
+        profits = self.history.view()['profit']
+        min_profit, max_profit = profits.min(), profits.max()
+        axis = self.profit_axis
+        axis.fit(min_profit, max_profit, floor_span=max(abs(max_profit), abs(min_profit), 100) * 0.1)
         
         # 0선 그리기
-        if min_profit <= 0 <= max_profit:
-            zero_y = rect.y + rect.height - ((0 - min_profit) / profit_range) * rect.height
+        zero_y = axis.to_y(0.0, rect.y, rect.height)
+        if axis.contains(0.0):
             pygame.draw.line(self.screen, COLORS['WHITE'], 
                            (rect.x, zero_y), (rect.x + rect.width, zero_y), 1)
         
         # 수익 라인 그리기
-        points = []
-        for i, profit in enumerate(profits):
-            x = rect.x + (i / (len(profits) - 1)) * rect.width
-            y = rect.y + rect.height - ((profit - min_profit) / profit_range) * rect.height
-            points.append((x, y))
-        
-        if len(points) > 1:
-            line_color = COLORS['GREEN'] if profits[-1] >= 0 else COLORS['RED']
-            pygame.draw.lines(self.screen, line_color, False, points, 3)
-            
-            # 영역 채우기
-            if min_profit <= 0 <= max_profit:
-                zero_y = rect.y + rect.height - ((0 - min_profit) / profit_range) * rect.height
-                fill_points = points + [(rect.x + rect.width, zero_y), (rect.x, zero_y)]
-                
-                # 반투명 색상으로 채우기
-                fill_color = (*line_color[:3], 50)  # 알파값 추가
-                fill_surface = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
-                pygame.draw.polygon(fill_surface, fill_color, 
-                                  [(p[0] - rect.x, p[1] - rect.y) for p in fill_points])
-                self.screen.blit(fill_surface, rect)
+        points = polyline(profits, rect.x, rect.width, axis, rect.y, rect.height)
+        line_color = COLORS['GREEN'] if profits[-1] >= 0 else COLORS['RED']
+        
+        # 영역 채우기 (반투명 레이어는 재사용)
+        if axis.contains(0.0):
+            fill_points = [(x - rect.x, y - rect.y) for x, y in points]
+            fill_points += [(rect.width, zero_y - rect.y), (0, zero_y - rect.y)]
+            self.profit_fill.fill((0, 0, 0, 0))
+            pygame.draw.polygon(self.profit_fill, (*line_color[:3], 50), fill_points)  # 알파값 추가
+            self.screen.blit(self.profit_fill, rect)
+        pygame.draw.lines(self.screen, line_color, False, points, 3)
         
         # Y축 라벨
-        for i in range(5):
-            y_pos = rect.y + (i / 4) * rect.height
-            profit_val = max_profit - (i / 4) * profit_range
-            label = f"${profit_val:+.0f}"
-            text_surface = self.font_small.render(label, True, COLORS['WHITE'])
-            self.screen.blit(text_surface, (rect.x - 60, y_pos - 8))
+        self.draw_axis_labels(rect, axis, "${:+.0f}")
     
     def draw_positions(self):
         """활성 포지션 표시"""
         rect = self.chart_areas['positions']
         self.draw_chart_border(rect, f"📊 Active Positions ({len(self.active_positions)})", COLORS['BLUE'])
         
-        if not self.active_positions:
-            text = self.font_medium.render("No Active Positions", True, COLORS['WHITE'])
+        if not len(self.active_positions):
+            text = self.text(self.font_medium, "No Active Positions", COLORS['WHITE'])
             text_rect = text.get_rect(center=rect.center)
             self.screen.blit(text, text_rect)
             return
@@ -304,15 +384,13 @@ class PygameGridVisualizer:
             color = COLORS['GREEN'] if buy_profit >= 0 else COLORS['RED']
             
             text = f"🔵 BUY Positions: {len(buy_positions)} | P&L: ${buy_profit:+.2f}"
-            text_surface = self.font_medium.render(text, True, color)
-            self.screen.blit(text_surface, (rect.x + 10, y_offset))
+            self.screen.blit(self.text(self.font_medium, text, color), (rect.x + 10, y_offset))
             y_offset += 30
             
             # 개별 포지션 (최대 5개)
             for i, pos in enumerate(buy_positions[:5]):
                 pos_text = f"  #{pos['ticket']} | Entry: ${pos['entry_price']:.0f} | P&L: ${pos['profit']:+.2f}"
-                pos_surface = self.font_small.render(pos_text, True, COLORS['LIGHT_GRAY'])
-                self.screen.blit(pos_surface, (rect.x + 20, y_offset))
+                self.screen.blit(self.text(self.font_small, pos_text, COLORS['LIGHT_GRAY']), (rect.x + 20, y_offset))
                 y_offset += 20
         
         # 매도 포지션
@@ -321,31 +399,42 @@ class PygameGridVisualizer:
             color = COLORS['GREEN'] if sell_profit >= 0 else COLORS['RED']
             
             text = f"🔴 SELL Positions: {len(sell_positions)} | P&L: ${sell_profit:+.2f}"
-            text_surface = self.font_medium.render(text, True, color)
-            self.screen.blit(text_surface, (rect.x + 10, y_offset))
+            self.screen.blit(self.text(self.font_medium, text, color), (rect.x + 10, y_offset))
             y_offset += 30
             
             # 개별 포지션 (최대 5개)
             for i, pos in enumerate(sell_positions[:5]):
                 pos_text = f"  #{pos['ticket']} | Entry: ${pos['entry_price']:.0f} | P&L: ${pos['profit']:+.2f}"
-                pos_surface = self.font_small.render(pos_text, True, COLORS['LIGHT_GRAY'])
-                self.screen.blit(pos_surface, (rect.x + 20, y_offset))
+                self.screen.blit(self.text(self.font_small, pos_text, COLORS['LIGHT_GRAY']), (rect.x + 20, y_offset))
                 y_offset += 20
     
     def draw_grid_levels(self):
-        """그리드 레벨 정보 표시"""
+        """그리드 레벨 정보 표시 - 가격 차트에 보이는 구간의 레벨 중 기준가에 가까운 순으로"""
         rect = self.chart_areas['levels']
         self.draw_chart_border(rect, "🎯 Grid Levels", COLORS['PURPLE'])
         
-        if not self.grid_levels:
-            text = self.font_medium.render("No Grid Levels", True, COLORS['WHITE'])
+        if not len(self.grid_levels):
+            text = self.text(self.font_medium, "No Grid Levels", COLORS['WHITE'])
             text_rect = text.get_rect(center=rect.center)
             self.screen.blit(text, text_rect)
             return
         
-        # 그리드 레벨 정보 (처음 8개만)
-        y_offset = rect.y + 20
-        for i, level in enumerate(self.grid_levels[:8]):
+        # 보이는 레벨 번호 (매수/매도 중 하나라도 구간 안) - 차트가 아직 없으면 앞쪽 레벨
+        axis = self.price_view or (self.price_axis if self.price_axis.span > 0 else None)
+        if axis is not None:
+            buy_prices, buy_order = self.level_index['buy_entry']
+            sell_prices, sell_order = self.level_index['sell_entry']
+            visible = np.union1d(buy_order[visible_slice(buy_prices, axis)],
+                                 sell_order[visible_slice(sell_prices, axis)])
+        else:
+            visible = np.arange(len(self.grid_levels))
+        
+        header = f"In view: {len(visible)} / {len(self.grid_levels)} levels"
+        self.screen.blit(self.text(self.font_small, header, COLORS['LIGHT_GRAY']), (rect.x + 10, rect.y + 10))
+        
+        y_offset = rect.y + 35
+        for i in visible[:LEVEL_TABLE_ROWS].tolist():
+            level = self.grid_levels[i]
             level_text = f"L{i+1} {level['name']}: Buy ${level['buy_entry']:.0f} | Sell ${level['sell_entry']:.0f}"
             
             # 레벨별 색상
@@ -356,88 +445,166 @@ class PygameGridVisualizer:
             else:
                 color = COLORS['ORANGE']  # 장기
             
-            level_surface = self.font_small.render(level_text, True, color)
-            self.screen.blit(level_surface, (rect.x + 10, y_offset))
+            self.screen.blit(self.text(self.font_small, level_text, color), (rect.x + 10, y_offset))
             y_offset += 25
     
-    def draw_status_bar(self):
-        """상태 바 그리기"""
+    def draw_status_values(self):
+        """상태 바 값 줄 (시각 / 현재가 / 기준가 / 총 손익 / 포지션 수)"""
         rect = self.chart_areas['status']
-        self.draw_chart_border(rect, "📊 System Status", COLORS['GOLD'])
         
         # 현재 시간
         current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        time_text = f"🕐 {current_time}"
-        time_surface = self.font_medium.render(time_text, True, COLORS['WHITE'])
-        self.screen.blit(time_surface, (rect.x + 10, rect.y + 20))
+        self.screen.blit(self.text(self.font_medium, f"🕐 {current_time}", COLORS['WHITE']), (rect.x + 10, rect.y + 20))
         
         # 현재가 정보
         if self.current_price > 0:
             price_text = f"💰 BTC: ${self.current_price:,.2f}"
-            price_surface = self.font_medium.render(price_text, True, COLORS['CYAN'])
-            self.screen.blit(price_surface, (rect.x + 300, rect.y + 20))
+            self.screen.blit(self.text(self.font_medium, price_text, COLORS['CYAN']), (rect.x + 300, rect.y + 20))
         
         # 기준가 정보
         if self.baseline_price > 0:
             baseline_text = f"🎯 Baseline: ${self.baseline_price:,.2f}"
-            baseline_surface = self.font_medium.render(baseline_text, True, COLORS['GOLD'])
-            self.screen.blit(baseline_surface, (rect.x + 600, rect.y + 20))
+            self.screen.blit(self.text(self.font_medium, baseline_text, COLORS['GOLD']), (rect.x + 600, rect.y + 20))
         
         # 총 수익
         profit_color = COLORS['GREEN'] if self.total_profit >= 0 else COLORS['RED']
         profit_text = f"💎 Total P&L: ${self.total_profit:+.2f}"
-        profit_surface = self.font_medium.render(profit_text, True, profit_color)
-        self.screen.blit(profit_surface, (rect.x + 900, rect.y + 20))
+        self.screen.blit(self.text(self.font_medium, profit_text, profit_color), (rect.x + 900, rect.y + 20))
         
         # 포지션 수
         pos_text = f"📊 Positions: {len(self.active_positions)}"
-        pos_surface = self.font_medium.render(pos_text, True, COLORS['BLUE'])
-        self.screen.blit(pos_surface, (rect.x + 1200, rect.y + 20))
-        
-        # 애니메이션 효과 (펄스)
-        pulse = abs(math.sin(self.animation_time * 2)) * 0.3 + 0.7
+        self.screen.blit(self.text(self.font_medium, pos_text, COLORS['BLUE']), (rect.x + 1200, rect.y + 20))
+    
+    def draw_status_pulse(self):
+        """상태 바 펄스 글자 (밝기 PULSE_STEPS 단계 - 단계마다 글리프 캐시 한 장)"""
+        rect = self.chart_areas['status']
+        pulse = self.pulse_step / PULSE_STEPS * 0.3 + 0.7
         pulse_color = (int(COLORS['GOLD'][0] * pulse), 
                       int(COLORS['GOLD'][1] * pulse), 
                       int(COLORS['GOLD'][2] * pulse))
-        
-        status_text = "🚀 GRID SYSTEM ACTIVE"
-        status_surface = self.font_large.render(status_text, True, pulse_color)
-        self.screen.blit(status_surface, (rect.x + 10, rect.y + 60))
-        
-        # 시스템 정보
-        info_lines = [
-            "🎮 Controls: ESC to exit, SPACE to pause",
-            "📈 Real-time grid trading visualization",
-            "💡 Multi-level unlimited profit system"
-        ]
-        
-        for i, line in enumerate(info_lines):
-            info_surface = self.font_small.render(line, True, COLORS['LIGHT_GRAY'])
-            self.screen.blit(info_surface, (rect.x + 10, rect.y + 100 + i * 20))
+        self.screen.blit(self.text(self.font_large, "🚀 GRID SYSTEM ACTIVE", pulse_color), (rect.x + 10, rect.y + 60))
+    
+    def draw_status_bar(self):
+        """상태 바 그리기 (정적 부분은 배경 레이어에 있음)"""
+        self.draw_status_values()
+        self.draw_status_pulse()
+    
+    def mark_time_dirty(self):
+        """시간에 따라 바뀌는 부분 표시 - 시계는 초가 바뀔 때, 펄스는 밝기 단계가 바뀔 때만"""
+        second = int(time.time())
+        if second != self.status_second:
+            self.status_second = second
+            self.dirty.add('status_values')
+        
+        pulse_step = int(abs(math.sin(self.animation_time * 2)) * PULSE_STEPS)
+        if pulse_step != self.pulse_step:
+            self.pulse_step = pulse_step
+            self.dirty.add('status_pulse')
+    
+    def invalidate(self):
+        """전체 다시 그리기 (창이 가려졌다 다시 보일 때 등)"""
+        self.screen.blit(self.background, (0, 0))
+        self.dirty.update(PANELS)
+        self.dirty_rects.append(self.screen.get_rect())
+    
+    def render_dirty(self):
+        """바뀐 패널만 정적 레이어로 지우고 다시 그림 → dirty rect 목록에 추가"""
+        painters = {
+            'price_chart': self.draw_price_chart,
+            'profit_chart': self.draw_profit_chart,
+            'positions': self.draw_positions,
+            'levels': self.draw_grid_levels,
+            'status_values': self.draw_status_values,
+            'status_pulse': self.draw_status_pulse,
+        }
+        for key in PANELS:
+            if key not in self.dirty:
+                continue
+            area = self.panel_areas[key]
+            self.screen.set_clip(area)
+            self.screen.blit(self.background, area, area)
+            painters[key]()
+            self.screen.set_clip(None)
+            self.dirty_rects.append(area)
+            self.render_stats['panel_redraws'] += 1
+        self.dirty.clear()
+    
+    def zoom_price(self, factor, anchor_y=None):
+        """🔍 가격 축 확대/축소 (anchor_y: 고정할 화면 y, 없으면 가운데)"""
+        rect = self.chart_areas['price_chart']
+        if self.price_view is None:
+            if self.price_axis.span <= 0:
+                return
+            self.price_view = self.price_axis.copy()
+        anchor = None if anchor_y is None else self.price_view.from_y(anchor_y, rect.y, rect.height)
+        self.price_view.zoom(factor, anchor)
+        self.dirty.update(('price_chart', 'levels'))
+    
+    def pan_price(self, pixels):
+        """↕️ 가격 축 이동 (화면 픽셀 단위, 아래로 끌면 +)"""
+        if self.price_view is None:
+            if self.price_axis.span <= 0:
+                return
+            self.price_view = self.price_axis.copy()
+        rect = self.chart_areas['price_chart']
+        self.price_view.pan(pixels / rect.height * self.price_view.span)
+        self.dirty.update(('price_chart', 'levels'))
+    
+    def reset_price_view(self):
+        """자동 범위로 복귀"""
+        self.price_view = None
+        self.dirty.update(('price_chart', 'levels'))
     
     def handle_events(self):
         """이벤트 처리"""
+        price_rect = self.chart_areas['price_chart']
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 return False
+            elif event.type == pygame.VIDEOEXPOSE:
+                self.invalidate()
+            elif event.type == pygame.MOUSEWHEEL:
+                mouse_x, mouse_y = pygame.mouse.get_pos()
+                if price_rect.collidepoint(mouse_x, mouse_y) and event.y:
+                    self.zoom_price(ZOOM_STEP ** event.y, anchor_y=mouse_y)
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and price_rect.collidepoint(event.pos):
+                self.drag_y = event.pos[1]
+            elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+                self.drag_y = None
+            elif event.type == pygame.MOUSEMOTION and self.drag_y is not None:
+                self.pan_price(event.pos[1] - self.drag_y)
+                self.drag_y = event.pos[1]
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     return False
                 elif event.key == pygame.K_SPACE:
                     # 일시정지 기능 (향후 구현)
                     pass
+                elif event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+                    self.zoom_price(ZOOM_STEP)
+                elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                    self.zoom_price(1 / ZOOM_STEP)
+                elif event.key == pygame.K_UP:
+                    self.pan_price(price_rect.height * PAN_STEP)
+                elif event.key == pygame.K_DOWN:
+                    self.pan_price(-price_rect.height * PAN_STEP)
+                elif event.key == pygame.K_HOME:
+                    self.reset_price_view()
         
         return True
     
     def run(self):
-        """메인 실행 루프"""
+        """메인 실행 루프 - 바뀐 영역만 다시 그려서 올림"""
         clock = pygame.time.Clock()
         
         print("🎮 Pygame 시각화 시작!")
         print("🎮 Controls:")
         print("  - ESC: 종료")
         print("  - SPACE: 일시정지 (향후 구현)")
+        print("  - 마우스 휠 / + -: 가격 축 확대·축소, 드래그 / ↑ ↓: 이동, Home: 자동 범위")
         
+        self.invalidate()
+        screen_px = self.width * self.height
         while self.running:
             # 이벤트 처리
             if not self.handle_events():
@@ -450,21 +617,22 @@ class PygameGridVisualizer:
             current_time = time.time()
             self.animation_time += current_time - self.last_update
             self.last_update = current_time
+            self.mark_time_dirty()
             
-            # 화면 그리기
-            self.draw_background()
-            self.draw_price_chart()
-            self.draw_profit_chart()
-            self.draw_positions()
-            self.draw_grid_levels()
-            self.draw_status_bar()
-            
-            # 화면 업데이트
-            pygame.display.flip()
-            clock.tick(30)  # 30 FPS
+            # 바뀐 영역만 그리고 올림
+            self.render_dirty()
+            if self.dirty_rects:
+                pygame.display.update(self.dirty_rects)
+                self.render_stats['repainted_px'] += sum(r.width * r.height for r in self.dirty_rects)
+                self.dirty_rects = []
+            self.render_stats['frames'] += 1
+            clock.tick(TARGET_FPS)
         
         pygame.quit()
-        print("🎮 Pygame 시각화 종료")
+        frames = max(self.render_stats['frames'], 1)
+        print(f"🎮 Pygame 시각화 종료 | {frames}프레임 | "
+              f"프레임당 다시 그린 영역 {self.render_stats['repainted_px'] / frames / screen_px * 100:.1f}% | "
+              f"글리프 캐시 적중 {self.glyphs.hit_rate * 100:.0f}%")
 
 # 테스트용 함수
 def test_visualizer():
@@ -19,6 +19,7 @@
 - 💰 수익 현황 그래프
 - 📊 포지션 상태 표시
 - 🔥 목표 달성 알림
+- 🖼️ 렌더러는 별도 프로세스에서 실행 (공유 메모리 스냅샷, 거래 루프와 GIL 을 나누지 않음)
 """
 
 import MetaTrader5 as mt5
@@ -33,32 +34,29 @@ import time
 from datetime import datetime, timedelta
 import json
 import os
+import importlib.util
 from collections import defaultdict, deque
 import warnings
 warnings.filterwarnings('ignore')
 
-# 시각화 라이브러리
-import matplotlib.pyplot as plt
-import matplotlib.animation as animation
-from matplotlib.patches import Rectangle
-import seaborn as sns
-import threading
-import queue
+from Grid_Levels import GridLevels, plan_rebalance
+from Order_Tracker import OrderTracker
+from Bulk_Order_Engine import BulkOrderPlacer, STATUS_PLACED, print_placement_report
+from Market_Snapshot import MarketSnapshot, TRADE_KEYS
+from Position_Book import evaluate, position_pnl
+from Viz_Snapshot import SnapshotBuffer, SharedSnapshotBuffer, position_rows, level_stat_rows
+from Viz_Process import start_visualizer_process
+from Deadline_Scheduler import DeadlineScheduler, print_schedule_report
+from Exit_Watcher import ExitWatcher
 
-# Pygame 시각화 (선택적)
-try:
-    from Grid_Pygame_Visualizer import PygameGridVisualizer
+# Pygame 시각화 (선택적) - 렌더러 프로세스에서만 불러오므로 여기서는 설치 여부만 확인
+if importlib.util.find_spec('pygame') is not None:
     PYGAME_AVAILABLE = True
     print("🎮 Pygame 시각화 사용 가능!")
-except ImportError:
+else:
     PYGAME_AVAILABLE = False
     print("📊 Matplotlib 시각화 사용 (pygame 설치 오류로 인해 비활성화)")
 
-# 한글 폰트 설정
-plt.rcParams['font.family'] = ['Malgun Gothic', 'DejaVu Sans']
-plt.rcParams['axes.unicode_minus'] = False
-plt.rcParams['font.size'] = 10
-
 class GridRevolutionaryBot:
     def __init__(self):
         self.config = {
@@ -108,26 +106,28 @@ class GridRevolutionaryBot:
             'aggressive_entry': True,            # 공격적 진입
             'price_chase': True,                 # 가격 추적 시스템
             'instant_execution': True,           # 즉시 체결 우선
-            
-            'unlimited_grid_levels': [
-                # 🔥 초밀집 그리드 (0.001% 간격으로 천문학적 수익!)
-                # 현재가 기준 위아래로 0.001%씩 1000개 레벨 배치
-            ] + [
-                # 동적으로 생성되는 초밀집 레벨들
-                {'name': f'초밀집{i:04d}', 'distance_pct': 0.00001 * i, 'lot_multiplier': 0.01 + (i * 0.001)}
-                for i in range(1, 10001)  # 10,000개 레벨!
-            ] + [
-                # 기존 무제한 레벨들 (백업용)
-                {'name': '무제한1', 'distance_pct': 1.0, 'lot_multiplier': 100.0},
-                {'name': '무제한2', 'distance_pct': 2.0, 'lot_multiplier': 200.0},
-                {'name': '무제한3', 'distance_pct': 5.0, 'lot_multiplier': 500.0},
-                {'name': '극한무제한', 'distance_pct': 10.0, 'lot_multiplier': 1000.0},
-            ]
+            'incremental_recenter': True,        # 🔁 기준가 이동시 바뀐 주문만 취소/수정/추가 (포지션 유지)
+            'market_exits': False,               # 🎯 True 면 시장가 그리드 청산을 LIMIT 대신 청산 감시 엔진으로 (Market 청산, 선택)
+            'market_exit_timeout': 30,           # 목표가 미도달시 강제 청산까지 (초)
+            
+            # 🔥 초밀집 그리드 (0.001% 간격 10,000개 레벨 - 배열 테이블로 한 번에 생성)
+            'unlimited_grid_levels': GridLevels.schedule(
+                10000, step_pct=0.00001, base_multiplier=0.01, multiplier_step=0.001,
+                name_format='초밀집{:04d}',
+                extra=[
+                    # 기존 무제한 레벨들 (백업용)
+                    {'name': '무제한1', 'distance_pct': 1.0, 'lot_multiplier': 100.0},
+                    {'name': '무제한2', 'distance_pct': 2.0, 'lot_multiplier': 200.0},
+                    {'name': '무제한3', 'distance_pct': 5.0, 'lot_multiplier': 500.0},
+                    {'name': '극한무제한', 'distance_pct': 10.0, 'lot_multiplier': 1000.0},
+                ],
+            ),
         }
         
         self.grid_positions = {
             'buy_orders': {},   # {level: order_info}
             'sell_orders': {},  # {level: order_info}
+            'detached_orders': {},  # {ticket: order_info} - 재배치 취소/수정 실패로 레벨 맵에서 빠진 주문 (예전 레벨 그대로)
             'active_positions': {},
             'completed_trades': [],
             'hedge_positions': {},      # 헤징 포지션
@@ -135,6 +135,21 @@ class GridRevolutionaryBot:
             'scalp_positions': {}       # 스캘핑 포지션
         }
         
+        # 주문 추적 인덱스 (ticket 키) - 모든 모니터링 루틴이 공유
+        self.order_tracker = OrderTracker()
+        
+        # 벌크 주문 배치 엔진 (심볼은 배치 직전에 현재 설정으로 맞춤)
+        self.order_placer = BulkOrderPlacer(self.config['symbol'], self.config['magic_number'], deviation=100)
+        
+        # 루프별 시장 스냅샷 (포지션/주문/틱/계좌 조회를 루프당 1회로)
+        self.market = MarketSnapshot(self.config['symbol'])
+        
+        # 주기 작업 스케줄러 (time.time() % N 트리거 대체 - run_grid_system 에서 작업 등록)
+        self.scheduler = DeadlineScheduler(clock=time)
+        
+        # 시장가 청산 감시 엔진 (포지션별 스레드 대신 목표가 힙 - 틱마다 발동분만 배치 청산)
+        self.exit_watcher = ExitWatcher(default_timeout=self.config['market_exit_timeout'])
+        
         self.stats = {
             'total_profit': 0.0,
             'total_trades': 0,
@@ -155,22 +170,17 @@ class GridRevolutionaryBot:
         
         # 시각화 데이터
         self.visualization_data = {
-            'price_history': deque(maxlen=200),      # 가격 히스토리
-            'profit_history': deque(maxlen=200),     # 수익 히스토리
-            'timestamps': deque(maxlen=200),         # 시간 히스토리
-            'grid_levels': [],                       # 현재 그리드 레벨
-            'active_positions': [],                  # 활성 포지션
+            'grid_levels': GridLevels({}),           # 현재 그리드 레벨 (읽기 전용 배열 테이블)
+            'active_positions': (),                  # 활성 포지션 (게시된 읽기 전용 행 배열)
             'completed_trades': [],                  # 완료된 거래
             'level_profits': defaultdict(list)      # 레벨별 수익
         }
         
-        # 시각화 큐 (스레드 간 통신)
-        self.viz_queue = queue.Queue()
-        self.viz_running = False
+        # 시각화 스냅샷 (가격/수익 히스토리 200개 링 버퍼 포함) - 시각화를 켜면 공유 메모리 버퍼로 교체
+        self.viz_snapshots = SnapshotBuffer(history=200)
         
-        # Pygame 시각화 (선택적)
-        self.pygame_viz = None
-        self.pygame_thread = None
+        # 렌더러 프로세스 (Matplotlib / Pygame)
+        self.viz_processes = []
         
         print("🔥 무제한 양방향 그리드 시스템 + 실시간 시각화 초기화 완료!")
         print(f"📊 그리드 레벨: {len(self.config['unlimited_grid_levels'])}개")
@@ -183,11 +193,14 @@ class GridRevolutionaryBot:
         print("  � 무제한: 100% ~ 800% (극한 수익)")
         print("  � 극한무제한: BTC 9배 상승 또는 1/9 폭락까지 대응!")
         
-        print(f"\n🎯 총 {len(self.config['unlimited_grid_levels'])}개 레벨로 촘촘한 그리드 형성:")
-        for i, level in enumerate(self.config['unlimited_grid_levels']):
-            if i < 4 or level['distance_pct'] >= 1.0:  # 처음 4개와 무제한 레벨만 표시
-                print(f"     🔥 L{i+1:2d} {level['name']:8s}: ±{level['distance_pct']*100:5.1f}% (거래량: {level['lot_multiplier']:4.1f}x)")
-            elif i == 4:
+        levels = self.config['unlimited_grid_levels']
+        print(f"\n🎯 총 {len(levels)}개 레벨로 촘촘한 그리드 형성:")
+        # 처음 4개와 무제한 레벨만 표시
+        shown = np.union1d(np.arange(min(4, len(levels))), np.flatnonzero(levels.distance_pct >= 1.0))
+        for i in shown:
+            level = levels[i]
+            print(f"     🔥 L{i+1:2d} {level['name']:8s}: ±{level['distance_pct']*100:5.1f}% (거래량: {level['lot_multiplier']:4.1f}x)")
+            if i == 3:
                 print("     ... (중간 레벨들)")
         
         print(f"\n💡 예상 동시 주문 수: 최대 {len(self.config['unlimited_grid_levels']) * 2}개 (매수 + 매도)")
@@ -421,9 +434,7 @@ class GridRevolutionaryBot:
     
     def calculate_unlimited_grid_levels(self, baseline_price):
         """🚀 즉시 수익 초고속 그리드 시스템 (실행하자마자 수익!)"""
-        grid_data = []
-        
-        print(f"\n� 즉시 수익 그리드 계산 (현재가: ${baseline_price:,..2f})")
+        print(f"\n� 즉시 수익 그리드 계산 (현재가: ${baseline_price:,.2f})")
         print("="*80)
         print("� 실행하자마자 즉시 수익! 대기시간 ZERO!")
         
@@ -454,50 +465,20 @@ class GridRevolutionaryBot:
         print(f"📊 총 주문 수: {max_levels * 2}개 (매수 {max_levels}개 + 매도 {max_levels}개)")
         print("🚀 현재가 바로 위아래에 촘촘하게 배치 → 즉시 수익!")
         
-        total_potential_profit = 0
-        
-        # 현재가 중심으로 위아래 촘촘하게 배치
-        for i in range(1, max_levels + 1):
-            distance_pct = grid_distance * i
-            lot_size = self.config['base_lot_size'] * (1 + i * 0.01)  # 레벨별 거래량 증가
-            
-            # 거리 계산
-            distance = baseline_price * distance_pct
-            
-            # 🔥 핵심: 현재가 바로 위아래에 배치 (즉시 수익!)
-            buy_entry = baseline_price - distance    # 현재가 아래
-            sell_entry = baseline_price + distance   # 현재가 위
-            
-            # 즉시 수익 목표 (매우 작은 움직임으로도 수익!)
-            buy_profit_target = buy_entry + (distance * 0.5)  # 절반만 회복해도 수익!
-            sell_profit_target = sell_entry - (distance * 0.5)  # 절반만 회복해도 수익!
-            
-            # 예상 수익 계산
-            profit_per_trade = distance * 0.5 * lot_size
-            
-            level_data = {
-                'level': i - 1,
-                'name': f'즉시{i:03d}',
-                'distance_pct': distance_pct,
-                'distance': distance,
-                'lot_size': lot_size,
-                'buy_entry': buy_entry,
-                'buy_target': buy_profit_target,
-                'sell_entry': sell_entry,
-                'sell_target': sell_profit_target,
-                'profit_per_trade': profit_per_trade
-            }
-            
-            grid_data.append(level_data)
-            total_potential_profit += profit_per_trade * 2  # 매수+매도
-            
-            # 처음 5개와 마지막 5개만 출력
-            if i <= 5 or i > max_levels - 5:
-                print(f"레벨 {i:3d}: 즉시{i:03d} (±{distance_pct*100:.3f}%)")
-                print(f"  💰 거래량: {lot_size:.3f}")
-                print(f"  🔵 매수: ${buy_entry:.2f} → ${buy_profit_target:.2f} (수익: ${profit_per_trade:.2f})")
-                print(f"  🔴 매도: ${sell_entry:.2f} → ${sell_profit_target:.2f} (수익: ${profit_per_trade:.2f})")
-            elif i == 6:
+        # 현재가 중심으로 위아래 촘촘하게 배치 (전 레벨 한 번에 벡터 계산)
+        # 🔥 핵심: 현재가 바로 위아래에 배치, 절반만 회복해도 수익!
+        grid_data = GridLevels.build(baseline_price, grid_distance, max_levels,
+                                     self.config['base_lot_size'], target_ratio=0.5)
+        total_potential_profit = float(grid_data.profit_per_trade.sum()) * 2  # 매수+매도
+        
+        # 처음 5개와 마지막 5개만 출력
+        for i in np.union1d(np.arange(min(5, max_levels)), np.arange(max(5, max_levels - 5), max_levels)):
+            level_data = grid_data[i]
+            print(f"레벨 {i+1:3d}: {level_data['name']} (±{level_data['distance_pct']*100:.3f}%)")
+            print(f"  💰 거래량: {level_data['lot_size']:.3f}")
+            print(f"  🔵 매수: ${level_data['buy_entry']:.2f} → ${level_data['buy_target']:.2f} (수익: ${level_data['profit_per_trade']:.2f})")
+            print(f"  🔴 매도: ${level_data['sell_entry']:.2f} → ${level_data['sell_target']:.2f} (수익: ${level_data['profit_per_trade']:.2f})")
+            if i == 4 and max_levels > 10:
                 print("  ... (중간 레벨들) ...")
         
         print(f"\n💎 총 잠재 수익: ${total_potential_profit:,.2f}")
@@ -508,282 +489,55 @@ class GridRevolutionaryBot:
         return grid_data
     
     def update_visualization_data(self):
-        """🎨 시각화 데이터 업데이트"""
-        current_price = self.get_current_price()
+        """🎨 시각화 데이터 업데이트 (모니터링 루프의 스냅샷 재사용)"""
+        current_price = self.market.price()
         if not current_price:
             return
         
-        current_time = datetime.now()
-        
-        # 가격 및 시간 데이터 추가
-        self.visualization_data['price_history'].append(current_price['mid'])
-        self.visualization_data['timestamps'].append(current_time)
-        
-        # 계좌 수익 데이터 추가
-        account_info = mt5.account_info()
-        if account_info:
-            profit = account_info.equity - account_info.balance
-            self.visualization_data['profit_history'].append(profit)
-        else:
-            self.visualization_data['profit_history'].append(0)
-        
-        # 활성 포지션 데이터 업데이트
-        positions = mt5.positions_get(symbol=self.config['symbol'])
-        self.visualization_data['active_positions'] = []
-        
-        if positions:
-            for pos in positions:
-                position_data = {
-                    'ticket': pos.ticket,
-                    'type': 'BUY' if pos.type == mt5.ORDER_TYPE_BUY else 'SELL',
-                    'entry_price': pos.price_open,
-                    'current_price': current_price['bid'] if pos.type == mt5.ORDER_TYPE_BUY else current_price['ask'],
-                    'volume': pos.volume,
-                    'profit': (current_price['bid'] - pos.price_open) * pos.volume if pos.type == mt5.ORDER_TYPE_BUY 
-                             else (pos.price_open - current_price['ask']) * pos.volume,
-                    'tp': pos.tp,
-                    'sl': pos.sl
-                }
-                self.visualization_data['active_positions'].append(position_data)
-        
-        # 시각화 큐에 데이터 전송
-        try:
-            viz_data = {
-                'timestamp': current_time,
-                'price': current_price['mid'],
-                'baseline': self.current_baseline,
-                'grid_levels': self.visualization_data['grid_levels'].copy(),
-                'positions': self.visualization_data['active_positions'].copy(),
-                'total_profit': self.visualization_data['profit_history'][-1] if self.visualization_data['profit_history'] else 0
-            }
-            self.viz_queue.put_nowait(viz_data)
-            
-            # Pygame 시각화에도 데이터 전송
-            if self.pygame_viz:
-                self.pygame_viz.add_data(
-                    current_price['mid'],
-                    self.visualization_data['profit_history'][-1] if self.visualization_data['profit_history'] else 0,
-                    self.current_baseline,
-                    self.visualization_data['grid_levels'].copy(),
-                    self.visualization_data['active_positions'].copy()
-                )
-        except queue.Full:
-            pass  # 큐가 가득 찬 경우 무시
+        # 계좌 수익
+        account_info = self.market.account()
+        profit = account_info.equity - account_info.balance if account_info else 0
+        
+        # 활성 포지션 (손익은 전체 포지션 한 번에 계산, 게시 후에는 바꾸지 않는 읽기 전용 행 배열)
+        book = self.market.position_book()
+        ev = evaluate(book, current_price['bid'], current_price['ask'])
+        self.visualization_data['active_positions'] = position_rows(book, ev)
+        
+        # 스냅샷 게시 - matplotlib / Pygame 렌더러가 최신 버전만 읽어감 (큐/복사 없음)
+        self.viz_snapshots.publish(
+            price=current_price['mid'],
+            profit=profit,
+            baseline=self.current_baseline,
+            grid_levels=self.visualization_data['grid_levels'],   # 읽기 전용 - 복사 불필요
+            positions=self.visualization_data['active_positions'],
+            level_stats=level_stat_rows(self.stats['level_stats']),
+        )
+    
+    def shared_viz_snapshots(self):
+        """📡 렌더러 프로세스와 나눌 공유 메모리 스냅샷 버퍼 (처음 시각화를 켤 때 만듦)"""
+        if not isinstance(self.viz_snapshots, SharedSnapshotBuffer):
+            self.viz_snapshots = SharedSnapshotBuffer(history=200)
+        return self.viz_snapshots
     
     def start_visualization(self):
-        """🎨 실시간 시각화 시작"""
-        def run_visualization():
-            try:
-                import matplotlib
-                matplotlib.use('TkAgg')  # GUI 백엔드 설정
-                
-                # 그래프 설정
-                plt.style.use('dark_background')
-                fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
-                fig.suptitle(f'🚀 Revolutionary Unlimited Grid Trading System - {self.config["symbol"]} 🚀', fontsize=16, color='gold')
-                
-                # 데이터 저장용
-                times = []
-                prices = []
-                profits = []
-                
-                def animate(frame):
-                    try:
-                        # 큐에서 데이터 가져오기
-                        data_updated = False
-                        while not self.viz_queue.empty():
-                            try:
-                                data = self.viz_queue.get_nowait()
-                                
-                                times.append(data['timestamp'])
-                                prices.append(data['price'])
-                                profits.append(data['total_profit'])
-                                data_updated = True
-                                
-                                # 최근 100개 데이터만 유지
-                                if len(times) > 100:
-                                    times.pop(0)
-                                    prices.pop(0)
-                                    profits.pop(0)
-                            except queue.Empty:
-                                break
-                        
-                        if len(times) < 2:
-                            return
-                        
-                        # 1. 가격 차트 + 그리드 레벨
-                        ax1.clear()
-                        ax1.plot(times, prices, 'cyan', linewidth=2, label=f'{self.config["symbol"]} Price')
-                        
-                        # 기준선 표시
-                        if hasattr(self, 'current_baseline') and self.current_baseline > 0:
-                            ax1.axhline(y=self.current_baseline, color='yellow', linestyle='--', alpha=0.8, label='Baseline')
-                        
-                        # 그리드 레벨 표시 (최근 가격 기준으로 일부만)
-                        if len(self.visualization_data['grid_levels']) > 0 and len(prices) > 0:
-                            current_price = prices[-1]
-                            for i, level_data in enumerate(self.visualization_data['grid_levels']):
-                                # 현재가 근처 레벨만 표시 (±20% 범위)
-                                if abs(level_data['buy_entry'] - current_price) / current_price < 0.2:
-                                    ax1.axhline(y=level_data['buy_entry'], color='lime', alpha=0.4, linestyle='-', linewidth=1)
-                                if abs(level_data['sell_entry'] - current_price) / current_price < 0.2:
-                                    ax1.axhline(y=level_data['sell_entry'], color='red', alpha=0.4, linestyle='-', linewidth=1)
-                        
-                        ax1.set_title('� BTC Price &, Grid Levels', color='white')
-                        ax1.set_ylabel('Price ($)', color='white')
-                        ax1.legend()
-                        ax1.grid(True, alpha=0.3)
-                        ax1.tick_params(axis='x', rotation=45)
-                        
-                        # 2. 수익 차트
-                        ax2.clear()
-                        if len(profits) > 0:
-                            ax2.plot(times, profits, 'gold', linewidth=2, label='Total Profit')
-                            ax2.axhline(y=0, color='white', linestyle='-', alpha=0.5)
-                            
-                            # 수익/손실에 따른 색상 채우기
-                            positive_profits = [max(0, p) for p in profits]
-                            negative_profits = [min(0, p) for p in profits]
-                            
-                            ax2.fill_between(times, positive_profits, 0, alpha=0.3, color='lime', label='Profit')
-                            ax2.fill_between(times, negative_profits, 0, alpha=0.3, color='red', label='Loss')
-                            
-                            ax2.set_title(f'� Profit History (${profits[-1]:+.2f})', color='white')
-                        else:
-                            ax2.set_title('💰 Profit History ($0.00)', color='white')
-                        
-                        ax2.set_ylabel('Profit ($)', color='white')
-                        ax2.legend()
-                        ax2.grid(True, alpha=0.3)
-                        ax2.tick_params(axis='x', rotation=45)
-                        
-                        # 3. 활성 포지션 현황
-                        ax3.clear()
-                        if self.visualization_data['active_positions']:
-                            buy_positions = [p for p in self.visualization_data['active_positions'] if p['type'] == 'BUY']
-                            sell_positions = [p for p in self.visualization_data['active_positions'] if p['type'] == 'SELL']
-                            
-                            position_types = []
-                            position_profits = []
-                            colors = []
-                            
-                            if buy_positions:
-                                buy_profit = sum(p['profit'] for p in buy_positions)
-                                position_types.append(f'BUY ({len(buy_positions)})')
-                                position_profits.append(buy_profit)
-                                colors.append('lime' if buy_profit >= 0 else 'red')
-                            
-                            if sell_positions:
-                                sell_profit = sum(p['profit'] for p in sell_positions)
-                                position_types.append(f'SELL ({len(sell_positions)})')
-                                position_profits.append(sell_profit)
-                                colors.append('lime' if sell_profit >= 0 else 'red')
-                            
-                            if position_types:
-                                bars = ax3.bar(position_types, position_profits, color=colors, alpha=0.7)
-                                
-                                # 수익 값 표시
-                                for bar, profit in zip(bars, position_profits):
-                                    height = bar.get_height()
-                                    ax3.text(bar.get_x() + bar.get_width()/2., height,
-                                            f'${profit:.1f}', ha='center', va='bottom' if height >= 0 else 'top',
-                                            color='white', fontsize=10)
-                            
-                            ax3.set_title(f'📊 Active Positions ({len(self.visualization_data["active_positions"])})', color='white')
-                        else:
-                            ax3.text(0.5, 0.5, 'No Active Positions', ha='center', va='center', 
-                                    transform=ax3.transAxes, color='white', fontsize=12)
-                            ax3.set_title('📊 Active Positions (0)', color='white')
-                        
-                        ax3.set_ylabel('Unrealized P&L ($)', color='white')
-                        ax3.grid(True, alpha=0.3)
-                        
-                        # 4. 레벨별 수익 분포
-                        ax4.clear()
-                        if self.stats['level_stats']:
-                            levels = []
-                            level_profits = []
-                            colors = []
-                            
-                            for level, stats in self.stats['level_stats'].items():
-                                if stats['trades'] > 0:
-                                    level_name = self.config['unlimited_grid_levels'][level]['name']
-                                    levels.append(f"L{level+1}\n{level_name}")
-                                    level_profits.append(stats['profit'])
-                                    colors.append('lime' if stats['profit'] >= 0 else 'red')
-                            
-                            if levels:
-                                bars = ax4.bar(levels, level_profits, color=colors, alpha=0.7)
-                                
-                                # 수익 값 표시
-                                for bar, profit in zip(bars, level_profits):
-                                    height = bar.get_height()
-                                    ax4.text(bar.get_x() + bar.get_width()/2., height,
-                                            f'${profit:.1f}', ha='center', va='bottom' if height >= 0 else 'top',
-                                            color='white', fontsize=8)
-                                
-                                ax4.set_title('🎯 Level Performance', color='white')
-                            else:
-                                ax4.text(0.5, 0.5, 'No Completed Trades', ha='center', va='center',
-                                        transform=ax4.transAxes, color='white', fontsize=12)
-                                ax4.set_title('🎯 Level Performance', color='white')
-                        else:
-                            ax4.text(0.5, 0.5, 'No Completed Trades', ha='center', va='center',
-                                    transform=ax4.transAxes, color='white', fontsize=12)
-                            ax4.set_title('🎯 Level Performance', color='white')
-                        
-                        ax4.set_ylabel('Profit ($)', color='white')
-                        ax4.grid(True, alpha=0.3)
-                        
-                        # 전체 레이아웃 조정
-                        plt.tight_layout()
-                        
-                    except Exception as e:
-                        print(f"시각화 애니메이션 오류: {e}")
-                
-                # 애니메이션 시작
-                ani = animation.FuncAnimation(fig, animate, interval=2000, cache_frame_data=False)
-                
-                # 창 제목 설정
-                manager = plt.get_current_fig_manager()
-                if hasattr(manager, 'window'):
-                    if hasattr(manager.window, 'wm_title'):
-                        manager.window.wm_title(f'🚀 {self.config["symbol"]} Grid Trading System - Real-time Visualization')
-                
-                plt.show()
-                
-            except Exception as e:
-                print(f"시각화 시작 오류: {e}")
-                print("matplotlib 또는 GUI 백엔드 설치가 필요할 수 있습니다.")
-                print("다음 명령어로 설치해보세요:")
-                print("pip install matplotlib")
-                print("pip install tkinter")
-        
-        # 별도 스레드에서 시각화 실행
-        viz_thread = threading.Thread(target=run_visualization, daemon=True)
-        viz_thread.start()
-        self.viz_running = True
-        print("🎨 실시간 시각화 시작됨!")
+        """🎨 실시간 시각화 시작 (Matplotlib - 별도 프로세스)"""
+        process = start_visualizer_process('matplotlib', self.shared_viz_snapshots(), self.config['symbol'],
+                                           level_schedule=self.config['unlimited_grid_levels'])
+        self.viz_processes.append(process)
+        print("🎨 실시간 시각화 시작됨! (별도 프로세스)")
+        return process
         
     def start_pygame_visualization(self):
-        """🎮 Pygame 시각화 시작"""
+        """🎮 Pygame 시각화 시작 (별도 프로세스)"""
         if not PYGAME_AVAILABLE:
             print("❌ Pygame이 설치되지 않았습니다.")
             print("다음 명령어로 설치하세요: pip install pygame")
             return None
         
-        def run_pygame_viz():
-            try:
-                self.pygame_viz = PygameGridVisualizer(symbol=self.config['symbol'])
-                self.pygame_viz.run()
-            except Exception as e:
-                print(f"Pygame 시각화 오류: {e}")
-        
-        self.pygame_thread = threading.Thread(target=run_pygame_viz, daemon=True)
-        self.pygame_thread.start()
-        print("🎮 Pygame 시각화 시작됨!")
-        
-        return self.pygame_thread
+        process = start_visualizer_process('pygame', self.shared_viz_snapshots(), self.config['symbol'])
+        self.viz_processes.append(process)
+        print("🎮 Pygame 시각화 시작됨! (별도 프로세스)")
+        return process
     
     def revolutionary_scalping_system(self, current_price):
         """⚡ 혁명적 초단기 스캘핑 시스템"""
@@ -823,7 +577,7 @@ class GridRevolutionaryBot:
                     "comment": "SCALP_BUY_MOMENTUM",
                 }
                 
-                result = mt5.order_send(scalp_request)
+                result = self.market.order_send(scalp_request)
                 if result and result.retcode == mt5.TRADE_RETCODE_DONE:
                     entry_price = result.price
                     target_price = entry_price + (current_price['mid'] * 0.0007)  # 0.07% 목표
@@ -845,7 +599,7 @@ class GridRevolutionaryBot:
                     "comment": "SCALP_SELL_MOMENTUM",
                 }
                 
-                result = mt5.order_send(scalp_request)
+                result = self.market.order_send(scalp_request)
                 if result and result.retcode == mt5.TRADE_RETCODE_DONE:
                     entry_price = result.price
                     target_price = entry_price - (current_price['mid'] * 0.0007)  # 0.07% 목표
@@ -886,7 +640,7 @@ class GridRevolutionaryBot:
                     "type_time": mt5.ORDER_TIME_GTC,
                 }
             
-            result = mt5.order_send(exit_request)
+            result = self.market.order_send(exit_request)
             if result and result.retcode == mt5.TRADE_RETCODE_DONE:
                 print(f"   ✅ 스캘핑 청산주문: #{result.order}")
                 
@@ -905,7 +659,7 @@ class GridRevolutionaryBot:
         if not self.config['martingale_enabled']:
             return
         
-        positions = mt5.positions_get(symbol=self.config['symbol'])
+        positions = self.market.positions()
         if not positions:
             return
         
@@ -958,7 +712,7 @@ class GridRevolutionaryBot:
                     "comment": f"MARTINGALE_L{current_level+1}_BUY",
                 }
             
-            result = mt5.order_send(martingale_request)
+            result = self.market.order_send(martingale_request)
             if result and result.retcode == mt5.TRADE_RETCODE_DONE:
                 print(f"🔥 마틴게일 L{current_level+1}: 거래량 {recovery_volume:.3f} | 손실복구: ${abs(loss_amount):.2f}")
                 
@@ -1003,7 +757,7 @@ class GridRevolutionaryBot:
                     "type_time": mt5.ORDER_TIME_GTC,
                 }
             
-            result = mt5.order_send(exit_request)
+            result = self.market.order_send(exit_request)
             if result and result.retcode == mt5.TRADE_RETCODE_DONE:
                 print(f"   ✅ 마틴게일 청산주문: #{result.order} @ ${target_price:.2f}")
                 
@@ -1015,7 +769,7 @@ class GridRevolutionaryBot:
         if not self.config['hedging_enabled']:
             return
         
-        positions = mt5.positions_get(symbol=self.config['symbol'])
+        positions = self.market.positions()
         if not positions:
             return
         
@@ -1071,7 +825,7 @@ class GridRevolutionaryBot:
                     "comment": f"HEDGE_SELL_{loss_amount:.0f}",
                 }
             
-            result = mt5.order_send(hedge_request)
+            result = self.market.order_send(hedge_request)
             if result and result.retcode == mt5.TRADE_RETCODE_DONE:
                 print(f"🛡️ 헤징 실행: {hedge_type.upper()} {hedge_volume:.3f} | 손실보호: ${loss_amount:.2f}")
                 
@@ -1088,7 +842,7 @@ class GridRevolutionaryBot:
     
     def instant_profit_system(self, current_price):
         """💎 즉시 수익 시스템 (손실 포지션을 즉시 수익으로 전환)"""
-        positions = mt5.positions_get(symbol=self.config['symbol'])
+        positions = self.market.positions()
         if not positions:
             return
         
@@ -1136,7 +890,7 @@ class GridRevolutionaryBot:
                     "comment": f"INSTANT_PROFIT_BUY_{losing_position.ticket}",
                 }
             
-            result = mt5.order_send(conversion_request)
+            result = self.market.order_send(conversion_request)
             if result and result.retcode == mt5.TRADE_RETCODE_DONE:
                 print(f"💎 즉시수익전환: {position_type.upper()} 손실 → {conversion_volume:.3f} 반대포지션")
                 
@@ -1178,7 +932,7 @@ class GridRevolutionaryBot:
                     "type_time": mt5.ORDER_TIME_GTC,
                 }
             
-            result = mt5.order_send(exit_request)
+            result = self.market.order_send(exit_request)
             if result and result.retcode == mt5.TRADE_RETCODE_DONE:
                 print(f"   ⚡ 마이크로수익 청산주문: #{result.order} @ ${target_price:.2f} (0.01% 수익)")
                 
@@ -1221,6 +975,7 @@ class GridRevolutionaryBot:
         # 3. 내부 데이터 초기화
         self.grid_positions['buy_orders'].clear()
         self.grid_positions['sell_orders'].clear()
+        self.grid_positions['detached_orders'].clear()
         self.grid_positions['active_positions'].clear()
         self.grid_positions['hedge_positions'].clear()
         self.grid_positions['martingale_levels'].clear()
@@ -1255,8 +1010,9 @@ class GridRevolutionaryBot:
                 "comment": "EMERGENCY_CLOSE_ALL",
             }
             
-            result = mt5.order_send(close_request)
+            result = self.market.order_send(close_request)
             if result and result.retcode == mt5.TRADE_RETCODE_DONE:
+                self.exit_watcher.discard(position.ticket)
                 # 수익 계산
                 if position.type == mt5.ORDER_TYPE_BUY:
                     profit = (result.price - position.price_open) * position.volume
@@ -1279,8 +1035,11 @@ class GridRevolutionaryBot:
                 "order": order_ticket,
             }
             
-            result = mt5.order_send(cancel_request)
-            return result and result.retcode == mt5.TRADE_RETCODE_DONE
+            result = self.market.order_send(cancel_request)
+            if result and result.retcode == mt5.TRADE_RETCODE_DONE:
+                self.order_tracker.note_cancelled(order_ticket)
+                return True
+            return False
             
         except Exception as e:
             print(f"❌ 주문 취소 오류: {e}")
@@ -1427,8 +1186,9 @@ class GridRevolutionaryBot:
                         "comment": "PROFIT_CLOSE_ONLY",
                     }
                     
-                    result = mt5.order_send(close_request)
+                    result = self.market.order_send(close_request)
                     if result and result.retcode == mt5.TRADE_RETCODE_DONE:
+                        self.exit_watcher.discard(position.ticket)
                         # 실제 청산 수익 계산
                         if position.type == mt5.ORDER_TYPE_BUY:
                             actual_profit = (result.price - position.price_open) * position.volume
@@ -1482,8 +1242,9 @@ class GridRevolutionaryBot:
                         "comment": "LOSS_CLOSE_ONLY",
                     }
                     
-                    result = mt5.order_send(close_request)
+                    result = self.market.order_send(close_request)
                     if result and result.retcode == mt5.TRADE_RETCODE_DONE:
+                        self.exit_watcher.discard(position.ticket)
                         # 실제 청산 손실 계산
                         if position.type == mt5.ORDER_TYPE_BUY:
                             actual_loss = (result.price - position.price_open) * position.volume
@@ -1639,7 +1400,7 @@ class GridRevolutionaryBot:
     
     def instant_loss_to_profit_flip(self, current_price):
         """⚡ 즉시 손실→수익 전환 (포지션 방향 뒤집기)"""
-        account_info = mt5.account_info()
+        account_info = self.market.account()
         if not account_info:
             return
         
@@ -1653,7 +1414,7 @@ class GridRevolutionaryBot:
     
     def flip_all_losing_positions(self, current_price):
         """🔄 모든 손실 포지션 방향 뒤집기"""
-        positions = mt5.positions_get(symbol=self.config['symbol'])
+        positions = self.market.positions()
         if not positions:
             return
         
@@ -1711,7 +1472,7 @@ class GridRevolutionaryBot:
                 }
             
             # 3. 반대 방향 포지션 진입
-            flip_result = mt5.order_send(flip_request)
+            flip_result = self.market.order_send(flip_request)
             if flip_result and flip_result.retcode == mt5.TRADE_RETCODE_DONE:
                 print(f"    ✅ 방향전환: {losing_position.type} → {flip_request['type']} @ ${flip_result.price:.2f}")
                 
@@ -1759,7 +1520,7 @@ class GridRevolutionaryBot:
                     "type_time": mt5.ORDER_TIME_GTC,
                 }
             
-            result = mt5.order_send(exit_request)
+            result = self.market.order_send(exit_request)
             if result and result.retcode == mt5.TRADE_RETCODE_DONE:
                 print(f"      ⚡ 마이크로청산 설정: #{result.order} @ ${target_price:.2f} (0.02% 수익)")
             
@@ -1768,7 +1529,7 @@ class GridRevolutionaryBot:
     
     def auto_flip_system(self, current_price):
         """🔄 자동 뒤집기 시스템 (실시간 모니터링)"""
-        positions = mt5.positions_get(symbol=self.config['symbol'])
+        positions = self.market.positions()
         if not positions:
             return
         
@@ -1793,7 +1554,7 @@ class GridRevolutionaryBot:
             print("🔄 완전 방향 전환 시작...")
             
             # 1. 현재 포지션 분석
-            positions = mt5.positions_get(symbol=self.config['symbol'])
+            positions = self.market.positions()
             if not positions:
                 return
             
@@ -1853,7 +1614,7 @@ class GridRevolutionaryBot:
                     "comment": f"MASSIVE_SELL_CONV_{i+1}_{loss_amount:.0f}",
                 }
                 
-                result = mt5.order_send(sell_request)
+                result = self.market.order_send(sell_request)
                 if result and result.retcode == mt5.TRADE_RETCODE_DONE:
                     print(f"  📉 대량매도 {i+1}/{num_entries}: {volume_per_entry:.3f} @ ${result.price:.2f}")
                     
@@ -1890,7 +1651,7 @@ class GridRevolutionaryBot:
                     "comment": f"MASSIVE_BUY_CONV_{i+1}_{loss_amount:.0f}",
                 }
                 
-                result = mt5.order_send(buy_request)
+                result = self.market.order_send(buy_request)
                 if result and result.retcode == mt5.TRADE_RETCODE_DONE:
                     print(f"  📈 대량매수 {i+1}/{num_entries}: {volume_per_entry:.3f} @ ${result.price:.2f}")
                     
@@ -1931,7 +1692,7 @@ class GridRevolutionaryBot:
                     "type_time": mt5.ORDER_TIME_GTC,
                 }
             
-            result = mt5.order_send(exit_request)
+            result = self.market.order_send(exit_request)
             if result and result.retcode == mt5.TRADE_RETCODE_DONE:
                 print(f"    ⚡ 초고속청산: #{result.order} @ ${target_price:.2f}")
                 
@@ -1940,7 +1701,7 @@ class GridRevolutionaryBot:
     
     def emergency_profit_boost_system(self, current_price):
         """🚀 긴급 수익 부스트 시스템 (추가 수익 창출)"""
-        account_info = mt5.account_info()
+        account_info = self.market.account()
         if not account_info:
             return
         
@@ -1980,7 +1741,7 @@ class GridRevolutionaryBot:
             }
             
             # 매수 실행
-            buy_result = mt5.order_send(buy_request)
+            buy_result = self.market.order_send(buy_request)
             if buy_result and buy_result.retcode == mt5.TRADE_RETCODE_DONE:
                 print(f"  🚀 부스트매수: {boost_volume:.3f} @ ${buy_result.price:.2f}")
                 # 0.03% 상승시 청산
@@ -1988,7 +1749,7 @@ class GridRevolutionaryBot:
                 self.place_ultra_quick_exit(buy_result.order, 'buy', buy_target, boost_volume)
             
             # 매도 실행
-            sell_result = mt5.order_send(sell_request)
+            sell_result = self.market.order_send(sell_request)
             if sell_result and sell_result.retcode == mt5.TRADE_RETCODE_DONE:
                 print(f"  🚀 부스트매도: {boost_volume:.3f} @ ${sell_result.price:.2f}")
                 # 0.03% 하락시 청산
@@ -1999,127 +1760,151 @@ class GridRevolutionaryBot:
             print(f"❌ 양방향 부스트 오류: {e}")
     
     def revolutionary_dynamic_grid_system(self, current_price):
-        """🚀 혁명적 동적 그리드 시스템 (다양한 주문 타입 사용)"""
+        """🚀 혁명적 동적 그리드 시스템 (다양한 주문 타입 사용)
+
+        가격 조건으로 움직이는 것만 매 루프 실행.
+        주기 실행 기법(시장가/스탑/공격적 진입/사다리/다중 시간대/Market 전용)은
+        register_scheduled_tasks 로 스케줄러에 등록됨
+        """
         if not self.config['dynamic_grid']:
             return
         
-        # 1. 시장가 주문으로 즉시 진입 (30% 확률)
-        self.execute_market_grid_orders(current_price)
-        
-        # 2. 스탑 주문으로 브레이크아웃 포착 (20% 확률)
-        self.execute_stop_grid_orders(current_price)
-        
-        # 3. 동적 리미트 주문 (가격 추적)
+        # 1. 동적 리미트 주문 (가격 추적)
         self.execute_dynamic_limit_orders(current_price)
         
-        # 4. 공격적 진입 시스템 (매 5초마다)
-        self.execute_aggressive_entry_system(current_price)
-        
-        # 5. 🔥 새로운 혁명적 기법들
+        # 2. 🔥 가격 조건 기반 기법들
         self.execute_momentum_breakout_system(current_price)
         self.execute_volatility_capture_system(current_price)
-        self.execute_price_ladder_system(current_price)
-        self.execute_multi_timeframe_grid(current_price)
-        
-        # 6. 🚀 Market 주문 전용 그리드 (새로 추가!)
-        self.execute_market_only_grid_system(current_price)
+    
+    def register_scheduled_tasks(self):
+        """⏰ 주기 작업 등록 (마감시각 스케줄러 - 가장 가까운 마감까지만 대기)"""
+        scheduler = self.scheduler
+        
+        def with_price(subsystem, *args):
+            # 실행 직전 새 틱의 현재가로 실행 (틱 없으면 건너뜀)
+            # monitor 스냅샷의 틱은 최대 1초 전 - 그 가격으로 스탑/리미트를 걸면 현재가 반대편에 놓여 거부/즉시 체결
+            def run():
+                self.market.invalidate('tick', 'price')
+                current_price = self.market.price()
+                if current_price:
+                    subsystem(current_price, *args)
+            return run
+        
+        scheduler.add('monitor', 1.0, self.monitor_grid_positions)
+        scheduler.add('grid_update', 180.0, self.update_grid_system)
+        scheduler.add('visualization', 1.0, self.update_visualization_data)
+        scheduler.add('status', 15.0, self.print_grid_status, align=True)
+        
+        # 🎯 Market 청산 감시 (0.1초마다, 감시할 포지션이 없으면 정지)
+        scheduler.add('exit_watcher', 0.1, self.process_market_exits, tolerance=0.05)
+        
+        if self.config['dynamic_grid']:
+            scheduler.add('market_grid', 3 / 2.7, with_price(self.execute_market_grid_orders))
+            scheduler.add('stop_grid', 10 / 6, with_price(self.execute_stop_grid_orders))
+            scheduler.add('aggressive_entry', 3.0, with_price(self.execute_aggressive_entry_system), align=True)
+            scheduler.add('price_ladder', 30.0, with_price(self.execute_price_ladder_system), align=True)
+            scheduler.add('market_only_grid', 1 / 0.8, with_price(self.execute_market_only_grid_system))
+            
+            # 🔄 다중 시간대 그리드 (주기, 거리, 거래량 배수)
+            for interval, distance_pct, volume_multiplier in self.MULTI_TIMEFRAME_GRIDS:
+                scheduler.add(f'timeframe_{interval}s', interval,
+                              with_price(self.place_ultra_short_grid, distance_pct, volume_multiplier),
+                              align=True)
     
     def execute_market_grid_orders(self, current_price):
         """⚡ 시장가 그리드 주문 (즉시 체결) - 완전 개선!"""
         if not self.config['market_orders']:
             return
         
-        # 90% 확률로 시장가 주문 실행 (매우 자주!)
-        if time.time() % 3 < 2.7:  # 3초 중 2.7초 (90% 확률)
-            # 더 큰 거래량으로 즉시 양방향 진입
-            market_volume = self.config['base_lot_size'] * 2.5  # 거래량 더 증가
-            
-            # 시장가 매수
-            market_buy_request = {
-                "action": mt5.TRADE_ACTION_DEAL,
-                "symbol": self.config['symbol'],
-                "volume": market_volume,
-                "type": mt5.ORDER_TYPE_BUY,
-                "deviation": 100,
-                "magic": self.config['magic_number'],
-                "comment": "MARKET_GRID_BUY_INSTANT",
-            }
-            
-            buy_result = mt5.order_send(market_buy_request)
-            if buy_result and buy_result.retcode == mt5.TRADE_RETCODE_DONE:
-                print(f"🚀 즉시시장가매수: {market_volume:.3f} @ ${buy_result.price:.5f}")
-                # 0.03% 수익시 즉시 청산 (더 빠른 청산)
-                self.set_quick_exit(buy_result.order, 'buy', buy_result.price, market_volume, 0.0003)
+        # 스케줄러가 3초에 2.7회 꼴로 호출 (기존 '3초 중 2.7초' 트리거와 같은 빈도)
+        # 더 큰 거래량으로 즉시 양방향 진입
+        market_volume = self.config['base_lot_size'] * 2.5  # 거래량 더 증가
+            
+        # 시장가 매수
+        market_buy_request = {
+            "action": mt5.TRADE_ACTION_DEAL,
+            "symbol": self.config['symbol'],
+            "volume": market_volume,
+            "type": mt5.ORDER_TYPE_BUY,
+            "deviation": 100,
+            "magic": self.config['magic_number'],
+            "comment": "MARKET_GRID_BUY_INSTANT",
+        }
             
-            # 시장가 매도
-            market_sell_request = {
-                "action": mt5.TRADE_ACTION_DEAL,
-                "symbol": self.config['symbol'],
-                "volume": market_volume,
-                "type": mt5.ORDER_TYPE_SELL,
-                "deviation": 100,
-                "magic": self.config['magic_number'],
-                "comment": "MARKET_GRID_SELL_INSTANT",
-            }
+        buy_result = self.market.order_send(market_buy_request)
+        if buy_result and buy_result.retcode == mt5.TRADE_RETCODE_DONE:
+            print(f"🚀 즉시시장가매수: {market_volume:.3f} @ ${buy_result.price:.5f}")
+            # 0.03% 수익시 즉시 청산 (더 빠른 청산)
+            self.set_market_grid_exit(buy_result, 'buy', market_volume, 0.0003, self.set_quick_exit)
+            
+        # 시장가 매도
+        market_sell_request = {
+            "action": mt5.TRADE_ACTION_DEAL,
+            "symbol": self.config['symbol'],
+            "volume": market_volume,
+            "type": mt5.ORDER_TYPE_SELL,
+            "deviation": 100,
+            "magic": self.config['magic_number'],
+            "comment": "MARKET_GRID_SELL_INSTANT",
+        }
             
-            sell_result = mt5.order_send(market_sell_request)
-            if sell_result and sell_result.retcode == mt5.TRADE_RETCODE_DONE:
-                print(f"🚀 즉시시장가매도: {market_volume:.3f} @ ${sell_result.price:.5f}")
-                # 0.03% 수익시 즉시 청산 (더 빠른 청산)
-                self.set_quick_exit(sell_result.order, 'sell', sell_result.price, market_volume, 0.0003)
+        sell_result = self.market.order_send(market_sell_request)
+        if sell_result and sell_result.retcode == mt5.TRADE_RETCODE_DONE:
+            print(f"🚀 즉시시장가매도: {market_volume:.3f} @ ${sell_result.price:.5f}")
+            # 0.03% 수익시 즉시 청산 (더 빠른 청산)
+            self.set_market_grid_exit(sell_result, 'sell', market_volume, 0.0003, self.set_quick_exit)
     
     def execute_stop_grid_orders(self, current_price):
         """🎯 스탑 그리드 주문 (브레이크아웃 포착) - 완전 개선!"""
         if not self.config['stop_orders']:
             return
         
-        # 60% 확률로 스탑 주문 배치 (기존 40%에서 대폭 증가)
-        if time.time() % 10 < 6:  # 10초 중 6초 (60% 확률)
-            stop_volume = self.config['base_lot_size'] * 2.0  # 거래량 더 증가
-            
-            # 상승 브레이크아웃 스탑 주문 (더 가까운 가격)
-            buy_stop_price = current_price['ask'] + (current_price['mid'] * 0.0002)  # 0.02% 위 (더 가까움)
-            buy_stop_request = {
-                "action": mt5.TRADE_ACTION_PENDING,
-                "symbol": self.config['symbol'],
-                "volume": stop_volume,
-                "type": mt5.ORDER_TYPE_BUY_STOP,
-                "price": buy_stop_price,
-                "deviation": 100,
-                "magic": self.config['magic_number'],
-                "comment": "STOP_GRID_BUY_ULTRA",
-                "type_time": mt5.ORDER_TIME_GTC,
-            }
-            
-            buy_stop_result = mt5.order_send(buy_stop_request)
-            if buy_stop_result and buy_stop_result.retcode == mt5.TRADE_RETCODE_DONE:
-                print(f"🎯 매수스탑: {stop_volume:.3f} @ ${buy_stop_price:.5f}")
+        # 스케줄러가 10초에 6회 꼴로 호출 (기존 '10초 중 6초' 트리거와 같은 빈도)
+        stop_volume = self.config['base_lot_size'] * 2.0  # 거래량 더 증가
+            
+        # 상승 브레이크아웃 스탑 주문 (더 가까운 가격)
+        buy_stop_price = current_price['ask'] + (current_price['mid'] * 0.0002)  # 0.02% 위 (더 가까움)
+        buy_stop_request = {
+            "action": mt5.TRADE_ACTION_PENDING,
+            "symbol": self.config['symbol'],
+            "volume": stop_volume,
+            "type": mt5.ORDER_TYPE_BUY_STOP,
+            "price": buy_stop_price,
+            "deviation": 100,
+            "magic": self.config['magic_number'],
+            "comment": "STOP_GRID_BUY_ULTRA",
+            "type_time": mt5.ORDER_TIME_GTC,
+        }
             
-            # 하락 브레이크아웃 스탑 주문 (더 가까운 가격)
-            sell_stop_price = current_price['bid'] - (current_price['mid'] * 0.0002)  # 0.02% 아래 (더 가까움)
-            sell_stop_request = {
-                "action": mt5.TRADE_ACTION_PENDING,
-                "symbol": self.config['symbol'],
-                "volume": stop_volume,
-                "type": mt5.ORDER_TYPE_SELL_STOP,
-                "price": sell_stop_price,
-                "deviation": 100,
-                "magic": self.config['magic_number'],
-                "comment": "STOP_GRID_SELL_ULTRA",
-                "type_time": mt5.ORDER_TIME_GTC,
-            }
+        buy_stop_result = self.market.order_send(buy_stop_request)
+        if buy_stop_result and buy_stop_result.retcode == mt5.TRADE_RETCODE_DONE:
+            print(f"🎯 매수스탑: {stop_volume:.3f} @ ${buy_stop_price:.5f}")
+            
+        # 하락 브레이크아웃 스탑 주문 (더 가까운 가격)
+        sell_stop_price = current_price['bid'] - (current_price['mid'] * 0.0002)  # 0.02% 아래 (더 가까움)
+        sell_stop_request = {
+            "action": mt5.TRADE_ACTION_PENDING,
+            "symbol": self.config['symbol'],
+            "volume": stop_volume,
+            "type": mt5.ORDER_TYPE_SELL_STOP,
+            "price": sell_stop_price,
+            "deviation": 100,
+            "magic": self.config['magic_number'],
+            "comment": "STOP_GRID_SELL_ULTRA",
+            "type_time": mt5.ORDER_TIME_GTC,
+        }
             
-            sell_stop_result = mt5.order_send(sell_stop_request)
-            if sell_stop_result and sell_stop_result.retcode == mt5.TRADE_RETCODE_DONE:
-                print(f"🎯 매도스탑: {stop_volume:.3f} @ ${sell_stop_price:.5f}")
+        sell_stop_result = self.market.order_send(sell_stop_request)
+        if sell_stop_result and sell_stop_result.retcode == mt5.TRADE_RETCODE_DONE:
+            print(f"🎯 매도스탑: {stop_volume:.3f} @ ${sell_stop_price:.5f}")
     
     def execute_dynamic_limit_orders(self, current_price):
         """🔄 동적 리미트 주문 (가격 추적)"""
         if not self.config['price_chase']:
             return
         
-        # 기존 리미트 주문들을 현재가에 맞춰 동적 조정
-        orders = mt5.orders_get(symbol=self.config['symbol'])
+        # 기존 리미트 주문들을 현재가에 맞춰 동적 조정 (이번 루프 스냅샷 공유)
+        orders = self.order_tracker.orders()
         if not orders:
             return
         
@@ -2160,7 +1945,7 @@ class GridRevolutionaryBot:
                             "type_time": mt5.ORDER_TIME_GTC,
                         }
                     
-                    result = mt5.order_send(new_request)
+                    result = self.market.order_send(new_request)
                     if result and result.retcode == mt5.TRADE_RETCODE_DONE:
                         print(f"🔄 동적조정: #{order.ticket} → #{result.order} @ ${new_price:.2f}")
     
@@ -2169,47 +1954,46 @@ class GridRevolutionaryBot:
         if not self.config['aggressive_entry']:
             return
         
-        # 매 3초마다 공격적 진입 (기존 5초에서 단축)
-        if time.time() % 3 < 1:
-            aggressive_volume = self.config['base_lot_size'] * 2.0  # 거래량 증가
-            
-            # 현재가 매우 가까운 곳에 주문 배치 (거의 시장가 수준)
-            aggressive_buy_price = current_price['bid'] + (current_price['mid'] * 0.00005)  # 0.005% 위 (더 가까움)
-            aggressive_sell_price = current_price['ask'] - (current_price['mid'] * 0.00005)  # 0.005% 아래 (더 가까움)
-            
-            # 공격적 매수 주문
-            aggressive_buy_request = {
-                "action": mt5.TRADE_ACTION_PENDING,
-                "symbol": self.config['symbol'],
-                "volume": aggressive_volume,
-                "type": mt5.ORDER_TYPE_BUY_LIMIT,
-                "price": aggressive_buy_price,
-                "deviation": 100,
-                "magic": self.config['magic_number'],
-                "comment": "AGGRESSIVE_BUY",
-                "type_time": mt5.ORDER_TIME_GTC,
-            }
-            
-            buy_result = mt5.order_send(aggressive_buy_request)
-            if buy_result and buy_result.retcode == mt5.TRADE_RETCODE_DONE:
-                print(f"🚀 공격매수: {aggressive_volume:.3f} @ ${aggressive_buy_price:.2f}")
+        # 매 3초마다 공격적 진입 (스케줄러 호출)
+        aggressive_volume = self.config['base_lot_size'] * 2.0  # 거래량 증가
+            
+        # 현재가 매우 가까운 곳에 주문 배치 (거의 시장가 수준)
+        aggressive_buy_price = current_price['bid'] + (current_price['mid'] * 0.00005)  # 0.005% 위 (더 가까움)
+        aggressive_sell_price = current_price['ask'] - (current_price['mid'] * 0.00005)  # 0.005% 아래 (더 가까움)
+            
+        # 공격적 매수 주문
+        aggressive_buy_request = {
+            "action": mt5.TRADE_ACTION_PENDING,
+            "symbol": self.config['symbol'],
+            "volume": aggressive_volume,
+            "type": mt5.ORDER_TYPE_BUY_LIMIT,
+            "price": aggressive_buy_price,
+            "deviation": 100,
+            "magic": self.config['magic_number'],
+            "comment": "AGGRESSIVE_BUY",
+            "type_time": mt5.ORDER_TIME_GTC,
+        }
             
-            # 공격적 매도 주문
-            aggressive_sell_request = {
-                "action": mt5.TRADE_ACTION_PENDING,
-                "symbol": self.config['symbol'],
-                "volume": aggressive_volume,
-                "type": mt5.ORDER_TYPE_SELL_LIMIT,
-                "price": aggressive_sell_price,
-                "deviation": 100,
-                "magic": self.config['magic_number'],
-                "comment": "AGGRESSIVE_SELL",
-                "type_time": mt5.ORDER_TIME_GTC,
-            }
+        buy_result = self.market.order_send(aggressive_buy_request)
+        if buy_result and buy_result.retcode == mt5.TRADE_RETCODE_DONE:
+            print(f"🚀 공격매수: {aggressive_volume:.3f} @ ${aggressive_buy_price:.2f}")
+            
+        # 공격적 매도 주문
+        aggressive_sell_request = {
+            "action": mt5.TRADE_ACTION_PENDING,
+            "symbol": self.config['symbol'],
+            "volume": aggressive_volume,
+            "type": mt5.ORDER_TYPE_SELL_LIMIT,
+            "price": aggressive_sell_price,
+            "deviation": 100,
+            "magic": self.config['magic_number'],
+            "comment": "AGGRESSIVE_SELL",
+            "type_time": mt5.ORDER_TIME_GTC,
+        }
             
-            sell_result = mt5.order_send(aggressive_sell_request)
-            if sell_result and sell_result.retcode == mt5.TRADE_RETCODE_DONE:
-                print(f"🚀 공격매도: {aggressive_volume:.3f} @ ${aggressive_sell_price:.2f}")
+        sell_result = self.market.order_send(aggressive_sell_request)
+        if sell_result and sell_result.retcode == mt5.TRADE_RETCODE_DONE:
+            print(f"🚀 공격매도: {aggressive_volume:.3f} @ ${aggressive_sell_price:.2f}")
     
     def set_quick_exit(self, position_ticket, position_type, entry_price, volume, profit_pct):
         """⚡ 빠른 청산 설정"""
@@ -2241,7 +2025,7 @@ class GridRevolutionaryBot:
                     "type_time": mt5.ORDER_TIME_GTC,
                 }
             
-            result = mt5.order_send(exit_request)
+            result = self.market.order_send(exit_request)
             if result and result.retcode == mt5.TRADE_RETCODE_DONE:
                 print(f"   ⚡ 빠른청산: #{result.order} @ ${target_price:.2f}")
                 
@@ -2274,7 +2058,7 @@ class GridRevolutionaryBot:
                         "comment": f"MOMENTUM_UP_{price_change*100:.2f}%",
                     }
                     
-                    result = mt5.order_send(momentum_request)
+                    result = self.market.order_send(momentum_request)
                     if result and result.retcode == mt5.TRADE_RETCODE_DONE:
                         print(f"🚀 모멘텀매수: {momentum_volume:.3f} @ ${result.price:.2f} (상승{price_change*100:.2f}%)")
                         # 0.2% 수익시 청산
@@ -2292,7 +2076,7 @@ class GridRevolutionaryBot:
                         "comment": f"MOMENTUM_DOWN_{abs(price_change)*100:.2f}%",
                     }
                     
-                    result = mt5.order_send(momentum_request)
+                    result = self.market.order_send(momentum_request)
                     if result and result.retcode == mt5.TRADE_RETCODE_DONE:
                         print(f"🚀 모멘텀매도: {momentum_volume:.3f} @ ${result.price:.2f} (하락{abs(price_change)*100:.2f}%)")
                         # 0.2% 수익시 청산
@@ -2335,8 +2119,8 @@ class GridRevolutionaryBot:
                 }
                 
                 # 동시 실행
-                buy_result = mt5.order_send(vol_buy_request)
-                sell_result = mt5.order_send(vol_sell_request)
+                buy_result = self.market.order_send(vol_buy_request)
+                sell_result = self.market.order_send(vol_sell_request)
                 
                 if buy_result and buy_result.retcode == mt5.TRADE_RETCODE_DONE:
                     print(f"⚡ 변동성매수: {volatility_volume:.3f} @ ${buy_result.price:.2f}")
@@ -2354,75 +2138,66 @@ class GridRevolutionaryBot:
     def execute_price_ladder_system(self, current_price):
         """🎯 가격 사다리 시스템 (계단식 주문 배치)"""
         try:
-            # 매 30초마다 실행
-            if time.time() % 30 < 1:
-                ladder_volume = self.config['base_lot_size'] * 0.5
-                
-                # 현재가 기준으로 위아래 5단계씩 사다리 주문
-                for i in range(1, 6):  # 5단계
-                    # 매수 사다리 (아래쪽)
-                    buy_price = current_price['mid'] * (1 - 0.0002 * i)  # 0.02%씩 아래
-                    buy_ladder_request = {
-                        "action": mt5.TRADE_ACTION_PENDING,
-                        "symbol": self.config['symbol'],
-                        "volume": ladder_volume,
-                        "type": mt5.ORDER_TYPE_BUY_LIMIT,
-                        "price": buy_price,
-                        "deviation": 100,
-                        "magic": self.config['magic_number'],
-                        "comment": f"LADDER_BUY_L{i}",
-                        "type_time": mt5.ORDER_TIME_GTC,
-                    }
+            # 매 30초마다 실행 (스케줄러 호출)
+            ladder_volume = self.config['base_lot_size'] * 0.5
+                
+            # 현재가 기준으로 위아래 5단계씩 사다리 주문
+            for i in range(1, 6):  # 5단계
+                # 매수 사다리 (아래쪽)
+                buy_price = current_price['mid'] * (1 - 0.0002 * i)  # 0.02%씩 아래
+                buy_ladder_request = {
+                    "action": mt5.TRADE_ACTION_PENDING,
+                    "symbol": self.config['symbol'],
+                    "volume": ladder_volume,
+                    "type": mt5.ORDER_TYPE_BUY_LIMIT,
+                    "price": buy_price,
+                    "deviation": 100,
+                    "magic": self.config['magic_number'],
+                    "comment": f"LADDER_BUY_L{i}",
+                    "type_time": mt5.ORDER_TIME_GTC,
+                }
                     
-                    # 매도 사다리 (위쪽)
-                    sell_price = current_price['mid'] * (1 + 0.0002 * i)  # 0.02%씩 위
-                    sell_ladder_request = {
-                        "action": mt5.TRADE_ACTION_PENDING,
-                        "symbol": self.config['symbol'],
-                        "volume": ladder_volume,
-                        "type": mt5.ORDER_TYPE_SELL_LIMIT,
-                        "price": sell_price,
-                        "deviation": 100,
-                        "magic": self.config['magic_number'],
-                        "comment": f"LADDER_SELL_L{i}",
-                        "type_time": mt5.ORDER_TIME_GTC,
-                    }
+                # 매도 사다리 (위쪽)
+                sell_price = current_price['mid'] * (1 + 0.0002 * i)  # 0.02%씩 위
+                sell_ladder_request = {
+                    "action": mt5.TRADE_ACTION_PENDING,
+                    "symbol": self.config['symbol'],
+                    "volume": ladder_volume,
+                    "type": mt5.ORDER_TYPE_SELL_LIMIT,
+                    "price": sell_price,
+                    "deviation": 100,
+                    "magic": self.config['magic_number'],
+                    "comment": f"LADDER_SELL_L{i}",
+                    "type_time": mt5.ORDER_TIME_GTC,
+                }
                     
-                    # 주문 실행
-                    buy_result = mt5.order_send(buy_ladder_request)
-                    if buy_result and buy_result.retcode == mt5.TRADE_RETCODE_DONE:
-                        print(f"🎯 사다리매수{i}: {ladder_volume:.3f} @ ${buy_price:.2f}")
+                # 주문 실행
+                buy_result = self.market.order_send(buy_ladder_request)
+                if buy_result and buy_result.retcode == mt5.TRADE_RETCODE_DONE:
+                    print(f"🎯 사다리매수{i}: {ladder_volume:.3f} @ ${buy_price:.2f}")
                     
-                    sell_result = mt5.order_send(sell_ladder_request)
-                    if sell_result and sell_result.retcode == mt5.TRADE_RETCODE_DONE:
-                        print(f"🎯 사다리매도{i}: {ladder_volume:.3f} @ ${sell_price:.2f}")
+                sell_result = self.market.order_send(sell_ladder_request)
+                if sell_result and sell_result.retcode == mt5.TRADE_RETCODE_DONE:
+                    print(f"🎯 사다리매도{i}: {ladder_volume:.3f} @ ${sell_price:.2f}")
                     
-                    time.sleep(0.1)  # 0.1초 간격
+                time.sleep(0.1)  # 0.1초 간격
                     
         except Exception as e:
             print(f"❌ 가격 사다리 오류: {e}")
     
+    # 🔄 다중 시간대 그리드: (주기 초, 거리, 거래량 배수) - 스케줄러가 주기별로 호출
+    MULTI_TIMEFRAME_GRIDS = (
+        (1, 0.0001, 0.3),     # 1초마다 - 초단기 그리드 (0.01%, 0.3배 거래량)
+        (5, 0.0005, 0.5),     # 5초마다 - 단기 그리드 (0.05%, 0.5배 거래량)
+        (15, 0.001, 1.0),     # 15초마다 - 중기 그리드 (0.1%, 1배 거래량)
+        (60, 0.002, 2.0),     # 60초마다 - 장기 그리드 (0.2%, 2배 거래량)
+    )
+    
     def execute_multi_timeframe_grid(self, current_price):
-        """🔄 다중 시간대 그리드 (다양한 주기로 주문)"""
+        """🔄 다중 시간대 그리드 전체를 한 번에 배치 (주기 실행은 스케줄러 담당)"""
         try:
-            current_time = time.time()
-            
-            # 1초마다 - 초단기 그리드
-            if current_time % 1 < 0.1:
-                self.place_ultra_short_grid(current_price, 0.0001, 0.3)  # 0.01%, 0.3배 거래량
-            
-            # 5초마다 - 단기 그리드
-            if current_time % 5 < 0.1:
-                self.place_ultra_short_grid(current_price, 0.0005, 0.5)  # 0.05%, 0.5배 거래량
-            
-            # 15초마다 - 중기 그리드
-            if current_time % 15 < 0.1:
-                self.place_ultra_short_grid(current_price, 0.001, 1.0)   # 0.1%, 1배 거래량
-            
-            # 60초마다 - 장기 그리드
-            if current_time % 60 < 0.1:
-                self.place_ultra_short_grid(current_price, 0.002, 2.0)   # 0.2%, 2배 거래량
-                
+            for _, distance_pct, volume_multiplier in self.MULTI_TIMEFRAME_GRIDS:
+                self.place_ultra_short_grid(current_price, distance_pct, volume_multiplier)
         except Exception as e:
             print(f"❌ 다중 시간대 그리드 오류: {e}")
     
@@ -2460,8 +2235,8 @@ class GridRevolutionaryBot:
             }
             
             # 주문 실행
-            buy_result = mt5.order_send(buy_request)
-            sell_result = mt5.order_send(sell_request)
+            buy_result = self.market.order_send(buy_request)
+            sell_result = self.market.order_send(sell_request)
             
             if buy_result and buy_result.retcode == mt5.TRADE_RETCODE_DONE:
                 print(f"⚡ 초단기매수: {volume:.3f} @ ${buy_price:.2f} ({distance_pct*100:.3f}%)")
@@ -2475,48 +2250,47 @@ class GridRevolutionaryBot:
     def execute_market_only_grid_system(self, current_price):
         """🚀 Market 주문 전용 초고속 그리드 시스템 (완전 개선!)"""
         try:
-            # 1초마다 즉시 체결 그리드 실행 (더 자주!)
-            if time.time() % 1 < 0.8:  # 1초 중 0.8초 (80% 확률로 매우 자주!)
-                # 초고속 거래량으로 즉시 양방향 진입
-                market_volume = self.config['base_lot_size'] * 3.0  # 3배 거래량 (더 큰 수익)
-                
-                # 연속 시장가 주문 (5개씩 더 많이!)
-                for i in range(5):
-                    # 시장가 매수 - 즉시 체결
-                    market_buy_request = {
-                        "action": mt5.TRADE_ACTION_DEAL,
-                        "symbol": self.config['symbol'],
-                        "volume": market_volume,
-                        "type": mt5.ORDER_TYPE_BUY,
-                        "deviation": 100,
-                        "magic": self.config['magic_number'],
-                        "comment": f"ULTRA_MARKET_BUY_{i+1}",
-                    }
+            # 1초에 0.8회 꼴로 즉시 체결 그리드 실행 (스케줄러 호출)
+            # 초고속 거래량으로 즉시 양방향 진입
+            market_volume = self.config['base_lot_size'] * 3.0  # 3배 거래량 (더 큰 수익)
+                
+            # 연속 시장가 주문 (5개씩 더 많이!)
+            for i in range(5):
+                # 시장가 매수 - 즉시 체결
+                market_buy_request = {
+                    "action": mt5.TRADE_ACTION_DEAL,
+                    "symbol": self.config['symbol'],
+                    "volume": market_volume,
+                    "type": mt5.ORDER_TYPE_BUY,
+                    "deviation": 100,
+                    "magic": self.config['magic_number'],
+                    "comment": f"ULTRA_MARKET_BUY_{i+1}",
+                }
                     
-                    buy_result = mt5.order_send(market_buy_request)
-                    if buy_result and buy_result.retcode == mt5.TRADE_RETCODE_DONE:
-                        print(f"🚀 초고속매수{i+1}: {market_volume:.3f} @ ${buy_result.price:.5f}")
-                        # 0.02% 수익시 즉시 청산 (더 빠른 청산!)
-                        self.set_ultra_quick_exit(buy_result.order, 'buy', buy_result.price, market_volume, 0.0002)
+                buy_result = self.market.order_send(market_buy_request)
+                if buy_result and buy_result.retcode == mt5.TRADE_RETCODE_DONE:
+                    print(f"🚀 초고속매수{i+1}: {market_volume:.3f} @ ${buy_result.price:.5f}")
+                    # 0.02% 수익시 즉시 청산 (더 빠른 청산!)
+                    self.set_market_grid_exit(buy_result, 'buy', market_volume, 0.0002, self.set_ultra_quick_exit)
                     
-                    # 시장가 매도 - 즉시 체결
-                    market_sell_request = {
-                        "action": mt5.TRADE_ACTION_DEAL,
-                        "symbol": self.config['symbol'],
-                        "volume": market_volume,
-                        "type": mt5.ORDER_TYPE_SELL,
-                        "deviation": 100,
-                        "magic": self.config['magic_number'],
-                        "comment": f"ULTRA_MARKET_SELL_{i+1}",
-                    }
+                # 시장가 매도 - 즉시 체결
+                market_sell_request = {
+                    "action": mt5.TRADE_ACTION_DEAL,
+                    "symbol": self.config['symbol'],
+                    "volume": market_volume,
+                    "type": mt5.ORDER_TYPE_SELL,
+                    "deviation": 100,
+                    "magic": self.config['magic_number'],
+                    "comment": f"ULTRA_MARKET_SELL_{i+1}",
+                }
                     
-                    sell_result = mt5.order_send(market_sell_request)
-                    if sell_result and sell_result.retcode == mt5.TRADE_RETCODE_DONE:
-                        print(f"🚀 초고속매도{i+1}: {market_volume:.3f} @ ${sell_result.price:.5f}")
-                        # 0.02% 수익시 즉시 청산 (더 빠른 청산!)
-                        self.set_ultra_quick_exit(sell_result.order, 'sell', sell_result.price, market_volume, 0.0002)
+                sell_result = self.market.order_send(market_sell_request)
+                if sell_result and sell_result.retcode == mt5.TRADE_RETCODE_DONE:
+                    print(f"🚀 초고속매도{i+1}: {market_volume:.3f} @ ${sell_result.price:.5f}")
+                    # 0.02% 수익시 즉시 청산 (더 빠른 청산!)
+                    self.set_market_grid_exit(sell_result, 'sell', market_volume, 0.0002, self.set_ultra_quick_exit)
                     
-                    time.sleep(0.1)  # 0.1초 간격 (더 빠르게!)
+                time.sleep(0.1)  # 0.1초 간격 (더 빠르게!)
                     
         except Exception as e:
             print(f"❌ 초고속 Market 그리드 오류: {e}")
@@ -2553,56 +2327,77 @@ class GridRevolutionaryBot:
                     "type_time": mt5.ORDER_TIME_GTC,
                 }
             
-            result = mt5.order_send(exit_request)
+            result = self.market.order_send(exit_request)
             if result and result.retcode == mt5.TRADE_RETCODE_DONE:
                 print(f"      ⚡ 초고속청산설정: #{result.order} @ ${target_price:.5f} ({profit_pct*100:.3f}% 수익)")
             
         except Exception as e:
             print(f"❌ 초고속청산 설정 오류: {e}")
     
+    def set_market_grid_exit(self, result, position_type, volume, profit_pct, limit_exit):
+        """🎯 시장가 그리드 진입 직후 청산 설정 (기본: 기존 LIMIT 청산, market_exits=True 일 때만 감시 엔진)"""
+        if self.config['market_exits']:
+            self.schedule_market_exit(result.order, position_type, result.price, volume, profit_pct)
+        else:
+            limit_exit(result.order, position_type, result.price, volume, profit_pct)
+    
     def schedule_market_exit(self, position_ticket, position_type, entry_price, volume, profit_pct):
-        """⚡ Market 주문으로 청산 예약 (LIMIT 주문 없이)"""
+        """⚡ Market 주문으로 청산 예약 (LIMIT 주문 없이) - 청산 감시 엔진에 등록"""
         try:
-            # 0.03% 수익 목표가 달성되면 즉시 Market 청산
+            # 0.03% 수익 목표가 달성되면 즉시 Market 청산, 최대 30초 후 강제 청산
             target_price = entry_price * (1 + profit_pct) if position_type == 'buy' else entry_price * (1 - profit_pct)
+            self.exit_watcher.watch(position_ticket, position_type, volume, target_price, time.time())
             
-            # 별도 스레드에서 가격 모니터링 후 Market 청산
-            import threading
-            
-            def monitor_and_close():
-                import time
-                max_wait_time = 30  # 최대 30초 대기
-                start_time = time.time()
-                
-                while time.time() - start_time < max_wait_time:
-                    current_price = self.get_current_price()
-                    if not current_price:
-                        time.sleep(0.5)
-                        continue
-                    
-                    # 목표가 달성 확인
-                    if position_type == 'buy':
-                        if current_price['bid'] >= target_price:
-                            self.execute_market_close(position_ticket, volume, 'buy')
-                            break
-                    else:
-                        if current_price['ask'] <= target_price:
-                            self.execute_market_close(position_ticket, volume, 'sell')
-                            break
-                    
-                    time.sleep(0.1)  # 0.1초마다 체크
-                
-                # 시간 초과시 강제 청산
-                if time.time() - start_time >= max_wait_time:
-                    self.execute_market_close(position_ticket, volume, position_type)
-            
-            # 백그라운드에서 모니터링 시작
-            monitor_thread = threading.Thread(target=monitor_and_close, daemon=True)
-            monitor_thread.start()
+            # 감시 작업 재개 (대기열이 비어 있으면 스케줄러가 깨우지 않음)
+            if 'exit_watcher' in self.scheduler.tasks:
+                self.scheduler.set_enabled('exit_watcher', True)
             
         except Exception as e:
             print(f"❌ Market 청산 예약 오류: {e}")
     
+    def process_market_exits(self):
+        """🎯 발동된 Market 청산 배치 실행 (틱 1회 조회 → 목표가/시간초과 도달분만 꺼내 한 번에 전송)"""
+        if not self.exit_watcher:
+            self.scheduler.set_enabled('exit_watcher', False)
+            return
+        
+        tick = mt5.symbol_info_tick(self.config['symbol'])
+        if tick is None:
+            return
+        exits = self.exit_watcher.pop_triggered(tick.bid, tick.ask, time.time())
+        if not exits:
+            return
+        
+        # 다른 경로(브로커 SL/TP, 반대 주문 등)로 이미 사라진 포지션은 보내지 않음 (조회 실패면 그대로 전송)
+        if self.market.positions() is not None:
+            open_tickets = set(self.market.position_book()['ticket'].tolist())
+            exits = [exit_order for exit_order in exits if exit_order.ticket in open_tickets]
+            if not exits:
+                return
+        
+        requests = [{
+            "action": mt5.TRADE_ACTION_DEAL,
+            "symbol": self.config['symbol'],
+            "volume": exit_order.volume,
+            "type": mt5.ORDER_TYPE_SELL if exit_order.side == 'buy' else mt5.ORDER_TYPE_BUY,
+            "position": exit_order.ticket,
+            "deviation": 100,
+            "magic": self.config['magic_number'],
+            "comment": f"MARKET_CLOSE_{exit_order.side.upper()}" if exit_order.reason == 'take_profit'
+                       else f"MARKET_TIMEOUT_{exit_order.side.upper()}",
+        } for exit_order in exits]
+        
+        self.order_placer.symbol = self.config['symbol']
+        report = self.order_placer.execute(requests)
+        self.market.invalidate(*TRADE_KEYS)
+        timeouts = sum(1 for exit_order in exits if exit_order.reason == 'timeout')
+        already_closed = report['retcodes'].get(mt5.TRADE_RETCODE_POSITION_CLOSED, 0)  # 다른 경로에서 먼저 청산됨
+        failed = report['failed'] - already_closed
+        print(f"⚡ Market일괄청산: {report['done']}/{len(exits)}개 "
+              f"(목표가 {len(exits) - timeouts}개, 시간초과 {timeouts}개) @ bid ${tick.bid:.5f} / ask ${tick.ask:.5f}"
+              + (f" | 이미 청산 {already_closed}개" if already_closed else "")
+              + (f" | 실패 {failed}개" if failed > 0 else ""))
+    
     def execute_market_close(self, position_ticket, volume, position_type):
         """🚀 Market 주문으로 즉시 청산"""
         try:
@@ -2617,8 +2412,9 @@ class GridRevolutionaryBot:
                 "comment": f"MARKET_CLOSE_{position_type.upper()}",
             }
             
-            result = mt5.order_send(close_request)
+            result = self.market.order_send(close_request)
             if result and result.retcode == mt5.TRADE_RETCODE_DONE:
+                self.exit_watcher.discard(position_ticket)
                 print(f"⚡ Market즉시청산: #{position_ticket} @ ${result.price:.5f}")
                 return True
             else:
@@ -2630,7 +2426,7 @@ class GridRevolutionaryBot:
             return False
     
     def place_grid_orders(self, grid_data):
-        """🚀 초밀집 그리드 주문 일괄 배치 (천문학적 수익 시스템)"""
+        """🚀 초밀집 그리드 주문 일괄 배치 (벌크 파이프라인)"""
         print("� 초밀집 그리드 주문 일괄 배치 시작!")
         print(f"📊 총 {len(grid_data)}개 레벨 × 2방향 = 최대 {len(grid_data) * 2}개 주문")
         print("⚡ 0.001% 간격으로 촘촘한 그리드 형성 - 천문학적 수익 대기!")
@@ -2641,129 +2437,37 @@ class GridRevolutionaryBot:
             print("❌ 현재가 조회 실패")
             return False
         
-        # 심볼 정보 확인
-        symbol_info = mt5.symbol_info(self.config['symbol'])
-        if not symbol_info:
-            print("❌ 심볼 정보 조회 실패")
-            return False
-        
-        successful_orders = 0
-        failed_orders = 0
-        
-        # 배치 처리를 위한 주문 그룹화 (너무 많으면 분할 처리)
-        batch_size = 100  # 한 번에 100개씩 처리
-        total_batches = (len(grid_data) * 2 + batch_size - 1) // batch_size
-        
-        print(f"📦 배치 처리: {total_batches}개 배치로 분할 처리")
-        
-        # 매수 주문 배치 처리
-        buy_orders = [(level_data['level'], level_data['name'], level_data, level_data['lot_size']) 
-                     for level_data in grid_data if level_data['buy_entry'] < current_price['mid']]
-        
-        print(f"\n🔵 매수 주문 {len(buy_orders)}개 배치 중...")
-        for batch_num in range(0, len(buy_orders), batch_size):
-            batch_orders = buy_orders[batch_num:batch_num + batch_size]
-            print(f"  📦 배치 {batch_num//batch_size + 1}/{(len(buy_orders) + batch_size - 1)//batch_size}: {len(batch_orders)}개 주문")
-            
-            for i, (level, name, level_data, lot_size) in enumerate(batch_orders):
-                # 거래량 정규화
-                min_lot = symbol_info.volume_min
-                max_lot = symbol_info.volume_max
-                lot_step = symbol_info.volume_step
-                lot_size = max(min_lot, min(max_lot, round(lot_size / lot_step) * lot_step))
-                
-                buy_request = {
-                    "action": mt5.TRADE_ACTION_PENDING,
-                    "symbol": self.config['symbol'],
-                    "volume": lot_size,
-                    "type": mt5.ORDER_TYPE_BUY_LIMIT,
-                    "price": level_data['buy_entry'],
-                    "deviation": 100,
-                    "magic": self.config['magic_number'],
-                    "comment": f"DENSE_GRID_BUY_L{level+1:04d}",
-                    "type_time": mt5.ORDER_TIME_GTC,
-                }
-                
-                buy_result = mt5.order_send(buy_request)
-                if buy_result and buy_result.retcode == mt5.TRADE_RETCODE_DONE:
-                    successful_orders += 1
-                    self.grid_positions['buy_orders'][level] = {
-                        'order_id': buy_result.order,
-                        'level_data': level_data,
-                        'timestamp': datetime.now()
-                    }
-                    
-                    # 처음 10개와 마지막 10개만 출력
-                    if i < 10 or i >= len(batch_orders) - 10:
-                        print(f"    ✅ L{level+1:04d}: ${level_data['buy_entry']:.5f} (#{buy_result.order})")
-                    elif i == 10:
-                        print(f"    ... (중간 주문들 생략) ...")
-                else:
-                    failed_orders += 1
-                    if i < 5:  # 처음 5개 실패만 출력
-                        error_code = buy_result.retcode if buy_result else "Unknown"
-                        print(f"    ❌ L{level+1:04d}: 실패 {error_code}")
-                
-                # 너무 빠른 주문 방지
-                if i % 50 == 0:  # 50개마다 잠시 대기
-                    time.sleep(0.1)
-        
-        # 매도 주문 배치 처리
-        sell_orders = [(level_data['level'], level_data['name'], level_data, level_data['lot_size']) 
-                      for level_data in grid_data if level_data['sell_entry'] > current_price['mid']]
-        
-        print(f"\n🔴 매도 주문 {len(sell_orders)}개 배치 중...")
-        for batch_num in range(0, len(sell_orders), batch_size):
-            batch_orders = sell_orders[batch_num:batch_num + batch_size]
-            print(f"  📦 배치 {batch_num//batch_size + 1}/{(len(sell_orders) + batch_size - 1)//batch_size}: {len(batch_orders)}개 주문")
-            
-            for i, (level, name, level_data, lot_size) in enumerate(batch_orders):
-                # 거래량 정규화
-                min_lot = symbol_info.volume_min
-                max_lot = symbol_info.volume_max
-                lot_step = symbol_info.volume_step
-                lot_size = max(min_lot, min(max_lot, round(lot_size / lot_step) * lot_step))
-                
-                sell_request = {
-                    "action": mt5.TRADE_ACTION_PENDING,
-                    "symbol": self.config['symbol'],
-                    "volume": lot_size,
-                    "type": mt5.ORDER_TYPE_SELL_LIMIT,
-                    "price": level_data['sell_entry'],
-                    "deviation": 100,
-                    "magic": self.config['magic_number'],
-                    "comment": f"DENSE_GRID_SELL_L{level+1:04d}",
-                    "type_time": mt5.ORDER_TIME_GTC,
-                }
-                
-                sell_result = mt5.order_send(sell_request)
-                if sell_result and sell_result.retcode == mt5.TRADE_RETCODE_DONE:
-                    successful_orders += 1
-                    self.grid_positions['sell_orders'][level] = {
-                        'order_id': sell_result.order,
-                        'level_data': level_data,
-                        'timestamp': datetime.now()
-                    }
-                    
-                    # 처음 10개와 마지막 10개만 출력
-                    if i < 10 or i >= len(batch_orders) - 10:
-                        print(f"    ✅ L{level+1:04d}: ${level_data['sell_entry']:.5f} (#{sell_result.order})")
-                    elif i == 10:
-                        print(f"    ... (중간 주문들 생략) ...")
-                else:
-                    failed_orders += 1
-                    if i < 5:  # 처음 5개 실패만 출력
-                        error_code = sell_result.retcode if sell_result else "Unknown"
-                        print(f"    ❌ L{level+1:04d}: 실패 {error_code}")
-                
-                # 너무 빠른 주문 방지
-                if i % 50 == 0:  # 50개마다 잠시 대기
-                    time.sleep(0.1)
+        # 현재가 아래 매수 / 위 매도 레벨만 (배열 마스크로 한 번에 선별)
+        buy_idx = np.flatnonzero(grid_data.buy_entry < current_price['mid'])
+        sell_idx = np.flatnonzero(grid_data.sell_entry > current_price['mid'])
+        print(f"\n🔵 매수 주문 {len(buy_idx)}개 + 🔴 매도 주문 {len(sell_idx)}개 파이프라인 배치 중...")
         
+        self.order_placer.symbol = self.config['symbol']
+        try:
+            report = self.order_placer.place_limit_grid(
+                grid_data.buy_entry[buy_idx], grid_data.sell_entry[sell_idx],
+                comment_format='DENSE_GRID_{side}_L{label:04d}',
+                buy_volumes=grid_data.lot_size[buy_idx], sell_volumes=grid_data.lot_size[sell_idx],
+                buy_labels=grid_data.level[buy_idx] + 1, sell_labels=grid_data.level[sell_idx] + 1,
+            )
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            return False
+        finally:
+            self.market.invalidate(*TRADE_KEYS)
+        
+        # 성공한 주문 등록 (레벨 맵 + ticket 인덱스)
+        tickets = report['tickets']
+        for k in report['buy_index']:
+            i = buy_idx[k]
+            self.register_grid_order('buy', int(grid_data.level[i]), int(tickets[k]), grid_data[i])
+        for k in report['sell_index']:
+            i = sell_idx[k]
+            self.register_grid_order('sell', int(grid_data.level[i]), int(tickets[k + len(buy_idx)]), grid_data[i])
+        
+        successful_orders = report['placed']
+        print_placement_report(report)
         print(f"\n🔥 초밀집 그리드 배치 완료!")
-        print(f"  ✅ 성공: {successful_orders}개 주문")
-        print(f"  ❌ 실패: {failed_orders}개 주문")
-        print(f"  📊 성공률: {successful_orders/(successful_orders+failed_orders)*100:.1f}%")
         
         if successful_orders > 0:
             print(f"🚀 {successful_orders}개 초밀집 주문이 활성화!")
@@ -2830,34 +2534,34 @@ class GridRevolutionaryBot:
     
     def monitor_grid_positions(self):
         """📊 그리드 포지션 모니터링 + 완전 자동 청산"""
-        # 대기 주문 확인
-        pending_orders = mt5.orders_get(symbol=self.config['symbol'])
-        active_positions = mt5.positions_get(symbol=self.config['symbol'])
+        # 이번 루프 스냅샷 (모든 서브시스템이 같은 값 공유 - 터미널 조회는 종류별 1회)
+        self.market.refresh(self.config['symbol'])
+        pending_orders = self.market.orders()
+        active_positions = self.market.positions()
         
-        current_price = self.get_current_price()
+        current_price = self.market.price()
         if not current_price:
             return
         
-        # 체결된 주문 확인 및 자동 청산 처리
+        # 체결된 주문 확인 (이전 스냅샷과 ticket 집합 비교 - 사라진 주문만 확인)
+        # orders_get 실패(None)면 전부 체결로 오인하지 않도록 이번 루프는 건너뜀
         filled_orders = []
-        for level, order_info in list(self.grid_positions['buy_orders'].items()):
-            order_id = order_info['order_id']
-            if not any(order.ticket == order_id for order in pending_orders or []):
-                # 주문이 체결됨 - 자동 청산 처리
-                filled_orders.append(('buy', level, order_info))
-                del self.grid_positions['buy_orders'][level]
-        
-        for level, order_info in list(self.grid_positions['sell_orders'].items()):
-            order_id = order_info['order_id']
-            if not any(order.ticket == order_id for order in pending_orders or []):
-                # 주문이 체결됨 - 자동 청산 처리
-                filled_orders.append(('sell', level, order_info))
-                del self.grid_positions['sell_orders'][level]
-        
-        # 체결된 주문 처리 및 즉시 청산
+        if pending_orders is not None:
+            order_diff = self.order_tracker.update(pending_orders)
+            for ticket, _, tag in order_diff.filled:
+                order_info = self.pop_grid_order(ticket, tag)
+                if order_info:
+                    # 주문이 체결됨 - 자동 청산 처리
+                    filled_orders.append((tag[0], tag[1], order_info))
+            for ticket, _, tag in order_diff.cancelled:
+                self.pop_grid_order(ticket, tag)   # 직접 취소한 그리드 주문은 체결 처리 없이 정리
+        
+        # 체결된 주문 처리 및 즉시 청산 (거래가 있었으면 포지션은 청산/재배치 후 상태로 다시 조회)
         for order_type, level, order_info in filled_orders:
             level_data = order_info['level_data']
             self.process_filled_order(order_type, level, level_data, current_price)
+        if filled_orders:
+            active_positions = self.market.positions()
         
         # 활성 포지션 자동 청산 모니터링
         if active_positions:
@@ -2875,23 +2579,42 @@ class GridRevolutionaryBot:
         # 🚀 혁명적 동적 그리드 시스템 (새로 추가!)
         self.revolutionary_dynamic_grid_system(current_price)
         
-        # 실시간 상태 표시
+        # 실시간 상태 표시 - 포지션은 위 기법들의 거래 후 상태 (대기주문 수는 표시용이라 루프 시작 스냅샷 그대로)
         total_pending = len(pending_orders or [])
-        total_positions = len(active_positions or [])
+        total_positions = len(self.market.positions() or [])
         
         if total_pending > 0 or total_positions > 0:
-            unrealized_profit = sum(
-                (current_price['bid'] - pos.price_open) * pos.volume if pos.type == mt5.ORDER_TYPE_BUY
-                else (pos.price_open - current_price['ask']) * pos.volume
-                for pos in (active_positions or [])
-            )
+            book = self.market.position_book()
+            unrealized_profit = float(position_pnl(book, current_price['bid'], current_price['ask']).sum())
             
             print(f"📊 그리드 상태: 대기주문 {total_pending}개 | 활성포지션 {total_positions}개 | 미실현 ${unrealized_profit:+.2f}")
     
+    def register_grid_order(self, order_type, level, ticket, level_data):
+        """📌 그리드 주문 등록 (레벨 맵 + ticket 인덱스)"""
+        self.grid_positions[f'{order_type}_orders'][level] = {
+            'order_id': ticket,
+            'level_data': level_data,
+            'timestamp': datetime.now()
+        }
+        self.order_tracker.track(ticket, (order_type, level))
+    
+    def pop_grid_order(self, ticket, tag):
+        """사라진 주문이 해당 레벨의 현재 그리드 주문이면 레벨 맵에서 제거 후 반환
+
+        재배치에서 떨어져 나온 주문은 ticket 으로 찾음 (태그는 예전 레벨 그대로)
+        """
+        if not tag:
+            return None
+        orders = self.grid_positions[f'{tag[0]}_orders']
+        order_info = orders.get(tag[1])
+        if order_info and order_info['order_id'] == ticket:
+            return orders.pop(tag[1])
+        return self.grid_positions['detached_orders'].pop(ticket, None)
+    
     def process_filled_order(self, order_type, level, level_data, current_price):
         """🎯 체결된 주문 처리 및 자동 청산"""
         level_name = level_data['name']
-        expected_profit = level_data[f'{order_type}_profit']
+        expected_profit = level_data['profit_per_trade']
         
         print(f"🎯 레벨 {level+1} {level_name} {order_type.upper()} 주문 체결!")
         print(f"   예상수익: ${expected_profit:.2f}")
@@ -2910,7 +2633,7 @@ class GridRevolutionaryBot:
         """⚡ 즉시 청산 주문 배치 (오류 수정)"""
         try:
             # 심볼 정보 다시 확인
-            symbol_info = mt5.symbol_info(self.config['symbol'])
+            symbol_info = self.market.symbol_info()
             if not symbol_info:
                 print(f"   ❌ 심볼 정보 조회 실패")
                 return
@@ -2949,7 +2672,7 @@ class GridRevolutionaryBot:
                 }
                 close_type = "매수"
             
-            result = mt5.order_send(close_request)
+            result = self.market.order_send(close_request)
             if result and result.retcode == mt5.TRADE_RETCODE_DONE:
                 actual_price = result.price if hasattr(result, 'price') else current_price['mid']
                 profit = self.calculate_trade_profit(order_type, level_data, actual_price)
@@ -2991,7 +2714,7 @@ class GridRevolutionaryBot:
     def force_close_position_by_symbol(self, volume, order_type):
         """🔧 포지션 강제 청산 (백업 방법)"""
         try:
-            positions = mt5.positions_get(symbol=self.config['symbol'])
+            positions = self.market.positions()
             if not positions:
                 return
             
@@ -3011,8 +2734,9 @@ class GridRevolutionaryBot:
                         "comment": "FORCE_CLOSE_BACKUP",
                     }
                     
-                    result = mt5.order_send(close_request)
+                    result = self.market.order_send(close_request)
                     if result and result.retcode == mt5.TRADE_RETCODE_DONE:
+                        self.exit_watcher.discard(position.ticket)
                         print(f"   🔧 백업 청산 성공: 포지션#{position.ticket}")
                         return True
             
@@ -3044,15 +2768,11 @@ class GridRevolutionaryBot:
                         "type_time": mt5.ORDER_TIME_GTC,
                     }
                     
-                    result = mt5.order_send(new_request)
+                    result = self.market.order_send(new_request)
                     if result and result.retcode == mt5.TRADE_RETCODE_DONE:
                         print(f"   🔄 새 매수주문 배치: ${new_buy_price:.2f} (주문#{result.order})")
                         # 내부 데이터 업데이트
-                        self.grid_positions['buy_orders'][level] = {
-                            'order_id': result.order,
-                            'level_data': level_data,
-                            'timestamp': datetime.now()
-                        }
+                        self.register_grid_order('buy', level, result.order, level_data)
             else:
                 # 매도 주문이 체결되었으므로 새로운 매도 주문 배치
                 new_sell_price = current_price['mid'] + (current_price['mid'] * level_data['distance_pct'])
@@ -3071,15 +2791,11 @@ class GridRevolutionaryBot:
                     "type_time": mt5.ORDER_TIME_GTC,
                 }
                 
-                result = mt5.order_send(new_request)
+                result = self.market.order_send(new_request)
                 if result and result.retcode == mt5.TRADE_RETCODE_DONE:
                     print(f"   🔄 새 매도주문 배치: ${new_sell_price:.2f} (주문#{result.order})")
                     # 내부 데이터 업데이트
-                    self.grid_positions['sell_orders'][level] = {
-                        'order_id': result.order,
-                        'level_data': level_data,
-                        'timestamp': datetime.now()
-                    }
+                    self.register_grid_order('sell', level, result.order, level_data)
                     
         except Exception as e:
             print(f"   ❌ 재배치 오류: {e}")
@@ -3153,8 +2869,9 @@ class GridRevolutionaryBot:
                 "comment": f"AUTO_{reason}",
             }
             
-            result = mt5.order_send(close_request)
+            result = self.market.order_send(close_request)
             if result and result.retcode == mt5.TRADE_RETCODE_DONE:
+                self.exit_watcher.discard(position.ticket)
                 actual_price = result.price if hasattr(result, 'price') else market_price
                 print(f"⚡ 자동청산: #{position.ticket} | ${actual_price:.2f} | ${profit:+.2f} | {reason}")
                 
@@ -3195,6 +2912,15 @@ class GridRevolutionaryBot:
         if abs(current_price['mid'] - self.current_baseline) / self.current_baseline > 0.03:
             print(f"\n🔄 기준가 업데이트: ${self.current_baseline:,.2f} → ${current_price['mid']:,.2f}")
             
+            grid_data = self.visualization_data['grid_levels']
+            if self.config['incremental_recenter'] and grid_data.params:
+                # 🔁 같은 간격 격자 위로 중심만 이동 → 바뀐 주문만 처리 (포지션/나머지 주문 유지)
+                grid_data = grid_data.recentered(current_price['mid'])
+                self.current_baseline = grid_data.params['baseline_price']
+                self.visualization_data['grid_levels'] = grid_data
+                self.rebalance_grid_orders(grid_data, current_price)
+                return
+            
             # 기존 대기 주문 취소 (개선된 정리 함수 사용)
             self.cleanup_all_positions_and_orders()
             
@@ -3204,6 +2930,143 @@ class GridRevolutionaryBot:
             self.visualization_data['grid_levels'] = grid_data  # 시각화용 업데이트
             self.place_grid_orders(grid_data)
     
+    def rebalance_grid_orders(self, grid_data, current_price):
+        """🔁 증분 재배치 - 새 레벨 가격과 다른 주문만 취소/수정/추가
+
+        가격이 같은 주문은 그대로 두고 새 레벨 번호로만 다시 등록.
+        수정(TRADE_ACTION_MODIFY)은 주문 유형을 못 바꾸므로 매수/매도 따로 계획.
+        """
+        started = time.time()
+        symbol_info = self.market.symbol_info()
+        tick_size = (symbol_info.trade_tick_size or symbol_info.point) if symbol_info else 0.01
+        
+        requests, kinds, plans = [], [], {}
+        infos = {}
+        for side in ('buy', 'sell'):
+            orders = self.grid_positions[f'{side}_orders']
+            infos[side] = list(orders.values())
+            tickets = [order_info['order_id'] for order_info in infos[side]]
+            snapshots = [self.order_tracker.get(t) for t in tickets]
+            prices = np.array([snap.price_open if snap else order_info['level_data'][f'{side}_entry']
+                               for snap, order_info in zip(snapshots, orders.values())], dtype=np.float64)
+            
+            entries = grid_data.column(f'{side}_entry')
+            targets = np.flatnonzero(entries < current_price['mid'] if side == 'buy'
+                                     else entries > current_price['mid'])
+            target_prices = np.round(np.round(entries[targets] / tick_size) * tick_size, 8)
+            plan = plan_rebalance(prices, target_prices, tick_size)
+            plans[side] = (tickets, snapshots, prices, targets, target_prices, plan)
+            
+            for k in plan.cancel:
+                requests.append({"action": mt5.TRADE_ACTION_REMOVE, "order": tickets[k]})
+                kinds.append((side, 'cancel', k))
+            for k, t in plan.modify:
+                # SL/TP 가 있던 주문(재배치 주문)은 같은 거리만큼 함께 이동
+                shift = target_prices[t] - prices[k]
+                snap = snapshots[k]
+                requests.append({
+                    "action": mt5.TRADE_ACTION_MODIFY,
+                    "order": tickets[k],
+                    "price": float(target_prices[t]),
+                    "sl": float(snap.sl + shift) if snap and snap.sl else 0.0,
+                    "tp": float(snap.tp + shift) if snap and snap.tp else 0.0,
+                    "type_time": mt5.ORDER_TIME_GTC,
+                })
+                kinds.append((side, 'modify', (k, t)))
+        
+        self.order_placer.symbol = self.config['symbol']
+        report = self.order_placer.execute(requests)
+        self.market.invalidate(*TRADE_KEYS)
+        done = report['status'] == STATUS_PLACED
+        
+        # 결과 반영 - 확인된 변경만 새 레벨 번호로 다시 구성
+        # 취소/수정 실패 주문 (대부분 이미 체결) 은 예전 레벨 정보 그대로 떼어 두고
+        # 모니터링의 체결 경로 (pop_grid_order → process_filled_order) 에서 처리
+        counts = defaultdict(int)
+        new_maps = {'buy': {}, 'sell': {}}
+        add_targets = {'buy': [], 'sell': []}
+        detached = self.grid_positions['detached_orders']
+        for (side, kind, key), ok in zip(kinds, done):
+            tickets, _, _, targets, _, _ = plans[side]
+            if kind == 'cancel':
+                if ok:
+                    self.order_tracker.note_cancelled(tickets[key])
+                    counts['cancelled'] += 1
+                else:
+                    detached[tickets[key]] = infos[side][key]
+                    counts['failed'] += 1
+            elif ok:
+                new_maps[side][int(targets[key[1]])] = tickets[key[0]]
+                counts['modified'] += 1
+            else:
+                detached[tickets[key[0]]] = infos[side][key[0]]
+                add_targets[side].append(key[1])   # 수정 실패 → 그 레벨은 새로 배치
+                counts['failed'] += 1
+        
+        for side in ('buy', 'sell'):
+            tickets, _, _, targets, _, plan = plans[side]
+            for k, t in plan.keep:
+                new_maps[side][int(targets[t])] = tickets[k]
+            counts['kept'] += len(plan.keep)
+            add_targets[side] = np.concatenate([plan.add, add_targets[side]]).astype(np.int64)
+        
+        buy_idx = plans['buy'][3][add_targets['buy']]
+        sell_idx = plans['sell'][3][add_targets['sell']]
+        if len(buy_idx) or len(sell_idx):
+            try:
+                placement = self.order_placer.place_limit_grid(
+                    grid_data.buy_entry[buy_idx], grid_data.sell_entry[sell_idx],
+                    comment_format='DENSE_GRID_{side}_L{label:04d}',
+                    buy_volumes=grid_data.lot_size[buy_idx], sell_volumes=grid_data.lot_size[sell_idx],
+                    buy_labels=grid_data.level[buy_idx] + 1, sell_labels=grid_data.level[sell_idx] + 1,
+                )
+            except RuntimeError as e:
+                print(f"❌ {e}")
+            else:
+                tickets = placement['tickets']
+                for k in placement['buy_index']:
+                    new_maps['buy'][int(buy_idx[k])] = int(tickets[k])
+                for k in placement['sell_index']:
+                    new_maps['sell'][int(sell_idx[k])] = int(tickets[k + len(buy_idx)])
+                counts['added'] += placement['placed']
+                counts['failed'] += placement['failed']
+                report['requested'] += placement['requested'] - placement['skipped']
+            finally:
+                self.market.invalidate(*TRADE_KEYS)
+        
+        for side in ('buy', 'sell'):
+            self.grid_positions[f'{side}_orders'].clear()
+            for i, ticket in new_maps[side].items():
+                self.register_grid_order(side, i, ticket, grid_data[i])
+        
+        previous = len(plans['buy'][0]) + len(plans['sell'][0])
+        full_rebuild = previous + len(plans['buy'][3]) + len(plans['sell'][3])
+        print(f"🔁 증분 재배치 완료 ({time.time() - started:.2f}초): "
+              f"유지 {counts['kept']}개 | 수정 {counts['modified']}개 | 추가 {counts['added']}개 | "
+              f"취소 {counts['cancelled']}개 | 실패 {counts['failed']}개")
+        print(f"📨 요청 {report['requested']}건 (전체 재구성이면 {full_rebuild}건 + 포지션 강제 청산) | 포지션 유지")
+        return counts
+    
+    def print_grid_status(self):
+        """📊 실시간 상태 표시 (스케줄러가 15초마다 호출)"""
+        account_info = self.market.account()
+        current_price = self.market.price()
+        
+        if account_info and current_price:
+            profit = account_info.equity - account_info.balance
+            completed_trades = len(self.grid_positions['completed_trades'])
+            total_profit_from_trades = sum(trade['profit'] for trade in self.grid_positions['completed_trades'])
+            winning_trades = sum(1 for trade in self.grid_positions['completed_trades'] if trade['profit'] > 0)
+            
+            print(f"[{datetime.now().strftime('%H:%M:%S')}] "
+                  f"{self.config['symbol']}: ${current_price['mid']:,.2f} | "
+                  f"기준가: ${self.current_baseline:,.2f} | "
+                  f"계좌손익: ${profit:+.2f} | "
+                  f"거래수익: ${total_profit_from_trades:+.2f} | "
+                  f"완료: {completed_trades}회 | "
+                  f"성공: {winning_trades}회 | "
+                  f"💡 'q' 입력시 청산메뉴")
+    
     def cleanup_all_positions_and_orders(self):
         """🗑️ 모든 기존 포지션과 주문 완전 삭제"""
         print("\n🗑️ 기존 포지션 및 주문 완전 정리 시작...")
@@ -3217,8 +3080,9 @@ class GridRevolutionaryBot:
                     "action": mt5.TRADE_ACTION_REMOVE,
                     "order": order.ticket,
                 }
-                result = mt5.order_send(cancel_request)
+                result = self.market.order_send(cancel_request)
                 if result and result.retcode == mt5.TRADE_RETCODE_DONE:
+                    self.order_tracker.note_cancelled(order.ticket)
                     print(f"  ✅ 주문 #{order.ticket} 취소 완료")
                 else:
                     print(f"  ❌ 주문 #{order.ticket} 취소 실패: {result.retcode if result else 'Unknown'}")
@@ -3239,8 +3103,9 @@ class GridRevolutionaryBot:
                     "comment": "FORCE_CLOSE_ALL",
                 }
                 
-                result = mt5.order_send(close_request)
+                result = self.market.order_send(close_request)
                 if result and result.retcode == mt5.TRADE_RETCODE_DONE:
+                    self.exit_watcher.discard(position.ticket)
                     print(f"  ✅ 포지션 #{position.ticket} 청산 완료")
                 else:
                     print(f"  ❌ 포지션 #{position.ticket} 청산 실패: {result.retcode if result else 'Unknown'}")
@@ -3248,6 +3113,7 @@ class GridRevolutionaryBot:
         # 3. 내부 데이터 초기화
         self.grid_positions['buy_orders'].clear()
         self.grid_positions['sell_orders'].clear()
+        self.grid_positions['detached_orders'].clear()
         self.grid_positions['active_positions'].clear()
         self.grid_positions['completed_trades'].clear()
         
@@ -3339,51 +3205,18 @@ class GridRevolutionaryBot:
         else:
             print("시각화 없이 진행합니다.")
         
-        last_update_time = 0
-        last_viz_update = 0
+        # 주기 작업 등록 (모니터링 1초, 그리드 업데이트 3분, 시각화 1초, 상태 15초, 동적 그리드 기법들)
+        self.register_scheduled_tasks()
         
         try:
             while True:
-                current_time = time.time()
-                
                 # 사용자 입력 체크 (비동기)
                 if self.check_user_input():
                     break  # 사용자가 청산을 선택하면 종료
                 
-                # 그리드 포지션 모니터링 (더 자주 - 1초마다)
-                self.monitor_grid_positions()
-                
-                # 3분마다 그리드 업데이트 확인 (더 자주)
-                if current_time - last_update_time > 180:
-                    self.update_grid_system()
-                    last_update_time = current_time
-                
-                # 1초마다 시각화 데이터 업데이트 (더 자주)
-                if current_time - last_viz_update > 1:
-                    self.update_visualization_data()
-                    last_viz_update = current_time
-                
-                # 실시간 상태 표시 (15초마다)
-                if current_time % 15 < 1:
-                    account_info = mt5.account_info()
-                    current_price = self.get_current_price()
-                    
-                    if account_info and current_price:
-                        profit = account_info.equity - account_info.balance
-                        completed_trades = len(self.grid_positions['completed_trades'])
-                        total_profit_from_trades = sum(trade['profit'] for trade in self.grid_positions['completed_trades'])
-                        winning_trades = sum(1 for trade in self.grid_positions['completed_trades'] if trade['profit'] > 0)
-                        
-                        print(f"[{datetime.now().strftime('%H:%M:%S')}] "
-                              f"{self.config['symbol']}: ${current_price['mid']:,.2f} | "
-                              f"기준가: ${self.current_baseline:,.2f} | "
-                              f"계좌손익: ${profit:+.2f} | "
-                              f"거래수익: ${total_profit_from_trades:+.2f} | "
-                              f"완료: {completed_trades}회 | "
-                              f"성공: {winning_trades}회 | "
-                              f"💡 'q' 입력시 청산메뉴")
-                
-                time.sleep(1)  # 1초마다 체크 (더 빠른 반응)
+                # 마감이 지난 작업 실행 후 다음 마감까지 대기 (키 입력은 최소 1초마다 확인)
+                self.scheduler.run_pending()
+                self.scheduler.sleep_until_next(max_sleep=1.0)
                 
         except KeyboardInterrupt:
             print("\n\n🛑 시스템 중단 요청됨")
@@ -3425,6 +3258,8 @@ class GridRevolutionaryBot:
         if account_info:
             total_profit = account_info.equity - account_info.balance
             print(f"  💰 총 손익: ${total_profit:+.2f}")
+        print(f"  📸 시장 스냅샷: {self.market.summary()}")
+        print_schedule_report(self.scheduler)
         
         # 레벨별 통계
         print(f"\n📊 레벨별 성과:")
@@ -3435,7 +3270,7 @@ class GridRevolutionaryBot:
                 print(f"  레벨 {level+1} ({level_name}, ±{distance_pct*100:.1f}%): {stats['trades']}회, ${stats['profit']:+.2f}")
         
         # 무제한 수익 달성 여부
-        unlimited_levels = [i for i, level in enumerate(self.config['unlimited_grid_levels']) if level['distance_pct'] >= 1.0]
+        unlimited_levels = np.flatnonzero(self.config['unlimited_grid_levels'].distance_pct >= 1.0)
         if any(self.stats['level_stats'][level]['trades'] > 0 for level in unlimited_levels):
             print(f"\n🚀 무제한 수익 레벨 달성!")
             for level in unlimited_levels:
@@ -12,6 +12,8 @@ import sys
 import json
 import os
 
+from Trade_Journal import TradeJournal
+
 # ==================== Instant Funding 규칙 설정 ====================
 INSTANT_FUNDING_CONFIG = {
     # 거래 설정
@@ -44,31 +46,34 @@ class InstantFundingTrader:
         self.trading_days = set()  # 거래한 날짜 저장
         self.daily_trades = {}      # 일별 거래 횟수
         self.session_file = 'instant_funding_session.json'
+        self.journal = TradeJournal(self.session_file)   # 저장마다 바뀐 항목만 추가 기록
         
         # 세션 데이터 로드
         self.load_session()
         
     def load_session(self):
         """이전 세션 데이터 로드"""
-        if os.path.exists(self.session_file):
-            try:
-                with open(self.session_file, 'r') as f:
-                    data = json.load(f)
-                    self.trading_days = set(data.get('trading_days', []))
-                    self.total_profit = data.get('total_profit', 0.0)
-                    print(f"✓ 세션 복원: {len(self.trading_days)}일 거래 완료, 누적 수익: ${self.total_profit:.2f}")
-            except:
-                pass
+        try:
+            # 스냅샷(기존 세션 파일) + 저널 재생
+            data = self.journal.load()
+            if data:
+                self.trading_days = set(data.get('trading_days', []))
+                self.total_profit = data.get('total_profit', 0.0)
+                print(f"✓ 세션 복원: {len(self.trading_days)}일 거래 완료, 누적 수익: ${self.total_profit:.2f}")
+        except:
+            pass
     
-    def save_session(self):
-        """세션 데이터 저장"""
+    def save_session(self, compact=False):
+        """세션 데이터 저장 - 저널에 바뀐 항목만 한 줄 추가 (compact=True 면 전체 스냅샷으로 압축)"""
         data = {
-            'trading_days': list(self.trading_days),
+            'trading_days': sorted(self.trading_days),   # 날짜순 → 새 거래일은 뒤에 추가
             'total_profit': self.total_profit,
             'last_update': datetime.now().isoformat()
         }
-        with open(self.session_file, 'w') as f:
-            json.dump(data, f, indent=2)
+        if compact:
+            self.journal.snapshot(data)
+        else:
+            self.journal.record(data)
     
     def connect(self):
         """MT5 연결 (Instant Funding 계정)"""
@@ -445,6 +450,7 @@ class InstantFundingTrader:
             traceback.print_exc()
         
         finally:
+            self.save_session(compact=True)
             mt5.shutdown()
             print("\nMT5 연결 종료\n")
 
@@ -0,0 +1,162 @@
+"""
+🔁 MT5 리플레이 러너 - 실제 봇 코드를 오프라인 시뮬레이터 위에서 실행
+- 봇 코드는 그대로, MetaTrader5 만 MT5_Simulator 로 교체
+- 기록된 틱(CSV/.npy) 또는 합성 틱으로 처리량/지연 측정
+- Linux 빌드 서버에서도 실행 가능 (msvcrt 없으면 봇 모듈에만 헤드리스 콘솔 연결)
+
+💡 사용법:
+    python MT5_Replay.py --bot main --ticks btcusd_ticks.csv
+    python MT5_Replay.py --bot Grid_Revolutionary_Bot --synthetic 1000000
+    python MT5_Replay.py --bot minn --synthetic 500000 --mode tick --ticks-per-sleep 5
+"""
+
+import io
+import time
+import types
+import argparse
+import importlib
+import importlib.util
+import contextlib
+
+import numpy as np
+
+import MT5_Simulator
+
+# 봇별 실행 방법 (스크립트 입력 + 진입점)
+GRID_FAMILY = ('main', 'live', 'live2', 'fix', 'final', 'final_', 'minn')
+
+
+def _grid_revolutionary_entry(module, symbol):
+    bot = module.GridRevolutionaryBot()
+    bot.config['symbol'] = symbol
+    if not bot.connect_mt5():
+        return None
+    bot.run_grid_system()
+    return bot
+
+
+def _module_main_entry(module, symbol):
+    module.GRID_CONFIG['symbol'] = symbol
+    module.main()
+    return None
+
+
+def bot_profile(name, symbol):
+    """봇 이름 → (스크립트 입력, 진입 함수)"""
+    if name == 'Grid_Revolutionary_Bot':
+        # 심볼 직접입력 → 정리 안 함 → 표준 밀집도 → 시각화 없음 → 종료시 청산 없음
+        return ['99', symbol, 'n', '3', '0', '3'], _grid_revolutionary_entry
+    if name == 'live2':
+        return ['n', 'y'], _module_main_entry
+    if name in GRID_FAMILY:
+        return ['y'], _module_main_entry
+    raise ValueError(f"지원하지 않는 봇: {name}")
+
+
+def _attach_headless_console(module):
+    """msvcrt 가 없는 환경(Linux)에서는 대상 모듈에만 키 입력이 없는 헤드리스 콘솔 연결
+
+    sys.modules 에 가짜 msvcrt 를 넣으면 subprocess 등이 Windows 로 판단해 pandas import 가 깨지므로
+    대상 모듈의 참조만 바꿈 (Grid_Engine 은 WINDOWS 플래그도 같이 → msvcrt 경로로 키 확인)
+    """
+    if importlib.util.find_spec('msvcrt') is not None:
+        return
+    module.msvcrt = types.SimpleNamespace(kbhit=lambda: False, getch=lambda: b'')
+    if hasattr(module, 'WINDOWS'):
+        module.WINDOWS = True
+
+
+def run_replay(bot_name, ticks, symbol='BTCUSD', mode='time', ticks_per_sleep=1,
+               balance=10000.0, leverage=100, quiet=True, **symbol_spec):
+    """🔁 봇 하나를 틱 리플레이로 실행하고 처리량/지연 리포트 반환"""
+    sim = MT5_Simulator.reset(balance=balance, leverage=leverage)
+    sim.load_ticks(symbol, ticks, **symbol_spec)
+    MT5_Simulator.install()
+
+    inputs, entry = bot_profile(bot_name, symbol)
+    sink = io.StringIO() if quiet else None
+    with contextlib.redirect_stdout(sink) if quiet else contextlib.nullcontext():
+        module = importlib.import_module(bot_name)
+        # 그리드 스크립트는 설정만 가지고 있고 루프/입력은 공용 엔진에 있음
+        target = importlib.import_module('Grid_Engine') if bot_name in GRID_FAMILY else module
+        clock = MT5_Simulator.patch_module(target, inputs=inputs, mode=mode,
+                                           ticks_per_sleep=ticks_per_sleep)
+        _attach_headless_console(target)
+        start = time.perf_counter()
+        error = None
+        try:
+            entry(module, symbol)
+        except (MT5_Simulator.ReplayFinished, SystemExit, EOFError) as e:
+            error = None if isinstance(e, MT5_Simulator.ReplayFinished) else repr(e)
+        elapsed = time.perf_counter() - start
+
+    return build_report(bot_name, sim, clock, elapsed, error)
+
+
+def build_report(bot_name, sim, clock, elapsed, error=None):
+    """📊 리플레이 결과 요약"""
+    loop_times = np.asarray(clock.loop_times, dtype=np.float64)
+    account = sim.account_info()
+    report = {
+        'bot': bot_name,
+        'ticks': sim.ticks_processed,
+        'elapsed_sec': elapsed,
+        'ticks_per_min': sim.ticks_processed / elapsed * 60 if elapsed > 0 else 0.0,
+        'loop_iterations': clock.sleep_calls,
+        'loop_p50_ms': float(np.percentile(loop_times, 50) * 1000) if len(loop_times) else 0.0,
+        'loop_p99_ms': float(np.percentile(loop_times, 99) * 1000) if len(loop_times) else 0.0,
+        'deals': len(sim.deals),
+        'open_positions': len(sim.positions),
+        'pending_orders': len(sim.orders),
+        'balance': account.balance,
+        'equity': account.equity,
+        'api_calls': MT5_Simulator.call_stats(),
+        'error': error,
+    }
+    return report
+
+
+def print_report(report):
+    print("\n" + "="*70)
+    print(f"  🔁 리플레이 결과: {report['bot']}")
+    print("="*70)
+    print(f"틱: {report['ticks']:,}개 | 소요: {report['elapsed_sec']:.2f}초 | "
+          f"처리량: {report['ticks_per_min']:,.0f} 틱/분")
+    print(f"루프: {report['loop_iterations']:,}회 | "
+          f"p50 {report['loop_p50_ms']:.3f}ms | p99 {report['loop_p99_ms']:.3f}ms")
+    print(f"체결: {report['deals']:,}건 | 보유 포지션: {report['open_positions']:,}개 | "
+          f"대기주문: {report['pending_orders']:,}개")
+    print(f"잔고: ${report['balance']:,.2f} | 자산: ${report['equity']:,.2f}")
+    print("\n📡 API 호출 (횟수 / 평균 지연):")
+    for name, (count, avg_us) in sorted(report['api_calls'].items(), key=lambda kv: -kv[1][0]):
+        print(f"  {name:22s} {count:>10,}회  {avg_us:8.2f}µs")
+    if report['error']:
+        print(f"\n⚠️ 종료 사유: {report['error']}")
+    print("="*70)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MT5 오프라인 틱 리플레이")
+    parser.add_argument('--bot', default='main', help="Grid_Revolutionary_Bot 또는 main/live/live2/fix/final/final_/minn")
+    parser.add_argument('--symbol', default='BTCUSD')
+    parser.add_argument('--ticks', help="틱 파일 (.csv / .npy / .npz)")
+    parser.add_argument('--synthetic', type=int, default=0, help="합성 틱 개수")
+    parser.add_argument('--mode', choices=['time', 'tick'], default='time')
+    parser.add_argument('--ticks-per-sleep', type=int, default=1)
+    parser.add_argument('--balance', type=float, default=10000.0)
+    parser.add_argument('--verbose', action='store_true', help="봇 출력 표시")
+    args = parser.parse_args()
+
+    if args.ticks:
+        ticks = args.ticks
+    else:
+        ticks = MT5_Simulator.generate_ticks(args.synthetic or 100000, seed=42)
+
+    report = run_replay(args.bot, ticks, symbol=args.symbol, mode=args.mode,
+                        ticks_per_sleep=args.ticks_per_sleep, balance=args.balance,
+                        quiet=not args.verbose)
+    print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1458 @@
+"""
+🧪 MetaTrader5 오프라인 대체 모듈 - 틱 리플레이 시뮬레이터 🧪
+- 기록된 틱을 재생하면서 LIMIT/STOP 대기 주문 체결
+- 포지션 / 증거금 / 거래내역(deal) 추적
+- 실제 MetaTrader5 와 같은 namedtuple 형태 결과 + 같은 retcode
+- 가상 시계(time.sleep / time.time / datetime.now)로 실시간 대기 없이 재생
+
+💡 사용법:
+    import MT5_Simulator
+    MT5_Simulator.load_ticks('BTCUSD', 'btcusd_ticks.csv')
+    MT5_Simulator.install()              # import MetaTrader5 → 시뮬레이터
+    import main                          # 봇은 코드 수정 없이 시뮬레이터 사용
+    MT5_Simulator.patch_module(main)     # 봇의 time/datetime 을 가상 시계로 교체
+
+⚡ 성능 포인트:
+- 틱 윈도우 단위 NumPy 처리 (min/max 한 번으로 체결 여부 판단)
+- 대기주문/SL·TP 최근접 가격 캐시 → 체결 없는 틱은 O(1)
+- 미실현 손익/증거금은 심볼별 누적합으로 O(1) 계산
+"""
+
+import sys
+import time as _time
+import threading
+import fnmatch
+from collections import namedtuple, defaultdict
+from datetime import datetime as _datetime
+
+import numpy as np
+
+# ==================== 상수 (MetaTrader5 와 동일한 값) ====================
+TRADE_ACTION_DEAL = 1
+TRADE_ACTION_PENDING = 5
+TRADE_ACTION_SLTP = 6
+TRADE_ACTION_MODIFY = 7
+TRADE_ACTION_REMOVE = 8
+TRADE_ACTION_CLOSE_BY = 10
+
+ORDER_TYPE_BUY = 0
+ORDER_TYPE_SELL = 1
+ORDER_TYPE_BUY_LIMIT = 2
+ORDER_TYPE_SELL_LIMIT = 3
+ORDER_TYPE_BUY_STOP = 4
+ORDER_TYPE_SELL_STOP = 5
+ORDER_TYPE_BUY_STOP_LIMIT = 6
+ORDER_TYPE_SELL_STOP_LIMIT = 7
+ORDER_TYPE_CLOSE_BY = 8
+
+ORDER_STATE_STARTED = 0
+ORDER_STATE_PLACED = 1
+ORDER_STATE_CANCELED = 2
+ORDER_STATE_PARTIAL = 3
+ORDER_STATE_FILLED = 4
+ORDER_STATE_REJECTED = 5
+ORDER_STATE_EXPIRED = 6
+
+ORDER_TIME_GTC = 0
+ORDER_TIME_DAY = 1
+ORDER_TIME_SPECIFIED = 2
+ORDER_TIME_SPECIFIED_DAY = 3
+
+ORDER_FILLING_FOK = 0
+ORDER_FILLING_IOC = 1
+ORDER_FILLING_RETURN = 2
+
+POSITION_TYPE_BUY = 0
+POSITION_TYPE_SELL = 1
+
+DEAL_TYPE_BUY = 0
+DEAL_TYPE_SELL = 1
+DEAL_TYPE_BALANCE = 2
+
+DEAL_ENTRY_IN = 0
+DEAL_ENTRY_OUT = 1
+DEAL_ENTRY_INOUT = 2
+DEAL_ENTRY_OUT_BY = 3
+
+DEAL_REASON_CLIENT = 0
+DEAL_REASON_EXPERT = 3
+DEAL_REASON_SL = 4
+DEAL_REASON_TP = 5
+DEAL_REASON_SO = 6
+
+TRADE_RETCODE_REQUOTE = 10004
+TRADE_RETCODE_REJECT = 10006
+TRADE_RETCODE_CANCEL = 10007
+TRADE_RETCODE_PLACED = 10008
+TRADE_RETCODE_DONE = 10009
+TRADE_RETCODE_DONE_PARTIAL = 10010
+TRADE_RETCODE_ERROR = 10011
+TRADE_RETCODE_TIMEOUT = 10012
+TRADE_RETCODE_INVALID = 10013
+TRADE_RETCODE_INVALID_VOLUME = 10014
+TRADE_RETCODE_INVALID_PRICE = 10015
+TRADE_RETCODE_INVALID_STOPS = 10016
+TRADE_RETCODE_TRADE_DISABLED = 10017
+TRADE_RETCODE_MARKET_CLOSED = 10018
+TRADE_RETCODE_NO_MONEY = 10019
+TRADE_RETCODE_PRICE_CHANGED = 10020
+TRADE_RETCODE_PRICE_OFF = 10021
+TRADE_RETCODE_INVALID_EXPIRATION = 10022
+TRADE_RETCODE_ORDER_CHANGED = 10023
+TRADE_RETCODE_TOO_MANY_REQUESTS = 10024
+TRADE_RETCODE_NO_CHANGES = 10025
+TRADE_RETCODE_INVALID_FILL = 10030
+TRADE_RETCODE_CONNECTION = 10031
+TRADE_RETCODE_LIMIT_ORDERS = 10033
+TRADE_RETCODE_LIMIT_VOLUME = 10034
+TRADE_RETCODE_INVALID_ORDER = 10035
+TRADE_RETCODE_POSITION_CLOSED = 10036
+
+TIMEFRAME_M1 = 1
+TIMEFRAME_M2 = 2
+TIMEFRAME_M3 = 3
+TIMEFRAME_M4 = 4
+TIMEFRAME_M5 = 5
+TIMEFRAME_M6 = 6
+TIMEFRAME_M10 = 10
+TIMEFRAME_M12 = 12
+TIMEFRAME_M15 = 15
+TIMEFRAME_M20 = 20
+TIMEFRAME_M30 = 30
+TIMEFRAME_H1 = 1 | 0x4000
+TIMEFRAME_H2 = 2 | 0x4000
+TIMEFRAME_H3 = 3 | 0x4000
+TIMEFRAME_H4 = 4 | 0x4000
+TIMEFRAME_H6 = 6 | 0x4000
+TIMEFRAME_H8 = 8 | 0x4000
+TIMEFRAME_H12 = 12 | 0x4000
+TIMEFRAME_D1 = 24 | 0x4000
+TIMEFRAME_W1 = 1 | 0x8000
+TIMEFRAME_MN1 = 1 | 0xC000
+
+COPY_TICKS_ALL = -1
+COPY_TICKS_INFO = 1
+COPY_TICKS_TRADE = 2
+
+TICK_FLAG_BID = 2
+TICK_FLAG_ASK = 4
+TICK_FLAG_LAST = 8
+TICK_FLAG_VOLUME = 16
+TICK_FLAG_BUY = 32
+TICK_FLAG_SELL = 64
+
+RES_S_OK = 1
+RES_E_FAIL = -1
+RES_E_INVALID_PARAMS = -2
+RES_E_NOT_FOUND = -4
+
+# ==================== 결과 타입 (MetaTrader5 namedtuple 과 같은 필드) ====================
+Tick = namedtuple('Tick', 'time bid ask last volume time_msc flags volume_real')
+
+SymbolInfo = namedtuple('SymbolInfo', [
+    'name', 'description', 'path', 'visible', 'select', 'digits', 'point', 'spread',
+    'trade_contract_size', 'trade_tick_size', 'trade_tick_value', 'trade_stops_level',
+    'trade_freeze_level', 'trade_mode', 'filling_mode', 'volume_min', 'volume_max',
+    'volume_step', 'bid', 'ask', 'last', 'time', 'currency_base', 'currency_profit',
+    'currency_margin',
+])
+
+AccountInfo = namedtuple('AccountInfo', [
+    'login', 'trade_mode', 'leverage', 'limit_orders', 'margin_so_mode', 'trade_allowed',
+    'trade_expert', 'margin_mode', 'currency_digits', 'fifo_close', 'balance', 'credit',
+    'profit', 'equity', 'margin', 'margin_free', 'margin_level', 'margin_so_call',
+    'margin_so_so', 'margin_initial', 'margin_maintenance', 'assets', 'liabilities',
+    'commission_blocked', 'name', 'server', 'currency', 'company',
+])
+
+TradePosition = namedtuple('TradePosition', [
+    'ticket', 'time', 'time_msc', 'time_update', 'time_update_msc', 'type', 'magic',
+    'identifier', 'reason', 'volume', 'price_open', 'sl', 'tp', 'price_current', 'swap',
+    'profit', 'symbol', 'comment', 'external_id',
+])
+
+TradeOrder = namedtuple('TradeOrder', [
+    'ticket', 'time_setup', 'time_setup_msc', 'time_done', 'time_done_msc',
+    'time_expiration', 'type', 'type_time', 'type_filling', 'state', 'magic',
+    'position_id', 'position_by_id', 'reason', 'volume_initial', 'volume_current',
+    'price_open', 'sl', 'tp', 'price_current', 'price_stoplimit', 'symbol', 'comment',
+    'external_id',
+])
+
+TradeDeal = namedtuple('TradeDeal', [
+    'ticket', 'order', 'time', 'time_msc', 'type', 'entry', 'magic', 'position_id',
+    'reason', 'volume', 'price', 'commission', 'swap', 'profit', 'fee', 'symbol',
+    'comment', 'external_id',
+])
+
+TradeRequest = namedtuple('TradeRequest', [
+    'action', 'magic', 'order', 'symbol', 'volume', 'price', 'stoplimit', 'sl', 'tp',
+    'deviation', 'type', 'type_filling', 'type_time', 'expiration', 'comment',
+    'position', 'position_by',
+])
+
+OrderSendResult = namedtuple('OrderSendResult', [
+    'retcode', 'deal', 'order', 'volume', 'price', 'bid', 'ask', 'comment',
+    'request_id', 'retcode_external', 'request',
+])
+
+RATES_DTYPE = np.dtype([
+    ('time', '<i8'), ('open', '<f8'), ('high', '<f8'), ('low', '<f8'), ('close', '<f8'),
+    ('tick_volume', '<u8'), ('spread', '<i4'), ('real_volume', '<u8'),
+])
+
+TICKS_DTYPE = np.dtype([
+    ('time', '<i8'), ('bid', '<f8'), ('ask', '<f8'), ('last', '<f8'), ('volume', '<u8'),
+    ('time_msc', '<i8'), ('flags', '<u4'), ('volume_real', '<f8'),
+])
+
+_RETCODE_COMMENTS = {
+    TRADE_RETCODE_DONE: 'Request executed',
+    TRADE_RETCODE_REQUOTE: 'Requote',
+    TRADE_RETCODE_INVALID: 'Invalid request',
+    TRADE_RETCODE_INVALID_VOLUME: 'Invalid volume',
+    TRADE_RETCODE_INVALID_PRICE: 'Invalid price',
+    TRADE_RETCODE_INVALID_STOPS: 'Invalid stops',
+    TRADE_RETCODE_MARKET_CLOSED: 'Market is closed',
+    TRADE_RETCODE_NO_MONEY: 'No money',
+    TRADE_RETCODE_TOO_MANY_REQUESTS: 'Too many requests',
+    TRADE_RETCODE_NO_CHANGES: 'No changes',
+    TRADE_RETCODE_LIMIT_ORDERS: 'Limit orders',
+    TRADE_RETCODE_INVALID_ORDER: 'Invalid order',
+    TRADE_RETCODE_POSITION_CLOSED: 'Position closed',
+}
+
+_EPS = 1e-9
+
+
+class ReplayFinished(KeyboardInterrupt):
+    """틱 재생 종료 신호 (봇의 Ctrl+C 종료 경로를 그대로 타도록 KeyboardInterrupt 상속)"""
+
+
+def timeframe_seconds(timeframe):
+    """TIMEFRAME_* 상수를 초 단위로 변환"""
+    if timeframe == TIMEFRAME_MN1:
+        return 30 * 86400
+    if timeframe == TIMEFRAME_W1:
+        return 7 * 86400
+    if timeframe & 0x4000:
+        return (timeframe & 0x3FFF) * 3600
+    return timeframe * 60
+
+
+def _to_seconds(value):
+    """datetime 또는 숫자를 epoch 초로 변환"""
+    if isinstance(value, _datetime):
+        return value.timestamp()
+    return float(value)
+
+
+# 주문/포지션마다 조회 행 캐시 (row) - 주문/포지션이 바뀌는 곳에서 row = None → 다음 조회 때 그 항목만 다시 만듦
+#   포지션: [현재가 앞 필드, 현재가 뒤 필드, 마지막 현재가, 마지막 행] - 현재가만 바뀌면 현재가/손익만 끼워 넣음
+#   대기주문: 완성된 행 하나 - price_current 는 주문을 접수/수정한 시점의 현재가
+#            (틱마다 수천 개 행을 다시 만들지 않도록 - 봇은 대기주문의 price_current 를 쓰지 않음)
+_tuple_new = tuple.__new__
+
+
+class _Order:
+    __slots__ = ('ticket', 'symbol', 'type', 'volume', 'price', 'sl', 'tp', 'magic',
+                 'comment', 'time_msc', 'type_time', 'type_filling', 'expiration', 'row')
+
+    def trade_order(self, current):
+        """TradeOrder 행 (주문이 바뀌지 않았으면 지난번 행 그대로 - current 는 행을 만들 때만 씀)"""
+        row = self.row
+        if row is None:
+            row = self.row = TradeOrder(self.ticket, self.time_msc // 1000, self.time_msc, 0, 0, self.expiration,
+                                        self.type, self.type_time, self.type_filling, ORDER_STATE_PLACED,
+                                        self.magic, 0, 0, 3, self.volume, self.volume, self.price, self.sl,
+                                        self.tp, current, 0.0, self.symbol, self.comment, '')
+        return row
+
+
+class _Position:
+    __slots__ = ('ticket', 'symbol', 'type', 'volume', 'price_open', 'sl', 'tp', 'magic',
+                 'comment', 'time_msc', 'time_update_msc', 'reason', 'row')
+
+    def trade_position(self, current, contract_size):
+        """TradePosition 행 (바뀐 것이 없으면 지난번 행 그대로, 현재가만 바뀌면 손익만 다시)"""
+        row = self.row
+        if row is None:
+            row = self.row = [(self.ticket, self.time_msc // 1000, self.time_msc, self.time_update_msc // 1000,
+                               self.time_update_msc, self.type, self.magic, self.ticket, self.reason,
+                               self.volume, self.price_open, self.sl, self.tp),
+                              (self.symbol, self.comment, ''), None, None]
+        elif row[2] == current:
+            return row[3]
+        if self.type == ORDER_TYPE_BUY:
+            profit = (current - self.price_open) * self.volume * contract_size
+        else:
+            profit = (self.price_open - current) * self.volume * contract_size
+        row[2] = current
+        row[3] = _tuple_new(TradePosition, row[0] + (current, 0.0, round(profit, 2)) + row[1])
+        return row[3]
+
+
+class _Feed:
+    """심볼 하나의 틱 배열 + 재생 커서 + 체결 트리거 캐시"""
+
+    def __init__(self, name, ticks, spec):
+        self.name = name
+        self.t_msc = np.ascontiguousarray(ticks['time_msc'], dtype=np.int64)
+        self.bid = np.ascontiguousarray(ticks['bid'], dtype=np.float64)
+        self.ask = np.ascontiguousarray(ticks['ask'], dtype=np.float64)
+        self.last = np.ascontiguousarray(ticks['last'], dtype=np.float64)
+        self.volume = np.ascontiguousarray(ticks['volume'], dtype=np.float64)
+        self.spec = spec
+        self.pos = -1
+        self.cur_bid = 0.0
+        self.cur_ask = 0.0
+        self.cur_last = 0.0
+        self.cur_msc = 0
+
+        # 심볼별 포지션 누적합 (O(1) 손익/증거금)
+        self.buy_vol = 0.0
+        self.buy_volopen = 0.0
+        self.sell_vol = 0.0
+        self.sell_volopen = 0.0
+
+        # 트리거 캐시 (주문/포지션 변경시 무효화)
+        self.orders_dirty = True
+        self.positions_dirty = True
+        self.order_rows = {}            # 이 심볼 대기주문 ticket → TradeOrder 행 (접수 순서)
+        self.order_prices = {}          # 주문 타입 → {ticket: 가격} (접수 순서, 체결 트리거용)
+        self.order_book = {}
+        self.stop_book = {}
+
+    @property
+    def exhausted(self):
+        return self.pos >= len(self.t_msc) - 1
+
+    def set_cursor(self, idx):
+        self.pos = idx
+        self.cur_bid = float(self.bid[idx])
+        self.cur_ask = float(self.ask[idx])
+        self.cur_last = float(self.last[idx])
+        self.cur_msc = int(self.t_msc[idx])
+
+
+class MT5Simulator:
+    """🧪 MetaTrader5 터미널 + 브로커 시뮬레이터"""
+
+    def __init__(self, balance=10000.0, leverage=100, login=10000001,
+                 server='MT5-Simulator', currency='USD', limit_orders=0,
+                 max_requests_per_second=0, order_latency=0.0):
+        self.initial_balance = float(balance)
+        self.balance = float(balance)
+        self.leverage = leverage
+        self.login_id = login
+        self.server = server
+        self.currency = currency
+        self.limit_orders = limit_orders
+        self.max_requests_per_second = max_requests_per_second
+        self.order_latency = order_latency
+
+        self.feeds = {}
+        self.orders = {}
+        self.positions = {}
+        self.deals = []
+        self.now_msc = 0
+        self.finished = False
+        self.connected = False
+
+        self._lock = threading.RLock()
+        self._next_ticket = 1000000
+        self._next_deal = 5000000
+        self._last_error = (RES_S_OK, 'Success')
+        self._request_times = []
+        self._version = 0
+        self._cache = {}
+        self._orders_version = 0        # 대기주문 추가/삭제/수정/체결마다 증가 (틱만 바뀌면 그대로)
+        self._orders_cache = {}         # orders_get 조회 키 → (주문 버전, 결과 튜플)
+        self.call_stats = defaultdict(lambda: [0, 0.0])
+        self.ticks_processed = 0
+
+    # ==================== 데이터 로딩 ====================
+    def load_ticks(self, symbol, source, digits=None, point=None, volume_min=0.01,
+                   volume_max=100.0, volume_step=0.01, contract_size=1.0,
+                   stops_level=0, description=None):
+        """📥 심볼 틱 데이터 등록 (CSV / .npy / 구조화 배열 / dict)"""
+        ticks = normalize_ticks(source)
+        if len(ticks['time_msc']) == 0:
+            raise ValueError(f"{symbol}: 틱 데이터가 비어 있습니다")
+
+        if digits is None:
+            digits = _guess_digits(ticks['bid'])
+        if point is None:
+            point = 10.0 ** -digits
+
+        spec = {
+            'digits': digits,
+            'point': point,
+            'volume_min': volume_min,
+            'volume_max': volume_max,
+            'volume_step': volume_step,
+            'contract_size': contract_size,
+            'stops_level': stops_level,
+            'description': description or symbol,
+        }
+
+        with self._lock:
+            feed = _Feed(symbol, ticks, spec)
+            self.feeds[symbol] = feed
+            start_msc = int(feed.t_msc[0])
+            if self.now_msc == 0 or start_msc < self.now_msc:
+                self.now_msc = start_msc
+            idx = int(np.searchsorted(feed.t_msc, self.now_msc, side='right')) - 1
+            feed.set_cursor(max(idx, 0))
+            self.finished = False
+            self._touch()
+        return feed
+
+    # ==================== 가상 시계 ====================
+    def time(self):
+        return self.now_msc / 1000.0
+
+    def advance(self, seconds):
+        """⏩ 가상 시계를 seconds 만큼 진행하고 그 사이 틱을 모두 처리"""
+        with self._lock:
+            target = self.now_msc + max(int(seconds * 1000), 1)
+            self._advance_to(target)
+
+    def step_ticks(self, count=1, symbol=None):
+        """⏩ 기준 심볼의 틱을 count 개 진행 (틱 단위 재생 모드)"""
+        with self._lock:
+            feed = self.feeds[symbol] if symbol else next(iter(self.feeds.values()))
+            if feed.exhausted:
+                self._advance_to(self.now_msc + 1)
+                return
+            idx = min(feed.pos + count, len(feed.t_msc) - 1)
+            self._advance_to(max(int(feed.t_msc[idx]), self.now_msc + 1))
+
+    def _advance_to(self, target_msc):
+        if not self.feeds:
+            self.finished = True
+            return
+
+        moved = False
+        for feed in self.feeds.values():
+            new_pos = int(np.searchsorted(feed.t_msc, target_msc, side='right')) - 1
+            if new_pos > feed.pos:
+                self._process_window(feed, feed.pos + 1, new_pos + 1)
+                moved = True
+
+        self.now_msc = target_msc
+        if moved:
+            self._touch()
+        if all(feed.exhausted and target_msc > feed.t_msc[-1] for feed in self.feeds.values()):
+            self.finished = True
+
+    def _process_window(self, feed, i0, i1):
+        """틱 윈도우 [i0, i1) 처리: 대기주문 체결 + SL/TP 청산"""
+        self.ticks_processed += i1 - i0
+        has_orders = bool(feed.order_book) or feed.orders_dirty
+        has_stops = bool(feed.stop_book) or feed.positions_dirty
+
+        if has_orders or has_stops:
+            if feed.orders_dirty:
+                self._rebuild_order_book(feed)
+            if feed.positions_dirty:
+                self._rebuild_stop_book(feed)
+
+        if feed.order_book or feed.stop_book:
+            bid_w = feed.bid[i0:i1]
+            ask_w = feed.ask[i0:i1]
+            if i1 - i0 == 1:
+                lo_bid = hi_bid = float(bid_w[0])
+                lo_ask = hi_ask = float(ask_w[0])
+            else:
+                lo_bid, hi_bid = float(bid_w.min()), float(bid_w.max())
+                lo_ask, hi_ask = float(ask_w.min()), float(ask_w.max())
+
+            if feed.order_book:
+                self._match_pending(feed, i0, bid_w, ask_w, lo_bid, hi_bid, lo_ask, hi_ask)
+            if feed.stop_book:
+                self._match_stops(feed, i0, bid_w, ask_w, lo_bid, hi_bid, lo_ask, hi_ask)
+
+        feed.set_cursor(i1 - 1)
+
+    # ==================== 체결 엔진 ====================
+    def _rebuild_order_book(self, feed):
+        # 트리거 가격만 다시 계산 (dict 값 max/min 한 번) - 배열은 트리거를 넘었을 때만 _book_arrays 로
+        book = {}
+        for order_type, by_ticket in feed.order_prices.items():
+            if not by_ticket:
+                continue
+            if order_type in (ORDER_TYPE_BUY_LIMIT, ORDER_TYPE_SELL_STOP):
+                trigger = max(by_ticket.values())
+            else:
+                trigger = min(by_ticket.values())
+            book[order_type] = (by_ticket, trigger)
+        feed.order_book = book
+        feed.orders_dirty = False
+
+    @staticmethod
+    def _book_arrays(by_ticket):
+        n = len(by_ticket)
+        prices = np.fromiter(by_ticket.values(), dtype=np.float64, count=n)
+        tickets = np.fromiter(by_ticket.keys(), dtype=np.int64, count=n)
+        return prices, tickets
+
+    def _rebuild_stop_book(self, feed):
+        book = {}
+        for side in (ORDER_TYPE_BUY, ORDER_TYPE_SELL):
+            for kind in ('sl', 'tp'):
+                items = [(getattr(p, kind), p.ticket) for p in self.positions.values()
+                         if p.symbol == feed.name and p.type == side and getattr(p, kind) > 0]
+                if not items:
+                    continue
+                prices = np.array([i[0] for i in items], dtype=np.float64)
+                tickets = np.array([i[1] for i in items], dtype=np.int64)
+                # 매수: bid <= SL / bid >= TP,  매도: ask >= SL / ask <= TP
+                if (side == ORDER_TYPE_BUY) == (kind == 'sl'):
+                    trigger = float(prices.max())
+                else:
+                    trigger = float(prices.min())
+                book[(side, kind)] = (prices, tickets, trigger)
+        feed.stop_book = book
+        feed.positions_dirty = False
+
+    def _match_pending(self, feed, i0, bid_w, ask_w, lo_bid, hi_bid, lo_ask, hi_ask):
+        book = feed.order_book
+        fills = []
+
+        # 매수 리미트: ask <= price
+        entry = book.get(ORDER_TYPE_BUY_LIMIT)
+        if entry and lo_ask <= entry[1]:
+            prices, tickets = self._book_arrays(entry[0])
+            for p, t in zip(prices[prices >= lo_ask], tickets[prices >= lo_ask]):
+                k = int(np.argmax(ask_w <= p))
+                fills.append((int(t), min(float(p), float(ask_w[k])), i0 + k))
+
+        # 매도 리미트: bid >= price
+        entry = book.get(ORDER_TYPE_SELL_LIMIT)
+        if entry and hi_bid >= entry[1]:
+            prices, tickets = self._book_arrays(entry[0])
+            for p, t in zip(prices[prices <= hi_bid], tickets[prices <= hi_bid]):
+                k = int(np.argmax(bid_w >= p))
+                fills.append((int(t), max(float(p), float(bid_w[k])), i0 + k))
+
+        # 매수 스탑: ask >= price
+        entry = book.get(ORDER_TYPE_BUY_STOP)
+        if entry and hi_ask >= entry[1]:
+            prices, tickets = self._book_arrays(entry[0])
+            for p, t in zip(prices[prices <= hi_ask], tickets[prices <= hi_ask]):
+                k = int(np.argmax(ask_w >= p))
+                fills.append((int(t), max(float(p), float(ask_w[k])), i0 + k))
+
+        # 매도 스탑: bid <= price
+        entry = book.get(ORDER_TYPE_SELL_STOP)
+        if entry and lo_bid <= entry[1]:
+            prices, tickets = self._book_arrays(entry[0])
+            for p, t in zip(prices[prices >= lo_bid], tickets[prices >= lo_bid]):
+                k = int(np.argmax(bid_w <= p))
+                fills.append((int(t), min(float(p), float(bid_w[k])), i0 + k))
+
+        if not fills:
+            return
+
+        fills.sort(key=lambda f: f[2])
+        for ticket, fill_price, idx in fills:
+            order = self.orders.pop(ticket, None)
+            if order is None:
+                continue
+            self._orders_changed(feed, order, placed=False)
+            side = ORDER_TYPE_BUY if order.type in (ORDER_TYPE_BUY_LIMIT, ORDER_TYPE_BUY_STOP) else ORDER_TYPE_SELL
+            fill_msc = int(feed.t_msc[idx])
+            required = self._margin_for(feed, order.volume, fill_price)
+            if required > self._free_margin():
+                continue  # 증거금 부족 → 주문 거부 (삭제)
+            self._open_position(feed, ticket, side, order.volume, fill_price, order.sl, order.tp,
+                                order.magic, order.comment, fill_msc, ticket)
+
+    def _match_stops(self, feed, i0, bid_w, ask_w, lo_bid, hi_bid, lo_ask, hi_ask):
+        book = feed.stop_book
+        hits = []
+
+        entry = book.get((ORDER_TYPE_BUY, 'sl'))
+        if entry and lo_bid <= entry[2]:
+            prices, tickets, _ = entry
+            for p, t in zip(prices[prices >= lo_bid], tickets[prices >= lo_bid]):
+                k = int(np.argmax(bid_w <= p))
+                hits.append((int(t), min(float(p), float(bid_w[k])), i0 + k, DEAL_REASON_SL))
+
+        entry = book.get((ORDER_TYPE_BUY, 'tp'))
+        if entry and hi_bid >= entry[2]:
+            prices, tickets, _ = entry
+            for p, t in zip(prices[prices <= hi_bid], tickets[prices <= hi_bid]):
+                k = int(np.argmax(bid_w >= p))
+                hits.append((int(t), max(float(p), float(bid_w[k])), i0 + k, DEAL_REASON_TP))
+
+        entry = book.get((ORDER_TYPE_SELL, 'sl'))
+        if entry and hi_ask >= entry[2]:
+            prices, tickets, _ = entry
+            for p, t in zip(prices[prices <= hi_ask], tickets[prices <= hi_ask]):
+                k = int(np.argmax(ask_w >= p))
+                hits.append((int(t), max(float(p), float(ask_w[k])), i0 + k, DEAL_REASON_SL))
+
+        entry = book.get((ORDER_TYPE_SELL, 'tp'))
+        if entry and lo_ask <= entry[2]:
+            prices, tickets, _ = entry
+            for p, t in zip(prices[prices >= lo_ask], tickets[prices >= lo_ask]):
+                k = int(np.argmax(ask_w <= p))
+                hits.append((int(t), min(float(p), float(ask_w[k])), i0 + k, DEAL_REASON_TP))
+
+        hits.sort(key=lambda h: h[2])
+        for ticket, price, idx, reason in hits:
+            position = self.positions.get(ticket)
+            if position is None:
+                continue
+            order_ticket = self._new_ticket()
+            self._close_position(feed, position, position.volume, price, int(feed.t_msc[idx]),
+                                 order_ticket, reason, position.comment)
+
+    # ==================== 포지션 / 계좌 계산 ====================
+    def _new_ticket(self):
+        self._next_ticket += 1
+        return self._next_ticket
+
+    def _new_deal(self):
+        self._next_deal += 1
+        return self._next_deal
+
+    def _touch(self):
+        self._version += 1
+        self._cache.clear()
+
+    def _orders_changed(self, feed, order, placed=True):
+        """대기주문 접수/수정(placed) 또는 삭제/체결 → 조회 행 갱신 + 체결 트리거/orders_get 캐시 무효화"""
+        if placed:
+            current = feed.cur_ask if order.type in (ORDER_TYPE_BUY_LIMIT, ORDER_TYPE_BUY_STOP) else feed.cur_bid
+            order.row = None
+            feed.order_rows[order.ticket] = order.trade_order(current)
+            feed.order_prices.setdefault(order.type, {})[order.ticket] = order.price
+        else:
+            feed.order_rows.pop(order.ticket, None)
+            feed.order_prices.get(order.type, {}).pop(order.ticket, None)
+        feed.orders_dirty = True
+        self._orders_version += 1
+
+    def _margin_for(self, feed, volume, price):
+        return volume * feed.spec['contract_size'] * price / self.leverage
+
+    def _floating_profit(self):
+        total = 0.0
+        for feed in self.feeds.values():
+            cs = feed.spec['contract_size']
+            total += cs * (feed.cur_bid * feed.buy_vol - feed.buy_volopen)
+            total += cs * (feed.sell_volopen - feed.cur_ask * feed.sell_vol)
+        return total
+
+    def _margin(self):
+        return sum(feed.spec['contract_size'] * (feed.buy_volopen + feed.sell_volopen)
+                   for feed in self.feeds.values()) / self.leverage
+
+    def _free_margin(self):
+        return self.balance + self._floating_profit() - self._margin()
+
+    def _book_volume(self, feed, side, volume, price, sign):
+        if side == ORDER_TYPE_BUY:
+            feed.buy_vol += sign * volume
+            feed.buy_volopen += sign * volume * price
+        else:
+            feed.sell_vol += sign * volume
+            feed.sell_volopen += sign * volume * price
+
+    def _open_position(self, feed, ticket, side, volume, price, sl, tp, magic, comment,
+                       time_msc, order_ticket):
+        position = _Position()
+        position.ticket = ticket
+        position.symbol = feed.name
+        position.type = side
+        position.volume = volume
+        position.price_open = price
+        position.sl = sl or 0.0
+        position.tp = tp or 0.0
+        position.magic = magic
+        position.comment = comment
+        position.time_msc = time_msc
+        position.time_update_msc = time_msc
+        position.reason = DEAL_REASON_EXPERT
+        position.row = None
+        self.positions[ticket] = position
+        self._book_volume(feed, side, volume, price, +1)
+        if position.sl or position.tp:
+            feed.positions_dirty = True
+
+        deal = self._record_deal(order_ticket, time_msc, DEAL_TYPE_BUY if side == ORDER_TYPE_BUY else DEAL_TYPE_SELL,
+                                 DEAL_ENTRY_IN, magic, ticket, DEAL_REASON_EXPERT, volume, price, 0.0,
+                                 feed.name, comment)
+        self._touch()
+        return deal
+
+    def _close_position(self, feed, position, volume, price, time_msc, order_ticket, reason, comment):
+        cs = feed.spec['contract_size']
+        if position.type == ORDER_TYPE_BUY:
+            profit = (price - position.price_open) * volume * cs
+            deal_type = DEAL_TYPE_SELL
+        else:
+            profit = (position.price_open - price) * volume * cs
+            deal_type = DEAL_TYPE_BUY
+
+        self._book_volume(feed, position.type, volume, position.price_open, -1)
+        self.balance += profit
+        position.volume = round(position.volume - volume, 8)
+        position.time_update_msc = time_msc
+        position.row = None
+        if position.volume <= _EPS:
+            del self.positions[position.ticket]
+            if position.sl or position.tp:
+                feed.positions_dirty = True
+
+        deal = self._record_deal(order_ticket, time_msc, deal_type, DEAL_ENTRY_OUT, position.magic,
+                                 position.ticket, reason, volume, price, profit, feed.name, comment)
+        self._touch()
+        return deal
+
+    def _record_deal(self, order, time_msc, deal_type, entry, magic, position_id, reason,
+                     volume, price, profit, symbol, comment):
+        ticket = self._new_deal()
+        self.deals.append(TradeDeal(ticket, order, time_msc // 1000, time_msc, deal_type, entry,
+                                    magic, position_id, reason, volume, price, 0.0, 0.0, profit,
+                                    0.0, symbol, comment, ''))
+        return ticket
+
+    # ==================== MetaTrader5 API ====================
+    def initialize(self, *args, **kwargs):
+        self.connected = True
+        if not self.feeds:
+            self._last_error = (RES_E_FAIL, 'No tick data loaded')
+            return False
+        self._last_error = (RES_S_OK, 'Success')
+        return True
+
+    def login(self, login=None, password=None, server=None, timeout=None):
+        if login is not None:
+            self.login_id = int(login)
+        if server:
+            self.server = server
+        return True
+
+    def shutdown(self):
+        # 리플레이 결과를 읽을 수 있도록 상태는 유지
+        self.connected = False
+        return None
+
+    def last_error(self):
+        return self._last_error
+
+    def version(self):
+        return (500, 4000, 'MT5-Simulator')
+
+    def account_info(self):
+        with self._lock:
+            key = ('account',)
+            cached = self._cache.get(key)
+            if cached is not None:
+                return cached
+            profit = self._floating_profit()
+            equity = self.balance + profit
+            margin = self._margin()
+            margin_level = equity / margin * 100 if margin > 0 else 0.0
+            info = AccountInfo(self.login_id, 0, self.leverage, self.limit_orders, 0, True, True,
+                               2, 2, False, round(self.balance, 2), 0.0, round(profit, 2),
+                               round(equity, 2), round(margin, 2), round(equity - margin, 2),
+                               round(margin_level, 2), 50.0, 30.0, 0.0, 0.0, 0.0, 0.0, 0.0,
+                               'Simulator', self.server, self.currency, 'MT5 Simulator')
+            self._cache[key] = info
+            return info
+
+    def symbols_total(self):
+        return len(self.feeds)
+
+    def symbols_get(self, group=None):
+        with self._lock:
+            names = [name for name in self.feeds if group is None or fnmatch.fnmatch(name, group)]
+            return tuple(self._symbol_info(self.feeds[name]) for name in names)
+
+    def symbol_info(self, symbol):
+        feed = self.feeds.get(symbol)
+        if feed is None:
+            self._last_error = (RES_E_NOT_FOUND, f'Symbol {symbol} not found')
+            return None
+        with self._lock:
+            return self._symbol_info(feed)
+
+    def _symbol_info(self, feed):
+        spec = feed.spec
+        spread = int(round((feed.cur_ask - feed.cur_bid) / spec['point']))
+        return SymbolInfo(feed.name, spec['description'], feed.name, True, True, spec['digits'],
+                          spec['point'], spread, spec['contract_size'], spec['point'],
+                          spec['point'] * spec['contract_size'], spec['stops_level'], 0, 4, 3,
+                          spec['volume_min'], spec['volume_max'], spec['volume_step'],
+                          feed.cur_bid, feed.cur_ask, feed.cur_last, feed.cur_msc // 1000,
+                          self.currency, self.currency, self.currency)
+
+    def symbol_select(self, symbol, enable=True):
+        return symbol in self.feeds
+
+    def symbol_info_tick(self, symbol):
+        feed = self.feeds.get(symbol)
+        if feed is None:
+            self._last_error = (RES_E_NOT_FOUND, f'Symbol {symbol} not found')
+            return None
+        with self._lock:
+            return Tick(feed.cur_msc // 1000, feed.cur_bid, feed.cur_ask, feed.cur_last,
+                        int(feed.volume[feed.pos]), feed.cur_msc, TICK_FLAG_BID | TICK_FLAG_ASK,
+                        float(feed.volume[feed.pos]))
+
+    def positions_total(self):
+        return len(self.positions)
+
+    def positions_get(self, symbol=None, group=None, ticket=None, magic=None):
+        with self._lock:
+            key = ('positions', symbol, group, ticket, magic)
+            cached = self._cache.get(key)
+            if cached is not None:
+                return cached
+            result = []
+            if ticket is not None:
+                candidates = [self.positions[ticket]] if ticket in self.positions else []
+            else:
+                candidates = self.positions.values()
+            for p in candidates:
+                if symbol is not None and p.symbol != symbol:
+                    continue
+                if group is not None and not fnmatch.fnmatch(p.symbol, group):
+                    continue
+                if magic is not None and p.magic != magic:
+                    continue
+                feed = self.feeds[p.symbol]
+                current = feed.cur_bid if p.type == ORDER_TYPE_BUY else feed.cur_ask
+                result.append(p.trade_position(current, feed.spec['contract_size']))
+            result = tuple(result)
+            self._cache[key] = result
+            return result
+
+    def orders_total(self):
+        return len(self.orders)
+
+    def orders_get(self, symbol=None, group=None, ticket=None, magic=None):
+        """대기주문 조회 - 결과는 주문 구성이 바뀔 때만 다시 만듦 (틱만 바뀌면 같은 튜플)"""
+        with self._lock:
+            key = ('orders', symbol, group, ticket, magic)
+            cached = self._orders_cache.get(key)
+            if cached is not None and cached[0] == self._orders_version:
+                return cached[1]
+            if symbol is not None and group is None and ticket is None and magic is None:
+                # 봇의 주 경로 (심볼 하나 전체) - 심볼별 행 dict 를 그대로 튜플로
+                feed = self.feeds.get(symbol)
+                result = tuple(feed.order_rows.values()) if feed is not None else ()
+                self._orders_cache[key] = (self._orders_version, result)
+                return result
+            result = []
+            if ticket is not None:
+                candidates = [self.orders[ticket]] if ticket in self.orders else []
+            else:
+                candidates = self.orders.values()
+            for o in candidates:
+                if symbol is not None and o.symbol != symbol:
+                    continue
+                if group is not None and not fnmatch.fnmatch(o.symbol, group):
+                    continue
+                if magic is not None and o.magic != magic:
+                    continue
+                feed = self.feeds[o.symbol]
+                current = feed.cur_ask if o.type in (ORDER_TYPE_BUY_LIMIT, ORDER_TYPE_BUY_STOP) else feed.cur_bid
+                result.append(o.trade_order(current))
+            result = tuple(result)
+            self._orders_cache[key] = (self._orders_version, result)
+            return result
+
+    def history_deals_total(self, date_from, date_to):
+        return len(self.history_deals_get(date_from, date_to))
+
+    def history_deals_get(self, date_from=None, date_to=None, group=None, ticket=None, position=None):
+        with self._lock:
+            deals = self.deals
+            if ticket is not None:
+                return tuple(d for d in deals if d.order == ticket)
+            if position is not None:
+                return tuple(d for d in deals if d.position_id == position)
+            lo = _to_seconds(date_from) if date_from is not None else float('-inf')
+            hi = _to_seconds(date_to) if date_to is not None else float('inf')
+            return tuple(d for d in deals if lo <= d.time <= hi
+                         and (group is None or fnmatch.fnmatch(d.symbol, group)))
+
+    def order_calc_margin(self, action, symbol, volume, price):
+        feed = self.feeds.get(symbol)
+        if feed is None:
+            return None
+        return self._margin_for(feed, volume, price)
+
+    def order_calc_profit(self, action, symbol, volume, price_open, price_close):
+        feed = self.feeds.get(symbol)
+        if feed is None:
+            return None
+        direction = 1.0 if action == ORDER_TYPE_BUY else -1.0
+        return direction * (price_close - price_open) * volume * feed.spec['contract_size']
+
+    # ==================== 히스토리 데이터 ====================
+    def copy_rates_from_pos(self, symbol, timeframe, start_pos, count):
+        """현재 재생 위치까지의 틱으로 봉 생성 (start_pos=0 → 진행 중인 봉)"""
+        rates = self._build_rates(symbol, timeframe)
+        if rates is None:
+            return None
+        end = len(rates) - start_pos
+        if end <= 0:
+            return np.empty(0, dtype=RATES_DTYPE)
+        return rates[max(0, end - count):end]
+
+    def copy_rates_from(self, symbol, timeframe, date_from, count):
+        rates = self._build_rates(symbol, timeframe)
+        if rates is None:
+            return None
+        end = int(np.searchsorted(rates['time'], _to_seconds(date_from), side='right'))
+        return rates[max(0, end - count):end]
+
+    def copy_rates_range(self, symbol, timeframe, date_from, date_to):
+        rates = self._build_rates(symbol, timeframe)
+        if rates is None:
+            return None
+        lo = int(np.searchsorted(rates['time'], _to_seconds(date_from), side='left'))
+        hi = int(np.searchsorted(rates['time'], _to_seconds(date_to), side='right'))
+        return rates[lo:hi]
+
+    def _build_rates(self, symbol, timeframe):
+        feed = self.feeds.get(symbol)
+        if feed is None:
+            self._last_error = (RES_E_NOT_FOUND, f'Symbol {symbol} not found')
+            return None
+        with self._lock:
+            key = ('rates', symbol, timeframe)
+            cached = self._cache.get(key)
+            if cached is not None:
+                return cached
+            n = feed.pos + 1
+            tf = timeframe_seconds(timeframe)
+            bar_time = (feed.t_msc[:n] // 1000) // tf * tf
+            starts = np.flatnonzero(np.r_[True, bar_time[1:] != bar_time[:-1]])
+            bid = feed.bid[:n]
+            rates = np.empty(len(starts), dtype=RATES_DTYPE)
+            rates['time'] = bar_time[starts]
+            rates['open'] = bid[starts]
+            rates['high'] = np.maximum.reduceat(bid, starts)
+            rates['low'] = np.minimum.reduceat(bid, starts)
+            rates['close'] = bid[np.r_[starts[1:] - 1, n - 1]]
+            rates['tick_volume'] = np.diff(np.r_[starts, n])
+            spread = (feed.ask[:n] - bid) / feed.spec['point']
+            rates['spread'] = np.maximum.reduceat(spread, starts).astype(np.int32)
+            rates['real_volume'] = np.add.reduceat(feed.volume[:n], starts).astype(np.uint64)
+            self._cache[key] = rates
+            return rates
+
+    def copy_ticks_from(self, symbol, date_from, count, flags=COPY_TICKS_ALL):
+        feed = self.feeds.get(symbol)
+        if feed is None:
+            return None
+        lo = int(np.searchsorted(feed.t_msc, int(_to_seconds(date_from) * 1000), side='left'))
+        hi = min(lo + count, feed.pos + 1)
+        return self._ticks_slice(feed, lo, hi)
+
+    def copy_ticks_range(self, symbol, date_from, date_to, flags=COPY_TICKS_ALL):
+        feed = self.feeds.get(symbol)
+        if feed is None:
+            return None
+        lo = int(np.searchsorted(feed.t_msc, int(_to_seconds(date_from) * 1000), side='left'))
+        hi = int(np.searchsorted(feed.t_msc, int(_to_seconds(date_to) * 1000), side='right'))
+        return self._ticks_slice(feed, lo, min(hi, feed.pos + 1))
+
+    def _ticks_slice(self, feed, lo, hi):
+        hi = max(lo, hi)
+        out = np.empty(hi - lo, dtype=TICKS_DTYPE)
+        out['time_msc'] = feed.t_msc[lo:hi]
+        out['time'] = feed.t_msc[lo:hi] // 1000
+        out['bid'] = feed.bid[lo:hi]
+        out['ask'] = feed.ask[lo:hi]
+        out['last'] = feed.last[lo:hi]
+        out['volume'] = feed.volume[lo:hi].astype(np.uint64)
+        out['flags'] = TICK_FLAG_BID | TICK_FLAG_ASK
+        out['volume_real'] = feed.volume[lo:hi]
+        return out
+
+    # ==================== 주문 처리 ====================
+    def order_send(self, request):
+        """📨 주문 요청 처리 - 실제 MT5 와 같은 retcode 반환"""
+        if self.order_latency > 0:
+            _time.sleep(self.order_latency)  # 브로커 왕복 지연 (락 밖에서 → 병렬 전송 효과 측정 가능)
+
+        with self._lock:
+            req = _to_trade_request(request)
+            if self.max_requests_per_second and self._rate_limited():
+                return self._result(TRADE_RETCODE_TOO_MANY_REQUESTS, req)
+
+            action = req.action
+            if action == TRADE_ACTION_DEAL:
+                return self._send_deal(req)
+            if action == TRADE_ACTION_PENDING:
+                return self._send_pending(req)
+            if action == TRADE_ACTION_REMOVE:
+                return self._send_remove(req)
+            if action == TRADE_ACTION_MODIFY:
+                return self._send_modify(req)
+            if action == TRADE_ACTION_SLTP:
+                return self._send_sltp(req)
+            if action == TRADE_ACTION_CLOSE_BY:
+                return self._send_close_by(req)
+            return self._result(TRADE_RETCODE_INVALID, req)
+
+    def _rate_limited(self):
+        now = _time.monotonic()
+        window = self._request_times
+        while window and now - window[0] > 1.0:
+            window.pop(0)
+        if len(window) >= self.max_requests_per_second:
+            return True
+        window.append(now)
+        return False
+
+    def _result(self, retcode, req, deal=0, order=0, volume=0.0, price=0.0, feed=None):
+        bid = feed.cur_bid if feed else 0.0
+        ask = feed.cur_ask if feed else 0.0
+        if retcode != TRADE_RETCODE_DONE:
+            self._last_error = (RES_E_FAIL, _RETCODE_COMMENTS.get(retcode, 'Error'))
+        return OrderSendResult(retcode, deal, order, volume, price, bid, ask,
+                               _RETCODE_COMMENTS.get(retcode, ''), 0, 0, req)
+
+    def _check_volume(self, feed, volume):
+        spec = feed.spec
+        if volume < spec['volume_min'] - _EPS or volume > spec['volume_max'] + _EPS:
+            return False
+        steps = volume / spec['volume_step']
+        return abs(steps - round(steps)) < 1e-6
+
+    def _check_stops(self, feed, side, price, sl, tp):
+        """SL/TP 방향 검증 (오류 10016 재현)"""
+        gap = feed.spec['stops_level'] * feed.spec['point']
+        if side == ORDER_TYPE_BUY:
+            if sl and sl > price - gap:
+                return False
+            if tp and tp < price + gap:
+                return False
+        else:
+            if sl and sl < price + gap:
+                return False
+            if tp and tp > price - gap:
+                return False
+        return True
+
+    def _send_deal(self, req):
+        position_ticket = req.position
+        if position_ticket:
+            position = self.positions.get(position_ticket)
+            if position is None:
+                return self._result(TRADE_RETCODE_POSITION_CLOSED, req)
+            feed = self.feeds[position.symbol]
+        else:
+            feed = self.feeds.get(req.symbol)
+            if feed is None:
+                return self._result(TRADE_RETCODE_INVALID, req)
+
+        if req.type not in (ORDER_TYPE_BUY, ORDER_TYPE_SELL):
+            return self._result(TRADE_RETCODE_INVALID_ORDER, req, feed=feed)
+        if not self._check_volume(feed, req.volume):
+            return self._result(TRADE_RETCODE_INVALID_VOLUME, req, feed=feed)
+
+        price = feed.cur_ask if req.type == ORDER_TYPE_BUY else feed.cur_bid
+        if req.price and req.deviation:
+            if abs(req.price - price) > req.deviation * feed.spec['point'] + _EPS:
+                return self._result(TRADE_RETCODE_REQUOTE, req, feed=feed)
+
+        order_ticket = self._new_ticket()
+        if position_ticket:
+            if position.type == req.type:
+                return self._result(TRADE_RETCODE_INVALID, req, feed=feed)
+            if req.volume > position.volume + _EPS:
+                return self._result(TRADE_RETCODE_INVALID_VOLUME, req, feed=feed)
+            deal = self._close_position(feed, position, req.volume, price, feed.cur_msc,
+                                        order_ticket, DEAL_REASON_EXPERT, req.comment)
+            return self._result(TRADE_RETCODE_DONE, req, deal, order_ticket, req.volume, price, feed)
+
+        if not self._check_stops(feed, req.type, price, req.sl, req.tp):
+            return self._result(TRADE_RETCODE_INVALID_STOPS, req, feed=feed)
+        if self._margin_for(feed, req.volume, price) > self._free_margin():
+            return self._result(TRADE_RETCODE_NO_MONEY, req, feed=feed)
+
+        deal = self._open_position(feed, order_ticket, req.type, req.volume, price, req.sl, req.tp,
+                                   req.magic, req.comment, feed.cur_msc, order_ticket)
+        return self._result(TRADE_RETCODE_DONE, req, deal, order_ticket, req.volume, price, feed)
+
+    def _send_pending(self, req):
+        feed = self.feeds.get(req.symbol)
+        if feed is None:
+            return self._result(TRADE_RETCODE_INVALID, req)
+        if req.type not in (ORDER_TYPE_BUY_LIMIT, ORDER_TYPE_SELL_LIMIT,
+                            ORDER_TYPE_BUY_STOP, ORDER_TYPE_SELL_STOP):
+            return self._result(TRADE_RETCODE_INVALID_ORDER, req, feed=feed)
+        if not self._check_volume(feed, req.volume):
+            return self._result(TRADE_RETCODE_INVALID_VOLUME, req, feed=feed)
+        if self.limit_orders and len(self.orders) >= self.limit_orders:
+            return self._result(TRADE_RETCODE_LIMIT_ORDERS, req, feed=feed)
+
+        price = round(req.price, feed.spec['digits'])
+        valid = {
+            ORDER_TYPE_BUY_LIMIT: 0 < price < feed.cur_ask,
+            ORDER_TYPE_SELL_LIMIT: price > feed.cur_bid,
+            ORDER_TYPE_BUY_STOP: price > feed.cur_ask,
+            ORDER_TYPE_SELL_STOP: 0 < price < feed.cur_bid,
+        }[req.type]
+        if not valid:
+            return self._result(TRADE_RETCODE_INVALID_PRICE, req, feed=feed)
+
+        side = ORDER_TYPE_BUY if req.type in (ORDER_TYPE_BUY_LIMIT, ORDER_TYPE_BUY_STOP) else ORDER_TYPE_SELL
+        if not self._check_stops(feed, side, price, req.sl, req.tp):
+            return self._result(TRADE_RETCODE_INVALID_STOPS, req, feed=feed)
+
+        order = _Order()
+        order.ticket = self._new_ticket()
+        order.symbol = feed.name
+        order.type = req.type
+        order.volume = req.volume
+        order.price = price
+        order.sl = req.sl or 0.0
+        order.tp = req.tp or 0.0
+        order.magic = req.magic
+        order.comment = req.comment
+        order.time_msc = feed.cur_msc
+        order.type_time = req.type_time
+        order.type_filling = req.type_filling
+        order.expiration = req.expiration
+        self.orders[order.ticket] = order
+        self._orders_changed(feed, order)
+        self._touch()
+        return self._result(TRADE_RETCODE_DONE, req, 0, order.ticket, req.volume, price, feed)
+
+    def _send_remove(self, req):
+        order = self.orders.pop(req.order, None)
+        if order is None:
+            return self._result(TRADE_RETCODE_INVALID, req)
+        feed = self.feeds[order.symbol]
+        self._orders_changed(feed, order, placed=False)
+        self._touch()
+        return self._result(TRADE_RETCODE_DONE, req, 0, order.ticket, order.volume, order.price, feed)
+
+    def _send_modify(self, req):
+        order = self.orders.get(req.order)
+        if order is None:
+            return self._result(TRADE_RETCODE_INVALID, req)
+        feed = self.feeds[order.symbol]
+        price = round(req.price, feed.spec['digits']) if req.price else order.price
+        sl = req.sl or 0.0
+        tp = req.tp or 0.0
+        if price == order.price and sl == order.sl and tp == order.tp:
+            return self._result(TRADE_RETCODE_NO_CHANGES, req, feed=feed)
+
+        valid = {
+            ORDER_TYPE_BUY_LIMIT: 0 < price < feed.cur_ask,
+            ORDER_TYPE_SELL_LIMIT: price > feed.cur_bid,
+            ORDER_TYPE_BUY_STOP: price > feed.cur_ask,
+            ORDER_TYPE_SELL_STOP: 0 < price < feed.cur_bid,
+        }[order.type]
+        if not valid:
+            return self._result(TRADE_RETCODE_INVALID_PRICE, req, feed=feed)
+        side = ORDER_TYPE_BUY if order.type in (ORDER_TYPE_BUY_LIMIT, ORDER_TYPE_BUY_STOP) else ORDER_TYPE_SELL
+        if not self._check_stops(feed, side, price, sl, tp):
+            return self._result(TRADE_RETCODE_INVALID_STOPS, req, feed=feed)
+
+        order.price, order.sl, order.tp = price, sl, tp
+        self._orders_changed(feed, order)
+        self._touch()
+        return self._result(TRADE_RETCODE_DONE, req, 0, order.ticket, order.volume, price, feed)
+
+    def _send_sltp(self, req):
+        position = self.positions.get(req.position)
+        if position is None:
+            return self._result(TRADE_RETCODE_POSITION_CLOSED, req)
+        feed = self.feeds[position.symbol]
+        sl = req.sl or 0.0
+        tp = req.tp or 0.0
+        if sl == position.sl and tp == position.tp:
+            return self._result(TRADE_RETCODE_NO_CHANGES, req, feed=feed)
+        market = feed.cur_bid if position.type == ORDER_TYPE_BUY else feed.cur_ask
+        if not self._check_stops(feed, position.type, market, sl, tp):
+            return self._result(TRADE_RETCODE_INVALID_STOPS, req, feed=feed)
+        position.sl, position.tp = sl, tp
+        position.time_update_msc = feed.cur_msc
+        position.row = None
+        feed.positions_dirty = True
+        self._touch()
+        return self._result(TRADE_RETCODE_DONE, req, feed=feed)
+
+    def _send_close_by(self, req):
+        position = self.positions.get(req.position)
+        opposite = self.positions.get(req.position_by)
+        if position is None or opposite is None:
+            return self._result(TRADE_RETCODE_POSITION_CLOSED, req)
+        if position.symbol != opposite.symbol or position.type == opposite.type:
+            return self._result(TRADE_RETCODE_INVALID, req)
+        feed = self.feeds[position.symbol]
+        volume = min(position.volume, opposite.volume)
+        price = opposite.price_open
+        order_ticket = self._new_ticket()
+        deal = self._close_position(feed, position, volume, price, feed.cur_msc, order_ticket,
+                                    DEAL_REASON_EXPERT, req.comment)
+        self._close_position(feed, opposite, volume, price, feed.cur_msc, order_ticket,
+                             DEAL_REASON_EXPERT, req.comment)
+        return self._result(TRADE_RETCODE_DONE, req, deal, order_ticket, volume, price, feed)
+
+
+# ==================== 입력 변환 헬퍼 ====================
+def _to_trade_request(request):
+    get = request.get
+    return TradeRequest(
+        get('action', 0), get('magic', 0), get('order', 0), get('symbol', ''),
+        float(get('volume', 0.0) or 0.0), float(get('price', 0.0) or 0.0),
+        float(get('stoplimit', 0.0) or 0.0), float(get('sl', 0.0) or 0.0),
+        float(get('tp', 0.0) or 0.0), get('deviation', 0), get('type', 0),
+        get('type_filling', 0), get('type_time', 0), get('expiration', 0),
+        get('comment', ''), get('position', 0), get('position_by', 0),
+    )
+
+
+def _guess_digits(bid):
+    """가격 배열에서 소수점 자릿수 추정"""
+    sample = np.asarray(bid[:1000], dtype=np.float64)
+    for digits in range(0, 6):
+        if np.allclose(np.round(sample, digits), sample, atol=1e-9):
+            return digits
+    return 5
+
+
+def normalize_ticks(source):
+    """여러 형태의 틱 입력을 time_msc/bid/ask/last/volume 배열 dict 로 통일"""
+    if isinstance(source, str):
+        if source.endswith('.npy'):
+            source = np.load(source)
+        elif source.endswith('.npz'):
+            data = np.load(source)
+            source = {key: data[key] for key in data.files}
+        else:
+            import pandas as pd
+            df = pd.read_csv(source)
+            source = {col: df[col].to_numpy() for col in df.columns}
+
+    if isinstance(source, np.ndarray) and source.dtype.names:
+        names = source.dtype.names
+        source = {name: source[name] for name in names}
+
+    if 'time_msc' in source:
+        t_msc = np.asarray(source['time_msc'], dtype=np.int64)
+    elif 'time' in source:
+        t = np.asarray(source['time'])
+        if np.issubdtype(t.dtype, np.datetime64):
+            t_msc = t.astype('datetime64[ms]').astype(np.int64)
+        else:
+            t_msc = (t.astype(np.float64) * 1000).astype(np.int64)
+    else:
+        raise ValueError("틱 데이터에 time 또는 time_msc 컬럼이 필요합니다")
+
+    bid = np.asarray(source['bid'], dtype=np.float64)
+    ask = np.asarray(source['ask'], dtype=np.float64) if 'ask' in source else bid.copy()
+    last = np.asarray(source['last'], dtype=np.float64) if 'last' in source else (bid + ask) / 2
+    volume = np.asarray(source['volume'], dtype=np.float64) if 'volume' in source else np.ones_like(bid)
+
+    # 시간순 정렬 + 0 가격(틱 누락) 제거
+    valid = (bid > 0) & (ask > 0)
+    order = np.argsort(t_msc[valid], kind='stable')
+    return {
+        'time_msc': t_msc[valid][order],
+        'bid': bid[valid][order],
+        'ask': ask[valid][order],
+        'last': last[valid][order],
+        'volume': volume[valid][order],
+    }
+
+
+def generate_ticks(count, start_price=90000.0, volatility=0.00005, spread=10.0,
+                   interval_ms=200, start_time=None, seed=None, digits=2):
+    """🎲 부하 테스트용 합성 틱 생성 (랜덤워크)"""
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0.0, volatility, count)
+    mid = start_price * np.exp(np.cumsum(returns))
+    if start_time is None:
+        start_time = _datetime(2024, 1, 1).timestamp()
+    t_msc = int(start_time * 1000) + np.arange(count, dtype=np.int64) * interval_ms
+    bid = np.round(mid - spread / 2, digits)
+    ask = np.round(mid + spread / 2, digits)
+    return {'time_msc': t_msc, 'bid': bid, 'ask': ask, 'last': np.round(mid, digits),
+            'volume': np.ones(count)}
+
+
+# ==================== 가상 시계 (봇 모듈 주입용) ====================
+class SimClock:
+    """⏱️ time 모듈 대체 - sleep() 은 실제로 자지 않고 틱을 재생"""
+
+    def __init__(self, sim, mode='time', ticks_per_sleep=1):
+        self._sim = sim
+        self.mode = mode
+        self.ticks_per_sleep = ticks_per_sleep
+        self.driver_thread = threading.get_ident()
+        self.sleep_calls = 0
+        self.loop_times = []          # 루프 1회 처리 시간 (실제 초) - 지연 측정용
+        self._last_wake = None
+
+    def time(self):
+        return self._sim.time()
+
+    def sleep(self, seconds):
+        if threading.get_ident() != self.driver_thread:
+            # 보조 스레드(키보드 리스너 등)는 시계를 움직이지 않음
+            _time.sleep(min(seconds, 0.05))
+            return
+        now = _time.perf_counter()
+        if self._last_wake is not None:
+            self.loop_times.append(now - self._last_wake)
+        if self._sim.finished:
+            raise ReplayFinished()
+        self.sleep_calls += 1
+        if self.mode == 'tick':
+            self._sim.step_ticks(self.ticks_per_sleep)
+        else:
+            self._sim.advance(seconds)
+        self._last_wake = _time.perf_counter()
+
+    def __getattr__(self, name):
+        return getattr(_time, name)
+
+
+def make_datetime_class(sim):
+    """datetime.now() 가 가상 시계를 따르는 datetime 서브클래스 생성"""
+
+    class SimDateTime(_datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return cls.fromtimestamp(sim.time(), tz)
+
+        @classmethod
+        def today(cls):
+            return cls.fromtimestamp(sim.time())
+
+    return SimDateTime
+
+
+# ==================== 모듈 레벨 API (import MetaTrader5 as mt5 호환) ====================
+_sim = MT5Simulator()
+_clock = None
+
+
+def get_simulator():
+    return _sim
+
+
+def reset(**account):
+    """새 시뮬레이터로 초기화 (계좌 설정 변경 가능)"""
+    global _sim, _clock
+    _sim = MT5Simulator(**account)
+    _clock = None
+    return _sim
+
+
+def load_ticks(symbol, source, **spec):
+    return _sim.load_ticks(symbol, source, **spec)
+
+
+def get_clock(mode='time', ticks_per_sleep=1):
+    global _clock
+    if _clock is None or _clock._sim is not _sim:
+        _clock = SimClock(_sim, mode, ticks_per_sleep)
+    else:
+        _clock.mode = mode
+        _clock.ticks_per_sleep = ticks_per_sleep
+    return _clock
+
+
+def install():
+    """🔌 import MetaTrader5 가 이 모듈을 가리키도록 등록"""
+    sys.modules['MetaTrader5'] = sys.modules[__name__]
+    return sys.modules[__name__]
+
+
+def patch_module(module, inputs=None, mode='time', ticks_per_sleep=1):
+    """🔧 봇 모듈의 time / datetime / input 을 가상 시계와 스크립트 입력으로 교체"""
+    clock = get_clock(mode, ticks_per_sleep)
+    module.time = clock
+    if getattr(module, 'datetime', None) is _datetime:
+        module.datetime = make_datetime_class(_sim)
+    if getattr(module, 'mt5', None) is not None:
+        module.mt5 = sys.modules[__name__]
+    if inputs is not None:
+        answers = list(inputs)
+
+        def scripted_input(prompt=''):
+            if not answers:
+                raise EOFError('스크립트 입력 소진')
+            return answers.pop(0)
+
+        module.input = scripted_input
+    return clock
+
+
+def call_stats():
+    """API 호출별 (횟수, 평균 지연 µs)"""
+    return {name: (count, total / count * 1e6 if count else 0.0)
+            for name, (count, total) in _sim.call_stats.items()}
+
+
+def _api(name):
+    perf = _time.perf_counter
+
+    def call(*args, **kwargs):
+        sim = _sim
+        t0 = perf()
+        try:
+            return getattr(sim, name)(*args, **kwargs)
+        finally:
+            stat = sim.call_stats[name]
+            stat[0] += 1
+            stat[1] += perf() - t0
+
+    call.__name__ = name
+    return call
+
+
+for _name in ('initialize', 'login', 'shutdown', 'last_error', 'version', 'account_info',
+              'symbols_total', 'symbols_get', 'symbol_info', 'symbol_info_tick', 'symbol_select',
+              'positions_total', 'positions_get', 'orders_total', 'orders_get', 'order_send',
+              'history_deals_total', 'history_deals_get', 'order_calc_margin', 'order_calc_profit',
+              'copy_rates_from_pos', 'copy_rates_from', 'copy_rates_range', 'copy_ticks_from',
+              'copy_ticks_range'):
+    globals()[_name] = _api(_name)
+del _name
+
+
+def _self_benchmark(tick_count=2_000_000, grid_levels=500):
+    """⚡ 시뮬레이터 자체 처리량 측정 (대기주문 그리드 + 틱 리플레이)"""
+    sim = reset(balance=1_000_000.0)
+    sim.load_ticks('BTCUSD', generate_ticks(tick_count, seed=7), digits=2)
+    tick = sim.symbol_info_tick('BTCUSD')
+    mid = (tick.bid + tick.ask) / 2
+    for i in range(1, grid_levels + 1):
+        for order_type, price in ((ORDER_TYPE_BUY_LIMIT, mid * (1 - 0.0001 * i)),
+                                  (ORDER_TYPE_SELL_LIMIT, mid * (1 + 0.0001 * i))):
+            sim.order_send({"action": TRADE_ACTION_PENDING, "symbol": 'BTCUSD', "volume": 0.01,
+                            "type": order_type, "price": price, "magic": 1})
+
+    start = _time.perf_counter()
+    while not sim.finished:
+        sim.advance(1.0)
+    elapsed = _time.perf_counter() - start
+
+    info = sim.account_info()
+    print(f"🧪 틱 {sim.ticks_processed:,}개 재생: {elapsed:.2f}초 "
+          f"({sim.ticks_processed / elapsed * 60:,.0f} 틱/분)")
+    print(f"   체결 deal: {len(sim.deals):,}개 | 포지션: {len(sim.positions):,}개 | "
+          f"대기주문: {len(sim.orders):,}개")
+    print(f"   잔고: ${info.balance:,.2f} | 자산: ${info.equity:,.2f} | 증거금: ${info.margin:,.2f}")
+
+
+if __name__ == "__main__":
+    _self_benchmark()
@@ -0,0 +1,159 @@
+"""
+📼 틱 히스토리 디스크 캐시 - 시장 분석을 실시간 수집(300초 대기) 대신 과거 틱으로
+- copy_ticks_range 로 받은 틱을 1초 샘플(그 초의 마지막 틱 스프레드/중간가)로 줄여 저장
+- 심볼 / 시간대(0~23시)별 파일 - 같은 시간대는 여러 날 것을 모아 시간대별 스프레드 패턴으로 사용
+- 재시작하면 캐시를 그대로 쓰고 마지막 저장 이후 새 틱만 받아 이어 붙임
+- keep_days 보다 오래된 샘플은 자동 정리, 파일 교체는 원자적 (저장 중 중단되어도 이전 캐시 유지)
+- recent() 는 1초 간격 격자로 채움 → 기존 1초마다 symbol_info_tick 을 읽던 것과 같은 모양의 데이터
+
+💡 사용법:
+    history = MarketHistory('market_cache')
+    summary = history.update('BTCUSD')               # 새 틱만 받아 캐시 확장
+    times, spreads, mids = history.recent('BTCUSD', 300)
+    patterns = history.hourly_spreads('BTCUSD')      # {시간대: 스프레드 ndarray}
+"""
+
+import json
+import os
+import time
+from datetime import datetime
+
+import MetaTrader5 as mt5
+import numpy as np
+
+
+def _hours_of_day(seconds):
+    """epoch 초 → 로컬 시간대 (datetime.fromtimestamp(...).hour 와 같음)"""
+    seconds = np.asarray(seconds, dtype=np.int64)
+    if not len(seconds):
+        return seconds
+    offset = datetime.fromtimestamp(int(seconds[-1])).astimezone().utcoffset()
+    return (seconds + int(offset.total_seconds())) // 3600 % 24
+
+
+def per_second_samples(ticks):
+    """틱 배열 → 초마다 마지막 틱의 (시각, 스프레드, 중간가)"""
+    seconds = ticks['time_msc'] // 1000
+    last = np.flatnonzero(np.r_[seconds[1:] != seconds[:-1], True]) if len(seconds) else seconds
+    bid = ticks['bid'][last].astype(np.float64)
+    ask = ticks['ask'][last].astype(np.float64)
+    return seconds[last].astype(np.int64), ask - bid, (bid + ask) / 2
+
+
+class MarketHistory:
+    """📼 심볼/시간대별 1초 샘플 캐시"""
+
+    def __init__(self, directory='market_cache', history_hours=6, keep_days=7):
+        self.directory = directory
+        self.history_hours = history_hours      # 캐시가 없을 때 처음 받아올 구간
+        self.keep_days = keep_days              # 시간대 파일마다 보관할 일수
+
+    def _symbol_dir(self, symbol):
+        return os.path.join(self.directory, symbol)
+
+    def _hour_path(self, symbol, hour):
+        return os.path.join(self._symbol_dir(symbol), f"h{hour:02d}.npz")
+
+    def _meta_path(self, symbol):
+        return os.path.join(self._symbol_dir(symbol), 'meta.json')
+
+    def load_meta(self, symbol):
+        try:
+            with open(self._meta_path(symbol), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def load_hour(self, symbol, hour):
+        """📂 시간대 파일 → (시각, 스프레드, 중간가) (없거나 손상되면 빈 배열)"""
+        try:
+            with np.load(self._hour_path(symbol, hour)) as data:
+                return data['time'], data['spread'], data['mid']
+        except (OSError, ValueError, KeyError):
+            return np.empty(0, np.int64), np.empty(0), np.empty(0)
+
+    def _save_hour(self, symbol, hour, times, spreads, mids):
+        path = self._hour_path(symbol, hour)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, time=times, spread=spreads, mid=mids)
+        os.replace(tmp_path, path)
+
+    def _save_meta(self, symbol, meta):
+        path = self._meta_path(symbol)
+        with open(path + '.tmp', 'w') as f:
+            json.dump(meta, f, indent=2)
+        os.replace(path + '.tmp', path)
+
+    def update(self, symbol):
+        """🔄 마지막 저장 이후 틱만 받아 캐시에 추가 → 요약 dict (틱 조회 실패시 None)"""
+        started = time.perf_counter()
+        tick = mt5.symbol_info_tick(symbol)
+        if tick is None:
+            return None
+
+        meta = self.load_meta(symbol)
+        now = int(tick.time) + 1
+        date_from = max(int(meta.get('last_time', 0)) + 1, now - int(self.history_hours * 3600))
+        ticks = mt5.copy_ticks_range(symbol, date_from, now, mt5.COPY_TICKS_INFO)
+        if ticks is None:
+            return None
+
+        times, spreads, mids = per_second_samples(ticks)
+        if len(times):
+            os.makedirs(self._symbol_dir(symbol), exist_ok=True)
+            cutoff = times[-1] - self.keep_days * 86400
+            hours = _hours_of_day(times)
+            for hour in np.unique(hours):
+                new = hours == hour
+                old_times, old_spreads, old_mids = self.load_hour(symbol, int(hour))
+                keep = (old_times > cutoff) & (old_times < times[new][0])
+                self._save_hour(symbol, int(hour),
+                                np.concatenate([old_times[keep], times[new]]),
+                                np.concatenate([old_spreads[keep], spreads[new]]),
+                                np.concatenate([old_mids[keep], mids[new]]))
+            meta = {'last_time': int(times[-1]), 'updated_at': datetime.now().isoformat()}
+            self._save_meta(symbol, meta)
+
+        return {
+            'new_ticks': len(ticks),
+            'new_samples': len(times),
+            'from_cache': date_from > now - int(self.history_hours * 3600),
+            'last_time': meta.get('last_time'),
+            'fetch_sec': time.perf_counter() - started,
+        }
+
+    def recent(self, symbol, seconds=300):
+        """⏱️ 마지막 seconds 초 → 1초 격자 (시각, 스프레드, 중간가) (캐시 없으면 None)
+
+        틱이 없던 초는 직전 틱 값 유지 (1초마다 현재가를 읽던 방식과 같음)
+        """
+        last_time = self.load_meta(symbol).get('last_time')
+        if last_time is None:
+            return None
+        start = last_time - seconds + 1
+        # 구간이 걸친 시간대 파일만 읽음 (직전 틱을 찾기 위해 한 시간 앞까지)
+        hour_starts = range(start - 3600, last_time + 3600, 3600)
+        parts = [self.load_hour(symbol, int(hour)) for hour in np.unique(_hours_of_day(list(hour_starts)))]
+        times = np.concatenate([p[0] for p in parts])
+        order = np.argsort(times, kind='stable')
+        times = times[order]
+        spreads = np.concatenate([p[1] for p in parts])[order]
+        mids = np.concatenate([p[2] for p in parts])[order]
+
+        grid = np.arange(start, last_time + 1, dtype=np.int64)
+        index = np.searchsorted(times, grid, side='right') - 1
+        valid = index >= 0
+        if not valid.any():
+            return None
+        index = index[valid]
+        return grid[valid], spreads[index], mids[index]
+
+    def hourly_spreads(self, symbol):
+        """🕐 시간대별 캐시된 스프레드 {시간대: ndarray (오래된 것 → 최근)}"""
+        patterns = {}
+        for hour in range(24):
+            times, spreads, _ = self.load_hour(symbol, hour)
+            if len(spreads):
+                patterns[hour] = spreads[np.argsort(times, kind='stable')]
+        return patterns
@@ -0,0 +1,151 @@
+"""
+📸 루프별 시장 스냅샷 - positions_get / orders_get / symbol_info_tick / symbol_info / account_info 를
+한 루프(또는 틱 변경)당 한 번씩만 조회하고 모든 서브시스템이 같은 값을 공유
+- 반환값은 전부 읽기 전용 (MT5 namedtuple 튜플, 현재가는 MappingProxyType)
+- 같은 루프 안에서 다시 조회하면 터미널 호출 없이 캐시 반환 → 절약한 API 호출 수 집계
+- 조회 실패(None)도 그대로 캐시 → 한 루프에서 같은 실패를 반복 조회하지 않음
+
+💡 사용법:
+    market = MarketSnapshot('BTCUSD')
+    market.refresh()                  # 루프 시작시
+    market.positions()                # mt5.positions_get(symbol=...) 대체
+    market.position_book()            # 같은 포지션의 구조화 배열 (Position_Book, 루프당 한 번 변환)
+    market.price()                    # {'bid', 'ask', 'mid', 'spread', 'time'}
+    market.order_send(request)        # mt5.order_send + 주문/포지션/계좌 캐시 무효화
+    market.invalidate(*TRADE_KEYS)    # 일괄 배치(OrderPlacer) 직후
+    market.stats['saved']             # 절약한 API 호출 수
+"""
+
+from datetime import datetime
+from types import MappingProxyType
+
+import MetaTrader5 as mt5
+
+from Position_Book import position_book
+
+
+# 거래(체결/청산/주문 배치)로 바뀌는 조회값
+TRADE_KEYS = ('positions', 'orders', 'account')
+
+# 원본 조회값에서 만든 캐시 - 원본을 비우면 같이 비움
+DERIVED_KEYS = {
+    'positions': ('position_book',),
+    'tick': ('price',),
+}
+
+
+class MarketSnapshot:
+    """📸 한 루프 동안 고정된 MT5 상태 뷰"""
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+        self._cache = {}
+        self._tick_msc = None
+        self.stats = {
+            'refreshes': 0,     # 스냅샷 갱신 횟수
+            'fetched': 0,       # 실제 터미널 호출 수
+            'saved': 0,         # 캐시로 대체된 호출 수
+            'by_call': {},      # 호출 종류별 {'fetched', 'saved'}
+        }
+
+    # ---------- 갱신 ----------
+    def refresh(self, symbol=None):
+        """🔄 새 루프 시작 - 캐시 비움 (심볼 변경도 여기서 반영)"""
+        if symbol is not None:
+            self.symbol = symbol
+        self._cache.clear()
+        self.stats['refreshes'] += 1
+
+    def refresh_on_tick(self, symbol=None):
+        """🔄 새 틱이 들어왔을 때만 캐시 비움 → 새 틱이면 True
+
+        틱 조회 1회는 항상 발생 (그 결과가 새 스냅샷의 tick 으로 재사용됨)
+        """
+        if symbol is not None and symbol != self.symbol:
+            self.symbol = symbol
+            self._tick_msc = None
+        tick = mt5.symbol_info_tick(self.symbol)
+        self._count('tick', fetched=True)
+        msc = tick.time_msc if tick else None
+        if msc is not None and msc == self._tick_msc:
+            return False
+        self._tick_msc = msc
+        self.refresh()
+        self._cache['tick'] = tick
+        return True
+
+    def invalidate(self, *keys):
+        """직접 주문/청산한 뒤 이번 루프에서도 최신값이 꼭 필요할 때만 사용 (파생 캐시도 함께)"""
+        for key in keys or tuple(self._cache):
+            self._cache.pop(key, None)
+            for derived in DERIVED_KEYS.get(key, ()):
+                self._cache.pop(derived, None)
+
+    def order_send(self, request):
+        """📨 mt5.order_send 후 거래로 바뀌는 캐시 무효화 → 이번 루프의 다음 조회는 거래 후 상태"""
+        result = mt5.order_send(request)
+        self.invalidate(*TRADE_KEYS)
+        return result
+
+    # ---------- 조회 ----------
+    def _count(self, key, fetched):
+        counter = self.stats['by_call'].setdefault(key, {'fetched': 0, 'saved': 0})
+        field = 'fetched' if fetched else 'saved'
+        counter[field] += 1
+        self.stats[field] += 1
+
+    def _get(self, key, fetch):
+        if key in self._cache:
+            self._count(key, fetched=False)
+            return self._cache[key]
+        value = fetch()
+        self._count(key, fetched=True)
+        self._cache[key] = value
+        return value
+
+    def positions(self):
+        """심볼 포지션 튜플 (조회 실패시 None)"""
+        return self._get('positions', lambda: mt5.positions_get(symbol=self.symbol))
+
+    def position_book(self):
+        """positions() 의 구조화 배열 (조회 실패시 빈 배열) - 손익/마스크는 Position_Book.evaluate 로"""
+        if 'position_book' not in self._cache:
+            self._cache['position_book'] = position_book(self.positions())
+        return self._cache['position_book']
+
+    def orders(self):
+        """심볼 대기주문 튜플 (조회 실패시 None - 비어있는 것과 구분)"""
+        return self._get('orders', lambda: mt5.orders_get(symbol=self.symbol))
+
+    def tick(self):
+        return self._get('tick', lambda: mt5.symbol_info_tick(self.symbol))
+
+    def symbol_info(self):
+        return self._get('symbol_info', lambda: mt5.symbol_info(self.symbol))
+
+    def account(self):
+        return self._get('account', mt5.account_info)
+
+    def price(self):
+        """현재가 dict (get_current_price 와 같은 키, 읽기 전용) - 틱 없으면 None"""
+        if 'price' in self._cache:
+            return self._cache['price']
+        tick = self.tick()
+        if tick is None:
+            return None
+        price = MappingProxyType({
+            'bid': tick.bid,
+            'ask': tick.ask,
+            'mid': (tick.bid + tick.ask) / 2,
+            'spread': tick.ask - tick.bid,
+            'time': datetime.fromtimestamp(tick.time),
+        })
+        self._cache['price'] = price
+        return price
+
+    def summary(self):
+        """📊 절약 요약 문자열"""
+        total = self.stats['fetched'] + self.stats['saved']
+        ratio = self.stats['saved'] / total * 100 if total else 0.0
+        return (f"API 호출 {self.stats['fetched']}회 | 캐시 {self.stats['saved']}회 절약 ({ratio:.0f}%) | "
+                f"스냅샷 {self.stats['refreshes']}회")
@@ -0,0 +1,98 @@
+"""
+💾 AI 모델 체크포인트 저장소 - 재시작할 때마다 처음부터 학습하지 않고 이어서 학습
+- 저장 항목: PyTorch 모델 가중치 + 옵티마이저 상태, 학습된 StandardScaler, RandomForest
+- 항목 키: 심볼 + 특성 스키마 해시 (특성 이름/순서, 모델 구조가 바뀌면 자동으로 다른 항목)
+- 항목마다 학습한 데이터 구간 해시와 마지막 봉 시각 기록
+  → 같은 구간이면 학습 생략, 아니면 그 이후 새 봉만 미세 학습
+- 임시 파일에 쓴 뒤 교체 (저장 중 중단되어도 이전 체크포인트 유지)
+
+💡 사용법:
+    store = ModelStore('model_cache')
+    key = store.key('BTCUSD', FEATURE_NAMES, models)
+    entry = store.load(key, device)          # 없거나 손상되면 None
+    store.save(key, models, optimizers, scaler, forest, timestamps, prices, version=3)
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+
+import numpy as np
+import torch
+
+
+def window_hash(timestamps, prices):
+    """학습 데이터 구간 해시 (봉 시각 + 종가)"""
+    digest = hashlib.sha1()
+    digest.update(np.ascontiguousarray(timestamps, dtype=np.int64).tobytes())
+    digest.update(np.ascontiguousarray(prices, dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+
+class ModelStore:
+    """💾 심볼/스키마별 모델 체크포인트 디렉터리"""
+
+    def __init__(self, directory='model_cache'):
+        self.directory = directory
+
+    def key(self, symbol, feature_names, models):
+        """심볼 + 특성 스키마 해시 → 체크포인트 키
+
+        models: {이름: nn.Module} - 구조(repr)가 바뀌면 옛 가중치를 쓰지 않도록 스키마에 포함
+        """
+        schema = json.dumps({
+            'features': list(feature_names),
+            'models': {name: repr(model) for name, model in sorted(models.items())},
+        }, sort_keys=True)
+        return f"{symbol}_{hashlib.sha1(schema.encode()).hexdigest()[:12]}"
+
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}.pt")
+
+    def save(self, key, models, optimizers, scaler, forest, timestamps, prices,
+             last_bar_time=None, version=0):
+        """💾 체크포인트 저장 - 파일 교체는 원자적이라 읽는 쪽은 항상 완성된 버전만 봄
+
+        timestamps: 학습한 봉 시각 (epoch 초), prices: 같은 구간 종가
+        last_bar_time: 학습 완료로 볼 마지막 봉 시각 (기본 timestamps 마지막)
+        version: 모델 버전 번호 (학습할 때마다 증가)
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        if last_bar_time is None:
+            last_bar_time = timestamps[-1] if len(timestamps) else 0
+        entry = {
+            'models': {name: model.state_dict() for name, model in models.items()},
+            'optimizers': {name: opt.state_dict() for name, opt in optimizers.items()},
+            'scaler': scaler,
+            'forest': forest,
+            'window_hash': window_hash(timestamps, prices),
+            'last_bar_time': int(last_bar_time),
+            'version': version,
+            'saved_at': datetime.now().isoformat(),
+        }
+        path = self.path(key)
+        tmp_path = path + '.tmp'
+        torch.save(entry, tmp_path)
+        os.replace(tmp_path, path)
+        return path
+
+    def load(self, key, device=None):
+        """📂 체크포인트 불러오기 → entry dict (없거나 손상되면 None)"""
+        path = self.path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            # scaler/forest 는 sklearn 객체라 weights_only 로는 못 읽음 (직접 저장한 파일만 읽음)
+            return torch.load(path, map_location=device, weights_only=False)
+        except Exception as e:
+            print(f"⚠️ 체크포인트 손상 ({path}): {e} - 새로 학습합니다")
+            return None
+
+    @staticmethod
+    def restore(entry, models, optimizers):
+        """체크포인트 가중치/옵티마이저 상태를 기존 객체에 적용"""
+        for name, model in models.items():
+            model.load_state_dict(entry['models'][name])
+        for name, opt in optimizers.items():
+            opt.load_state_dict(entry['optimizers'][name])
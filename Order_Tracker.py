@@ -0,0 +1,92 @@
+"""
+🗂️ 주문 추적 인덱스 - ticket 키 dict + 집합 연산으로 체결/취소/신규 주문 검출
+- 매 루프 orders_get 스냅샷을 이전 스냅샷과 비교 (O(주문 수), 레벨 × 주문 전수 비교 없음)
+- 봇이 등록한 주문에는 태그(예: ('buy', level))를 붙여 체결시 바로 레벨을 찾음
+- 등록 직후 다음 스냅샷 전에 체결된 주문도 놓치지 않음
+- 봇이 직접 취소한 주문은 '체결' 이 아니라 '취소' 로 분류
+
+💡 사용법:
+    tracker = OrderTracker()
+    tracker.track(result.order, ('buy', level))       # 주문 배치 직후
+    diff = tracker.update(mt5.orders_get(symbol=symbol))
+    for ticket, order, tag in diff.filled: ...
+"""
+
+from collections import namedtuple
+
+# order: 마지막으로 본 TradeOrder (스냅샷에 한 번도 안 나타났으면 None)
+TrackedOrder = namedtuple('TrackedOrder', ['ticket', 'order', 'tag'])
+OrderDiff = namedtuple('OrderDiff', ['new', 'filled', 'cancelled'])
+
+
+class OrderTracker:
+    """🗂️ ticket → 주문 인덱스 (스냅샷 차이 계산)"""
+
+    def __init__(self):
+        self._orders = {}         # ticket → TradeOrder (현재 스냅샷)
+        self._tags = {}           # ticket → 봇이 붙인 태그
+        self._expected = set()    # 등록했지만 아직 스냅샷에서 못 본 주문
+        self._cancelled = set()   # 봇이 직접 취소 요청한 주문
+        self.stats = {'updates': 0, 'new': 0, 'filled': 0, 'cancelled': 0}
+
+    # ---------- 봇 쪽 알림 ----------
+    def track(self, ticket, tag=None):
+        """주문 배치 성공 직후 호출 - 다음 update 에서 사라져 있으면 체결로 판정"""
+        self._tags[ticket] = tag
+        if ticket not in self._orders:
+            self._expected.add(ticket)
+
+    def untrack(self, ticket):
+        self._tags.pop(ticket, None)
+        self._expected.discard(ticket)
+
+    def note_cancelled(self, ticket):
+        """봇이 직접 취소한 주문 - 사라져도 체결로 보지 않음"""
+        self._cancelled.add(ticket)
+
+    # ---------- 스냅샷 비교 ----------
+    def update(self, orders):
+        """📋 새 orders_get 스냅샷 반영 → OrderDiff(new, filled, cancelled)"""
+        current = {order.ticket: order for order in orders or ()}
+        previous = self._orders
+
+        gone = (previous.keys() | self._expected) - current.keys()
+        new = [current[t] for t in current.keys() - previous.keys()]
+
+        filled, cancelled = [], []
+        for ticket in gone:
+            entry = TrackedOrder(ticket, previous.get(ticket), self._tags.pop(ticket, None))
+            (cancelled if ticket in self._cancelled else filled).append(entry)
+
+        self._cancelled.intersection_update(current.keys())
+        self._expected.clear()
+        self._orders = current
+
+        self.stats['updates'] += 1
+        self.stats['new'] += len(new)
+        self.stats['filled'] += len(filled)
+        self.stats['cancelled'] += len(cancelled)
+        return OrderDiff(new, filled, cancelled)
+
+    # ---------- 조회 (O(1)) ----------
+    def __contains__(self, ticket):
+        return ticket in self._orders
+
+    def __len__(self):
+        return len(self._orders)
+
+    def get(self, ticket):
+        return self._orders.get(ticket)
+
+    def tag_of(self, ticket):
+        return self._tags.get(ticket)
+
+    def orders(self):
+        """마지막 스냅샷의 주문들 (orders_get 재호출 없이 공유)"""
+        return tuple(self._orders.values())
+
+    def clear(self):
+        self._orders.clear()
+        self._tags.clear()
+        self._expected.clear()
+        self._cancelled.clear()
@@ -14,6 +14,13 @@ import json
 import os
 from collections import defaultdict
 
+from Series_Store import SeriesStore
+from Trade_Journal import TradeJournal
+
+# 가격 변동 기록 스키마 (Series_Store 열) - 예전엔 trading_stats.json 의 price_movements dict 목록
+PRICE_MOVEMENT_FIELDS = {'from_price': 'f8', 'to_price': 'f8', 'change': 'f8', 'profit': 'f8', 'lot_size': 'f8',
+                         'ticket': 'i8'}
+
 # ==================== 플랫폼 설정 ====================
 PLATFORMS = {
     '1': {
@@ -127,6 +134,11 @@ class RevolutionaryCompoundBot:
             'hourly_profits': defaultdict(float)
         }
         self.save_file = 'trading_stats.json'
+        self.journal = TradeJournal(self.save_file)   # 거래마다 바뀐 항목만 추가 기록
+        # 틱 단위 가격 변동 기록 - 30일 보관, 2일 지나면 1분 간격으로 축소 (변동폭/수익은 합계)
+        self.price_movements = SeriesStore('series_store/price_movements', PRICE_MOVEMENT_FIELDS,
+                                           retention_days=30, downsample_after_days=2, downsample_seconds=60,
+                                           sum_fields=('change', 'profit'))
         self.load_stats()
         
     def select_platform(self):
@@ -553,31 +565,48 @@ class RevolutionaryCompoundBot:
         
         print(f"{'='*70}\n")
     
-    def save_stats(self):
-        """통계 저장"""
+    def save_stats(self, compact=False):
+        """통계 저장 - 저널에 바뀐 항목만 한 줄 추가 (compact=True 면 전체 스냅샷으로 압축)"""
         stats_to_save = self.stats.copy()
         stats_to_save['daily_profits'] = dict(stats_to_save['daily_profits'])
         stats_to_save['hourly_profits'] = dict(stats_to_save['hourly_profits'])
         stats_to_save['start_time'] = stats_to_save['start_time'].isoformat()
         
-        with open(self.save_file, 'w') as f:
-            json.dump(stats_to_save, f, indent=2)
+        if compact:
+            self.journal.snapshot(stats_to_save)
+            self.price_movements.flush()
+        else:
+            self.journal.record(stats_to_save)
     
     def load_stats(self):
         """통계 불러오기"""
-        if os.path.exists(self.save_file):
-            try:
-                with open(self.save_file, 'r') as f:
-                    loaded_stats = json.load(f)
-                
+        try:
+            # 스냅샷(기존 통계 파일) + 저널 재생
+            loaded_stats = self.journal.load()
+            if loaded_stats:
+                # 예전 price_movements 목록 → 시계열 저장소 (통계 JSON 에서는 뺌)
+                legacy_movements = loaded_stats.pop('price_movements', [])
+                for movement in legacy_movements:
+                    # 두 가지 옛 형식 (profit/lot_size 또는 expected_profit/trade_volume/trade_ticket)
+                    self.price_movements.append(
+                        datetime.fromisoformat(movement['time']).timestamp(),
+                        from_price=movement.get('from_price'), to_price=movement.get('to_price'),
+                        change=movement.get('change'),
+                        profit=movement.get('profit', movement.get('expected_profit')),
+                        lot_size=movement.get('lot_size', movement.get('trade_volume')),
+                        ticket=movement.get('trade_ticket'))
                 self.stats.update(loaded_stats)
                 self.stats['start_time'] = datetime.fromisoformat(loaded_stats['start_time'])
                 self.stats['daily_profits'] = defaultdict(float, loaded_stats['daily_profits'])
                 self.stats['hourly_profits'] = defaultdict(float, loaded_stats['hourly_profits'])
                 
                 print(f"\n✓ 이전 통계 불러옴: 누적 수익 ${self.stats['total_profit']:,.2f}")
-            except:
-                print("\n⚠️ 통계 파일 손상. 새로 시작합니다.")
+                if legacy_movements:
+                    # 옮긴 목록이 빠진 스냅샷으로 다시 써서 다음 시작에 또 옮기지 않음
+                    self.save_stats(compact=True)
+                    print(f"✓ 가격 변동 기록 {len(legacy_movements)}건을 시계열 저장소로 이전")
+        except:
+            print("\n⚠️ 통계 파일 손상. 새로 시작합니다.")
     
     def run(self):
         """메인 트레이딩 루프"""
@@ -650,7 +679,7 @@ class RevolutionaryCompoundBot:
                     print("✓ 모든 포지션 청산 완료")
             
         finally:
-            self.save_stats()
+            self.save_stats(compact=True)
             mt5.shutdown()
             print("\nMT5 연결 종료\n")
 
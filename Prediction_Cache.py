@@ -0,0 +1,60 @@
+"""
+🧠 예측 결과 캐시 - (심볼, 마지막 봉 시각, 진행 중인 봉 종가/틱 수, 모델 버전) 이 같으면 모델을 다시 돌리지 않음
+- 입력(진행 중인 봉 미리보기)이 그대로인 반복 호출 → 저장된 모델 출력 그대로 반환 (추론/출력 없음)
+- 모델 재학습/교체시 invalidate() 로 명시적으로 비움 (버전이 키에 있어도 옛 항목 정리)
+- 최근 항목만 보관 (오래된 봉 결과는 자동으로 밀려남)
+- 적중/미스/무효화 횟수 집계
+
+💡 사용법:
+    cache = PredictionCache()
+    key = ('BTCUSD', bar_time, forming['close'], forming['tick_volume'], model_version)
+    outputs = cache.get(key)
+    if outputs is None:
+        outputs = predict(...)
+        cache.put(key, outputs)
+    cache.invalidate()                       # 모델 재학습/교체 후
+    print(cache.summary())
+"""
+
+from collections import OrderedDict
+
+
+class PredictionCache:
+    """🧠 봉/모델 버전 단위 예측 메모이제이션"""
+
+    def __init__(self, max_entries=16):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+
+    def get(self, key):
+        """캐시된 출력 (없으면 None)"""
+        outputs = self._entries.get(key)
+        if outputs is None:
+            self.stats['misses'] += 1
+            return None
+        self.stats['hits'] += 1
+        return outputs
+
+    def put(self, key, outputs):
+        self._entries[key] = outputs
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self):
+        """🧹 전부 비움 (모델 재학습/교체시)"""
+        self._entries.clear()
+        self.stats['invalidations'] += 1
+
+    def __len__(self):
+        return len(self._entries)
+
+    def hit_rate(self):
+        total = self.stats['hits'] + self.stats['misses']
+        return self.stats['hits'] / total if total else 0.0
+
+    def summary(self):
+        """📊 캐시 요약 문자열"""
+        return (f"예측 캐시 적중 {self.stats['hits']}회 | 미스 {self.stats['misses']}회 "
+                f"({self.hit_rate() * 100:.0f}%) | 무효화 {self.stats['invalidations']}회")
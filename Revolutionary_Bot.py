@@ -29,6 +29,13 @@ import json
 import os
 from collections import defaultdict
 import warnings
+
+from Fast_Inference import FastPredictor
+from Model_Store import ModelStore, window_hash
+from Position_Book import evaluate, position_book, position_pnl
+from Prediction_Cache import PredictionCache
+from Streaming_Indicators import FEATURE_NAMES, StreamingFeatureEngine, build_feature_matrix
+from Training_Worker import TrainingWorker
 warnings.filterwarnings('ignore')
 
 class PyTorchPricePredictor(nn.Module):
@@ -89,7 +96,16 @@ class RevolutionaryAIBot:
             'extreme_loss_multiplier': 0.01,     # 극도로 가깝게 (0.01배)
             'ai_confidence_threshold': 0.6,      # AI 신뢰도 임계값
             'max_spread': 10.0,
-            'device': torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+            'device': torch.device('cuda' if torch.cuda.is_available() else 'cpu'),
+            'model_cache_dir': 'model_cache',    # 모델 체크포인트 저장 위치
+            'fine_tune_epochs': {'price': 20, 'direction': 30},  # 체크포인트 이어서 학습할 때
+            'fine_tune_min_rows': 100,           # 미세 학습 최소 샘플 (새 봉이 적으면 최근 봉 포함)
+            'background_training': True,         # 재학습을 별도 프로세스에서 (거래 루프 안 멈춤)
+            'training_threads': 2,               # 학습 프로세스 torch 스레드 수
+            'retrain_interval': 600,             # 정기 재학습 주기 (초)
+            'drift_z_threshold': 3.0,            # 최신 특성 평균 |z| 가 이 이상이면 분포 변화로 보고 재학습
+            'drift_min_interval': 60,            # 분포 변화 재학습 최소 간격 (초)
+            'fast_inference': True               # ⚡ 스케일러 합친 TorchScript + 펼친 포레스트로 예측 (CPU)
         }
         
         self.ai_models = {
@@ -111,15 +127,30 @@ class RevolutionaryAIBot:
             'direction_loss': nn.CrossEntropyLoss()
         }
         
+        # 💾 모델 체크포인트 (심볼 + 특성 스키마별)
+        self.model_store = ModelStore(self.config['model_cache_dir'])
+        self.model_key = self.model_store.key(self.config['symbol'], FEATURE_NAMES, self.torch_models())
+        self.trained_until = None   # 마지막으로 학습에 쓴 마감 봉 시각 (epoch 초)
+        self.model_version = 0      # 학습할 때마다 증가 (체크포인트에 기록)
+        self.trainer = None         # 🏋️ 백그라운드 학습 프로세스 (run_extreme_system 에서 시작)
+        self.fast_predictor = None  # ⚡ 모델이 바뀔 때마다 다시 생성
+        self.prediction_cache = PredictionCache()   # 🧠 (심볼, 봉 시각, 진행 봉 종가/틱 수, 모델 버전) → 모델 출력
+        
         self.market_data = {
             'prices': [],
             'volumes': [],
             'spreads': [],
             'timestamps': [],
             'features': [],
-            'raw_data': []
+            'raw_data': [],
+            'latest_features': None,    # 스트리밍 엔진 기준 최신 특성 (예측용)
+            'forming_bar': None,        # 진행 중인 봉 (copy_rates 레코드)
+            'latest_bar_time': None     # 진행 중인 봉 시각 (예측 캐시 키)
         }
         
+        # 📈 스트리밍 지표 엔진 (새 봉마다 O(1) 갱신, collect_advanced_market_data 에서 워밍업)
+        self.feature_engine = None
+        
         self.stats = {
             'total_profit': 0.0,
             'total_trades': 0,
@@ -209,39 +240,64 @@ class RevolutionaryAIBot:
         df['stoch_k'] = 100 * ((df['close'] - low_14) / (high_14 - low_14))
         df['stoch_d'] = df['stoch_k'].rolling(window=3).mean()
         
-        # PyTorch용 고급 특성 생성
-        features = []
-        for i in range(50, len(df)):
-            feature_vector = [
-                df['rsi'].iloc[i],
-                df['rsi_fast'].iloc[i],
-                df['rsi_slow'].iloc[i],
-                df['macd'].iloc[i],
-                df['macd_signal'].iloc[i],
-                df['macd_histogram'].iloc[i],
-                df['volatility'].iloc[i],
-                df['volatility_fast'].iloc[i],
-                df['price_change'].iloc[i],
-                df['price_change_5'].iloc[i],
-                df['volume_change'].iloc[i],
-                df['bb_position'].iloc[i],
-                df['bb_width'].iloc[i],
-                df['stoch_k'].iloc[i],
-                df['stoch_d'].iloc[i]
-            ]
-            
-            # NaN 값 처리
-            feature_vector = [0.0 if pd.isna(x) else float(x) for x in feature_vector]
-            features.append(feature_vector)
+        # PyTorch용 고급 특성 생성 - 컬럼 배열에서 float32 행렬 한 번에 (앞 50봉은 지표 워밍업)
+        features = build_feature_matrix(df, start=50)
         
-        self.market_data['features'] = np.array(features)
+        self.market_data['features'] = features
         self.market_data['prices'] = df['close'].values
         self.market_data['timestamps'] = df['time'].values
         self.market_data['raw_data'] = df
         
+        # 스트리밍 엔진 워밍업 - 마감된 봉까지 반영, 마지막(진행 중) 봉은 미리보기
+        self.feature_engine = StreamingFeatureEngine()
+        self.feature_engine.warm_up(rates[-StreamingFeatureEngine.WARM_UP_BARS - 1:-1])
+        self.market_data['forming_bar'] = rates[-1]
+        self.market_data['latest_bar_time'] = int(rates[-1]['time'])
+        self.market_data['latest_features'] = self.feature_engine.preview(rates[-1])
+        
         print(f"✅ {len(features)}개 고급 특성 벡터 생성 완료!")
         return True
     
+    def update_streaming_features(self, preview=True):
+        """📈 새로 마감된 봉만 스트리밍 엔진에 반영 → 최신 특성 벡터 (실패시 None)
+        
+        전체 DataFrame 재계산 없이 마지막 반영 이후의 봉만 조회해서 증분 갱신
+        preview=False: 봉만 반영하고 진행 중인 봉 특성 계산은 미룸 (preview_forming_bar)
+        """
+        engine = self.feature_engine
+        if engine is None or engine.last_time is None:
+            return None
+        
+        symbol = self.config['symbol']
+        rates = mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_M1, 0, 2)
+        if rates is None or len(rates) == 0:
+            return self.market_data['latest_features']
+        
+        # 조회한 봉보다 많이 밀렸으면 빠진 봉까지 다시 조회
+        missing = int(rates[0]['time'] - engine.last_time) // 60 - 1
+        if missing > 0:
+            rates = mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_M1, 0, missing + 2)
+            if rates is None or len(rates) == 0:
+                return self.market_data['latest_features']
+        
+        for bar in rates[:-1]:
+            if bar['time'] > engine.last_time:
+                engine.update(bar)
+        
+        self.market_data['forming_bar'] = rates[-1]
+        self.market_data['latest_bar_time'] = int(rates[-1]['time'])
+        if preview:
+            return self.preview_forming_bar()
+        return self.market_data['latest_features']
+    
+    def preview_forming_bar(self):
+        """👀 진행 중인 봉은 엔진 상태를 바꾸지 않고 미리보기 (이미 반영된 봉이면 이전 값 유지)"""
+        engine = self.feature_engine
+        forming = self.market_data['forming_bar']
+        if engine is not None and forming is not None and forming['time'] > engine.last_time:
+            self.market_data['latest_features'] = engine.preview(forming)
+        return self.market_data['latest_features']
+    
     def calculate_rsi(self, prices, period=14):
         """RSI 계산"""
         delta = prices.diff()
@@ -251,22 +307,119 @@ class RevolutionaryAIBot:
         rsi = 100 - (100 / (1 + rs))
         return rsi
     
-    def train_pytorch_models(self):
-        """🤖 PyTorch 모델 학습"""
+    def torch_models(self):
+        return {
+            'price_predictor': self.ai_models['price_predictor'],
+            'direction_classifier': self.ai_models['direction_classifier']
+        }
+    
+    def feature_times(self):
+        """특성 행별 봉 시각 (epoch 초)"""
+        timestamps = self.market_data['timestamps'].astype('datetime64[s]').astype(np.int64)
+        return timestamps[len(timestamps) - len(self.market_data['features']):]
+    
+    def prepare_ai_models(self):
+        """💾 저장된 체크포인트가 있으면 불러와서 새 봉만 미세 학습, 없으면 전체 학습"""
+        entry = self.model_store.load(self.model_key, self.config['device'])
+        if entry is None:
+            print("💾 저장된 모델 없음 - 처음부터 학습합니다")
+            return self.train_pytorch_models()
+        
+        try:
+            self.apply_checkpoint(entry)
+        except (KeyError, RuntimeError) as e:
+            print(f"⚠️ 체크포인트 적용 실패: {e} - 처음부터 학습합니다")
+            return self.train_pytorch_models()
+        print(f"💾 체크포인트 불러옴: {self.model_key} v{self.model_version} (저장: {entry['saved_at'][:19]})")
+        
+        timestamps = self.market_data['timestamps'].astype('datetime64[s]').astype(np.int64)
+        if entry['window_hash'] == window_hash(timestamps, self.market_data['prices']):
+            print("✅ 같은 데이터 구간으로 학습된 모델 - 학습 생략")
+            return True
+        return self.fine_tune_models()
+    
+    def apply_checkpoint(self, entry):
+        """체크포인트 내용을 현재 모델/스케일러/변동성 모델에 적용"""
+        ModelStore.restore(entry, self.torch_models(), self.optimizers)
+        self.ai_models['scaler'] = entry['scaler']
+        self.ai_models['volatility_predictor'] = entry['forest']
+        self.trained_until = entry['last_bar_time']
+        self.model_version = entry.get('version', 0)
+        self.on_models_changed()
+    
+    def on_models_changed(self):
+        """모델 재학습/교체 후 - 추론기 재생성 + 예측 캐시 비움"""
+        self.rebuild_fast_predictor()
+        self.prediction_cache.invalidate()
+    
+    def rebuild_fast_predictor(self):
+        """⚡ 현재 모델로 저지연 추론기 생성 (실패하면 기존 경로로 예측)"""
+        self.fast_predictor = None
+        if not self.config['fast_inference']:
+            return
+        try:
+            self.fast_predictor = FastPredictor(self.ai_models['price_predictor'],
+                                                self.ai_models['direction_classifier'],
+                                                self.ai_models['scaler'],
+                                                self.ai_models['volatility_predictor'])
+        except Exception as e:
+            print(f"⚠️ 저지연 추론기 생성 실패: {e} - 기존 경로로 예측")
+    
+    def fine_tune_models(self):
+        """🔁 마지막 학습 이후 새 봉만으로 짧게 이어서 학습"""
+        times = self.feature_times()
+        new_from = int(np.searchsorted(times, self.trained_until or 0, side='right'))
+        new_bars = len(times) - new_from
+        if new_bars <= 0:
+            print("✅ 새 봉 없음 - 미세 학습 생략")
+            return True
+        
+        start_row = max(0, min(new_from, len(times) - self.config['fine_tune_min_rows']))
+        print(f"🔁 새 봉 {new_bars}개 미세 학습 (샘플 {len(times) - start_row}개)")
+        return self.train_pytorch_models(start_row=start_row)
+    
+    def save_model_checkpoint(self):
+        """💾 현재 모델/옵티마이저/스케일러/변동성 모델 저장"""
+        timestamps = self.market_data['timestamps'].astype('datetime64[s]').astype(np.int64)
+        try:
+            path = self.model_store.save(self.model_key, self.torch_models(), self.optimizers,
+                                         self.ai_models['scaler'], self.ai_models['volatility_predictor'],
+                                         timestamps, self.market_data['prices'],
+                                         last_bar_time=self.trained_until, version=self.model_version)
+            print(f"💾 모델 체크포인트 저장: {path}")
+        except Exception as e:
+            print(f"⚠️ 모델 체크포인트 저장 실패: {e}")
+    
+    def train_pytorch_models(self, start_row=None):
+        """🤖 PyTorch 모델 학습
+        
+        start_row: 지정하면 그 특성 행부터 미세 학습 (스케일러/변동성 모델은 체크포인트 것 유지, 짧은 에포크)
+        """
+        fine_tune = start_row is not None
         if len(self.market_data['features']) < 100:
             print("⚠️ 학습 데이터 부족")
             return False
         
-        print("🤖 PyTorch 모델 학습 중...")
+        print("🤖 PyTorch 모델 " + ("미세 학습 중..." if fine_tune else "학습 중..."))
         
         features = self.market_data['features']
         prices = self.market_data['prices']
+        price_epochs, direction_epochs = 100, 150
+        if fine_tune:
+            # 특성과 가격을 같은 만큼 잘라야 정렬(len(prices) - len(features))이 유지됨
+            features = features[start_row:]
+            prices = prices[start_row:]
+            price_epochs = self.config['fine_tune_epochs']['price']
+            direction_epochs = self.config['fine_tune_epochs']['direction']
+        
+        # 특성 정규화 (float32 입력 → float32 출력, 미세 학습은 기존 스케일 유지)
+        if fine_tune:
+            features_scaled = self.ai_models['scaler'].transform(features)
+        else:
+            features_scaled = self.ai_models['scaler'].fit_transform(features)
         
-        # 특성 정규화
-        features_scaled = self.ai_models['scaler'].fit_transform(features)
-        
-        # PyTorch 텐서로 변환
-        X = torch.FloatTensor(features_scaled).to(self.config['device'])
+        # PyTorch 텐서로 변환 (CPU 에서는 numpy 메모리 공유, 복사 없음)
+        X = torch.as_tensor(features_scaled, dtype=torch.float32, device=self.config['device'])
         
         # 1. 가격 예측 모델 학습
         print("  📈 가격 예측 모델 학습...")
@@ -280,7 +433,7 @@ class RevolutionaryAIBot:
         print(f"    학습 데이터 크기: X={X_price.shape}, y={y_price.shape}")
         
         self.ai_models['price_predictor'].train()
-        for epoch in range(100):
+        for epoch in range(price_epochs):
             self.optimizers['price_opt'].zero_grad()
             predictions = self.ai_models['price_predictor'](X_price).squeeze()
             loss = self.loss_functions['price_loss'](predictions, y_price)
@@ -325,7 +478,7 @@ class RevolutionaryAIBot:
             print("    ⚠️ 방향 학습 데이터 없음, 건너뛰기")
         else:
             self.ai_models['direction_classifier'].train()
-            for epoch in range(150):
+            for epoch in range(direction_epochs):
                 self.optimizers['direction_opt'].zero_grad()
                 predictions = self.ai_models['direction_classifier'](X_direction)
                 loss = self.loss_functions['direction_loss'](predictions, y_direction)
@@ -335,6 +488,9 @@ class RevolutionaryAIBot:
                 if epoch % 30 == 0:
                     print(f"    Epoch {epoch}: Loss = {loss.item():.4f}")
         
+        if fine_tune:
+            return self.finish_training()
+        
         # 3. 변동성 예측 모델 학습 (scikit-learn)
         print("  ⚡ 변동성 예측 모델 학습...")
         volatilities = []
@@ -358,24 +514,33 @@ class RevolutionaryAIBot:
             self.ai_models['volatility_predictor'].fit(features_for_vol, volatilities)
             print(f"    변동성 모델 학습 완료: {len(volatilities)}개 샘플")
         
+        return self.finish_training()
+    
+    def finish_training(self):
+        # 진행 중인 마지막 봉은 다음 미세 학습에 다시 포함되도록 그 전 봉까지만 학습 완료로 기록
+        times = self.feature_times()
+        self.trained_until = int(times[-2]) if len(times) > 1 else None
+        self.model_version += 1
+        self.on_models_changed()
+        self.save_model_checkpoint()
         print("✅ 모든 AI 모델 학습 완료!")
         return True
     
-    def get_pytorch_prediction(self):
-        """🤖 PyTorch AI 예측 수행"""
-        current_price = self.get_current_price()
-        if not current_price:
-            return None
+    def run_prediction_models(self):
+        """🤖 최신 특성으로 세 모델 실행 → (예측가, 방향 확률, 예상 변동성)"""
+        latest_features = self.preview_forming_bar()
+        if latest_features is None:
+            latest_features = self.market_data['features'][-1]
         
-        if len(self.market_data['features']) == 0:
-            return None
+        if self.fast_predictor is not None:
+            # ⚡ 미리 할당된 버퍼 + TorchScript + 펼친 포레스트
+            return self.fast_predictor.predict(latest_features)
         
-        # 최신 특성 벡터
-        latest_features = self.market_data['features'][-1].reshape(1, -1)
+        latest_features = latest_features.reshape(1, -1)
         features_scaled = self.ai_models['scaler'].transform(latest_features)
         
         # PyTorch 텐서로 변환
-        X = torch.FloatTensor(features_scaled).to(self.config['device'])
+        X = torch.as_tensor(features_scaled, dtype=torch.float32, device=self.config['device'])
         
         # AI 예측 수행
         self.ai_models['price_predictor'].eval()
@@ -386,6 +551,29 @@ class RevolutionaryAIBot:
             direction_probs = self.ai_models['direction_classifier'](X).cpu().numpy()[0]
         
         predicted_volatility = self.ai_models['volatility_predictor'].predict(features_scaled)[0]
+        return predicted_price, direction_probs, predicted_volatility
+    
+    def get_pytorch_prediction(self):
+        """🤖 PyTorch AI 예측 수행"""
+        current_price = self.get_current_price()
+        if not current_price:
+            return None
+        
+        if len(self.market_data['features']) == 0:
+            return None
+        
+        # 새로 마감된 봉 반영 (진행 중인 봉 특성은 캐시 미스일 때만 계산)
+        # 예측 입력이 진행 중인 봉 미리보기라 그 봉의 종가/틱 수까지 키에 포함 (새 틱이면 다시 예측)
+        self.update_streaming_features(preview=False)
+        forming = self.market_data['forming_bar']
+        forming_state = (float(forming['close']), int(forming['tick_volume'])) if forming is not None else None
+        cache_key = (self.config['symbol'], self.market_data['latest_bar_time'], forming_state, self.model_version)
+        outputs = self.prediction_cache.get(cache_key)
+        cached = outputs is not None
+        if not cached:
+            outputs = self.run_prediction_models()
+            self.prediction_cache.put(cache_key, outputs)
+        predicted_price, direction_probs, predicted_volatility = outputs
         
         # 방향 결정
         direction_idx = np.argmax(direction_probs)
@@ -403,6 +591,9 @@ class RevolutionaryAIBot:
             'direction_probs': direction_probs.tolist()
         }
         
+        if cached:
+            return prediction      # 같은 봉/모델 - 이미 출력한 예측
+        
         print(f"🤖 PyTorch AI 예측: {predicted_direction} (신뢰도: {confidence:.3f})")
         print(f"   현재가: ${current_price['mid']:,.2f}")
         print(f"   예측가: ${predicted_price:,.2f}")
@@ -705,55 +896,36 @@ class RevolutionaryAIBot:
             print("❌ 현재가 조회 실패")
             return
         
-        total_unrealized_profit = 0
-        buy_positions = []
-        sell_positions = []
+        # 전체 포지션 손익/수익률을 한 번에 계산
+        book = position_book(positions)
+        ev = evaluate(book, current_price['bid'], current_price['ask'])
+        is_buy = ev['is_buy']
+        total_unrealized_profit = float(ev['pnl'].sum())
+        # 목표가까지 거리 (매수 tp - 현재가, 매도 현재가 - tp) × 랏
+        distance_to_tp = np.where(is_buy, book['tp'] - ev['close_price'], ev['close_price'] - book['tp'])
+        potential_profit = distance_to_tp * book['volume']
         
         print(f"\n📊 실제 포지션 분석:")
         print(f"   현재 BTC 가격: ${current_price['mid']:,.2f}")
         print(f"   활성 포지션: {len(positions)}개")
         
         for i, pos in enumerate(positions):
-            # 포지션 타입별 분류
-            if pos.type == mt5.ORDER_TYPE_BUY:
-                unrealized_profit = (current_price['bid'] - pos.price_open) * pos.volume
-                buy_positions.append(pos)
-                position_type = "매수"
-                current_value = current_price['bid']
-            else:
-                unrealized_profit = (pos.price_open - current_price['ask']) * pos.volume
-                sell_positions.append(pos)
-                position_type = "매도"
-                current_value = current_price['ask']
-            
-            total_unrealized_profit += unrealized_profit
-            
-            # 수익률 계산
-            profit_percentage = (unrealized_profit / (pos.price_open * pos.volume)) * 100
-            
-            print(f"\n   포지션 #{i+1} ({position_type}):")
+            print(f"\n   포지션 #{i+1} ({'매수' if is_buy[i] else '매도'}):")
             print(f"     티켓: {pos.ticket}")
             print(f"     진입가: ${pos.price_open:,.2f}")
-            print(f"     현재가: ${current_value:,.2f}")
+            print(f"     현재가: ${ev['close_price'][i]:,.2f}")
             print(f"     거래량: {pos.volume}")
             print(f"     목표가: ${pos.tp:,.2f}")
             print(f"     손절가: ${pos.sl:,.2f}")
-            print(f"     미실현 손익: ${unrealized_profit:+.2f} ({profit_percentage:+.2f}%)")
-            
-            # 목표가까지의 거리 계산
-            if pos.type == mt5.ORDER_TYPE_BUY:
-                distance_to_tp = pos.tp - current_value
-                potential_profit = distance_to_tp * pos.volume
-            else:
-                distance_to_tp = current_value - pos.tp
-                potential_profit = distance_to_tp * pos.volume
-            
-            print(f"     목표까지: ${distance_to_tp:+.2f} (잠재수익: ${potential_profit:+.2f})")
+            print(f"     미실현 손익: ${ev['pnl'][i]:+.2f} ({ev['profit_pct'][i]:+.2f}%)")
+            print(f"     목표까지: ${distance_to_tp[i]:+.2f} (잠재수익: ${potential_profit[i]:+.2f})")
         
         # 양방향 거래 분석
+        buy_count = int(is_buy.sum())
+        sell_count = len(book) - buy_count
         print(f"\n🎯 양방향 거래 분석:")
-        print(f"   매수 포지션: {len(buy_positions)}개")
-        print(f"   매도 포지션: {len(sell_positions)}개")
+        print(f"   매수 포지션: {buy_count}개")
+        print(f"   매도 포지션: {sell_count}개")
         print(f"   총 미실현 손익: ${total_unrealized_profit:+.2f}")
         
         # 계좌 정보 확인
@@ -764,25 +936,14 @@ class RevolutionaryAIBot:
             print(f"   계좌 잔고: ${account_info.balance:,.2f}")
             print(f"   계좌 자산: ${account_info.equity:,.2f}")
         
-        # 양방향 수익 예측
-        if len(buy_positions) > 0 and len(sell_positions) > 0:
+        # 양방향 수익 예측 (±5% 가격에서 전체 포지션 손익)
+        if buy_count > 0 and sell_count > 0:
             print(f"\n🚀 양방향 수익 시나리오:")
             
-            # 5% 상승시
             price_up = current_price['mid'] * 1.05
-            profit_if_up = 0
-            for pos in buy_positions:
-                profit_if_up += (price_up - pos.price_open) * pos.volume
-            for pos in sell_positions:
-                profit_if_up += (pos.price_open - price_up) * pos.volume
-            
-            # 5% 하락시  
             price_down = current_price['mid'] * 0.95
-            profit_if_down = 0
-            for pos in buy_positions:
-                profit_if_down += (price_down - pos.price_open) * pos.volume
-            for pos in sell_positions:
-                profit_if_down += (pos.price_open - price_down) * pos.volume
+            profit_if_up = float(position_pnl(book, price_up, price_up).sum())
+            profit_if_down = float(position_pnl(book, price_down, price_down).sum())
             
             print(f"   5% 상승시 (${price_up:,.2f}): ${profit_if_up:+.2f}")
             print(f"   5% 하락시 (${price_down:,.2f}): ${profit_if_down:+.2f}")
@@ -799,26 +960,14 @@ class RevolutionaryAIBot:
         if not current_price:
             return
         
-        total_profit = 0
-        extreme_profits = 0
-        minimal_losses = 0
-        buy_count = 0
-        sell_count = 0
-        
-        for pos in positions:
-            if pos.type == mt5.ORDER_TYPE_BUY:
-                profit = (current_price['bid'] - pos.price_open) * pos.volume
-                buy_count += 1
-            else:
-                profit = (pos.price_open - current_price['ask']) * pos.volume
-                sell_count += 1
-            
-            total_profit += profit
-            
-            if profit > 0:
-                extreme_profits += profit
-            else:
-                minimal_losses += abs(profit)
+        book = position_book(positions)
+        ev = evaluate(book, current_price['bid'], current_price['ask'])
+        pnl = ev['pnl']
+        buy_count = int(ev['is_buy'].sum())
+        sell_count = len(book) - buy_count
+        total_profit = float(pnl.sum())
+        extreme_profits = float(pnl[pnl > 0].sum())
+        minimal_losses = float(-pnl[pnl <= 0].sum())
         
         if len(positions) > 0:
             print(f"📊 극한 포지션: {len(positions)}개 (매수:{buy_count}, 매도:{sell_count}) | "
@@ -827,15 +976,54 @@ class RevolutionaryAIBot:
                   f"극소손실: ${minimal_losses:.2f}")
             
             # 목표 달성 여부 체크
-            profitable_positions = sum(1 for pos in positions if 
-                                     (pos.type == mt5.ORDER_TYPE_BUY and current_price['bid'] >= pos.tp) or
-                                     (pos.type == mt5.ORDER_TYPE_SELL and current_price['ask'] <= pos.tp))
+            profitable_positions = int(ev['tp_hit'].sum())
             
             if profitable_positions > 0:
                 print(f"🎯 목표 달성 포지션: {profitable_positions}개!")
         
         return total_profit
     
+    def start_background_training(self):
+        """🏋️ 재학습 프로세스 시작 (이미 있으면 종료 후 다시)"""
+        if not self.config['background_training']:
+            return
+        if self.trainer is not None:
+            self.trainer.stop()
+        self.trainer = TrainingWorker(self.config['model_cache_dir'], self.config['training_threads'])
+        self.trainer.start(version=self.model_version)
+    
+    def request_retraining(self, reason):
+        """🔄 재학습 요청 - 학습 프로세스가 있으면 넘기고 바로 반환, 없으면 기존처럼 직접 학습"""
+        if self.trainer is not None and self.trainer.is_alive():
+            if self.trainer.submit(self.market_data, reason):
+                print(f"📤 백그라운드 재학습 요청 ({reason}) - 거래는 계속됩니다")
+                return True
+        return self.train_pytorch_models()
+    
+    def apply_published_models(self):
+        """🆕 학습 프로세스가 새 버전을 게시했으면 불러와 교체 (틱 사이에서 호출)"""
+        if self.trainer is None:
+            return False
+        result = self.trainer.poll()
+        if result is None:
+            return False
+        entry = self.model_store.load(self.model_key, self.config['device'])
+        if entry is None or entry.get('version', 0) <= self.model_version:
+            return False
+        self.apply_checkpoint(entry)
+        print(f"🆕 모델 v{self.model_version} 적용 | 학습 {result['train_sec']:.1f}초 | "
+              f"샘플 {result['samples']}개 | 사유: {result['reason']}")
+        return True
+    
+    def detect_feature_drift(self):
+        """📐 최신 특성이 학습 때 분포에서 크게 벗어났는지 (스케일러 기준 평균 |z|)"""
+        latest = self.market_data['latest_features']
+        scaler = self.ai_models['scaler']
+        if latest is None or not hasattr(scaler, 'scale_'):
+            return False
+        z = np.abs((latest - scaler.mean_) / scaler.scale_)
+        return float(np.nanmean(np.where(np.isfinite(z), z, np.nan))) >= self.config['drift_z_threshold']
+    
     def run_extreme_system(self):
         """🚀 극한 시스템 실행"""
         print("\n" + "="*70)
@@ -846,9 +1034,11 @@ class RevolutionaryAIBot:
         if not self.collect_advanced_market_data(500):
             return False
         
-        if not self.train_pytorch_models():
+        if not self.prepare_ai_models():
             return False
         
+        self.start_background_training()
+        
         print("\n🤖 PyTorch AI 시스템 준비 완료!")
         print("💡 x달러 변화 = x달러 수익 보장!")
         print("🔥 극한 거리 설정으로 어마무시한 수익!")
@@ -864,11 +1054,17 @@ class RevolutionaryAIBot:
             while True:
                 current_time = time.time()
                 
-                # 10분마다 데이터 업데이트 및 AI 재학습
-                if current_time - last_data_update > 600:
-                    print(f"\n🔄 PyTorch AI 모델 업데이트 중... (거래 {trade_count}회 완료)")
+                # 학습 프로세스가 게시한 새 모델 적용 (학습 자체는 다른 프로세스)
+                self.apply_published_models()
+                
+                # 10분마다 또는 특성 분포가 크게 바뀌면 데이터 업데이트 및 AI 재학습
+                since_update = current_time - last_data_update
+                drift = since_update > self.config['drift_min_interval'] and self.detect_feature_drift()
+                if since_update > self.config['retrain_interval'] or drift:
+                    reason = 'drift' if drift and since_update <= self.config['retrain_interval'] else 'schedule'
+                    print(f"\n🔄 PyTorch AI 모델 업데이트 중... (거래 {trade_count}회 완료, 사유: {reason})")
                     self.collect_advanced_market_data(200)
-                    self.train_pytorch_models()
+                    self.request_retraining(reason)
                     last_data_update = current_time
                 
                 # 2분마다 거래 기회 확인
@@ -924,10 +1120,15 @@ class RevolutionaryAIBot:
                 
         except KeyboardInterrupt:
             print("\n\n🛑 사용자가 극한 시스템을 중단했습니다")
+            if self.trainer is not None:
+                self.trainer.stop()
             self.display_extreme_final_stats()
         except Exception as e:
             print(f"\n❌ 시스템 오류 발생: {e}")
             print("🔄 시스템을 재시작합니다...")
+            if self.trainer is not None:
+                self.trainer.stop()
+                self.trainer = None
             time.sleep(10)
             # 재귀 호출로 시스템 재시작
             self.run_extreme_system()
@@ -953,6 +1154,8 @@ class RevolutionaryAIBot:
             avg_extreme_ratio = np.mean([p['extreme_ratio'] for p in self.stats['ai_predictions']])
             print(f"  🎯 평균 AI 신뢰도: {avg_confidence:.3f}")
             print(f"  ⚡ 평균 극한 비율: {avg_extreme_ratio:.0f}:1")
+        
+        print(f"  🧠 {self.prediction_cache.summary()}")
 
 def main():
     """메인 함수"""
@@ -0,0 +1,141 @@
+"""
+🧮 벡터화 시나리오 최적화 - Bot_V2 의 수익률 × 거래량 × 최소수익 3중 루프를 NumPy 브로드캐스팅으로
+- 점수 모델은 여기 하나뿐 (UltimateOptimizedBot 의 스칼라 calculate_* 점수 함수는 이 모듈로 대체)
+  · 종합 점수 = 사용자 만족도 40% + 수익성 30% + 안전성 20% + 성공률 10%
+- 각 지표는 실제로 의존하는 축의 모양으로만 계산
+  · 성공률 (R,1,1) · 거래 빈도 (R,1,M) · 리스크/만족도/거래당 수익 (R,L,1)
+  · 시간당 수익/종합 점수만 전체 (R,L,M)
+- 수천 단계 격자도 밀리초~수십 밀리초 (기본 6×9×6 격자는 기존 결과와 동일)
+
+💡 사용법:
+    grid = scenario_grid(user_settings, ratio_steps=500, lot_steps=2000, min_steps=6)
+    surface = score_surface(*grid, market_analysis, user_settings)
+    best = best_scenario(surface, spread_limit=market_analysis.get('optimal_spread_limit', 5.0))
+    surface['score']            # (수익률, 거래량, 최소수익) 점수 큐브
+"""
+
+import numpy as np
+
+RISK_TOLERANCE_SCORES = {'low': 0.3, 'medium': 0.6, 'high': 0.9}
+RISK_TOLERANCE_MULTIPLIERS = {'low': 1.5, 'medium': 1.0, 'high': 0.7}
+
+# 기존 calculate_all_scenarios 의 격자 (사용자 설정 배수)
+DEFAULT_RATIO_FACTORS = (0.5, 0.75, 1.0, 1.25, 1.5, 2.0)
+DEFAULT_BASE_LOTS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0)
+DEFAULT_MIN_PROFIT_FACTORS = (0.05, 0.1, 0.15, 0.2, 0.25, 0.3)
+
+
+def scenario_grid(user_settings, ratio_steps=None, lot_steps=None, min_steps=None):
+    """📐 탐색 격자 (profit_ratios, lot_sizes, min_profits)
+
+    steps 를 안 주면 기존 고정 목록, 주면 같은 범위를 촘촘하게
+    (수익률·최소수익은 균등, 거래량은 0.001~2.0 로그 간격)
+    """
+    target_ratio = user_settings['target_profit_percentage']
+    lot_multiplier = user_settings['custom_lot_multiplier']
+    min_movement = user_settings['min_price_movement']
+
+    ratio_factors = (np.array(DEFAULT_RATIO_FACTORS) if ratio_steps is None
+                     else np.linspace(DEFAULT_RATIO_FACTORS[0], DEFAULT_RATIO_FACTORS[-1], ratio_steps))
+    base_lots = (np.array(DEFAULT_BASE_LOTS) if lot_steps is None
+                 else np.geomspace(DEFAULT_BASE_LOTS[0], DEFAULT_BASE_LOTS[-1], lot_steps))
+    min_factors = (np.array(DEFAULT_MIN_PROFIT_FACTORS) if min_steps is None
+                   else np.linspace(DEFAULT_MIN_PROFIT_FACTORS[0], DEFAULT_MIN_PROFIT_FACTORS[-1], min_steps))
+    return target_ratio * ratio_factors, base_lots * lot_multiplier, min_movement * min_factors
+
+
+def score_surface(profit_ratios, lot_sizes, min_profits, market_analysis, user_settings):
+    """🧮 전체 파라미터 큐브 점수 계산 → 지표별 배열 dict (서로 브로드캐스트 가능한 모양)"""
+    pr = np.asarray(profit_ratios, dtype=np.float64)[:, None, None]
+    lot = np.asarray(lot_sizes, dtype=np.float64)[None, :, None]
+    mp = np.asarray(min_profits, dtype=np.float64)[None, None, :]
+
+    target_ratio = user_settings['target_profit_percentage']
+    min_movement = user_settings['min_price_movement']
+    lot_multiplier = user_settings['custom_lot_multiplier']
+    tolerance = user_settings['risk_tolerance']
+    avg_volatility = market_analysis['avg_volatility']
+    spread_efficiency_freq = market_analysis.get('spread_efficiency_score', 0.5)
+    spread_efficiency = market_analysis.get('spread_efficiency_score', 0)
+
+    # 거래당 예상 수익 (R,L,1)
+    expected = min_movement * pr * lot
+
+    # 거래 빈도 (R,1,M)
+    base_frequency = avg_volatility / 15
+    movement_factor = avg_volatility / min_movement if min_movement > 0 else 1
+    ratio_factor = (1 / pr) * 0.05
+    profit_factor = np.maximum(0.1, 1 / mp)
+    efficiency_factor = 1 + spread_efficiency_freq
+    frequency = base_frequency * movement_factor * ratio_factor * profit_factor * efficiency_factor
+    trades_per_hour = np.minimum(frequency, 8)
+
+    hourly_profit = expected * trades_per_hour
+
+    # 리스크 (R,L,1)
+    volatility_risk = market_analysis.get('volatility_std', 0) / max(market_analysis.get('avg_volatility', 1), 1)
+    spread_risk = market_analysis.get('spread_std', 0) / max(market_analysis.get('avg_spread', 1), 1)
+    tolerance_multiplier = RISK_TOLERANCE_MULTIPLIERS.get(tolerance, 1.0)
+    risk_score = np.minimum((lot * 1.5 + pr * 3 + volatility_risk + spread_risk) * tolerance_multiplier, 10)
+
+    # 성공률 (R,1,1)
+    ratio_penalty = (pr - target_ratio) * 0.3
+    volatility_bonus = min(avg_volatility / 50, 0.05)
+    efficiency_bonus = spread_efficiency * 0.03
+    success_rate = np.maximum(0.6, np.minimum(1.0, 0.95 - ratio_penalty + volatility_bonus + efficiency_bonus))
+
+    # 사용자 만족도 (R,L,1)
+    ratio_score = np.maximum(0, 1.0 - np.abs(pr - target_ratio) / target_ratio) * 0.4
+    target_profit = min_movement * target_ratio
+    profit_match = np.minimum(1.0, expected / target_profit) if target_profit > 0 else np.zeros_like(expected)
+    lot_appropriateness = (np.minimum(1.0, lot / (0.1 * lot_multiplier)) if lot_multiplier > 0
+                           else np.full_like(lot, 0.5))
+    risk_preference = RISK_TOLERANCE_SCORES.get(tolerance, 0.6) * 0.1
+    user_satisfaction = np.minimum(1.0, ratio_score + profit_match * 0.3 + lot_appropriateness * 0.2
+                                   + risk_preference)
+
+    # 종합 점수 (R,L,M)
+    score = (user_satisfaction * 40 + np.minimum(hourly_profit, 100) * 0.3
+             + (10 - risk_score) * 2 + success_rate * 10)
+
+    return {
+        'profit_ratios': pr[:, 0, 0],
+        'lot_sizes': lot[0, :, 0],
+        'min_profits': mp[0, 0, :],
+        'expected_profit_per_trade': expected,
+        'trades_per_hour': trades_per_hour,
+        'hourly_profit': hourly_profit,
+        'risk_score': risk_score,
+        'success_rate': success_rate,
+        'user_satisfaction': user_satisfaction,
+        'score': score,
+    }
+
+
+def best_scenario(surface, spread_limit=5.0, min_satisfaction=0.7):
+    """🏆 만족도 min_satisfaction 이상 중 최고 점수 (없으면 전체 최고) → 기존과 같은 시나리오 dict
+
+    동점이면 기존 3중 루프 순서(수익률 → 거래량 → 최소수익)에서 먼저 나온 것
+    """
+    score = surface['score']
+    eligible = np.broadcast_to(surface['user_satisfaction'] >= min_satisfaction, score.shape)
+    candidates = np.where(eligible, score, -np.inf) if eligible.any() else score
+    index = np.unravel_index(int(np.argmax(candidates)), score.shape)
+
+    def at(name):
+        array = surface[name]
+        return float(array[tuple(i if n > 1 else 0 for i, n in zip(index, array.shape))])
+
+    return {
+        'profit_ratio': float(surface['profit_ratios'][index[0]]),
+        'lot_size': float(surface['lot_sizes'][index[1]]),
+        'min_profit': float(surface['min_profits'][index[2]]),
+        'expected_profit_per_trade': at('expected_profit_per_trade'),
+        'trades_per_hour': at('trades_per_hour'),
+        'hourly_profit': at('hourly_profit'),
+        'risk_score': at('risk_score'),
+        'success_rate': at('success_rate'),
+        'spread_limit': spread_limit,
+        'user_satisfaction': at('user_satisfaction'),
+        'score': float(score[index]),
+    }
@@ -0,0 +1,177 @@
+"""
+🗄️ 열(column) 기반 시계열 저장소 - 통계 JSON 에 무한히 쌓이던 기록을 NumPy 청크 파일로
+- 고정 스키마 구조화 배열 (time + 숫자 열) → 레코드당 수십 바이트 (JSON dict 대비 수십 배 작음)
+- 최근 행은 head 청크(최대 chunk_rows 행)에 모아 저장, 가득 차면 시간 범위가 이름에 들어간 청크로 봉인
+  → 저장 비용은 전체 기록 길이와 무관 (head 만 다시 씀)
+- query(start, end): 파일 이름의 시간 범위로 필요한 청크만 골라 메모리 맵으로 읽음 (전체 로드 없음)
+- 보관 기간 지난 청크 삭제, downsample_after_days 지난 청크는 downsample_seconds 간격으로 축소
+  (간격마다 마지막 행, sum_fields 는 합계)
+- 메모리에는 head 청크만 → 몇 주를 돌려도 메모리 일정
+
+💡 사용법:
+    store = SeriesStore('series_store/price_movements', {'price': 'f8', 'profit': 'f8'},
+                        retention_days=30, downsample_after_days=2, sum_fields=('profit',))
+    store.append(time.time(), price=71440.5, profit=6.5)
+    rows = store.query(start=time.time() - 3600)          # 최근 1시간 (구조화 배열)
+    rows['profit'].sum()
+    store.flush()                                          # 종료시
+"""
+
+import glob
+import os
+import time
+
+import numpy as np
+
+HEAD_FILE = 'head.npy'
+
+
+def _chunk_name(times, downsampled=False):
+    start_ms, end_ms = int(times[0] * 1000), int(times[-1] * 1000)
+    return f"{start_ms:015d}-{end_ms:015d}-{len(times)}{'-ds' if downsampled else ''}.npy"
+
+
+def _parse_chunk(path):
+    """청크 파일 이름 → (시작 초, 끝 초, 행 수, 축소 여부)"""
+    parts = os.path.basename(path)[:-4].split('-')
+    return int(parts[0]) / 1000, int(parts[1]) / 1000, int(parts[2]), parts[-1] == 'ds'
+
+
+def _save_atomic(path, array):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.save(f, array)
+    os.replace(tmp_path, path)
+
+
+class SeriesStore:
+    """🗄️ 한 시계열 (디렉터리 하나) - 시각은 단조 증가로 추가"""
+
+    def __init__(self, directory, fields, chunk_rows=4096, flush_seconds=30, retention_days=None,
+                 downsample_after_days=None, downsample_seconds=60, sum_fields=()):
+        self.directory = directory
+        self.dtype = np.dtype([('time', 'f8')] + [(name, kind) for name, kind in fields.items()])
+        self._defaults = [(name, np.nan if self.dtype[name].kind == 'f' else 0) for name in fields]
+        self.chunk_rows = chunk_rows
+        self.flush_seconds = flush_seconds
+        self.retention_days = retention_days
+        self.downsample_after_days = downsample_after_days
+        self.downsample_seconds = downsample_seconds
+        self.sum_fields = tuple(sum_fields)
+
+        os.makedirs(directory, exist_ok=True)
+        self._head = np.zeros(chunk_rows, dtype=self.dtype)
+        self._size = 0
+        self._dirty = False
+        self._last_flush = time.time()
+        self._load_head()
+
+    # ==================== 쓰기 ====================
+    def _load_head(self):
+        path = os.path.join(self.directory, HEAD_FILE)
+        if not os.path.exists(path):
+            return
+        try:
+            head = np.load(path)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ 시계열 head 손상 ({path}): {e}")
+            return
+        if head.dtype != self.dtype:
+            # 스키마가 바뀜 → 옛 head 는 그대로 봉인하고 새로 시작 (같은 열만 옮기지 않음)
+            if len(head):
+                _save_atomic(os.path.join(self.directory, _chunk_name(head['time'])), head)
+            os.remove(path)
+            return
+        self._size = min(len(head), self.chunk_rows)
+        self._head[:self._size] = head[:self._size]
+
+    def append(self, timestamp, **values):
+        """➕ 한 행 추가 (없는 열은 NaN/0) - flush_seconds 마다 또는 head 가 차면 디스크에 씀"""
+        self._head[self._size] = (timestamp,) + tuple(
+            default if values.get(name) is None else values[name] for name, default in self._defaults)
+        self._size += 1
+        self._dirty = True
+        if self._size == self.chunk_rows:
+            self._seal()
+        elif time.time() - self._last_flush >= self.flush_seconds:
+            self.flush()
+
+    def flush(self):
+        """💾 head 청크 저장 (최대 chunk_rows 행만 다시 씀)"""
+        self._last_flush = time.time()
+        if not self._dirty:
+            return
+        _save_atomic(os.path.join(self.directory, HEAD_FILE), self._head[:self._size])
+        self._dirty = False
+
+    def _seal(self):
+        """head 가 가득 참 → 시간 범위 이름의 청크로 봉인하고 보관/축소 정리"""
+        head = self._head[:self._size]
+        _save_atomic(os.path.join(self.directory, _chunk_name(head['time'])), head.copy())
+        latest = float(head['time'][-1])
+        self._size = 0
+        self._dirty = True
+        self.flush()
+        self._maintain(latest)
+
+    def _maintain(self, latest):
+        """보관 기간 지난 청크 삭제, 오래된 청크 축소 (기준 시각은 데이터의 마지막 시각)"""
+        for path in self._chunk_paths():
+            start, end, rows, downsampled = _parse_chunk(path)
+            if self.retention_days is not None and end < latest - self.retention_days * 86400:
+                os.remove(path)
+            elif (self.downsample_after_days is not None and not downsampled
+                  and end < latest - self.downsample_after_days * 86400):
+                reduced = self._downsample(np.load(path))
+                _save_atomic(os.path.join(self.directory, _chunk_name(reduced['time'], downsampled=True)), reduced)
+                os.remove(path)
+
+    def _downsample(self, data):
+        bucket = np.floor(data['time'] / self.downsample_seconds)
+        starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+        ends = np.r_[starts[1:], len(data)] - 1
+        reduced = data[ends].copy()
+        for name in self.sum_fields:
+            reduced[name] = np.add.reduceat(data[name], starts)
+        return reduced
+
+    # ==================== 읽기 ====================
+    def _chunk_paths(self):
+        return sorted(glob.glob(os.path.join(self.directory, '*-*-*.npy')))
+
+    def query(self, start=None, end=None):
+        """🔍 [start, end] 구간 행 (구조화 배열 복사본) - 겹치는 청크만 메모리 맵으로 읽음"""
+        start = -np.inf if start is None else start
+        end = np.inf if end is None else end
+        parts = []
+        for path in self._chunk_paths():
+            chunk_start, chunk_end, _, _ = _parse_chunk(path)
+            if chunk_end < start or chunk_start > end:
+                continue
+            parts.append(self._slice(np.load(path, mmap_mode='r'), start, end))
+        parts.append(self._slice(self._head[:self._size], start, end))
+        return np.concatenate(parts) if parts else np.empty(0, dtype=self.dtype)
+
+    @staticmethod
+    def _slice(data, start, end):
+        times = data['time']
+        lo = np.searchsorted(times, start, side='left')
+        hi = np.searchsorted(times, end, side='right')
+        return np.array(data[lo:hi])
+
+    def tail(self, count):
+        """마지막 count 행"""
+        if count <= self._size:
+            return self._head[self._size - count:self._size].copy()
+        parts = [self._head[:self._size].copy()]
+        needed = count - self._size
+        for path in reversed(self._chunk_paths()):
+            chunk = np.load(path, mmap_mode='r')
+            parts.insert(0, np.array(chunk[-needed:]))
+            needed -= min(needed, len(chunk))
+            if needed == 0:
+                break
+        return np.concatenate(parts)
+
+    def __len__(self):
+        return sum(_parse_chunk(path)[2] for path in self._chunk_paths()) + self._size
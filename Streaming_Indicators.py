@@ -0,0 +1,359 @@
+"""
+📈 스트리밍 증분 지표 엔진 - 새 1분봉 하나마다 15개 특성을 O(1) 로 갱신
+- pandas rolling/ewm 과 같은 알고리즘 (Kahan 보정 합, Welford 분산, 단조 덱 최소/최대, 가중 EWM)
+  → collect_advanced_market_data 의 pandas 결과와 같은 값
+- 지표마다 창 크기만큼의 상태만 유지 (전체 DataFrame 재계산 없음)
+- preview(): 아직 진행 중인 봉으로 상태를 바꾸지 않고 특성 계산 (봉 마감시 update())
+- build_feature_matrix(): 지표 컬럼 → float32 연속 행렬 한 번에 (행별 .iloc 루프 대체)
+
+💡 사용법:
+    features = build_feature_matrix(df, start=50)   # (봉 수 - 50, 15) float32
+    engine = StreamingFeatureEngine()
+    engine.warm_up(rates)                    # copy_rates_from_pos 결과 (마감된 봉들)
+    features = engine.update(new_bar)        # 새 봉 마감 → 15개 특성 (NaN → 0)
+    features = engine.preview(forming_bar)   # 진행 중인 봉 기준 특성
+"""
+
+import copy
+import math
+from collections import deque
+
+import numpy as np
+
+NaN = float('nan')
+
+FEATURE_DTYPE = np.float32
+
+# collect_advanced_market_data 특성 순서
+FEATURE_NAMES = (
+    'rsi', 'rsi_fast', 'rsi_slow',
+    'macd', 'macd_signal', 'macd_histogram',
+    'volatility', 'volatility_fast',
+    'price_change', 'price_change_5', 'volume_change',
+    'bb_position', 'bb_width',
+    'stoch_k', 'stoch_d',
+)
+
+
+class RollingMean:
+    """rolling(window).mean() - Kahan 보정 합 (추가/제거 보정 따로)"""
+
+    __slots__ = ('window', 'values', 'nobs', 'sum_x', 'neg_ct', 'comp_add', 'comp_remove',
+                 'same_count', 'prev_value')
+
+    def __init__(self, window):
+        self.window = window
+        self.values = deque()
+        self.nobs = 0
+        self.sum_x = 0.0
+        self.neg_ct = 0
+        self.comp_add = 0.0
+        self.comp_remove = 0.0
+        self.same_count = 0
+        self.prev_value = NaN
+
+    def update(self, value):
+        if len(self.values) == self.window:
+            old = self.values.popleft()
+            if old == old:
+                self.nobs -= 1
+                y = -old - self.comp_remove
+                t = self.sum_x + y
+                self.comp_remove = t - self.sum_x - y
+                self.sum_x = t
+                if math.copysign(1.0, old) < 0:
+                    self.neg_ct -= 1
+        self.values.append(value)
+        if value == value:
+            self.nobs += 1
+            y = value - self.comp_add
+            t = self.sum_x + y
+            self.comp_add = t - self.sum_x - y
+            self.sum_x = t
+            if math.copysign(1.0, value) < 0:
+                self.neg_ct += 1
+            if value == self.prev_value:
+                self.same_count += 1
+            else:
+                self.same_count = 1
+            self.prev_value = value
+
+        if self.nobs < self.window or self.nobs == 0:
+            return NaN
+        if self.same_count >= self.nobs:
+            return self.prev_value
+        result = self.sum_x / self.nobs
+        if self.neg_ct == 0 and result < 0:
+            return 0.0
+        if self.neg_ct == self.nobs and result > 0:
+            return 0.0
+        return result
+
+
+class RollingStd:
+    """rolling(window).std() (ddof=1) - Welford 평균/제곱합 + Kahan 보정"""
+
+    __slots__ = ('window', 'values', 'nobs', 'mean_x', 'ssqdm_x', 'comp_add', 'comp_remove')
+
+    def __init__(self, window):
+        self.window = window
+        self.values = deque()
+        self.nobs = 0
+        self.mean_x = 0.0
+        self.ssqdm_x = 0.0
+        self.comp_add = 0.0
+        self.comp_remove = 0.0
+
+    def update(self, value):
+        if len(self.values) == self.window:
+            old = self.values.popleft()
+            if old == old:
+                self.nobs -= 1
+                if self.nobs:
+                    prev_mean = self.mean_x - self.comp_remove
+                    y = old - self.comp_remove
+                    t = y - self.mean_x
+                    self.comp_remove = t + self.mean_x - y
+                    self.mean_x -= t / self.nobs
+                    self.ssqdm_x -= (old - prev_mean) * (old - self.mean_x)
+                    if self.ssqdm_x < 0:
+                        # 반올림으로 음수가 된 제곱합 → 0, 평균은 남은 최신 값 (pandas 와 같은 보정)
+                        self.ssqdm_x = 0.0
+                        self.mean_x = self.values[-1]
+                else:
+                    self.mean_x = 0.0
+                    self.ssqdm_x = 0.0
+        self.values.append(value)
+        if value == value:
+            self.nobs += 1
+            prev_mean = self.mean_x - self.comp_add
+            y = value - self.comp_add
+            t = y - self.mean_x
+            self.comp_add = t + self.mean_x - y
+            self.mean_x += t / self.nobs
+            self.ssqdm_x += (value - prev_mean) * (value - self.mean_x)
+            if self.ssqdm_x < 0:
+                self.ssqdm_x = 0.0
+                self.mean_x = value
+
+        if self.nobs < self.window or self.nobs <= 1:
+            return NaN
+        variance = self.ssqdm_x / (self.nobs - 1)
+        return math.sqrt(variance) if variance > 0 else 0.0
+
+
+class RollingExtreme:
+    """rolling(window).min() / .max() - 단조 덱 (분할상환 O(1))"""
+
+    __slots__ = ('window', 'is_max', 'index', 'deque')
+
+    def __init__(self, window, is_max):
+        self.window = window
+        self.is_max = is_max
+        self.index = -1
+        self.deque = deque()            # (위치, 값) - 값이 단조
+
+    def update(self, value):
+        self.index += 1
+        dq = self.deque
+        while dq and dq[0][0] <= self.index - self.window:
+            dq.popleft()
+        if value == value:
+            if self.is_max:
+                while dq and dq[-1][1] <= value:
+                    dq.pop()
+            else:
+                while dq and dq[-1][1] >= value:
+                    dq.pop()
+            dq.append((self.index, value))
+        if self.index < self.window - 1 or not dq:
+            return NaN
+        return dq[0][1]
+
+
+class EWMMean:
+    """ewm(span=span).mean() (adjust=True) - pandas ewma 와 같은 가중 평균 갱신"""
+
+    __slots__ = ('old_wt_factor', 'weighted', 'old_wt', 'started')
+
+    def __init__(self, span):
+        com = (span - 1) / 2.0
+        self.old_wt_factor = 1.0 - 1.0 / (1.0 + com)
+        self.weighted = NaN
+        self.old_wt = 1.0
+        self.started = False
+
+    def update(self, value):
+        if not self.started:
+            self.started = True
+            self.weighted = value
+            return value if value == value else NaN
+        weighted = self.weighted
+        if weighted == weighted:
+            self.old_wt *= self.old_wt_factor
+            if value == value:
+                if weighted != value:
+                    weighted = (self.old_wt * weighted + value) / (self.old_wt + 1.0)
+                self.old_wt += 1.0
+        elif value == value:
+            weighted = value
+        self.weighted = weighted
+        return weighted
+
+
+class Lag:
+    """x.shift(periods) 용 고정 길이 버퍼"""
+
+    __slots__ = ('buffer',)
+
+    def __init__(self, periods):
+        self.buffer = deque(maxlen=periods + 1)
+
+    def update(self, value):
+        self.buffer.append(value)
+        return self.buffer[0] if len(self.buffer) == self.buffer.maxlen else NaN
+
+
+def _div(a, b):
+    """pandas/numpy 나눗셈과 같은 결과 (0 으로 나누면 ±inf 또는 NaN)"""
+    try:
+        return a / b
+    except ZeroDivisionError:
+        if a != a or a == 0:
+            return NaN
+        return math.copysign(math.inf, a) * math.copysign(1.0, b)
+
+
+class StreamingRSI:
+    """calculate_rsi 와 같은 단순이동평균 RSI (첫 봉 delta 는 0 으로 취급)"""
+
+    __slots__ = ('prev', 'gain', 'loss')
+
+    def __init__(self, period):
+        self.prev = NaN
+        self.gain = RollingMean(period)
+        self.loss = RollingMean(period)
+
+    def update(self, close):
+        delta = close - self.prev
+        self.prev = close
+        gain = self.gain.update(delta if delta > 0 else 0.0)
+        loss = self.loss.update(-delta if delta < 0 else -0.0)    # pandas: -(delta.where(delta < 0, 0)) → -0.0
+        return 100 - _div(100, 1 + _div(gain, loss))
+
+
+class StreamingFeatureEngine:
+    """📈 15개 특성 스트리밍 계산기 (봉 단위)"""
+
+    WARM_UP_BARS = 1000     # 이 이상 과거는 EMA 초기값 영향이 float32 특성에 남지 않음
+
+    def __init__(self):
+        self.sma_20 = RollingMean(20)
+        self.ema_12 = EWMMean(12)
+        self.ema_26 = EWMMean(26)
+        self.macd_signal = EWMMean(9)
+        self.rsi = StreamingRSI(14)
+        self.rsi_fast = StreamingRSI(7)
+        self.rsi_slow = StreamingRSI(21)
+        self.std_20 = RollingStd(20)
+        self.std_10 = RollingStd(10)
+        self.close_lag_1 = Lag(1)
+        self.close_lag_5 = Lag(5)
+        self.volume_lag_1 = Lag(1)
+        self.low_14 = RollingExtreme(14, is_max=False)
+        self.high_14 = RollingExtreme(14, is_max=True)
+        self.stoch_d = RollingMean(3)
+        self.bars = 0
+        self.last_time = None
+
+    def _step(self, close, high, low, volume):
+        macd = self.ema_12.update(close) - self.ema_26.update(close)
+        macd_signal = self.macd_signal.update(macd)
+        sma_20 = self.sma_20.update(close)
+        volatility = self.std_20.update(close)
+        bb_upper = sma_20 + volatility * 2
+        bb_lower = sma_20 - volatility * 2
+        low_14 = self.low_14.update(low)
+        high_14 = self.high_14.update(high)
+        stoch_k = 100 * _div(close - low_14, high_14 - low_14)
+        return np.array([
+            self.rsi.update(close),
+            self.rsi_fast.update(close),
+            self.rsi_slow.update(close),
+            macd,
+            macd_signal,
+            macd - macd_signal,
+            volatility,
+            self.std_10.update(close),
+            _div(close, self.close_lag_1.update(close)) - 1,
+            _div(close, self.close_lag_5.update(close)) - 1,
+            _div(volume, self.volume_lag_1.update(volume)) - 1,
+            _div(close - bb_lower, bb_upper - bb_lower),
+            bb_upper - bb_lower,
+            stoch_k,
+            self.stoch_d.update(stoch_k),
+        ], dtype=FEATURE_DTYPE)
+
+    def update(self, bar):
+        """🕯️ 마감된 봉 반영 → 특성 벡터 (NaN → 0, pd.isna 와 같게 inf 는 유지)
+
+        bar: copy_rates 레코드 또는 close/high/low/tick_volume 키를 가진 매핑
+        """
+        raw = self._step(float(bar['close']), float(bar['high']), float(bar['low']),
+                         float(bar['tick_volume']))
+        self.bars += 1
+        if 'time' in _fields(bar):
+            self.last_time = int(bar['time'])
+        return _mask_nan(raw)
+
+    def preview(self, bar):
+        """👀 진행 중인 봉 기준 특성 (엔진 상태는 그대로 - 지표 상태 복제본에 반영)"""
+        twin = copy.copy(self)
+        for name, state in vars(self).items():
+            if hasattr(state, '__slots__'):
+                setattr(twin, name, _clone(state))
+        return twin.update(bar)
+
+    def warm_up(self, rates):
+        """🔥 과거 봉들로 상태 채우기 → 마지막 봉 특성 (봉 없으면 None)"""
+        features = None
+        for bar in rates:
+            features = self.update(bar)
+        return features
+
+
+def build_feature_matrix(df, start=0):
+    """🧮 지표 컬럼들 → (행, 15) float32 C-연속 행렬 (NaN → 0, pd.isna 와 같게 inf 는 유지)
+
+    df: FEATURE_NAMES 컬럼을 가진 DataFrame (또는 컬럼명 → 배열 매핑)
+    start: 앞쪽 지표 워밍업 구간 제외 (기존 range(50, len(df)) 의 50)
+    반환 행렬은 StandardScaler / torch.as_tensor 에 복사 없이 바로 넘길 수 있음
+    """
+    rows = max(len(df[FEATURE_NAMES[0]]) - start, 0)
+    matrix = np.empty((rows, len(FEATURE_NAMES)), dtype=FEATURE_DTYPE)
+    for col, name in enumerate(FEATURE_NAMES):
+        matrix[:, col] = np.asarray(df[name], dtype=np.float64)[start:]
+    return _mask_nan(matrix)
+
+
+def _mask_nan(matrix):
+    np.copyto(matrix, 0.0, where=np.isnan(matrix))
+    return matrix
+
+
+def _clone(state):
+    # deepcopy 보다 훨씬 가벼운 지표 상태 복제 (덱과 하위 지표만 새로 만듦)
+    twin = object.__new__(type(state))
+    for name in state.__slots__:
+        value = getattr(state, name)
+        if isinstance(value, deque):
+            value = value.copy()
+        elif hasattr(value, '__slots__'):
+            value = _clone(value)
+        setattr(twin, name, value)
+    return twin
+
+
+def _fields(bar):
+    names = getattr(getattr(bar, 'dtype', None), 'names', None)
+    return names if names is not None else bar.keys()
@@ -0,0 +1,177 @@
+"""
+📒 추가 전용 거래 저널 - 거래마다 통계 JSON 전체를 다시 쓰지 않음
+- record(state): 마지막 기록 이후 바뀐 항목만 JSONL 한 줄로 추가 (거래당 작은 쓰기 한 번)
+  · 숫자/문자열 → set · 리스트 뒤에 붙은 항목 → append · dict 에서 바뀐 키 → update
+- snapshot_every 줄마다 (그리고 종료시) 전체 상태를 기존 통계 파일에 스냅샷으로 압축 → 저널 비움
+- load(): 스냅샷 + 그 이후 저널 줄 재생 → 마지막 상태 복원
+  (기존 통계 JSON 은 그대로 스냅샷으로 읽힘, 쓰다 끊긴 마지막 줄은 무시)
+- 스냅샷은 임시 파일에 쓴 뒤 교체, 줄마다 일련번호 → 스냅샷 직후 중단되어도 중복 재생 없음
+
+💡 사용법:
+    journal = TradeJournal('trading_stats.json')     # 저널: trading_stats.journal.jsonl
+    state = journal.load()                           # 없으면 None
+    journal.record(state)                            # 거래마다 (바뀐 것만 추가)
+    journal.snapshot(state)                          # 종료시 압축
+"""
+
+import json
+import os
+
+_MISSING = object()
+
+
+def apply_event(state, event):
+    """저널 한 줄을 상태 dict 에 적용"""
+    for key, value in event.get('set', {}).items():
+        state[key] = value
+    for key, items in event.get('append', {}).items():
+        state.setdefault(key, []).extend(items)
+    for key, changes in event.get('update', {}).items():
+        state.setdefault(key, {}).update(changes)
+    return state
+
+
+class TradeJournal:
+    """📒 스냅샷(JSON) + 추가 전용 저널(JSONL)"""
+
+    def __init__(self, snapshot_path, snapshot_every=500):
+        self.snapshot_path = snapshot_path
+        self.journal_path = os.path.splitext(snapshot_path)[0] + '.journal.jsonl'
+        self.snapshot_every = snapshot_every
+        self.seq = 0
+        self._pending = 0               # 마지막 스냅샷 이후 저널 줄 수
+        self._shadow = None             # 마지막으로 기록된 상태 (비교용)
+        self._torn = False              # 저널 끝이 깨져 있음 → 다음 기록은 스냅샷
+        self._file = None
+        self.stats = {'records': 0, 'snapshots': 0, 'bytes': 0, 'replayed': 0}
+
+    def load(self):
+        """📂 스냅샷 + 저널 재생 → 상태 dict (둘 다 없으면 None)
+
+        스냅샷이 손상되었으면 json 예외가 그대로 올라감 (호출하는 쪽에서 새로 시작)
+        """
+        state, seq = None, 0
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, 'r') as f:
+                state = json.load(f)
+            seq = state.pop('_journal_seq', 0)
+
+        replayed = 0
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        self._torn = True       # 쓰다 끊긴 줄 - 이후는 버림
+                        break
+                    if event['seq'] <= seq:
+                        continue
+                    state = apply_event(state if state is not None else {}, event)
+                    seq = event['seq']
+                    replayed += 1
+
+        self.seq = seq
+        self._pending = replayed
+        self.stats['replayed'] = replayed
+        if state is not None:
+            self._shadow = self._remember(state)
+        return state
+
+    def record(self, state):
+        """✍️ 마지막 기록 이후 바뀐 항목만 저널에 한 줄 추가 (필요하면 스냅샷으로 압축)"""
+        if self._shadow is None or self._torn or self._pending >= self.snapshot_every:
+            self.snapshot(state)
+            return
+
+        event = self._diff(state)
+        if not event:
+            return
+        self.seq += 1
+        event['seq'] = self.seq
+        line = json.dumps(event, ensure_ascii=False, separators=(',', ':')) + '\n'
+        if self._file is None:
+            self._file = open(self.journal_path, 'a', encoding='utf-8')
+        self._file.write(line)
+        self._file.flush()
+        self._pending += 1
+        self.stats['records'] += 1
+        self.stats['bytes'] += len(line)
+
+    def snapshot(self, state):
+        """🗜️ 전체 상태를 스냅샷 파일로 (원자적 교체) → 저널 비움"""
+        tmp_path = self.snapshot_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({**state, '_journal_seq': self.seq}, f, indent=2)
+        os.replace(tmp_path, self.snapshot_path)
+
+        self.close()
+        open(self.journal_path, 'w').close()
+        self._pending = 0
+        self._torn = False
+        self._shadow = self._remember(state)
+        self.stats['snapshots'] += 1
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    @staticmethod
+    def _remember(state):
+        """비교용 기록 - 리스트는 (길이, 마지막 항목), dict 는 얕은 복사, 나머지는 값"""
+        shadow = {}
+        for key, value in state.items():
+            if isinstance(value, list):
+                shadow[key] = ('list', len(value), value[-1] if value else _MISSING)
+            elif isinstance(value, dict):
+                shadow[key] = ('dict', dict(value))
+            else:
+                shadow[key] = ('value', value)
+        return shadow
+
+    def _diff(self, state):
+        """상태 변화 → 저널 이벤트 dict (변화 없으면 빈 dict) - 비교 기록도 갱신"""
+        sets, appends, updates = {}, {}, {}
+        shadow = self._shadow
+        for key, value in state.items():
+            old = shadow.get(key)
+            if isinstance(value, list):
+                if old is not None and old[0] == 'list':
+                    length, last = old[1], old[2]
+                    appended_only = len(value) >= length and (
+                        length == 0 or value[length - 1] is last or value[length - 1] == last)
+                    if appended_only:
+                        if len(value) > length:
+                            appends[key] = value[length:]
+                    else:
+                        sets[key] = value
+                else:
+                    sets[key] = value
+                shadow[key] = ('list', len(value), value[-1] if value else _MISSING)
+            elif isinstance(value, dict):
+                if old is not None and old[0] == 'dict':
+                    previous = old[1]
+                    if len(previous.keys() - value.keys()):
+                        sets[key] = value
+                        shadow[key] = ('dict', dict(value))
+                        continue
+                    changed = {k: v for k, v in value.items() if previous.get(k, _MISSING) != v}
+                    if changed:
+                        updates[key] = changed
+                        previous.update(changed)
+                else:
+                    sets[key] = value
+                    shadow[key] = ('dict', dict(value))
+            elif old is None or old[0] != 'value' or old[1] != value:
+                sets[key] = value
+                shadow[key] = ('value', value)
+
+        event = {}
+        if sets:
+            event['set'] = sets
+        if appends:
+            event['append'] = appends
+        if updates:
+            event['update'] = updates
+        return event
@@ -0,0 +1,152 @@
+"""
+🏋️ 백그라운드 모델 학습 프로세스 - 학습하는 동안에도 거래 루프는 멈추지 않음
+- 거래 프로세스는 학습용 시장 데이터(특성/가격/시각)만 큐로 넘기고 바로 돌아옴
+- 학습 프로세스가 자기 모델 복사본으로 학습 → ModelStore 체크포인트로 원자적 게시 (버전 증가)
+- 거래 루프는 틱 사이에 poll() 로 새 버전 알림만 확인 → 체크포인트를 불러와 교체
+- 학습 중에 들어온 요청은 최신 것 하나만 남기고 합침 (밀린 학습이 쌓이지 않음)
+- 학습 시간, 모델 버전, 샘플 수, 학습 사유 보고
+
+💡 사용법:
+    trainer = TrainingWorker(model_cache_dir='model_cache')
+    trainer.start(version=entry_version)
+    trainer.submit(market_data, reason='schedule')   # 즉시 반환
+    result = trainer.poll()                          # 새 버전 게시되면 결과 dict, 아니면 None
+    trainer.stop()
+"""
+
+import contextlib
+import multiprocessing as mp
+import os
+import queue
+import time
+
+
+def _training_loop(jobs, results, config, version):
+    """학습 프로세스 본체 - 봇 객체를 하나 만들어 학습 코드(train_pytorch_models)를 그대로 사용"""
+    import torch
+    from Revolutionary_Bot import RevolutionaryAIBot
+
+    torch.set_num_threads(config['threads'])
+    bot = RevolutionaryAIBot()
+    bot.config['model_cache_dir'] = config['model_cache_dir']
+    bot.config['fast_inference'] = False        # 학습 프로세스는 예측하지 않음
+    bot.model_store.directory = config['model_cache_dir']
+    bot.model_version = version
+
+    # 거래 프로세스와 같은 체크포인트에서 출발 (있으면)
+    entry = bot.model_store.load(bot.model_key, bot.config['device'])
+    if entry is not None:
+        bot.apply_checkpoint(entry)
+
+    while True:
+        job = jobs.get()
+        merged = 1
+        while job is not None:
+            # 학습 중에 쌓인 요청은 가장 최신 데이터 하나로 합침
+            try:
+                newer = jobs.get_nowait()
+            except queue.Empty:
+                break
+            job = newer
+            merged += 1
+        if job is None:
+            return
+
+        bot.market_data.update(job['market_data'])
+        started = time.time()
+        error = None
+        try:
+            # 에포크 로그는 거래 화면을 어지럽히지 않도록 숨김 (결과는 거래 프로세스에서 한 줄로 보고)
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                ok = bot.train_pytorch_models()
+        except Exception as e:
+            ok, error = False, str(e)
+        results.put({
+            'ok': ok,
+            'version': bot.model_version,
+            'train_sec': time.time() - started,
+            'samples': len(job['market_data']['features']),
+            'reason': job['reason'],
+            'jobs': merged,
+            'error': error,
+        })
+
+
+class TrainingWorker:
+    """🏋️ 학습 프로세스 관리 (거래 프로세스 쪽 핸들)"""
+
+    def __init__(self, model_cache_dir='model_cache', threads=2):
+        self.config = {'model_cache_dir': model_cache_dir, 'threads': threads}
+        self._ctx = mp.get_context('spawn')     # torch/MT5 상태를 fork 로 복제하지 않음
+        self._jobs = None
+        self._results = None
+        self.process = None
+        self.pending = 0
+        self.stats = {'submitted': 0, 'merged': 0, 'published': 0, 'failed': 0, 'train_sec': 0.0}
+
+    def start(self, version=0):
+        self._jobs = self._ctx.Queue()
+        self._results = self._ctx.Queue()
+        self.process = self._ctx.Process(
+            target=_training_loop, args=(self._jobs, self._results, self.config, version),
+            name='model-trainer', daemon=True)
+        self.process.start()
+        print(f"🏋️ 학습 프로세스 시작 (PID {self.process.pid}, 스레드 {self.config['threads']}개)")
+
+    def is_alive(self):
+        return self.process is not None and self.process.is_alive()
+
+    @property
+    def busy(self):
+        return self.pending > 0
+
+    def submit(self, market_data, reason='schedule'):
+        """📤 학습 요청 (즉시 반환) - 필요한 배열만 넘김 (DataFrame 제외)"""
+        if not self.is_alive():
+            return False
+        self._jobs.put({
+            'market_data': {
+                'features': market_data['features'],
+                'prices': market_data['prices'],
+                'timestamps': market_data['timestamps'],
+            },
+            'reason': reason,
+        })
+        self.pending += 1
+        self.stats['submitted'] += 1
+        return True
+
+    def poll(self):
+        """📥 학습 결과 확인 (대기 없음) → 가장 최근 결과 dict 또는 None"""
+        if self._results is None:
+            return None
+        latest = None
+        while True:
+            try:
+                result = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self.pending = max(0, self.pending - result['jobs'])
+            self.stats['merged'] += result['jobs'] - 1
+            self.stats['train_sec'] += result['train_sec']
+            if result['ok']:
+                self.stats['published'] += 1
+                latest = result
+            else:
+                self.stats['failed'] += 1
+                print(f"⚠️ 백그라운드 학습 실패 ({result['reason']}): {result['error'] or '데이터 부족'}")
+        return latest
+
+    def stop(self, timeout=5.0):
+        """🛑 학습 프로세스 종료 (진행 중인 학습은 timeout 까지만 기다림)"""
+        if self.process is None:
+            return
+        if self.process.is_alive():
+            self._jobs.put(None)
+            self.process.join(timeout)
+            if self.process.is_alive():
+                self.process.terminate()
+                self.process.join()
+        self.process = None
+        print(f"🏋️ 학습 프로세스 종료 - 게시 {self.stats['published']}회 | 실패 {self.stats['failed']}회 | "
+              f"합쳐진 요청 {self.stats['merged']}회 | 총 학습 {self.stats['train_sec']:.1f}초")
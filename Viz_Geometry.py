@@ -0,0 +1,159 @@
+"""
+📐 시각화 좌표 계산 (렌더러 공용, pygame 없이 NumPy 만)
+- SeriesRing: 렌더러 쪽 긴 가격/수익 히스토리 링 버퍼 - 새 행만 복사, view() 는 복사 없는 시간순 연속 배열
+  (같은 행을 두 번 저장하는 이중 길이 배열 → 랩어라운드가 있어도 슬라이스 하나)
+- AxisRange: 값 → 픽셀 y 변환, 범위 히스테리시스 (데이터가 범위 안에 있으면 축이 그대로 → 라벨/배경 재사용)
+- polyline(): 점 수가 폭의 2배를 넘으면 픽셀 열마다 최소/최대 두 점으로 줄임 → 히스토리가 길어도 그리는 점은 일정
+- 그리드 레벨 LOD: 정렬된 레벨 가격에서 이분 탐색 (searchsorted)
+  · visible_slice(): 보이는 가격 구간 안의 레벨만
+  · level_density(): 픽셀 행 경계마다 searchsorted → 행별 레벨 수 (1픽셀보다 촘촘한 레벨은 한 행에 모아 밀도 띠로)
+    → 레벨 1만 개든 100개든 비용은 O(높이 × log 레벨 수)
+
+💡 사용법:
+    ring = SeriesRing(36000)
+    version, rows = snapshots.history_since(version)
+    ring.extend(rows)
+    axis = AxisRange()
+    axis.fit(prices.min(), prices.max(), floor_span=prices[-1] * 0.01)   # 범위가 바뀌면 True
+    points = polyline(ring.view()['price'], rect.x, rect.width, axis, rect.y, rect.height)
+    prices, order = sorted_levels(grid_levels, 'buy_entry')           # 레벨 테이블이 바뀔 때 한 번
+    counts = level_density(prices, axis, rect.height)                 # 위 → 아래 픽셀 행별 레벨 수
+    axis.zoom(0.8, anchor=axis.from_y(mouse_y, rect.y, rect.height))  # 커서 위치 기준 확대
+"""
+
+import numpy as np
+
+from Viz_Snapshot import HISTORY_DTYPE
+
+
+class SeriesRing:
+    """🔁 고정 용량 히스토리 링 버퍼 (HISTORY_DTYPE 행)"""
+
+    def __init__(self, capacity, dtype=HISTORY_DTYPE):
+        self.capacity = capacity
+        self._data = np.zeros(capacity * 2, dtype=dtype)
+        self._head = 0                  # 다음에 쓸 위치 (0 ~ capacity-1)
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def extend(self, rows):
+        """새 행 추가 (시간순) - 넘치면 오래된 것부터 밀려남"""
+        rows = rows[-self.capacity:]
+        if not len(rows):
+            return
+        index = (self._head + np.arange(len(rows))) % self.capacity
+        self._data[index] = rows
+        self._data[index + self.capacity] = rows
+        self._head = (self._head + len(rows)) % self.capacity
+        self.count = min(self.count + len(rows), self.capacity)
+
+    def view(self):
+        """시간순 전체 (복사 없는 읽기 전용 뷰 - 다음 extend 전까지만 유효)"""
+        start = (self._head - self.count) % self.capacity
+        view = self._data[start:start + self.count]
+        view.flags.writeable = False
+        return view
+
+    def clear(self):
+        self._head = 0
+        self.count = 0
+
+
+class AxisRange:
+    """📏 값 축 범위 + 픽셀 변환
+
+    pad: 새로 맞출 때 위아래 여백 (데이터 폭 대비)
+    shrink: 데이터 폭이 축 폭의 이 비율보다 작아지면 다시 맞춤 (줌인)
+    """
+
+    def __init__(self, pad=0.1, shrink=0.4):
+        self.pad = pad
+        self.shrink = shrink
+        self.low = 0.0
+        self.high = 0.0
+
+    @property
+    def span(self):
+        return self.high - self.low
+
+    def fit(self, low, high, floor_span):
+        """데이터 [low, high] 가 들어가도록 축 조정 → 바뀌었으면 True (축 라벨/배경 다시 그려야 함)"""
+        span = high - low
+        if self.span > 0 and self.low <= low and high <= self.high and span >= self.span * self.shrink:
+            return False
+        if span <= 0:
+            span = floor_span
+            low, high = (low + high - span) / 2, (low + high + span) / 2
+        margin = span * self.pad
+        self.low, self.high = low - margin, high + margin
+        return True
+
+    def contains(self, value):
+        return self.low <= value <= self.high
+
+    def to_y(self, values, top, height):
+        """값 (스칼라/배열) → 픽셀 y (위가 high)"""
+        return top + height - (np.asarray(values, dtype=np.float64) - self.low) / self.span * height
+
+    def from_y(self, y, top, height):
+        """픽셀 y → 값"""
+        return self.high - (y - top) / height * self.span
+
+    def copy(self):
+        axis = AxisRange(self.pad, self.shrink)
+        axis.low, axis.high = self.low, self.high
+        return axis
+
+    def zoom(self, factor, anchor=None):
+        """🔍 범위를 factor 배로 (1 미만이면 확대) - anchor 값의 화면 위치는 그대로"""
+        anchor = (self.low + self.high) / 2 if anchor is None else anchor
+        self.low = anchor - (anchor - self.low) * factor
+        self.high = anchor + (self.high - anchor) * factor
+
+    def pan(self, delta):
+        """↕️ 범위를 delta 만큼 이동"""
+        self.low += delta
+        self.high += delta
+
+
+def polyline(values, left, width, axis, top, height):
+    """📈 값 배열 → pygame.draw.lines 용 점 목록 (폭 전체에 고르게, 열마다 최소/최대로 줄임)"""
+    count = len(values)
+    if count < 2:
+        return []
+    if count <= width * 2:
+        x = left + np.arange(count) * (width / (count - 1))
+        y = axis.to_y(values, top, height)
+    else:
+        edges = np.linspace(0, count, int(width) + 1).astype(np.intp)[:-1]
+        y = np.empty(len(edges) * 2)
+        y[0::2] = axis.to_y(np.minimum.reduceat(values, edges), top, height)
+        y[1::2] = axis.to_y(np.maximum.reduceat(values, edges), top, height)
+        x = np.repeat(left + np.arange(len(edges)) * (width / (len(edges) - 1)), 2)
+    return np.column_stack((x, y)).tolist()
+
+
+def sorted_levels(grid_levels, key):
+    """레벨 가격 열 → (오름차순 가격, 원래 레벨 번호) - GridLevels 또는 레벨 dict 목록"""
+    if hasattr(grid_levels, 'column'):
+        prices = np.asarray(grid_levels.column(key), dtype=np.float64) if len(grid_levels) else np.zeros(0)
+    else:
+        prices = np.fromiter((level[key] for level in grid_levels), dtype=np.float64)
+    order = np.argsort(prices, kind='stable')
+    return prices[order], order
+
+
+def visible_slice(sorted_prices, axis):
+    """🔎 축 범위 [low, high] 안에 있는 레벨 구간 (정렬 배열 이분 탐색)"""
+    return slice(np.searchsorted(sorted_prices, axis.low, side='left'),
+                 np.searchsorted(sorted_prices, axis.high, side='right'))
+
+
+def level_density(sorted_prices, axis, height):
+    """📊 픽셀 행별 레벨 수 (0 = 맨 위 행) - 행 경계 가격마다 이분 탐색, 레벨 수와 무관한 비용"""
+    height = int(height)
+    edges = axis.low + np.arange(height + 1) * (axis.span / height)
+    counts = np.diff(np.searchsorted(sorted_prices, edges, side='left'))
+    return counts[::-1]
@@ -0,0 +1,154 @@
+"""
+📊 시각화 위치별 거래 루프 지터 벤치마크 - 렌더러 없음 vs 같은 프로세스 스레드 vs 별도 프로세스
+- 거래 루프: DeadlineScheduler 로 'monitor' 작업 (포지션 북 평가 + 스냅샷 게시) 을 주기 실행
+- 렌더러: 최신 스냅샷 / 히스토리를 읽어 순수 Python 으로 좌표 계산 (matplotlib/pygame 프레임 대신)
+  · thread : 같은 프로세스 스레드 + SnapshotBuffer → GIL 을 두고 거래 루프와 경쟁
+  · process: spawn 프로세스 + SharedSnapshotBuffer / SharedSnapshotReader → GIL 공유 없음
+- 결과: 'monitor' 마감 대비 지연 p50 / p99 / 최대, 주기 누락, 렌더러 프레임 수
+
+💡 사용법:
+    python Viz_Jitter_Benchmark.py                   # 모드별 10초, monitor 10ms 주기
+    python Viz_Jitter_Benchmark.py 30 0.005          # 모드별 시간(초), monitor 주기(초)
+"""
+
+import multiprocessing
+import sys
+import threading
+import time
+
+import numpy as np
+
+import MT5_Simulator
+
+mt5 = MT5_Simulator.install()
+
+from Deadline_Scheduler import DeadlineScheduler  # noqa: E402 (시뮬레이터 등록 후 import)
+from Grid_Levels import GridLevels  # noqa: E402
+from Position_Book import POSITION_DTYPE, evaluate  # noqa: E402
+from Viz_Snapshot import (SnapshotBuffer, SharedSnapshotBuffer, SharedSnapshotReader,  # noqa: E402
+                          position_rows)
+
+POSITION_COUNT = 2000
+LEVEL_COUNT = 10000
+FRAME_INTERVAL = 1 / 30         # 렌더러 목표 프레임 간격
+MODES = ('none', 'thread', 'process')
+
+
+def make_book(count, price=50000.0, seed=7):
+    """합성 포지션 북 (매수/매도 반반, 진입가 ±2%)"""
+    rng = np.random.default_rng(seed)
+    book = np.zeros(count, dtype=POSITION_DTYPE)
+    book['ticket'] = np.arange(1, count + 1)
+    book['type'] = rng.integers(0, 2, count)
+    book['price_open'] = price * (1 + rng.uniform(-0.02, 0.02, count))
+    book['volume'] = 0.01
+    return book
+
+
+def render_frame(snapshot, times, prices, width=1200, height=700):
+    """🖌️ 프레임 하나 분량의 순수 Python 좌표 계산 (그리드 라인 / 가격선 / 포지션 목록 텍스트)"""
+    low = min(prices) * 0.98
+    span = max(max(prices) * 1.02 - low, 1e-9)
+    lines = [(0, height - (p - low) / span * height, width) for p in snapshot.grid_levels.buy_entry.tolist()]
+    lines += [(0, height - (p - low) / span * height, width) for p in snapshot.grid_levels.sell_entry.tolist()]
+    step = width / max(len(prices) - 1, 1)
+    points = [(i * step, height - (p - low) / span * height) for i, p in enumerate(prices)]
+    labels = [f"#{ticket} {kind} ${profit:+.2f}"
+              for ticket, kind, profit in zip(snapshot.positions['ticket'].tolist(),
+                                              snapshot.positions['type'].tolist(),
+                                              snapshot.positions['profit'].tolist())]
+    return len(lines) + len(points) + len(labels)
+
+
+def render_loop(snapshots, stop, frames):
+    """렌더러 루프 - 새 버전이 있을 때만 그림, 프레임 간격까지 대기"""
+    last_version = 0
+    while not stop.is_set():
+        started = time.perf_counter()
+        snapshot = snapshots.latest(since=last_version)
+        if snapshot is not None:
+            last_version = snapshot.version
+            times, prices, _ = snapshots.history(200)
+            if len(prices) >= 2:
+                render_frame(snapshot, times, prices.tolist())
+                frames.value += 1
+        stop.wait(max(0.0, FRAME_INTERVAL - (time.perf_counter() - started)))
+
+
+def _render_process_main(shm_name, stop, frames):
+    snapshots = SharedSnapshotReader(shm_name)
+    try:
+        render_loop(snapshots, stop, frames)
+    finally:
+        snapshots.close()
+
+
+class _Counter:
+    """스레드 모드용 프레임 카운터 (multiprocessing.Value 와 같은 .value 인터페이스)"""
+
+    def __init__(self):
+        self.value = 0
+
+
+def run_mode(mode, duration, interval):
+    """모드 하나 실행 → monitor 작업 리포트 + 렌더러 프레임 수"""
+    book = make_book(POSITION_COUNT)
+    levels = GridLevels.build(50000.0, grid_distance=0.0005, max_levels=LEVEL_COUNT, base_lot=0.01)
+    rng = np.random.default_rng(11)
+    state = {'price': 50000.0, 'profit': 0.0}
+
+    renderer = None
+    if mode == 'process':
+        snapshots = SharedSnapshotBuffer(history=200, max_positions=POSITION_COUNT, max_levels=LEVEL_COUNT)
+        ctx = multiprocessing.get_context('spawn')
+        stop, frames = ctx.Event(), ctx.Value('l', 0)
+        renderer = ctx.Process(target=_render_process_main, args=(snapshots.name, stop, frames), daemon=True)
+    else:
+        snapshots = SnapshotBuffer(history=200)
+        stop, frames = threading.Event(), _Counter()
+        if mode == 'thread':
+            renderer = threading.Thread(target=render_loop, args=(snapshots, stop, frames), daemon=True)
+
+    def monitor():
+        state['price'] *= 1 + rng.normal(0, 0.0002)
+        price = state['price']
+        ev = evaluate(book, price - 0.5, price + 0.5, max_loss=5.0, take_profit=1.0)
+        state['profit'] = float(ev['pnl'].sum())
+        snapshots.publish(price, state['profit'], 50000.0, levels, position_rows(book, ev))
+
+    monitor()                                   # 렌더러가 첫 프레임부터 그릴 데이터
+    if renderer is not None:
+        renderer.start()
+        time.sleep(1.0)                         # spawn 자식 기동 시간은 측정에서 제외
+
+    scheduler = DeadlineScheduler()
+    scheduler.add('monitor', interval, monitor)
+    end = time.time() + duration
+    while time.time() < end:
+        scheduler.run_pending()
+        scheduler.sleep_until_next(max_sleep=end - time.time())
+
+    stop.set()
+    if renderer is not None:
+        renderer.join(timeout=5)
+    if mode == 'process':
+        snapshots.close()
+    return scheduler.report()['monitor'], frames.value
+
+
+def main():
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else 10.0
+    interval = float(sys.argv[2]) if len(sys.argv) > 2 else 0.01
+
+    print(f"📊 시각화 지터 벤치마크: 모드별 {duration:.0f}초 | monitor {interval * 1000:.0f}ms 주기 | "
+          f"포지션 {POSITION_COUNT:,}개 | 레벨 {LEVEL_COUNT:,}개 × 2 | 렌더러 {1 / FRAME_INTERVAL:.0f}fps 목표")
+    print(f"{'모드':<8} | {'실행':>6} | {'누락':>5} | {'p50':>8} | {'p99':>8} | {'최대':>8} | {'평균 실행':>9} | 프레임")
+    for mode in MODES:
+        r, frames = run_mode(mode, duration, interval)
+        print(f"{mode:<8} | {r['fired']:>6} | {r['missed']:>5} | {r['p50_lateness_sec'] * 1000:>6.2f}ms | "
+              f"{r['p99_lateness_sec'] * 1000:>6.2f}ms | {r['max_lateness_sec'] * 1000:>6.2f}ms | "
+              f"{r['avg_runtime_sec'] * 1000:>7.2f}ms | {frames}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+"""
+🖼️ 시각화 렌더러 별도 프로세스 - 거래 프로세스와 GIL 을 나누지 않음
+- 거래 루프는 SharedSnapshotBuffer 에 게시만 하고 (publish ≈ 수십 µs), 렌더링은 다른 프로세스에서
+- 렌더러는 SharedSnapshotReader 로 최신 스냅샷 / 가격·수익 히스토리 링 버퍼를 읽음 (큐 없음)
+- 이 파일을 진입 스크립트로 새 인터프리터 실행 → Windows / Linux / Mac 동일
+  (multiprocessing spawn 은 부모의 __main__ 을 자식에서 다시 실행해 봇 스크립트의 torch 등까지 불러오므로 쓰지 않음,
+   자식은 이 모듈 + Viz_Snapshot / Grid_Levels + 렌더러만 불러옴)
+- 레벨 이름표(level_schedule)는 stdin 으로 pickle 전달, 인자는 종류 / 공유 메모리 이름 / 심볼
+- stdin 파이프는 전달 후에도 열어 둠 → 거래 프로세스가 어떻게 끝나든 (정상 종료 / 크래시 / 강제 종료) OS 가 파이프를 닫고,
+  렌더러의 감시 스레드가 EOF 를 받아 스스로 종료 (Windows / Linux / Mac 동일, 정상 종료면 atexit 으로도 종료)
+- 공유 메모리는 거래 프로세스 종료시 해제 (렌더러는 resource_tracker 에 등록하지 않고 붙기만 함)
+
+💡 사용법:
+    snapshots = SharedSnapshotBuffer(history=200)
+    start_visualizer_process('matplotlib', snapshots, 'BTCUSD', level_schedule=levels)
+    start_visualizer_process('pygame', snapshots, 'BTCUSD')
+    snapshots.publish(...)          # 거래 루프에서 계속
+"""
+
+import atexit
+import os
+import pickle
+import subprocess
+import sys
+import threading
+
+from Viz_Snapshot import SharedSnapshotReader
+
+VISUALIZER_KINDS = ('matplotlib', 'pygame')
+
+
+def start_visualizer_process(kind, snapshots, symbol, level_schedule=None):
+    """🖼️ 렌더러 프로세스 시작 (kind: 'matplotlib' / 'pygame') → subprocess.Popen"""
+    if kind not in VISUALIZER_KINDS:
+        raise ValueError(f"알 수 없는 시각화 종류: {kind} (가능: {', '.join(VISUALIZER_KINDS)})")
+    process = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), kind, snapshots.name, symbol],
+        stdin=subprocess.PIPE)
+    pickle.dump(level_schedule, process.stdin)
+    process.stdin.flush()                   # 닫지 않음 - 이 파이프의 EOF 가 렌더러의 종료 신호
+    atexit.register(process.terminate)      # 이미 끝난 프로세스면 아무것도 안 함
+    return process
+
+
+def _exit_with_parent(stream):
+    """부모(거래 프로세스)가 끝나 stdin 파이프가 닫히면 렌더러도 종료 - 창이 멈춘 데이터로 남지 않도록"""
+    stream.read()                           # EOF 까지 대기 (부모는 아무것도 더 쓰지 않음)
+    os._exit(0)
+
+
+def _pygame_main(snapshots, symbol):
+    try:
+        from Grid_Pygame_Visualizer import PygameGridVisualizer
+        PygameGridVisualizer(symbol=symbol, snapshots=snapshots).run()
+    except Exception as e:
+        print(f"Pygame 시각화 오류: {e}")
+
+
+def run_matplotlib(snapshots, symbol, level_schedule=None):
+    """📊 Matplotlib 4분할 차트 (가격+그리드 / 수익 / 포지션 / 레벨별 성과) - 2초마다 최신 스냅샷으로
+
+    snapshots: latest(since) / history(count) 를 가진 객체 (SharedSnapshotReader 또는 SnapshotBuffer)
+    level_schedule: 레벨 이름 조회용 GridLevels (없으면 'L{번호}')
+    """
+    try:
+        import matplotlib
+        matplotlib.use('TkAgg')  # GUI 백엔드 설정
+        import matplotlib.pyplot as plt
+        import matplotlib.animation as animation
+
+        # 한글 폰트 설정
+        plt.rcParams['font.family'] = ['Malgun Gothic', 'DejaVu Sans']
+        plt.rcParams['axes.unicode_minus'] = False
+        plt.rcParams['font.size'] = 10
+
+        # 그래프 설정
+        plt.style.use('dark_background')
+        fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
+        fig.suptitle(f'🚀 Revolutionary Unlimited Grid Trading System - {symbol} 🚀', fontsize=16, color='gold')
+
+        last_version = 0
+
+        def animate(frame):
+            nonlocal last_version
+            try:
+                # 최신 스냅샷만 읽음 - 새 버전이 없으면 다시 그리지 않음
+                snapshot = snapshots.latest(since=last_version)
+                if snapshot is None:
+                    return
+                last_version = snapshot.version
+
+                # 최근 100개 데이터만 표시
+                times, prices, profits = snapshots.history(100)
+                if len(times) < 2:
+                    return
+
+                # 1. 가격 차트 + 그리드 레벨
+                ax1.clear()
+                ax1.plot(times, prices, 'cyan', linewidth=2, label=f'{symbol} Price')
+
+                # 기준선 표시
+                if snapshot.baseline and snapshot.baseline > 0:
+                    ax1.axhline(y=snapshot.baseline, color='yellow', linestyle='--', alpha=0.8, label='Baseline')
+
+                # 그리드 레벨 표시 (최근 가격 기준으로 일부만)
+                grid_levels = snapshot.grid_levels
+                if len(grid_levels) > 0 and len(prices) > 0:
+                    current_price = prices[-1]
+                    # 현재가 근처 레벨만 표시 (±20% 범위) - 레벨별 axhline 대신 한 번에
+                    buy_near = grid_levels.buy_entry[grid_levels.near(current_price, 0.2, 'buy_entry')]
+                    sell_near = grid_levels.sell_entry[grid_levels.near(current_price, 0.2, 'sell_entry')]
+                    ax1.hlines(buy_near, 0, 1, transform=ax1.get_yaxis_transform(), colors='lime', alpha=0.4, linewidth=1)
+                    ax1.hlines(sell_near, 0, 1, transform=ax1.get_yaxis_transform(), colors='red', alpha=0.4, linewidth=1)
+
+                ax1.set_title('� BTC Price &, Grid Levels', color='white')
+                ax1.set_ylabel('Price ($)', color='white')
+                ax1.legend()
+                ax1.grid(True, alpha=0.3)
+                ax1.tick_params(axis='x', rotation=45)
+
+                # 2. 수익 차트
+                ax2.clear()
+                if len(profits) > 0:
+                    ax2.plot(times, profits, 'gold', linewidth=2, label='Total Profit')
+                    ax2.axhline(y=0, color='white', linestyle='-', alpha=0.5)
+
+                    # 수익/손실에 따른 색상 채우기
+                    positive_profits = [max(0, p) for p in profits]
+                    negative_profits = [min(0, p) for p in profits]
+
+                    ax2.fill_between(times, positive_profits, 0, alpha=0.3, color='lime', label='Profit')
+                    ax2.fill_between(times, negative_profits, 0, alpha=0.3, color='red', label='Loss')
+
+                    ax2.set_title(f'� Profit History (${profits[-1]:+.2f})', color='white')
+                else:
+                    ax2.set_title('💰 Profit History ($0.00)', color='white')
+
+                ax2.set_ylabel('Profit ($)', color='white')
+                ax2.legend()
+                ax2.grid(True, alpha=0.3)
+                ax2.tick_params(axis='x', rotation=45)
+
+                # 3. 활성 포지션 현황
+                ax3.clear()
+                if len(snapshot.positions):
+                    buy_positions = [p for p in snapshot.positions if p['type'] == 'BUY']
+                    sell_positions = [p for p in snapshot.positions if p['type'] == 'SELL']
+
+                    position_types = []
+                    position_profits = []
+                    colors = []
+
+                    if buy_positions:
+                        buy_profit = sum(p['profit'] for p in buy_positions)
+                        position_types.append(f'BUY ({len(buy_positions)})')
+                        position_profits.append(buy_profit)
+                        colors.append('lime' if buy_profit >= 0 else 'red')
+
+                    if sell_positions:
+                        sell_profit = sum(p['profit'] for p in sell_positions)
+                        position_types.append(f'SELL ({len(sell_positions)})')
+                        position_profits.append(sell_profit)
+                        colors.append('lime' if sell_profit >= 0 else 'red')
+
+                    if position_types:
+                        bars = ax3.bar(position_types, position_profits, color=colors, alpha=0.7)
+
+                        # 수익 값 표시
+                        for bar, profit in zip(bars, position_profits):
+                            height = bar.get_height()
+                            ax3.text(bar.get_x() + bar.get_width()/2., height,
+                                    f'${profit:.1f}', ha='center', va='bottom' if height >= 0 else 'top',
+                                    color='white', fontsize=10)
+
+                    ax3.set_title(f'📊 Active Positions ({len(snapshot.positions)})', color='white')
+                else:
+                    ax3.text(0.5, 0.5, 'No Active Positions', ha='center', va='center', 
+                            transform=ax3.transAxes, color='white', fontsize=12)
+                    ax3.set_title('📊 Active Positions (0)', color='white')
+
+                ax3.set_ylabel('Unrealized P&L ($)', color='white')
+                ax3.grid(True, alpha=0.3)
+
+                # 4. 레벨별 수익 분포
+                ax4.clear()
+                if len(snapshot.level_stats):
+                    levels = []
+                    level_profits = []
+                    colors = []
+
+                    for level, trades, profit in snapshot.level_stats.tolist():
+                        level_name = level_schedule[level]['name'] if level_schedule is not None else f'L{level+1}'
+                        levels.append(f"L{level+1}\n{level_name}")
+                        level_profits.append(profit)
+                        colors.append('lime' if profit >= 0 else 'red')
+
+                    if levels:
+                        bars = ax4.bar(levels, level_profits, color=colors, alpha=0.7)
+
+                        # 수익 값 표시
+                        for bar, profit in zip(bars, level_profits):
+                            height = bar.get_height()
+                            ax4.text(bar.get_x() + bar.get_width()/2., height,
+                                    f'${profit:.1f}', ha='center', va='bottom' if height >= 0 else 'top',
+                                    color='white', fontsize=8)
+
+                        ax4.set_title('🎯 Level Performance', color='white')
+                    else:
+                        ax4.text(0.5, 0.5, 'No Completed Trades', ha='center', va='center',
+                                transform=ax4.transAxes, color='white', fontsize=12)
+                        ax4.set_title('🎯 Level Performance', color='white')
+                else:
+                    ax4.text(0.5, 0.5, 'No Completed Trades', ha='center', va='center',
+                            transform=ax4.transAxes, color='white', fontsize=12)
+                    ax4.set_title('🎯 Level Performance', color='white')
+
+                ax4.set_ylabel('Profit ($)', color='white')
+                ax4.grid(True, alpha=0.3)
+
+                # 전체 레이아웃 조정
+                plt.tight_layout()
+
+            except Exception as e:
+                print(f"시각화 애니메이션 오류: {e}")
+
+        # 애니메이션 시작
+        ani = animation.FuncAnimation(fig, animate, interval=2000, cache_frame_data=False)
+
+        # 창 제목 설정
+        manager = plt.get_current_fig_manager()
+        if hasattr(manager, 'window'):
+            if hasattr(manager.window, 'wm_title'):
+                manager.window.wm_title(f'🚀 {symbol} Grid Trading System - Real-time Visualization')
+
+        plt.show()
+
+    except Exception as e:
+        print(f"시각화 시작 오류: {e}")
+        print("matplotlib 또는 GUI 백엔드 설치가 필요할 수 있습니다.")
+        print("다음 명령어로 설치해보세요:")
+        print("pip install matplotlib")
+        print("pip install tkinter")
+
+
+if __name__ == "__main__":
+    # 렌더러 진입점 (start_visualizer_process 가 실행): 종류, 공유 메모리 이름, 심볼
+    kind, shm_name, symbol = sys.argv[1], sys.argv[2], sys.argv[3]
+    level_schedule = pickle.load(sys.stdin.buffer)
+    threading.Thread(target=_exit_with_parent, args=(sys.stdin.buffer,), daemon=True).start()
+
+    reader = SharedSnapshotReader(shm_name, track=False)
+    try:
+        if kind == 'pygame':
+            _pygame_main(reader, symbol)
+        else:
+            run_matplotlib(reader, symbol, level_schedule)
+    finally:
+        reader.close()
@@ -0,0 +1,326 @@
+"""
+🪞 시각화 스냅샷 더블 버퍼 - 거래 루프 → 렌더러, 큐/복사 없이 최신 상태만 전달
+- publish(): 거래 루프가 불변 스냅샷을 뒤 슬롯에 쓰고 앞/뒤 인덱스만 바꿈
+- 렌더러는 latest(since) 로 마지막 버전만 읽음 → 렌더가 밀리면 그 사이 버전은 건너뜀 (쌓이는 데이터 없음)
+- 가격/수익 히스토리는 고정 크기 NumPy 링 버퍼 (publish 당 한 칸) → 오래 돌려도 메모리 일정
+- SnapshotBuffer: 같은 프로세스 (쓰는 쪽 하나, 스냅샷 안의 값은 바꾸지 않으므로 락 없음)
+- SharedSnapshotBuffer / SharedSnapshotReader: 같은 레이아웃을 multiprocessing.shared_memory 위에
+  → 렌더러를 다른 프로세스로 (GIL 경쟁 없음). 슬롯마다 버전을 마지막에 써서 읽는 쪽이 찢어진 값을 버림
+- 포지션은 VIZ_POSITION_DTYPE 행 배열 (p['type'] == 'BUY', p['profit'] 처럼 기존 dict 방식 접근 그대로)
+
+💡 사용법:
+    snapshots = SnapshotBuffer(history=200)            # 또는 SharedSnapshotBuffer(history=200)
+    snapshots.publish(price=71440.5, profit=6.5, baseline=71400.0, grid_levels=levels,
+                      positions=position_rows(book, ev), level_stats=level_stat_rows(stats))
+    snap = snapshots.latest(since=last_version)       # 새 버전 없으면 None → 다시 그리지 않음
+    times, prices, profits = snapshots.history(100)   # 최근 100개 (시간순, 읽는 쪽 소유 배열)
+    version, rows = snapshots.history_since(version)  # 지난번 이후 새 히스토리 행만 (렌더러 쪽 긴 링 버퍼용)
+
+    reader = SharedSnapshotReader(snapshots.name)     # 렌더러 프로세스에서 (같은 API)
+    reader = SharedSnapshotReader(name, track=False)  # multiprocessing 자식이 아닌 별도 인터프리터에서
+"""
+
+import atexit
+import os
+import sys
+from collections import namedtuple
+from datetime import datetime
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from Grid_Levels import GridLevels
+
+VizSnapshot = namedtuple('VizSnapshot', ['version', 'timestamp', 'price', 'profit', 'baseline',
+                                         'grid_levels', 'positions', 'level_stats'])
+
+HISTORY_DTYPE = np.dtype([('time', 'M8[ms]'), ('price', 'f8'), ('profit', 'f8')])
+
+VIZ_POSITION_DTYPE = np.dtype([('ticket', 'i8'), ('type', 'U4'), ('entry_price', 'f8'), ('current_price', 'f8'),
+                               ('volume', 'f8'), ('profit', 'f8'), ('tp', 'f8'), ('sl', 'f8')])
+
+LEVEL_STAT_DTYPE = np.dtype([('level', 'i8'), ('trades', 'i8'), ('profit', 'f8')])
+
+# 공유 메모리용 그리드 레벨 열 (렌더러가 쓰는 것만)
+LEVEL_COLUMNS = ('level', 'distance_pct', 'buy_entry', 'sell_entry')
+LEVEL_ROW_DTYPE = np.dtype([('level', 'i8'), ('distance_pct', 'f8'), ('buy_entry', 'f8'), ('sell_entry', 'f8')])
+
+# 히스토리 여유 칸: 읽는 동안 publish 가 이만큼 더 와도 읽는 구간은 덮어쓰지 않음
+HISTORY_SPARE = 64
+
+
+def _readonly(array):
+    array.flags.writeable = False
+    return array
+
+
+def _ring_rows(ring, since, version, history_size):
+    """히스토리 링에서 (since, version] 버전 행 복사 - 링에 남은 history_size 개까지만"""
+    start = max(since, version - history_size)
+    return ring[np.arange(start + 1, version + 1) % len(ring)]
+
+
+def position_rows(book, ev):
+    """Position_Book 배열 + evaluate 결과 → 시각화용 포지션 행 (벡터 변환, 읽기 전용)"""
+    rows = np.empty(len(book), dtype=VIZ_POSITION_DTYPE)
+    rows['ticket'] = book['ticket']
+    rows['type'] = np.where(ev['is_buy'], 'BUY', 'SELL')
+    rows['entry_price'] = book['price_open']
+    rows['current_price'] = ev['close_price']
+    rows['volume'] = book['volume']
+    rows['profit'] = ev['pnl']
+    rows['tp'] = book['tp']
+    rows['sl'] = book['sl']
+    return _readonly(rows)
+
+
+def level_stat_rows(level_stats):
+    """{레벨: {'trades', 'profit'}} → 거래 있는 레벨만 행 배열 (레벨 순)"""
+    rows = [(level, stats['trades'], stats['profit'])
+            for level, stats in sorted(level_stats.items()) if stats['trades'] > 0]
+    return _readonly(np.array(rows, dtype=LEVEL_STAT_DTYPE))
+
+
+class SnapshotBuffer:
+    """🪞 같은 프로세스용 - 버전 붙은 불변 스냅샷 + 히스토리 링 버퍼"""
+
+    def __init__(self, history=200):
+        self.history_size = history
+        self._slots = [None, None]
+        self._front = 0
+        self._ring = np.zeros(history + HISTORY_SPARE, dtype=HISTORY_DTYPE)
+        self.version = 0
+
+    def publish(self, price, profit, baseline, grid_levels, positions, level_stats=None, timestamp=None):
+        """📤 새 스냅샷 게시 (거래 루프에서만 호출) → 버전 번호"""
+        timestamp = timestamp or datetime.now()
+        version = self.version + 1
+        self._ring[version % len(self._ring)] = (np.datetime64(timestamp, 'ms'), price, profit)
+
+        if not isinstance(positions, np.ndarray):
+            positions = tuple(positions)
+        if level_stats is None:
+            level_stats = np.zeros(0, dtype=LEVEL_STAT_DTYPE)
+
+        back = 1 - self._front
+        self._slots[back] = VizSnapshot(version, timestamp, price, profit, baseline,
+                                        grid_levels, positions, level_stats)
+        self._front = back
+        self.version = version
+        return version
+
+    def latest(self, since=0):
+        """📥 since 보다 새 버전이 있으면 최신 스냅샷, 없으면 None (중간 버전은 건너뜀)"""
+        snapshot = self._slots[self._front]
+        if snapshot is None or snapshot.version <= since:
+            return None
+        return snapshot
+
+    def history(self, count=None):
+        """최근 count 개 (times, prices, profits) - 시간순, 링 버퍼 밖으로 복사된 배열"""
+        version = self.version
+        count = self.history_size if count is None else min(count, self.history_size)
+        size = min(version, count)
+        rows = self._ring[np.arange(version - size + 1, version + 1) % len(self._ring)]
+        return rows['time'], rows['price'], rows['profit']
+
+    def history_since(self, since=0):
+        """since 이후 새로 쌓인 히스토리 행 → (마지막 버전, HISTORY_DTYPE 행 배열)"""
+        version = self.version
+        return version, _ring_rows(self._ring, since, version, self.history_size)
+
+
+# ==================== 공유 메모리 ====================
+CONTROL_DTYPE = np.dtype([('front', 'i8'), ('version', 'i8'), ('history', 'i8'),
+                          ('max_positions', 'i8'), ('max_levels', 'i8'), ('max_level_stats', 'i8')])
+
+SLOT_HEADER_DTYPE = np.dtype([('version', 'i8'), ('timestamp', 'M8[ms]'), ('price', 'f8'), ('profit', 'f8'),
+                              ('baseline', 'f8'), ('positions', 'i8'), ('levels', 'i8'),
+                              ('levels_version', 'i8'), ('level_stats', 'i8')])
+
+
+def _block_dtype(history, max_positions, max_levels, max_level_stats):
+    slot = np.dtype([('header', SLOT_HEADER_DTYPE),
+                     ('positions', VIZ_POSITION_DTYPE, (max_positions,)),
+                     ('levels', LEVEL_ROW_DTYPE, (max_levels,)),
+                     ('level_stats', LEVEL_STAT_DTYPE, (max_level_stats,))])
+    return np.dtype([('control', CONTROL_DTYPE),
+                     ('slots', slot, (2,)),
+                     ('history', HISTORY_DTYPE, (history + HISTORY_SPARE,))])
+
+
+class SharedSnapshotBuffer:
+    """📡 쓰는 쪽 (거래 프로세스) - 공유 메모리 블록 생성, 종료시 자동 해제
+
+    포지션/레벨은 용량(max_positions / max_levels)까지만 싣고 나머지는 잘림
+    (그리드 레벨은 기준가에서 가까운 순이라 먼 레벨부터 빠짐)
+    """
+
+    def __init__(self, history=200, max_positions=4096, max_levels=4096, max_level_stats=1024):
+        dtype = _block_dtype(history, max_positions, max_levels, max_level_stats)
+        self._shm = shared_memory.SharedMemory(create=True, size=dtype.itemsize)
+        self.name = self._shm.name
+        self.history_size = history
+        self._block = np.ndarray((), dtype=dtype, buffer=self._shm.buf)
+        self._block[...] = np.zeros((), dtype=dtype)
+        control = self._block['control']
+        control['history'] = history
+        control['max_positions'] = max_positions
+        control['max_levels'] = max_levels
+        control['max_level_stats'] = max_level_stats
+        self._slot_levels = [None, None]    # 슬롯마다 마지막으로 복사한 GridLevels (같으면 다시 안 씀)
+        self._levels_version = 0
+        self._levels_source = None
+        self.version = 0
+        atexit.register(self.close)
+
+    def publish(self, price, profit, baseline, grid_levels, positions, level_stats=None, timestamp=None):
+        """📤 새 스냅샷을 뒤 슬롯에 쓰고 앞으로 전환 → 버전 번호"""
+        timestamp = timestamp or datetime.now()
+        block = self._block
+        control = block['control']
+        version = self.version + 1
+
+        ring = block['history']
+        ring[version % len(ring)] = (np.datetime64(timestamp, 'ms'), price, profit)
+
+        if grid_levels is not self._levels_source:
+            self._levels_source = grid_levels
+            self._levels_version += 1
+
+        back = 1 - int(control['front'])
+        slot = block['slots'][back]
+        header = slot['header']
+        header['version'] = -1                      # 쓰는 중 - 읽는 쪽은 이 슬롯을 버림
+
+        count = min(len(positions), len(slot['positions']))
+        slot['positions'][:count] = positions[:count]
+        header['positions'] = count
+
+        if self._slot_levels[back] is not grid_levels:
+            count = min(len(grid_levels), len(slot['levels']))
+            for name in LEVEL_COLUMNS if count else ():
+                slot['levels'][name][:count] = grid_levels.column(name)[:count]
+            header['levels'] = count
+            header['levels_version'] = self._levels_version
+            self._slot_levels[back] = grid_levels
+
+        stats = level_stats if level_stats is not None else np.zeros(0, dtype=LEVEL_STAT_DTYPE)
+        count = min(len(stats), len(slot['level_stats']))
+        slot['level_stats'][:count] = stats[:count]
+        header['level_stats'] = count
+
+        header['timestamp'] = np.datetime64(timestamp, 'ms')
+        header['price'] = price
+        header['profit'] = profit
+        header['baseline'] = baseline or 0.0
+        header['version'] = version                 # 마지막에 버전 → 슬롯 완성
+        control['front'] = back
+        control['version'] = version
+        self.version = version
+        return version
+
+    def close(self):
+        if self._shm is None:
+            return
+        self._block = None
+        self._shm.close()
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+        self._shm = None
+
+
+def _attach(name, track):
+    """기존 공유 메모리 열기 - track=False 면 이 프로세스의 resource_tracker 에 등록하지 않음
+
+    multiprocessing 자식이 아닌 별도 인터프리터는 자기 tracker 를 따로 띄우므로, 등록된 채로 끝나면
+    쓰는 쪽이 아직 쓰고 있는 블록을 종료시 unlink 해버림 (POSIX)
+    """
+    if not track and sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    shm = shared_memory.SharedMemory(name=name)
+    if not track and os.name == 'posix':
+        resource_tracker.unregister(shm._name, 'shared_memory')
+    return shm
+
+
+class SharedSnapshotReader:
+    """📥 읽는 쪽 (렌더러 프로세스) - SnapshotBuffer 와 같은 latest / history API
+
+    track: multiprocessing 으로 띄운 자식이면 True (부모와 tracker 공유), 따로 실행한 인터프리터면 False
+    """
+
+    RETRIES = 3
+
+    def __init__(self, name, level_name_format='L{:04d}', track=True):
+        self._shm = _attach(name, track)
+        control = np.ndarray((), dtype=CONTROL_DTYPE, buffer=self._shm.buf)
+        dtype = _block_dtype(int(control['history']), int(control['max_positions']),
+                             int(control['max_levels']), int(control['max_level_stats']))
+        self._block = np.ndarray((), dtype=dtype, buffer=self._shm.buf)
+        self.history_size = int(control['history'])
+        self.level_name_format = level_name_format
+        self._levels = (0, GridLevels({}))          # (levels_version, GridLevels) 캐시
+
+    @property
+    def version(self):
+        return int(self._block['control']['version'])
+
+    def latest(self, since=0):
+        """📥 since 보다 새 버전의 완성된 슬롯 → VizSnapshot (없거나 계속 쓰는 중이면 None)"""
+        block = self._block
+        for _ in range(self.RETRIES):
+            slot = block['slots'][int(block['control']['front'])]
+            header = slot['header']
+            version = int(header['version'])
+            if 0 <= version <= since:
+                return None
+            if version < 0:
+                continue
+            head = header.copy()
+            positions = _readonly(slot['positions'][:int(head['positions'])].copy())
+            level_stats = _readonly(slot['level_stats'][:int(head['level_stats'])].copy())
+            grid_levels = self._grid_levels(slot, int(head['levels_version']), int(head['levels']))
+            if int(header['version']) != version:
+                continue                            # 읽는 동안 다시 써짐 → 다시
+            return VizSnapshot(version, head['timestamp'].item(), float(head['price']),
+                               float(head['profit']), float(head['baseline']),
+                               grid_levels, positions, level_stats)
+        return None
+
+    def _grid_levels(self, slot, levels_version, count):
+        if self._levels[0] != levels_version:
+            rows = slot['levels'][:count]
+            self._levels = (levels_version, GridLevels({name: rows[name] for name in LEVEL_COLUMNS},
+                                                       name_format=self.level_name_format))
+        return self._levels[1]
+
+    def history(self, count=None):
+        """최근 count 개 (times, prices, profits) - 시간순 복사본"""
+        block = self._block
+        ring = block['history']
+        count = self.history_size if count is None else min(count, self.history_size)
+        for _ in range(self.RETRIES):
+            version = int(block['control']['version'])
+            size = min(version, count)
+            rows = ring[np.arange(version - size + 1, version + 1) % len(ring)]
+            if int(block['control']['version']) - version < HISTORY_SPARE:
+                break
+        return rows['time'], rows['price'], rows['profit']
+
+    def history_since(self, since=0):
+        """since 이후 새로 쌓인 히스토리 행 → (마지막 버전, HISTORY_DTYPE 행 배열)"""
+        block = self._block
+        for _ in range(self.RETRIES):
+            version = int(block['control']['version'])
+            rows = _ring_rows(block['history'], since, version, self.history_size)
+            if int(block['control']['version']) - version < HISTORY_SPARE:
+                break
+        return version, rows
+
+    def close(self):
+        self._block = None
+        self._shm.close()
+
@@ -15,6 +15,8 @@ import json
 import os
 from collections import defaultdict
 
+from Trade_Journal import TradeJournal
+
 class AbsoluteProfitBot:
     def __init__(self):
         self.config = {}
@@ -28,6 +30,7 @@ class AbsoluteProfitBot:
         
         self.last_price = 0.0
         self.save_file = 'absolute_profit_stats.json'
+        self.journal = TradeJournal(self.save_file)   # 거래마다 바뀐 항목만 추가 기록
         self.load_stats()
     
     def configure_profit_settings(self):
@@ -343,29 +346,30 @@ class AbsoluteProfitBot:
         
         print(f"{'='*70}\n")
     
-    def save_stats(self):
-        """통계 저장"""
+    def save_stats(self, compact=False):
+        """통계 저장 - 저널에 바뀐 항목만 한 줄 추가 (compact=True 면 전체 스냅샷으로 압축)"""
         stats_to_save = self.stats.copy()
         stats_to_save['daily_profits'] = dict(stats_to_save['daily_profits'])
         stats_to_save['start_time'] = stats_to_save['start_time'].isoformat()
         
-        with open(self.save_file, 'w') as f:
-            json.dump(stats_to_save, f, indent=2)
+        if compact:
+            self.journal.snapshot(stats_to_save)
+        else:
+            self.journal.record(stats_to_save)
     
     def load_stats(self):
         """통계 불러오기"""
-        if os.path.exists(self.save_file):
-            try:
-                with open(self.save_file, 'r') as f:
-                    loaded_stats = json.load(f)
-                
+        try:
+            # 스냅샷(기존 통계 파일) + 저널 재생
+            loaded_stats = self.journal.load()
+            if loaded_stats:
                 self.stats.update(loaded_stats)
                 self.stats['start_time'] = datetime.fromisoformat(loaded_stats['start_time'])
                 self.stats['daily_profits'] = defaultdict(float, loaded_stats['daily_profits'])
                 
                 print(f"\n✓ 이전 통계 불러옴: 누적 수익 ${self.stats['total_real_profit']:,.2f}")
-            except:
-                print("\n⚠️ 통계 파일 손상. 새로 시작합니다.")
+        except:
+            print("\n⚠️ 통계 파일 손상. 새로 시작합니다.")
     
     def run(self):
         """메인 실행 루프 - 절댓값 수익만"""
@@ -419,7 +423,7 @@ class AbsoluteProfitBot:
             self.display_real_statistics()
             
         finally:
-            self.save_stats()
+            self.save_stats(compact=True)
             mt5.shutdown()
             print("\n💎 절댓값 수익 보장 시스템 종료\n")
 